@@ -144,14 +144,17 @@ class LeadAdmin(admin.ModelAdmin):
 
     contact_email.short_description = "Email"
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).without_transcripts()
+
     def conversation_snippet(self, obj):
-        if obj.conversation_history:
-            snippet = obj.conversation_history[:50].replace("\n", " ")
-            if len(obj.conversation_history) > 50:
+        if obj.conversation_preview:
+            snippet = obj.conversation_preview[:50].replace("\n", " ")
+            if len(obj.conversation_preview) > 50:
                 snippet += "..."
             return format_html(
                 '<span title="{}" style="font-family: monospace; background: #f8f9fa; padding: 2px 4px; border-radius: 2px;">💬 {}</span>',
-                obj.conversation_history[:200],
+                obj.conversation_preview,
                 snippet,
             )
         return format_html('<span style="color: #6c757d;">—</span>')
@@ -446,9 +449,9 @@ class LeadAdmin(admin.ModelAdmin):
         )
 
         # Re-analyze conversation if exists
-        if obj.conversation_history:
+        if obj.conversation_preview:
             actions.append(
-                f'<a href="/admin-config/ai-dashboard/?conversation_text={obj.conversation_history[:100]}" class="button" style="background: #17a2b8; color: white; padding: 5px 8px; text-decoration: none; border-radius: 3px; margin-right: 3px; font-size: 11px;" title="Re-analyze conversation">🔄</a>'
+                f'<a href="/admin-config/ai-dashboard/?conversation_text={obj.conversation_preview[:100]}" class="button" style="background: #17a2b8; color: white; padding: 5px 8px; text-decoration: none; border-radius: 3px; margin-right: 3px; font-size: 11px;" title="Re-analyze conversation">🔄</a>'
             )
 
         # View details
@@ -471,7 +474,7 @@ class ConversationAnalysisAdmin(admin.ModelAdmin):
         "analysis_actions",
     ]
     list_filter = ["analysis_timestamp", "user"]
-    search_fields = ["conversation_text", "user__username"]
+    search_fields = ["conversation_preview", "user__username"]
     readonly_fields = ["id", "analysis_timestamp", "extracted_data_display"]
 
     fieldsets = (
@@ -487,12 +490,30 @@ class ConversationAnalysisAdmin(admin.ModelAdmin):
         ("Metadata", {"fields": ("id",), "classes": ("collapse",)}),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).without_transcripts()
+        return queryset.defer("search_vector")
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        words = ConversationAnalysis.build_search_vector(search_term).split()
+        if words:
+            # conversation_text is stored compressed, so the database cannot
+            # match inside it; match the words kept in search_vector instead
+            matching = queryset
+            for word in words:
+                matching = matching.filter(search_vector__icontains=word)
+            results |= matching
+        return results, may_have_duplicates
+
     def conversation_snippet(self, obj):
-        if obj.conversation_text:
+        if obj.conversation_preview:
             return (
-                obj.conversation_text[:100] + "..."
-                if len(obj.conversation_text) > 100
-                else obj.conversation_text
+                obj.conversation_preview[:100] + "..."
+                if len(obj.conversation_preview) > 100
+                else obj.conversation_preview
             )
         return "No conversation text"
 
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AiServiceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ai_service"
+
+    def ready(self):
+        from celery.signals import task_postrun
+
+        from . import metrics
+
+        # Celery workers add their AI metrics to the shared totals per task
+        task_postrun.connect(
+            metrics.flush_after_task, weak=False, dispatch_uid="ai_metrics_flush"
+        )
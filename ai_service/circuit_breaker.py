@@ -0,0 +1,378 @@
+"""
+Shared circuit breaker for the Gemini model backend
+
+When Gemini is degraded every request would otherwise walk the retry loop in
+``_make_api_call`` (exponential backoff plus quota waits), tying up web
+workers for the whole site. The breaker trips after repeated upstream
+failures and, while open, callers fail fast:
+
+- ``closed``: calls go through; failures are counted in a rolling window
+- ``open``: calls are rejected with ``CircuitOpenError`` until the recovery
+  timeout has passed
+- ``half_open``: a single probe call is let through; success closes the
+  breaker, failure opens it again
+
+State lives in Redis (REDIS_URL) so every worker process shares it. If Redis
+is unreachable the breaker keeps working with per-process state.
+
+``protect_service`` adds the fast fallback on the service side for the
+analysis methods that need it: their successful results are kept as
+last-known-good values, and a call rejected by the open breaker is answered
+with the cached result instead of the ``_get_default_*`` one.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+from .redis_client import LocalStore, get_redis
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# How long to use local state before trying Redis again after an error
+REDIS_RETRY_SECONDS = 30
+
+CIRCUIT_TRIPS = metrics.REGISTRY.counter(
+    "nia_ai_circuit_trips_total", "Times the circuit breaker opened", ["breaker"]
+)
+CIRCUIT_REJECTIONS = metrics.REGISTRY.counter(
+    "nia_ai_circuit_rejections_total",
+    "Calls rejected because the circuit breaker was open",
+    ["breaker"],
+)
+LAST_KNOWN_GOOD_SERVED = metrics.REGISTRY.counter(
+    "nia_ai_last_known_good_served_total",
+    "Calls answered from the last-known-good cache while the breaker was open",
+    ["method"],
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit breaker"""
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Quota errors are handled by key rotation and are not outages"""
+    message = str(error).lower()
+    return (
+        "quota" in message
+        or "rate limit" in message
+        or "resource_exhausted" in message
+    )
+
+
+_local_store = LocalStore()
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker with shared state
+
+    Args:
+        name (str): Breaker name, used in keys and metric labels
+        failure_threshold (int): Failures within ``failure_window`` that trip it
+        failure_window (int): Seconds over which failures are counted
+        recovery_timeout (int): Seconds to stay open before probing
+        store: Redis-like client; defaults to Redis, or a local store if
+            GEMINI_BREAKER_STORE is "local"
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = None,
+        failure_window: int = None,
+        recovery_timeout: int = None,
+        store=None,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._failure_window = failure_window
+        self._recovery_timeout = recovery_timeout
+        self._store = store
+        self._degraded_until = 0.0
+        self.key_prefix = f"circuit:{name}"
+
+    # Settings are read on access so they can be changed without a restart
+
+    @property
+    def failure_threshold(self) -> int:
+        return self._failure_threshold or getattr(
+            settings, "GEMINI_BREAKER_FAILURE_THRESHOLD", 5
+        )
+
+    @property
+    def failure_window(self) -> int:
+        return self._failure_window or getattr(
+            settings, "GEMINI_BREAKER_FAILURE_WINDOW", 60
+        )
+
+    @property
+    def recovery_timeout(self) -> int:
+        return self._recovery_timeout or getattr(
+            settings, "GEMINI_BREAKER_RECOVERY_TIMEOUT", 30
+        )
+
+    # Storage
+
+    @property
+    def store(self):
+        if self._store is not None:
+            return self._store
+        if getattr(settings, "GEMINI_BREAKER_STORE", "redis") == "local":
+            return _local_store
+        if time.time() < self._degraded_until:
+            return _local_store
+        return get_redis()
+
+    def _run(self, operation):
+        """Run a store operation, degrading to per-process state on errors"""
+        store = self.store
+        try:
+            return operation(store)
+        except Exception as e:
+            if store is self._store or store is _local_store:
+                raise
+            logger.warning(
+                f"Circuit breaker store unavailable, using local state: {e}"
+            )
+            self._degraded_until = time.time() + REDIS_RETRY_SECONDS
+            return operation(_local_store)
+
+    def _key(self, suffix):
+        return f"{self.key_prefix}:{suffix}"
+
+    # State
+
+    def _read(self):
+        data = self._run(lambda store: store.hgetall(self._key("state"))) or {}
+        return data.get("state", STATE_CLOSED), float(data.get("opened_at", 0) or 0)
+
+    def get_state(self) -> str:
+        state, opened_at = self._read()
+        if state == STATE_OPEN and time.time() >= opened_at + self.recovery_timeout:
+            return STATE_HALF_OPEN
+        return state
+
+    def is_open(self) -> bool:
+        """True while calls should fail fast (does not consume the probe)"""
+        return self.get_state() == STATE_OPEN
+
+    def acquire(self) -> str:
+        """
+        Admit a call, claiming the half-open probe if needed
+
+        Returns the state the call was admitted in (pass it to
+        ``record_success``); raises CircuitOpenError if the call is rejected.
+        """
+        state = self.get_state()
+        if state == STATE_CLOSED:
+            return state
+        # Only one worker gets to probe per recovery period
+        if state == STATE_HALF_OPEN and self._run(
+            lambda store: store.set(
+                self._key("probe"), "1", nx=True, ex=self.recovery_timeout
+            )
+        ):
+            return state
+        CIRCUIT_REJECTIONS.inc(breaker=self.name)
+        _mark_call("rejected")
+        raise CircuitOpenError(f"Circuit breaker {self.name} is open")
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, claiming the half-open probe"""
+        try:
+            self.acquire()
+        except CircuitOpenError:
+            return False
+        return True
+
+    def record_success(self, admitted_state: str = None):
+        """Close the breaker after a successful probe
+
+        Calls admitted while the breaker was closed have nothing to close, so
+        passing the state returned by ``acquire`` skips the store round trip.
+        """
+        if admitted_state == STATE_CLOSED:
+            return
+        state, _ = self._read()
+        if state != STATE_CLOSED:
+            logger.info(f"Circuit breaker {self.name} closed after successful probe")
+            self._run(
+                lambda store: store.hset(
+                    self._key("state"), mapping={"state": STATE_CLOSED, "opened_at": 0}
+                )
+            )
+            self._run(
+                lambda store: store.delete(self._key("failures"), self._key("probe"))
+            )
+
+    def record_failure(self):
+        state = self.get_state()
+        if state == STATE_HALF_OPEN:
+            self._trip("probe failed")
+            return
+
+        def count(store):
+            failures = store.incr(self._key("failures"))
+            if failures == 1:
+                store.expire(self._key("failures"), self.failure_window)
+            return failures
+
+        failures = self._run(count)
+        if state == STATE_CLOSED and failures >= self.failure_threshold:
+            self._trip(f"{failures} failures in {self.failure_window}s")
+
+    def _trip(self, reason: str):
+        now = time.time()
+        logger.error(f"Circuit breaker {self.name} opened: {reason}")
+        self._run(
+            lambda store: store.hset(
+                self._key("state"), mapping={"state": STATE_OPEN, "opened_at": now}
+            )
+        )
+        self._run(
+            lambda store: store.delete(self._key("failures"), self._key("probe"))
+        )
+        self._run(lambda store: store.incr(self._key("trips")))
+        self._run(lambda store: store.set(self._key("last_trip_at"), now))
+        CIRCUIT_TRIPS.inc(breaker=self.name)
+
+    def reset(self):
+        """Force the breaker closed and clear its counters"""
+        self._run(
+            lambda store: store.delete(
+                self._key("state"),
+                self._key("failures"),
+                self._key("probe"),
+                self._key("trips"),
+                self._key("last_trip_at"),
+            )
+        )
+
+    def get_status(self) -> dict:
+        """Breaker state and trip counts for status endpoints"""
+        state, opened_at = self._read()
+        current = self.get_state()
+        failures = self._run(lambda store: store.get(self._key("failures")))
+        trips = self._run(lambda store: store.get(self._key("trips")))
+        last_trip_at = self._run(lambda store: store.get(self._key("last_trip_at")))
+        return {
+            "name": self.name,
+            "state": current,
+            "recent_failures": int(failures or 0),
+            "failure_threshold": self.failure_threshold,
+            "failure_window_seconds": self.failure_window,
+            "recovery_timeout_seconds": self.recovery_timeout,
+            "opened_at": opened_at if state == STATE_OPEN else None,
+            "retry_at": (
+                opened_at + self.recovery_timeout if current == STATE_OPEN else None
+            ),
+            "trip_count": int(trips or 0),
+            "last_trip_at": float(last_trip_at) if last_trip_at else None,
+        }
+
+
+gemini_breaker = CircuitBreaker("gemini")
+
+
+def breaker_enabled() -> bool:
+    return getattr(settings, "GEMINI_BREAKER_ENABLED", True)
+
+
+# Last-known-good results
+
+_fallback_context = threading.local()
+
+
+def _cache_key(method: str, args, kwargs) -> str:
+    payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"gemini_lkg:{method}:{digest}"
+
+
+def _mark_call(flag: str):
+    """Flag the innermost protected call (and, on return, its callers)"""
+    stack = getattr(_fallback_context, "stack", None)
+    if stack:
+        stack[-1][flag] = True
+
+
+def _marks_fallback(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _mark_call("fell_back")
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _serves_last_known_good(func):
+    method = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not breaker_enabled():
+            return func(self, *args, **kwargs)
+
+        stack = getattr(_fallback_context, "stack", None)
+        if stack is None:
+            stack = _fallback_context.stack = []
+        stack.append({"fell_back": False, "rejected": False})
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            flags = stack.pop()
+            if stack:
+                for flag, value in flags.items():
+                    stack[-1][flag] = stack[-1][flag] or value
+
+        key = _cache_key(method, args, kwargs)
+        if flags["rejected"]:
+            cached = cache.get(key)
+            if cached is not None:
+                LAST_KNOWN_GOOD_SERVED.inc(method=method)
+                return cached
+        elif not flags["fell_back"] and isinstance(result, (dict, list)):
+            cache.set(
+                key, result, getattr(settings, "GEMINI_LAST_KNOWN_GOOD_TTL", 86400)
+            )
+        return result
+
+    return wrapper
+
+
+def protect_service(*last_known_good):
+    """
+    Class decorator adding last-known-good fallbacks to a Gemini service
+
+    Only the methods named in ``last_known_good`` are wrapped. Their
+    successful results are cached per arguments; when a call is rejected by
+    the open breaker (checked once, in ``_make_api_call``) and the method
+    falls back, the cached result is returned instead of the
+    ``_get_default_*`` one. Results produced by a default fallback are never
+    cached, and other methods are left untouched.
+    """
+
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if not callable(value) or isinstance(value, (staticmethod, classmethod)):
+                continue
+            if attr.startswith("_get_default_"):
+                setattr(cls, attr, _marks_fallback(value))
+            elif attr in last_known_good:
+                setattr(cls, attr, _serves_last_known_good(value))
+        return cls
+
+    return decorate
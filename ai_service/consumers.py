@@ -0,0 +1,47 @@
+"""
+WebSocket consumers for AI service
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .jobs import get_job, job_group_name, job_visible_to, serialize_job
+
+
+class AIJobConsumer(AsyncWebsocketConsumer):
+    """Pushes progress and completion of an async AI job"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.job_id = None
+        self.group_name = None
+
+    async def connect(self):
+        """Join the job's group and send its current state"""
+        self.job_id = self.scope["url_route"]["kwargs"]["job_id"]
+        job = await sync_to_async(get_job)(self.job_id)
+
+        if job is None or not job_visible_to(job, self.scope.get("user")):
+            await self.close(code=4004)
+            return
+
+        self.group_name = job_group_name(self.job_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        # The job may have progressed (or finished) before the socket opened
+        await self.send_job(serialize_job(job))
+
+    async def disconnect(self, close_code):
+        """Leave the job's group"""
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def job_update(self, event):
+        """Forward a job update pushed by ai_service.jobs.update_job"""
+        await self.send_job(event["job"])
+
+    async def send_job(self, job):
+        await self.send(text_data=json.dumps({"type": "job_update", "job": job}))
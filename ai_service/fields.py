@@ -0,0 +1,329 @@
+"""
+Custom model fields for AI service data
+
+CompressedTextField stores large transcript text (conversation transcripts,
+chat history) compressed in a binary column and decompresses it transparently
+when the row is loaded. Values behave like plain strings in Python, forms and
+serializers; only the storage format changes.
+"""
+
+import logging
+import struct
+import zlib
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Stored payload layout: MAGIC + codec byte + dictionary id (uint32) + data.
+# Text never starts with a NUL byte, so anything without the magic prefix is
+# treated as legacy uncompressed UTF-8 written before the column was converted.
+MAGIC = b"\x00NZ"
+HEADER = struct.Struct(">cI")
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+CODEC_IDS = {CODEC_ZLIB: b"z", CODEC_ZSTD: b"s"}
+CODEC_NAMES = {value: key for key, value in CODEC_IDS.items()}
+
+# Values shorter than this are stored as raw UTF-8; the header would cost more
+# than compression saves.
+MIN_COMPRESS_BYTES = 64
+
+_dictionary_cache = {}
+_active_dictionary_ids = {}
+
+
+def get_codec() -> str:
+    """Return the configured codec, falling back to zlib if zstd is missing"""
+    codec = getattr(settings, "TRANSCRIPT_COMPRESSION_CODEC", CODEC_ZLIB)
+    if codec == CODEC_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed, using zlib for transcripts")
+        return CODEC_ZLIB
+    return codec if codec in CODEC_IDS else CODEC_ZLIB
+
+
+def get_dictionary(dictionary_id: int) -> bytes:
+    """Load a compression dictionary by id (cached for the process lifetime)"""
+    if dictionary_id not in _dictionary_cache:
+        model = apps.get_model("ai_service", "CompressionDictionary")
+        _dictionary_cache[dictionary_id] = bytes(
+            model.objects.values_list("data", flat=True).get(id=dictionary_id)
+        )
+    return _dictionary_cache[dictionary_id]
+
+
+def get_active_dictionary_id(codec: str) -> int:
+    """Return the id of the active dictionary for a codec, or 0 if none"""
+    if not getattr(settings, "TRANSCRIPT_COMPRESSION_USE_DICTIONARY", True):
+        return 0
+    if codec not in _active_dictionary_ids:
+        model = apps.get_model("ai_service", "CompressionDictionary")
+        active = (
+            model.objects.filter(codec=codec, is_active=True)
+            .order_by("-created_at")
+            .values_list("id", flat=True)
+            .first()
+        )
+        _active_dictionary_ids[codec] = active or 0
+    return _active_dictionary_ids[codec]
+
+
+def clear_dictionary_cache():
+    """Forget cached dictionaries, e.g. after training a new one"""
+    _dictionary_cache.clear()
+    _active_dictionary_ids.clear()
+
+
+def compress_text(
+    text: str, codec: Optional[str] = None, dictionary_id: Optional[int] = None
+) -> bytes:
+    """Compress text into the stored payload format"""
+    raw = text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return raw
+
+    codec = codec or get_codec()
+    if dictionary_id is None:
+        dictionary_id = get_active_dictionary_id(codec)
+    level = getattr(settings, "TRANSCRIPT_COMPRESSION_LEVEL", 6)
+
+    if codec == CODEC_ZSTD:
+        dict_data = (
+            zstandard.ZstdCompressionDict(get_dictionary(dictionary_id))
+            if dictionary_id
+            else None
+        )
+        data = zstandard.ZstdCompressor(level=level, dict_data=dict_data).compress(
+            raw
+        )
+    else:
+        compressor = (
+            zlib.compressobj(level, zdict=get_dictionary(dictionary_id))
+            if dictionary_id
+            else zlib.compressobj(level)
+        )
+        data = compressor.compress(raw) + compressor.flush()
+
+    return MAGIC + HEADER.pack(CODEC_IDS[codec], dictionary_id) + data
+
+
+def decompress_text(payload) -> str:
+    """Decode a stored payload (compressed or legacy plain text) into a string"""
+    if isinstance(payload, str):
+        return payload
+    payload = bytes(payload)
+    if not payload.startswith(MAGIC):
+        return payload.decode("utf-8")
+
+    codec_id, dictionary_id = HEADER.unpack_from(payload, len(MAGIC))
+    data = payload[len(MAGIC) + HEADER.size :]
+    codec = CODEC_NAMES[codec_id]
+
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd transcripts")
+        dict_data = (
+            zstandard.ZstdCompressionDict(get_dictionary(dictionary_id))
+            if dictionary_id
+            else None
+        )
+        raw = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    else:
+        decompressor = (
+            zlib.decompressobj(zdict=get_dictionary(dictionary_id))
+            if dictionary_id
+            else zlib.decompressobj()
+        )
+        raw = decompressor.decompress(data) + decompressor.flush()
+
+    return raw.decode("utf-8")
+
+
+def is_compressed(payload) -> bool:
+    """Check whether a stored payload already uses the compressed format"""
+    return not isinstance(payload, str) and bytes(payload[: len(MAGIC)]) == MAGIC
+
+
+def train_dictionary(samples: Iterable[str], codec: str, size: int = 32768) -> bytes:
+    """
+    Build a compression dictionary from sample transcripts
+
+    zstd dictionaries use the library trainer. zlib has no trainer, so the
+    dictionary is assembled from the most valuable repeated phrases, with the
+    most frequent ones last where zlib can reference them most cheaply.
+    """
+    sample_list: List[bytes] = [s.encode("utf-8") for s in samples if s]
+    if not sample_list:
+        return b""
+
+    if codec == CODEC_ZSTD:
+        return zstandard.train_dictionary(size, sample_list).as_bytes()
+
+    phrases = Counter()
+    for sample in sample_list:
+        words = sample.split()
+        for n in (1, 2, 3):
+            for i in range(len(words) - n + 1):
+                phrases[b" ".join(words[i : i + n]) + b" "] += 1
+
+    ranked = sorted(
+        (phrase for phrase, count in phrases.items() if count > 1),
+        key=lambda phrase: phrases[phrase] * len(phrase),
+        reverse=True,
+    )
+    chosen, total = [], 0
+    for phrase in ranked:
+        if total + len(phrase) > size:
+            continue
+        chosen.append(phrase)
+        total += len(phrase)
+
+    return b"".join(reversed(chosen))
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    """Deferred attribute that keeps the field's preview column in sync"""
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+        if self.field.preview_field and isinstance(value, str):
+            setattr(
+                instance,
+                self.field.preview_field,
+                value[: self.field.preview_length],
+            )
+
+
+class CompressedTextField(models.TextField):
+    """
+    TextField stored compressed in a binary column
+
+    Args:
+        preview_field (str): Optional CharField kept in sync with the first
+            ``preview_length`` characters, so list views can show a snippet
+            without loading (or decompressing) the full text. It must be
+            declared before this field on the model.
+        preview_length (int): Number of characters copied into the preview.
+    """
+
+    descriptor_class = CompressedTextDescriptor
+
+    def __init__(self, *args, preview_field=None, preview_length=200, **kwargs):
+        self.preview_field = preview_field
+        self.preview_length = preview_length
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.preview_field:
+            kwargs["preview_field"] = self.preview_field
+            if self.preview_length != 200:
+                kwargs["preview_length"] = self.preview_length
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decompress_text(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        if not prepared:
+            value = self.get_prep_value(value)
+        return connection.Database.Binary(compress_text(value))
+
+
+class CompressedTextQuerySet(models.QuerySet):
+    """QuerySet helpers for models with compressed transcript fields"""
+
+    def without_transcripts(self):
+        """Defer every CompressedTextField; use on list querysets"""
+        heavy = [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if isinstance(field, CompressedTextField)
+        ]
+        return self.defer(*heavy)
+
+
+def convert_to_compressed(app_label, model_name, field_name, field):
+    """
+    Migration operation converting an existing TextField to CompressedTextField
+
+    PostgreSQL cannot cast text to bytea safely (backslashes are treated as
+    escapes), so the column is converted with ``convert_to``. Other backends
+    use the regular schema editor. Existing rows stay readable as legacy
+    plain text until ``compress_transcripts`` rewrites them.
+    """
+    from django.db import migrations
+
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        old_field = model._meta.get_field(field_name)
+        if schema_editor.connection.vendor == "postgresql":
+            quote = schema_editor.quote_name
+            column = quote(old_field.column)
+            schema_editor.execute(
+                f"ALTER TABLE {quote(model._meta.db_table)} ALTER COLUMN {column} "
+                f"TYPE bytea USING convert_to({column}, 'UTF8')"
+            )
+        else:
+            new_field = field.clone()
+            new_field.set_attributes_from_name(field_name)
+            new_field.model = model
+            schema_editor.alter_field(model, old_field, new_field)
+
+    def backwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        current_field = model._meta.get_field(field_name)
+        quote = schema_editor.quote_name
+        table, column = quote(model._meta.db_table), quote(current_field.column)
+        pk_column = quote(model._meta.pk.column)
+        connection = schema_editor.connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {pk_column}, {column} FROM {table}")
+            rows = [(pk, decompress_text(value)) for pk, value in cursor.fetchall()]
+
+        text_field = models.TextField(
+            blank=current_field.blank, help_text=current_field.help_text
+        )
+        text_field.set_attributes_from_name(field_name)
+        text_field.model = model
+        if connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text "
+                f"USING ''"
+            )
+        else:
+            schema_editor.alter_field(model, current_field, text_field)
+
+        with connection.cursor() as cursor:
+            for pk, text in rows:
+                cursor.execute(
+                    f"UPDATE {table} SET {column} = %s WHERE {pk_column} = %s",
+                    [text, pk],
+                )
+
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[
+            migrations.AlterField(
+                model_name=model_name, name=field_name, field=field
+            )
+        ],
+        database_operations=[migrations.RunPython(forwards, backwards)],
+    )
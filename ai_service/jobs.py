@@ -0,0 +1,292 @@
+"""
+Asynchronous jobs for long-running AI endpoints
+
+Endpoints that spend many seconds in Gemini calls accept ``async=true``
+(query string or body). Instead of doing the work inside the request they
+submit a job and answer ``202 Accepted`` with its ID:
+
+- the work runs in the ``run_ai_job`` Celery task
+- status, progress and the final result are kept in a Redis hash
+  (``ai_job:<id>``) that expires after AI_JOB_TTL seconds
+- every update is pushed to the Channels group ``ai_job_<id>``
+  (``ws/ai/jobs/<id>/``); ``GET /api/ai/jobs/<id>/`` is the polling fallback
+- identical submissions (same kind, parameters and user) are deduplicated
+  onto the job that is still queued or running; once a job finishes its
+  dedupe key is released, so a resubmission (e.g. regenerate) runs again
+- a job is only visible to the signed-in user who submitted it
+
+Job kinds map to handler functions in ``JOB_HANDLERS``. A handler receives
+the submitted parameters and a ``progress(percent, message)`` callback and
+returns a JSON-serializable result.
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .redis_client import LocalStore, get_redis
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+JOB_HANDLERS = {
+    "comprehensive_recommendations": (
+        "ai_service.views.run_comprehensive_recommendations_job"
+    ),
+    "opportunity_intelligence": "ai_service.views.run_opportunity_intelligence_job",
+    "meeting_intelligence": "meeting_service.views.run_meeting_intelligence_job",
+    "meeting_outcome": "meeting_service.views.run_meeting_outcome_job",
+}
+
+_local_store = LocalStore()
+
+
+class UnknownJobKind(ValueError):
+    """Raised when a job is submitted for a kind without a handler"""
+
+
+def get_job_store():
+    """Redis client for job state (per-process store if AI_JOB_STORE is "local")"""
+    if getattr(settings, "AI_JOB_STORE", "redis") == "local":
+        return _local_store
+    return get_redis()
+
+
+def get_job_ttl() -> int:
+    return int(getattr(settings, "AI_JOB_TTL", 3600))
+
+
+def wants_async(request) -> bool:
+    """True when the request asked for ``async=true``"""
+    value = request.GET.get("async")
+    if value is None:
+        data = getattr(request, "data", None)
+        if data is None:
+            try:
+                data = json.loads(request.body or b"{}")
+            except (TypeError, ValueError):
+                data = {}
+        value = data.get("async") if hasattr(data, "get") else None
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def job_group_name(job_id: str) -> str:
+    return f"ai_job_{job_id}"
+
+
+def _job_key(job_id: str) -> str:
+    return f"ai_job:{job_id}"
+
+
+def _dedupe_key(kind: str, params: dict, user_id) -> str:
+    payload = json.dumps(
+        {"kind": kind, "params": params, "user": user_id},
+        sort_keys=True,
+        default=str,
+    )
+    return f"ai_job_dedupe:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def _decode(data: dict) -> dict:
+    job = dict(data)
+    for field in ("params", "result"):
+        if job.get(field):
+            job[field] = json.loads(job[field])
+    job["progress"] = int(job.get("progress") or 0)
+    return job
+
+
+def get_job(job_id: str):
+    """Job state as a dict, or None if it does not exist or has expired"""
+    data = get_job_store().hgetall(_job_key(job_id))
+    return _decode(data) if data else None
+
+
+def job_visible_to(job: dict, user) -> bool:
+    """True when ``user`` is signed in and submitted ``job``"""
+    if user is None or not user.is_authenticated:
+        return False
+    return bool(job.get("user_id")) and job["user_id"] == str(user.pk)
+
+
+def serialize_job(job: dict, include_params: bool = False) -> dict:
+    """Public representation of a job for API responses and pushes"""
+    payload = {
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "message": job.get("message", ""),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "status_url": f"/api/ai/jobs/{job['job_id']}/",
+        "websocket_url": f"/ws/ai/jobs/{job['job_id']}/",
+    }
+    if job["status"] == STATUS_COMPLETED:
+        payload["result"] = job.get("result")
+    if job["status"] == STATUS_FAILED:
+        payload["error"] = job.get("error", "")
+    if include_params:
+        payload["params"] = job.get("params")
+    return payload
+
+
+def update_job(job_id: str, **fields) -> dict:
+    """Update a job's hash, refresh its TTL and push the new state"""
+    store = get_job_store()
+    key = _job_key(job_id)
+    fields["updated_at"] = timezone.now().isoformat()
+    if "result" in fields:
+        fields["result"] = json.dumps(fields["result"], default=str)
+    store.hset(key, mapping=fields)
+    store.expire(key, get_job_ttl())
+
+    job = get_job(job_id)
+    if job:
+        if job["status"] in FINISHED_STATUSES:
+            _release_dedupe_key(job)
+        push_job_update(job)
+    return job
+
+
+def _release_dedupe_key(job: dict):
+    """Let identical submissions start a new job once this one has finished"""
+    dedupe_key = job.get("dedupe_key")
+    if not dedupe_key:
+        return
+    store = get_job_store()
+    if store.get(dedupe_key) == job["job_id"]:
+        store.delete(dedupe_key)
+
+
+def push_job_update(job: dict):
+    """Send a job's state to its Channels group; polling still works without it"""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            job_group_name(job["job_id"]),
+            {"type": "job_update", "job": serialize_job(job)},
+        )
+    except Exception as e:
+        logger.warning(f"Could not push update for job {job['job_id']}: {e}")
+
+
+def submit_job(kind: str, params: dict, user=None):
+    """
+    Queue a job, or return the existing one for an identical submission
+
+    Returns:
+        tuple: (job dict, created flag)
+    """
+    if kind not in JOB_HANDLERS:
+        raise UnknownJobKind(f"Unknown job kind: {kind}")
+
+    from .tasks import run_ai_job
+
+    store = get_job_store()
+    ttl = get_job_ttl()
+    user_id = str(user.pk) if user is not None and user.is_authenticated else ""
+    dedupe_key = _dedupe_key(kind, params, user_id)
+    job_id = uuid.uuid4().hex
+
+    # Claim the dedupe key first so concurrent submissions share one job
+    if not store.set(dedupe_key, job_id, nx=True, ex=ttl):
+        existing_id = store.get(dedupe_key)
+        existing = get_job(existing_id) if existing_id else None
+        if existing and existing["status"] in ACTIVE_STATUSES:
+            return existing, False
+        store.set(dedupe_key, job_id, ex=ttl)
+
+    now = timezone.now().isoformat()
+    key = _job_key(job_id)
+    store.hset(
+        key,
+        mapping={
+            "job_id": job_id,
+            "kind": kind,
+            "status": STATUS_QUEUED,
+            "progress": 0,
+            "message": "",
+            "params": json.dumps(params, default=str),
+            "user_id": user_id,
+            "dedupe_key": dedupe_key,
+            "created_at": now,
+            "updated_at": now,
+        },
+    )
+    store.expire(key, ttl)
+
+    try:
+        run_ai_job.delay(job_id)
+    except Exception as e:
+        logger.error(f"Could not queue {kind} job {job_id}: {e}")
+        fail_job(job_id, f"Could not queue job: {e}")
+        raise
+
+    return get_job(job_id), True
+
+
+def fail_job(job_id: str, error: str) -> dict:
+    """Mark a job failed; its dedupe key is released so it can be resubmitted"""
+    return update_job(job_id, status=STATUS_FAILED, error=error)
+
+
+def execute_job(job_id: str):
+    """Run a job's handler and record its outcome (called by the Celery task)"""
+    job = get_job(job_id)
+    if job is None:
+        logger.warning(f"Job {job_id} expired before it ran")
+        return None
+    if job["status"] in FINISHED_STATUSES:
+        return job
+
+    update_job(job_id, status=STATUS_RUNNING, message="Started")
+
+    def progress(percent: int, message: str = ""):
+        update_job(job_id, progress=max(0, min(100, int(percent))), message=message)
+
+    try:
+        handler = import_string(JOB_HANDLERS[job["kind"]])
+        result = handler(job["params"] or {}, progress)
+    except Exception as e:
+        logger.error(f"Job {job_id} ({job['kind']}) failed: {e}", exc_info=True)
+        return fail_job(job_id, str(e))
+
+    return update_job(
+        job_id,
+        status=STATUS_COMPLETED,
+        progress=100,
+        message="Completed",
+        result=result,
+    )
+
+
+def job_params(data) -> dict:
+    """Request payload to store with a job, without the ``async`` flag"""
+    return {key: value for key, value in data.items() if key != "async"}
+
+
+def accepted_payload(job: dict, created: bool) -> dict:
+    """Body of the 202 response returned when a job is submitted"""
+    payload = serialize_job(job)
+    payload["success"] = True
+    payload["deduplicated"] = not created
+    return payload
@@ -0,0 +1,355 @@
+"""
+Load-test harness for the AI endpoints
+
+Drives each AI view in-process through Django's test client at a target
+request rate while the Gemini model backend is replaced by the replay or
+synthetic backend (see model_backends.py), so no quota is spent. For every
+endpoint it reports latency percentiles, throughput, quota-limiter waits and
+database query counts.
+
+Besides the ``/api/ai/`` views this covers the AI-backed meeting endpoints
+(meeting intelligence, meeting outcomes) and the voice conversation summary.
+Those need a meeting and a call session to work on; the runner creates them
+for the load-test user on first use (see ``create_load_test_fixtures``).
+Meeting intelligence is an admin view, so the user must be staff.
+"""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .quota_tracker import quota_tracker
+
+SAMPLE_CONVERSATION = (
+    "Sales Rep: Hi Sarah, thanks for taking the time today.\n"
+    "Customer: Sure. I'm the IT Director at TechCorp Solutions, we have about "
+    "500 employees and our CRM is slow and our team wastes hours on manual data "
+    "entry.\n"
+    "Sales Rep: What budget and timeline are you working with?\n"
+    "Customer: We have around $50,000 to $100,000 and want to implement by Q2. "
+    "We're also talking to Salesforce. You can reach me at sarah@techcorp.com."
+)
+
+SAMPLE_LEAD_DATA = {
+    "company_name": "TechCorp Solutions",
+    "industry": "Technology",
+    "company_size": "500 employees",
+    "contact_details": {
+        "name": "Sarah Johnson",
+        "email": "sarah@techcorp.com",
+        "title": "IT Director",
+    },
+    "pain_points": ["Slow CRM", "Manual data entry"],
+    "requirements": ["CRM automation", "Reporting"],
+    "budget_info": "$50,000 - $100,000",
+    "timeline": "Implement by Q2",
+    "decision_makers": ["IT Director", "CFO"],
+    "urgency_level": "high",
+    "competitors_mentioned": ["Salesforce"],
+}
+
+SAMPLE_OPPORTUNITY_DATA = {"stage": "qualification", "value": 75000}
+
+
+@dataclass
+class Endpoint:
+    """
+    An AI endpoint and the request used to exercise it
+
+    ``path`` may contain ``{meeting_id}`` or ``{call_session_id}``, filled in
+    from the runner's fixtures.
+    """
+
+    name: str
+    path: str
+    payload: Optional[Dict[str, Any]] = None
+    method: str = "post"
+
+
+AI_ENDPOINTS = [
+    Endpoint(
+        "analyze_conversation",
+        "/api/ai/analyze/",
+        {"conversation_text": SAMPLE_CONVERSATION},
+    ),
+    Endpoint(
+        "extract_lead_info",
+        "/api/ai/extract-lead/",
+        {"conversation_text": SAMPLE_CONVERSATION},
+    ),
+    Endpoint(
+        "extract_entities", "/api/ai/extract-entities/", {"text": SAMPLE_CONVERSATION}
+    ),
+    Endpoint(
+        "lead_quality_score",
+        "/api/ai/lead-quality-score/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint(
+        "sales_strategy", "/api/ai/sales-strategy/", {"lead_data": SAMPLE_LEAD_DATA}
+    ),
+    Endpoint(
+        "industry_insights",
+        "/api/ai/industry-insights/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint(
+        "comprehensive_recommendations",
+        "/api/ai/comprehensive-recommendations/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint("next_steps", "/api/ai/next-steps/", {"lead_data": SAMPLE_LEAD_DATA}),
+    Endpoint(
+        "opportunity_conversion_analysis",
+        "/api/ai/opportunity-conversion-analysis/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint(
+        "deal_size_timeline_prediction",
+        "/api/ai/deal-size-timeline-prediction/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint(
+        "sales_stage_recommendation",
+        "/api/ai/sales-stage-recommendation/",
+        {"lead_data": SAMPLE_LEAD_DATA, "opportunity_data": SAMPLE_OPPORTUNITY_DATA},
+    ),
+    Endpoint(
+        "risk_factor_analysis",
+        "/api/ai/risk-factor-analysis/",
+        {"lead_data": SAMPLE_LEAD_DATA, "opportunity_data": SAMPLE_OPPORTUNITY_DATA},
+    ),
+    Endpoint(
+        "historical_pattern_analysis",
+        "/api/ai/historical-pattern-analysis/",
+        {"lead_data": SAMPLE_LEAD_DATA},
+    ),
+    Endpoint(
+        "comprehensive_opportunity_intelligence",
+        "/api/ai/comprehensive-opportunity-intelligence/",
+        {"lead_data": SAMPLE_LEAD_DATA, "opportunity_data": SAMPLE_OPPORTUNITY_DATA},
+    ),
+    Endpoint("test_connection", "/api/ai/test-connection/", method="get"),
+    Endpoint(
+        "meeting_intelligence",
+        "/meeting/admin/meeting_service/meeting/{meeting_id}/generate_intelligence/",
+        {"type": "talking_points"},
+    ),
+    Endpoint(
+        "meeting_outcome_summary",
+        "/meeting/api/meetings/{meeting_id}/outcomes/summary/",
+        {"regenerate": True},
+    ),
+    Endpoint(
+        "meeting_outcome_complete",
+        "/meeting/api/meetings/{meeting_id}/outcomes/complete/",
+        {"regenerate": True},
+    ),
+    Endpoint(
+        "voice_conversation_summary",
+        "/api/voice/session/{call_session_id}/summary/",
+        method="get",
+    ),
+]
+
+
+def create_load_test_fixtures(user) -> Dict[str, str]:
+    """Lead, completed meeting and voice call session for the path placeholders"""
+    from meeting_service.models import Meeting
+    from voice_service.models import CallSession, ConversationTurn
+
+    from .models import Lead
+
+    lead = Lead.objects.create(
+        user=user,
+        company_name=SAMPLE_LEAD_DATA["company_name"],
+        industry=SAMPLE_LEAD_DATA["industry"],
+        company_size=SAMPLE_LEAD_DATA["company_size"],
+        pain_points=SAMPLE_LEAD_DATA["pain_points"],
+        requirements=SAMPLE_LEAD_DATA["requirements"],
+        budget_info=SAMPLE_LEAD_DATA["budget_info"],
+        conversation_history=SAMPLE_CONVERSATION,
+    )
+    meeting = Meeting.objects.create(
+        lead=lead,
+        title="Load test discovery call",
+        scheduled_at=timezone.now(),
+        status=Meeting.Status.COMPLETED,
+        outcome=SAMPLE_CONVERSATION,
+    )
+
+    call_session = CallSession.objects.create(user=user)
+    ConversationTurn.objects.bulk_create(
+        [
+            ConversationTurn(
+                session=call_session,
+                turn_number=number,
+                speaker=(
+                    ConversationTurn.Speaker.USER
+                    if line.startswith("Sales Rep")
+                    else ConversationTurn.Speaker.NIA
+                ),
+                content=line.split(": ", 1)[-1],
+            )
+            for number, line in enumerate(SAMPLE_CONVERSATION.splitlines(), 1)
+        ]
+    )
+
+    return {"meeting_id": str(meeting.id), "call_session_id": str(call_session.pk)}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class RequestSample:
+    """Measurements for a single request"""
+
+    latency: float
+    status_code: int
+    queries: int
+    quota_waits: int
+    quota_wait_seconds: float
+
+
+@dataclass
+class EndpointReport:
+    """Aggregated load-test results for one endpoint"""
+
+    name: str
+    target_rps: float
+    elapsed: float
+    samples: List[RequestSample] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = [sample.latency * 1000 for sample in self.samples]
+        queries = [sample.queries for sample in self.samples]
+        errors = sum(1 for sample in self.samples if sample.status_code >= 500)
+        return {
+            "endpoint": self.name,
+            "requests": len(self.samples),
+            "errors": errors,
+            "target_rps": self.target_rps,
+            "throughput_rps": (
+                round(len(self.samples) / self.elapsed, 2) if self.elapsed else 0.0
+            ),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 1),
+                "p95": round(percentile(latencies, 95), 1),
+                "p99": round(percentile(latencies, 99), 1),
+                "max": round(max(latencies), 1) if latencies else 0.0,
+            },
+            "quota_waits": sum(sample.quota_waits for sample in self.samples),
+            "quota_wait_seconds": round(
+                sum(sample.quota_wait_seconds for sample in self.samples), 2
+            ),
+            "db_queries": {
+                "mean": round(statistics.mean(queries), 1) if queries else 0.0,
+                "max": max(queries) if queries else 0,
+            },
+        }
+
+
+class LoadTestRunner:
+    """
+    Open-loop load generator for the AI endpoints
+
+    Requests are started on a fixed schedule (1 / rps seconds apart) regardless
+    of how long earlier requests take, so slow endpoints build up concurrency
+    the way they would under real traffic, bounded by ``concurrency`` workers.
+    """
+
+    def __init__(
+        self,
+        user,
+        rps: float = 2.0,
+        duration: float = 10.0,
+        concurrency: int = 8,
+        on_request: Optional[Callable[[Endpoint, RequestSample], None]] = None,
+        fixtures: Optional[Dict[str, str]] = None,
+    ):
+        self.user = user
+        self.rps = rps
+        self.duration = duration
+        self.concurrency = concurrency
+        self.on_request = on_request
+        self.fixtures = fixtures
+        self._local = threading.local()
+
+    def _resolve_path(self, endpoint: Endpoint) -> str:
+        if "{" not in endpoint.path:
+            return endpoint.path
+        if self.fixtures is None:
+            self.fixtures = create_load_test_fixtures(self.user)
+        return endpoint.path.format(**self.fixtures)
+
+    def _get_client(self) -> Client:
+        if not hasattr(self._local, "client"):
+            client = Client()
+            client.force_login(self.user)
+            self._local.client = client
+        return self._local.client
+
+    def _execute(self, endpoint: Endpoint, path: str) -> RequestSample:
+        close_old_connections()
+        client = self._get_client()
+        quota_tracker.reset_wait_stats()
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.monotonic()
+            if endpoint.method == "get":
+                response = client.get(path)
+            else:
+                response = client.post(
+                    path, endpoint.payload or {}, content_type="application/json"
+                )
+            latency = time.monotonic() - started
+
+        waits = quota_tracker.get_wait_stats()
+        sample = RequestSample(
+            latency=latency,
+            status_code=response.status_code,
+            queries=len(queries),
+            quota_waits=waits["count"],
+            quota_wait_seconds=waits["seconds"],
+        )
+        if self.on_request:
+            self.on_request(endpoint, sample)
+        return sample
+
+    def run_endpoint(self, endpoint: Endpoint) -> EndpointReport:
+        """Drive one endpoint at the target rate for the configured duration"""
+        path = self._resolve_path(endpoint)
+        total_requests = max(1, int(self.rps * self.duration))
+        interval = 1.0 / self.rps
+        futures = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            started = time.monotonic()
+            for index in range(total_requests):
+                delay = started + index * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self._execute, endpoint, path))
+            samples = [future.result() for future in futures]
+            elapsed = time.monotonic() - started
+
+        return EndpointReport(endpoint.name, self.rps, elapsed, samples)
+
+    def run(self, endpoints: List[Endpoint]) -> List[EndpointReport]:
+        """Run every endpoint in turn"""
+        return [self.run_endpoint(endpoint) for endpoint in endpoints]
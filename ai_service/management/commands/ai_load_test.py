@@ -0,0 +1,122 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from ai_service.load_testing import AI_ENDPOINTS, LoadTestRunner
+from ai_service.model_backends import BACKEND_REPLAY, BACKEND_SYNTHETIC
+from ai_service.quota_tracker import quota_tracker
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test every AI endpoint against the replay or synthetic Gemini "
+        "backend. Requests run against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            choices=[BACKEND_SYNTHETIC, BACKEND_REPLAY],
+            default=BACKEND_SYNTHETIC,
+            help="Fake model backend to use",
+        )
+        parser.add_argument(
+            "--rps", type=float, default=2.0, help="Target requests per second"
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds per endpoint"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=8, help="Maximum in-flight requests"
+        )
+        parser.add_argument(
+            "--latency",
+            default="lognormal:0.8:0.4",
+            help='Simulated model latency, e.g. "fixed:0.5" or "recorded"',
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Latency RNG seed")
+        parser.add_argument(
+            "--endpoints", default="", help="Comma-separated endpoint names"
+        )
+        parser.add_argument(
+            "--username", default="loadtest", help="User the requests run as"
+        )
+        parser.add_argument(
+            "--ignore-quota",
+            action="store_true",
+            help="Lift the Gemini quota limits for the duration of the run",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON"
+        )
+
+    def handle(self, *args, **options):
+        endpoints = AI_ENDPOINTS
+        if options["endpoints"]:
+            names = {name.strip() for name in options["endpoints"].split(",")}
+            endpoints = [endpoint for endpoint in AI_ENDPOINTS if endpoint.name in names]
+            unknown = names - {endpoint.name for endpoint in endpoints}
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        # Staff, so the admin meeting intelligence view can be exercised
+        user, _ = User.objects.get_or_create(
+            username=options["username"], defaults={"is_staff": True}
+        )
+        runner = LoadTestRunner(
+            user,
+            rps=options["rps"],
+            duration=options["duration"],
+            concurrency=options["concurrency"],
+        )
+
+        saved_limits = (
+            quota_tracker.minute_limit,
+            quota_tracker.daily_limit,
+            quota_tracker.token_per_minute_limit,
+        )
+        if options["ignore_quota"]:
+            quota_tracker.minute_limit = quota_tracker.daily_limit = 10**9
+            quota_tracker.token_per_minute_limit = 10**12
+
+        try:
+            with override_settings(
+                GEMINI_BACKEND=options["backend"],
+                GEMINI_FAKE_LATENCY=options["latency"],
+                GEMINI_FAKE_SEED=options["seed"],
+                DEBUG=False,
+            ):
+                reports = []
+                for endpoint in endpoints:
+                    self.stderr.write(f"Running {endpoint.name}...")
+                    reports.append(runner.run_endpoint(endpoint).as_dict())
+        finally:
+            (
+                quota_tracker.minute_limit,
+                quota_tracker.daily_limit,
+                quota_tracker.token_per_minute_limit,
+            ) = saved_limits
+
+        if options["json"]:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+
+        header = (
+            f"{'endpoint':42} {'reqs':>5} {'err':>4} {'rps':>6} {'p50':>8} "
+            f"{'p95':>8} {'p99':>8} {'q-waits':>8} {'q-wait s':>9} {'db q':>6}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for report in reports:
+            latency = report["latency_ms"]
+            self.stdout.write(
+                f"{report['endpoint']:42} {report['requests']:>5} "
+                f"{report['errors']:>4} {report['throughput_rps']:>6} "
+                f"{latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8} "
+                f"{report['quota_waits']:>8} {report['quota_wait_seconds']:>9} "
+                f"{report['db_queries']['mean']:>6}"
+            )
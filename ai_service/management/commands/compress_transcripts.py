@@ -0,0 +1,184 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ai_service.fields import (
+    CompressedTextField,
+    clear_dictionary_cache,
+    compress_text,
+    decompress_text,
+    get_codec,
+    is_compressed,
+    train_dictionary,
+)
+from ai_service.models import CompressionDictionary
+
+
+class Command(BaseCommand):
+    help = "Compress existing transcript rows in batches and report size reduction"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Rows rewritten per batch"
+        )
+        parser.add_argument(
+            "--train-dictionary",
+            action="store_true",
+            help="Train a new compression dictionary from existing transcripts first",
+        )
+        parser.add_argument(
+            "--sample-size",
+            type=int,
+            default=1000,
+            help="Transcripts sampled per field when training a dictionary",
+        )
+        parser.add_argument(
+            "--dictionary-size",
+            type=int,
+            default=32768,
+            help="Maximum dictionary size in bytes",
+        )
+        parser.add_argument(
+            "--recompress",
+            action="store_true",
+            help="Rewrite rows that are already compressed (implied by training)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the expected size reduction without writing",
+        )
+
+    def handle(self, *args, **options):
+        targets = self._get_targets()
+        recompress = options["recompress"] or options["train_dictionary"]
+
+        if options["train_dictionary"]:
+            self._train(targets, options)
+
+        total_before = total_after = 0
+        for model, field in targets:
+            stats = self._compress_field(
+                model, field, options["batch_size"], recompress, options["dry_run"]
+            )
+            total_before += stats["bytes_before"]
+            total_after += stats["bytes_after"]
+            self.stdout.write(
+                f"{model._meta.label}.{field.name}: {stats['rows']} rows scanned, "
+                f"{stats['rewritten']} compressed, "
+                f"{self._format_reduction(stats['bytes_before'], stats['bytes_after'])}"
+            )
+
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}Total {self._format_reduction(total_before, total_after)}"
+            )
+        )
+
+    def _get_targets(self):
+        """All (model, field) pairs using CompressedTextField"""
+        return [
+            (model, field)
+            for model in apps.get_models()
+            for field in model._meta.concrete_fields
+            if isinstance(field, CompressedTextField)
+        ]
+
+    def _iter_raw_rows(self, model, field, batch_size):
+        """Yield batches of (pk, stored value) using keyset pagination"""
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        pk_column = quote(model._meta.pk.column)
+        column = quote(field.column)
+        last_pk = None
+
+        while True:
+            with connection.cursor() as cursor:
+                if last_pk is None:
+                    cursor.execute(
+                        f"SELECT {pk_column}, {column} FROM {table} "
+                        f"ORDER BY {pk_column} LIMIT %s",
+                        [batch_size],
+                    )
+                else:
+                    cursor.execute(
+                        f"SELECT {pk_column}, {column} FROM {table} "
+                        f"WHERE {pk_column} > %s ORDER BY {pk_column} LIMIT %s",
+                        [last_pk, batch_size],
+                    )
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            yield rows
+            last_pk = rows[-1][0]
+
+    def _compress_field(self, model, field, batch_size, recompress, dry_run):
+        quote = connection.ops.quote_name
+        update_sql = (
+            f"UPDATE {quote(model._meta.db_table)} SET {quote(field.column)} = %s "
+            f"WHERE {quote(model._meta.pk.column)} = %s"
+        )
+        stats = {"rows": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+
+        for rows in self._iter_raw_rows(model, field, batch_size):
+            updates = []
+            for pk, stored in rows:
+                stats["rows"] += 1
+                if stored is None:
+                    continue
+                size_before = (
+                    len(stored.encode("utf-8"))
+                    if isinstance(stored, str)
+                    else len(stored)
+                )
+                stats["bytes_before"] += size_before
+
+                if is_compressed(stored) and not recompress:
+                    stats["bytes_after"] += size_before
+                    continue
+
+                payload = compress_text(decompress_text(stored))
+                stats["bytes_after"] += len(payload)
+                stats["rewritten"] += 1
+                updates.append((connection.Database.Binary(payload), pk))
+
+            if updates and not dry_run:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.executemany(update_sql, updates)
+
+        return stats
+
+    def _train(self, targets, options):
+        codec = get_codec()
+        samples = []
+        for model, field in targets:
+            for rows in self._iter_raw_rows(model, field, options["sample_size"]):
+                samples.extend(decompress_text(stored) for _, stored in rows if stored)
+                break
+
+        data = train_dictionary(samples, codec, options["dictionary_size"])
+        if not data:
+            self.stdout.write(self.style.WARNING("No transcripts to train on"))
+            return
+
+        with transaction.atomic():
+            CompressionDictionary.objects.filter(codec=codec, is_active=True).update(
+                is_active=False
+            )
+            dictionary = CompressionDictionary.objects.create(
+                codec=codec, data=data, sample_count=len(samples)
+            )
+        clear_dictionary_cache()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Trained {codec} dictionary #{dictionary.id} "
+                f"({len(data)} bytes from {len(samples)} transcripts)"
+            )
+        )
+
+    @staticmethod
+    def _format_reduction(before, after):
+        saved = (1 - after / before) * 100 if before else 0.0
+        return f"{before:,} -> {after:,} bytes ({saved:.1f}% smaller)"
@@ -0,0 +1,457 @@
+"""
+Lightweight Prometheus-style instrumentation for the AI services
+
+Samples are recorded in an in-process registry: recording is a dict lookup
+and an addition under a lock, so the instrumentation is cheap enough to
+leave on in production.
+
+Gunicorn workers and Celery processes each have their own registry, so the
+/metrics endpoint cannot render one process's numbers as the service's.
+Every process therefore also keeps the deltas recorded since its last flush
+and adds them to shared Redis hashes (``nia_metrics:<metric>``, one
+HINCRBYFLOAT per label set, bucket, sum and count):
+
+- after an instrumented call, at most once per AI_METRICS_FLUSH_INTERVAL
+- when a Celery task finishes (``task_postrun``)
+- before /metrics renders, which then serves the shared totals
+
+With AI_METRICS_STORE = "local" (tests, single-process development) or when
+Redis is unreachable, /metrics renders this process's registry only.
+
+GeminiAIService is instrumented with the ``instrument_service`` class
+decorator:
+
+- public methods get call counts, outcomes and wall time
+- ``_get_default_*`` methods count default fallbacks
+- ``_parse_ai_response`` counts parse failures
+
+``_make_api_call`` reports upstream latency, tokens, retries, key rotations
+and retry sleeps through the ``record_*`` helpers, which attribute them to
+the innermost instrumented method running on the current thread.
+"""
+
+import bisect
+import functools
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        # Increments not yet added to the shared store
+        self._pending: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            self._pending[key] = self._pending.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key, 0.0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+            self._pending.clear()
+
+    def drain(self):
+        """Take the increments recorded since the last flush"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending):
+        """Put back increments whose flush failed"""
+        with self._lock:
+            for key, amount in pending.items():
+                self._pending[key] = self._pending.get(key, 0.0) + amount
+
+    def shared_fields(self, pending):
+        """Hash fields and increments for the shared store"""
+        for key, amount in pending.items():
+            yield json.dumps(key), amount
+
+    def from_shared(self, fields):
+        """Values in the shape of ``_values`` from a shared hash"""
+        return {
+            tuple(json.loads(field)): float(value) for field, value in fields.items()
+        }
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def collect(self, values=None):
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{self._format_labels(key)} {value}"
+
+
+class Histogram(Counter):
+    """Cumulative histogram with labels"""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            for values in (self._values, self._pending):
+                state = values.get(key)
+                if state is None:
+                    state = values[key] = self._empty_state()
+                state[0][index] += 1
+                state[1] += value
+                state[2] += 1
+
+    def _empty_state(self):
+        return [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+    def get_count(self, **labels) -> int:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        state = self._values.get(key)
+        return state[2] if state else 0
+
+    def restore(self, pending):
+        with self._lock:
+            for key, (bucket_counts, total, count) in pending.items():
+                state = self._pending.get(key)
+                if state is None:
+                    state = self._pending[key] = self._empty_state()
+                state[0] = [a + b for a, b in zip(state[0], bucket_counts)]
+                state[1] += total
+                state[2] += count
+
+    def shared_fields(self, pending):
+        for key, (bucket_counts, total, count) in pending.items():
+            prefix = json.dumps(key)
+            for index, bucket_count in enumerate(bucket_counts):
+                if bucket_count:
+                    yield f"{prefix}|{index}", bucket_count
+            yield f"{prefix}|sum", total
+            yield f"{prefix}|count", count
+
+    def from_shared(self, fields):
+        values = {}
+        for field, value in fields.items():
+            prefix, _, part = field.rpartition("|")
+            key = tuple(json.loads(prefix))
+            state = values.get(key)
+            if state is None:
+                state = values[key] = self._empty_state()
+            if part == "sum":
+                state[1] = float(value)
+            elif part == "count":
+                state[2] = int(float(value))
+            else:
+                state[0][int(part)] = int(float(value))
+        return values
+
+    def collect(self, values=None):
+        if values is None:
+            with self._lock:
+                values = {
+                    key: (list(state[0]), state[1], state[2])
+                    for key, state in self._values.items()
+                }
+        items = sorted(
+            (key, (state[0], state[1], state[2])) for key, state in values.items()
+        )
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(
+                self.buckets + (float("inf"),), bucket_counts
+            ):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield (
+                    f"{self.name}_bucket{self._format_labels(key, [('le', le)])} "
+                    f"{cumulative}"
+                )
+            yield f"{self.name}_sum{self._format_labels(key)} {total}"
+            yield f"{self.name}_count{self._format_labels(key)} {count}"
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, store=None) -> str:
+        """Text exposition of this process's values, or of the shared totals"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            if store is None:
+                lines.extend(metric.collect())
+            else:
+                fields = store.hgetall(shared_key(metric.name))
+                lines.extend(metric.collect(metric.from_shared(fields)))
+        return "\n".join(lines) + "\n"
+
+    def flush(self, store):
+        """Add the increments recorded since the last flush to ``store``"""
+        drained = [(metric, metric.drain()) for metric in self._metrics.values()]
+        drained = [(metric, pending) for metric, pending in drained if pending]
+        if not drained:
+            return
+        try:
+            pipe = store.pipeline() if hasattr(store, "pipeline") else store
+            for metric, pending in drained:
+                key = shared_key(metric.name)
+                for field, amount in metric.shared_fields(pending):
+                    pipe.hincrbyfloat(key, field, amount)
+            if pipe is not store:
+                pipe.execute()
+        except Exception:
+            for metric, pending in drained:
+                metric.restore(pending)
+            raise
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+def shared_key(metric_name: str) -> str:
+    return f"nia_metrics:{metric_name}"
+
+
+REGISTRY = Registry()
+
+METHOD_CALLS = REGISTRY.counter(
+    "nia_ai_method_calls_total",
+    "AI service method calls by outcome (ok, fallback, error)",
+    ["method", "outcome"],
+)
+METHOD_DURATION = REGISTRY.histogram(
+    "nia_ai_method_duration_seconds",
+    "Wall time of AI service methods",
+    ["method"],
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "nia_ai_upstream_latency_seconds",
+    "Latency of individual model backend calls",
+    ["method"],
+)
+PROMPT_TOKENS = REGISTRY.counter(
+    "nia_ai_prompt_tokens_total", "Estimated prompt tokens sent", ["method"]
+)
+RESPONSE_TOKENS = REGISTRY.counter(
+    "nia_ai_response_tokens_total", "Estimated response tokens received", ["method"]
+)
+RETRIES = REGISTRY.counter(
+    "nia_ai_retries_total", "Model call retries", ["method", "reason"]
+)
+RETRY_SLEEP = REGISTRY.counter(
+    "nia_ai_retry_sleep_seconds_total",
+    "Seconds spent sleeping between model call attempts",
+    ["method", "reason"],
+)
+KEY_ROTATIONS = REGISTRY.counter(
+    "nia_ai_key_rotations_total", "API key rotations", ["method"]
+)
+PARSE_FAILURES = REGISTRY.counter(
+    "nia_ai_parse_failures_total", "Model responses that failed to parse", ["method"]
+)
+DEFAULT_FALLBACKS = REGISTRY.counter(
+    "nia_ai_default_fallbacks_total",
+    "Calls answered with a _get_default_* result",
+    ["method", "fallback"],
+)
+
+_last_flush = time.monotonic()
+
+
+def get_shared_store():
+    """Redis client the metrics are aggregated in (None when the store is local)"""
+    if getattr(settings, "AI_METRICS_STORE", "redis") == "local":
+        return None
+    return get_redis()
+
+
+def flush() -> bool:
+    """Add this process's unflushed samples to the shared store"""
+    global _last_flush
+    _last_flush = time.monotonic()
+    store = get_shared_store()
+    if store is None:
+        return False
+    try:
+        REGISTRY.flush(store)
+    except Exception as e:
+        logger.warning(f"Could not flush AI metrics to Redis: {e}")
+        return False
+    return True
+
+
+def maybe_flush():
+    """Flush at most once per AI_METRICS_FLUSH_INTERVAL seconds"""
+    interval = getattr(settings, "AI_METRICS_FLUSH_INTERVAL", 10)
+    if time.monotonic() - _last_flush >= interval:
+        flush()
+
+
+def flush_after_task(**kwargs):
+    """``task_postrun`` receiver: Celery workers flush when a task finishes"""
+    flush()
+
+
+def render() -> str:
+    """Metrics for the /metrics endpoint: shared totals, else this process's"""
+    if flush():
+        try:
+            return REGISTRY.render(get_shared_store())
+        except Exception as e:
+            logger.warning(f"Could not read shared AI metrics from Redis: {e}")
+    return REGISTRY.render()
+
+
+_context = threading.local()
+
+
+def current_method() -> str:
+    """Innermost instrumented method running on this thread"""
+    stack = getattr(_context, "stack", None)
+    return stack[-1][0] if stack else "unknown"
+
+
+def _mark_fallback():
+    stack = getattr(_context, "stack", None)
+    if stack:
+        stack[-1][1] = True
+
+
+def record_upstream_call(seconds: float, prompt_tokens: int, response_tokens: int):
+    method = current_method()
+    UPSTREAM_LATENCY.observe(seconds, method=method)
+    PROMPT_TOKENS.inc(prompt_tokens, method=method)
+    RESPONSE_TOKENS.inc(response_tokens, method=method)
+
+
+def record_retry(reason: str, sleep_seconds: float = 0.0):
+    method = current_method()
+    RETRIES.inc(method=method, reason=reason)
+    if sleep_seconds:
+        RETRY_SLEEP.inc(sleep_seconds, method=method, reason=reason)
+
+
+def record_key_rotation():
+    KEY_ROTATIONS.inc(method=current_method())
+
+
+def instrumented(func):
+    """Record call count, outcome and wall time for a service method"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_context, "stack", None)
+        if stack is None:
+            stack = _context.stack = []
+        stack.append([name, False])
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "fallback" if stack[-1][1] else "ok"
+            return result
+        finally:
+            METHOD_DURATION.observe(time.perf_counter() - started, method=name)
+            METHOD_CALLS.inc(method=name, outcome=outcome)
+            fell_back = stack.pop()[1]
+            # A nested fallback also degrades the caller's result
+            if fell_back and stack:
+                stack[-1][1] = True
+            if not stack:
+                maybe_flush()
+
+    return wrapper
+
+
+def counts_fallback(func):
+    """Count calls to a _get_default_* method as a default fallback"""
+    fallback = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        DEFAULT_FALLBACKS.inc(method=current_method(), fallback=fallback)
+        _mark_fallback()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def counts_parse_failures(func):
+    """Count exceptions raised while parsing a model response"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            PARSE_FAILURES.inc(method=current_method())
+            raise
+
+    return wrapper
+
+
+def instrument_service(cls):
+    """Class decorator applying the method decorators above"""
+    for attr, value in list(vars(cls).items()):
+        if not callable(value) or isinstance(value, (staticmethod, classmethod)):
+            continue
+        if attr.startswith("_get_default_"):
+            setattr(cls, attr, counts_fallback(value))
+        elif attr == "_parse_ai_response":
+            setattr(cls, attr, counts_parse_failures(value))
+        elif not attr.startswith("_"):
+            setattr(cls, attr, instrumented(value))
+    return cls
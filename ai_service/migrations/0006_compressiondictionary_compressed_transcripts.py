@@ -0,0 +1,82 @@
+from django.db import migrations, models
+from django.db.models.functions import Substr
+
+import ai_service.fields
+
+
+def backfill_previews(apps, schema_editor):
+    """Copy the first 200 characters of existing transcripts into previews"""
+    ConversationAnalysis = apps.get_model("ai_service", "ConversationAnalysis")
+    Lead = apps.get_model("ai_service", "Lead")
+
+    ConversationAnalysis.objects.update(
+        conversation_preview=Substr("conversation_text", 1, 200)
+    )
+    Lead.objects.update(conversation_preview=Substr("conversation_history", 1, 200))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_service", "0005_remove_opportunityintelligence_opportunity_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompressionDictionary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "codec",
+                    models.CharField(
+                        choices=[("zlib", "zlib"), ("zstd", "zstd")], max_length=10
+                    ),
+                ),
+                ("data", models.BinaryField()),
+                ("sample_count", models.PositiveIntegerField(default=0)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "Compression dictionaries",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="conversationanalysis",
+            name="conversation_preview",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="conversation_preview",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_previews, migrations.RunPython.noop),
+        ai_service.fields.convert_to_compressed(
+            "ai_service",
+            "conversationanalysis",
+            "conversation_text",
+            ai_service.fields.CompressedTextField(
+                preview_field="conversation_preview"
+            ),
+        ),
+        ai_service.fields.convert_to_compressed(
+            "ai_service",
+            "lead",
+            "conversation_history",
+            ai_service.fields.CompressedTextField(
+                blank=True,
+                help_text="Original conversation transcript",
+                preview_field="conversation_preview",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:09
+
+import re
+
+from django.db import migrations, models
+
+
+def build_search_vectors(apps, schema_editor):
+    """Fill search_vector for analyses saved before admin search switched to it"""
+    ConversationAnalysis = apps.get_model("ai_service", "ConversationAnalysis")
+    batch = []
+    for analysis in ConversationAnalysis.objects.only(
+        "id", "conversation_text", "search_vector"
+    ).iterator(chunk_size=500):
+        # Same normalization as ConversationAnalysis.build_search_vector
+        words = re.findall(r"\w+", (analysis.conversation_text or "").lower())
+        analysis.search_vector = " ".join(dict.fromkeys(words))
+        batch.append(analysis)
+        if len(batch) >= 500:
+            ConversationAnalysis.objects.bulk_update(batch, ["search_vector"])
+            batch = []
+    if batch:
+        ConversationAnalysis.objects.bulk_update(batch, ["search_vector"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_service", "0006_compressiondictionary_compressed_transcripts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversationanalysis",
+            name="search_vector",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,419 @@
+"""
+Pluggable model backends for Gemini-powered services
+
+GeminiAIService and ConversationSummaryService talk to a backend object that
+exposes ``generate_content(prompt)`` / ``generate_content_async(prompt)`` and
+returns something with a ``.text`` attribute, just like a
+``genai.GenerativeModel``. The backend is selected with the GEMINI_BACKEND
+setting:
+
+- ``live``: call Gemini (default)
+- ``record``: call Gemini and store every response in the cassette store
+- ``replay``: serve recorded responses deterministically, with simulated latency
+- ``synthetic``: build schema-valid responses from the JSON template embedded
+  in the prompt, without any network access
+
+Unless GEMINI_BREAKER_ENABLED is off (or the caller gates calls itself, as
+``GeminiAIService._make_api_call`` does), the backend is wrapped in
+``CircuitBreakerBackend`` so upstream outages trip the shared breaker.
+
+Replay and synthetic modes never touch the Gemini API, which makes them
+suitable for load testing the AI endpoints without spending quota.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+from django.conf import settings
+
+from .circuit_breaker import (
+    CircuitBreaker,
+    breaker_enabled,
+    gemini_breaker,
+    is_quota_error,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKEND_LIVE = "live"
+BACKEND_RECORD = "record"
+BACKEND_REPLAY = "replay"
+BACKEND_SYNTHETIC = "synthetic"
+
+
+class CassetteMissError(Exception):
+    """Raised when replay mode has no recording for a prompt"""
+
+
+class ModelResponse:
+    """Minimal stand-in for a Gemini response object"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self):
+        return f"ModelResponse({self.text[:40]!r})"
+
+
+class LatencyModel:
+    """
+    Simulated upstream latency for replay and synthetic backends
+
+    Specs are strings so they can come from the environment:
+    ``fixed:0.5``, ``uniform:0.2:1.5``, ``lognormal:0.8:0.4`` (median, sigma)
+    or ``recorded`` (use the latency captured when the response was recorded).
+    All values are in seconds. A seed makes the sequence reproducible.
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: Optional[int] = None):
+        parts = (spec or "fixed:0").split(":")
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        if self.kind not in ("fixed", "uniform", "lognormal", "recorded"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        """Draw a latency in seconds"""
+        with self.lock:
+            if self.kind == "fixed":
+                return self.params[0] if self.params else 0.0
+            if self.kind == "uniform":
+                low, high = self.params
+                return self.rng.uniform(low, high)
+            if self.kind == "lognormal":
+                median, sigma = self.params
+                return median * self.rng.lognormvariate(0, sigma)
+            return recorded or 0.0
+
+
+class CassetteStore:
+    """
+    File-based store of recorded model responses
+
+    Each recording is a JSON file named after the hash of the model name and
+    the whitespace-normalized prompt.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(f"{model_name}\n{normalized}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        file_path = self.path / f"{key}.json"
+        if not file_path.exists():
+            return None
+        return json.loads(file_path.read_text(encoding="utf-8"))
+
+    def put(self, key: str, record: Dict[str, Any]):
+        with self.lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            (self.path / f"{key}.json").write_text(
+                json.dumps(record, indent=2), encoding="utf-8"
+            )
+
+    def __len__(self):
+        return len(list(self.path.glob("*.json"))) if self.path.exists() else 0
+
+
+class ModelBackend:
+    """Base class for model backends"""
+
+    mode = None
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str):
+        raise NotImplementedError
+
+    async def generate_content_async(self, prompt: str):
+        return await asyncio.to_thread(self.generate_content, prompt)
+
+
+class LiveBackend(ModelBackend):
+    """Calls the Gemini API"""
+
+    mode = BACKEND_LIVE
+
+    def __init__(self, model_name: str, api_key: Optional[str] = None):
+        super().__init__(model_name)
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt: str):
+        return self.model.generate_content(prompt)
+
+    async def generate_content_async(self, prompt: str):
+        return await self.model.generate_content_async(prompt)
+
+
+class RecordingBackend(ModelBackend):
+    """Wraps another backend and records every response to a cassette store"""
+
+    mode = BACKEND_RECORD
+
+    def __init__(self, inner: ModelBackend, store: CassetteStore):
+        super().__init__(inner.model_name)
+        self.inner = inner
+        self.store = store
+
+    def generate_content(self, prompt: str):
+        started = time.monotonic()
+        response = self.inner.generate_content(prompt)
+        self._record(prompt, response, time.monotonic() - started)
+        return response
+
+    async def generate_content_async(self, prompt: str):
+        started = time.monotonic()
+        response = await self.inner.generate_content_async(prompt)
+        self._record(prompt, response, time.monotonic() - started)
+        return response
+
+    def _record(self, prompt: str, response, latency: float):
+        self.store.put(
+            CassetteStore.make_key(self.model_name, prompt),
+            {
+                "model": self.model_name,
+                "prompt": prompt,
+                "text": response.text,
+                "latency": round(latency, 4),
+                "recorded_at": time.time(),
+            },
+        )
+
+
+class SyntheticBackend(ModelBackend):
+    """
+    Produces schema-valid responses without calling Gemini
+
+    Most prompts embed the expected JSON structure with placeholder values
+    ("string or null", ["item"], 0-100). The template is extracted, made
+    parseable and echoed back with placeholders coerced to plausible types,
+    so the service's parsing and validation paths run exactly as in
+    production.
+    """
+
+    mode = BACKEND_SYNTHETIC
+
+    RANGE_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)")
+    BARE_VALUE_PATTERN = re.compile(r'(:\s*)([^\s"\[\{\]\},][^,\n\}\]]*?)(\s*[,\n\}\]])')
+
+    def __init__(self, model_name: str, latency: Optional[LatencyModel] = None):
+        super().__init__(model_name)
+        self.latency = latency or LatencyModel()
+
+    def generate_content(self, prompt: str):
+        time.sleep(self.latency.sample())
+        return ModelResponse(self.synthesize(prompt))
+
+    async def generate_content_async(self, prompt: str):
+        await asyncio.sleep(self.latency.sample())
+        return ModelResponse(self.synthesize(prompt))
+
+    def synthesize(self, prompt: str) -> str:
+        template = self._extract_template(prompt)
+        if template is None:
+            return json.dumps({"response": "Connection successful"})
+        return json.dumps(self._fill(template))
+
+    def _extract_template(self, prompt: str):
+        """Find the largest balanced {...} block that parses as a template"""
+        candidates = []
+        depth, start = 0, None
+        for index, char in enumerate(prompt):
+            if char == "{":
+                if depth == 0:
+                    start = index
+                depth += 1
+            elif char == "}" and depth:
+                depth -= 1
+                if depth == 0:
+                    candidates.append(prompt[start : index + 1])
+
+        for block in sorted(candidates, key=len, reverse=True):
+            parsed = self._parse_lenient(block)
+            if isinstance(parsed, dict):
+                return parsed
+        return None
+
+    def _parse_lenient(self, block: str):
+        for text in (block, self._quote_bare_values(block)):
+            try:
+                return json.loads(re.sub(r",(\s*[\}\]])", r"\1", text))
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    def _quote_bare_values(self, block: str) -> str:
+        def replace(match):
+            value = match.group(2).strip()
+            if value in ("true", "false", "null") or re.fullmatch(
+                r"-?\d+(\.\d+)?", value
+            ):
+                return match.group(0)
+            return f"{match.group(1)}{json.dumps(value)}{match.group(3)}"
+
+        return self.BARE_VALUE_PATTERN.sub(replace, block)
+
+    def _fill(self, value):
+        if isinstance(value, dict):
+            return {key: self._fill(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._fill(item) for item in value]
+        if isinstance(value, str):
+            match = self.RANGE_PATTERN.match(value)
+            if match:
+                low, high = float(match.group(1)), float(match.group(2))
+                midpoint = (low + high) / 2
+                return int(midpoint) if midpoint.is_integer() else midpoint
+            if "|" in value and " " not in value.split("|")[0]:
+                return value.split("|")[0]
+        return value
+
+
+class ReplayBackend(ModelBackend):
+    """Serves recorded responses with simulated latency"""
+
+    mode = BACKEND_REPLAY
+
+    def __init__(
+        self,
+        model_name: str,
+        store: CassetteStore,
+        latency: Optional[LatencyModel] = None,
+        fallback: Optional[ModelBackend] = None,
+    ):
+        super().__init__(model_name)
+        self.store = store
+        self.latency = latency or LatencyModel("recorded")
+        self.fallback = fallback
+
+    def _lookup(self, prompt: str):
+        record = self.store.get(CassetteStore.make_key(self.model_name, prompt))
+        if record is None and self.fallback is None:
+            raise CassetteMissError(
+                f"No recording for prompt ({len(prompt)} chars) in {self.store.path}"
+            )
+        return record
+
+    def generate_content(self, prompt: str):
+        record = self._lookup(prompt)
+        if record is None:
+            return self.fallback.generate_content(prompt)
+        time.sleep(self.latency.sample(record.get("latency")))
+        return ModelResponse(record["text"])
+
+    async def generate_content_async(self, prompt: str):
+        record = self._lookup(prompt)
+        if record is None:
+            return await self.fallback.generate_content_async(prompt)
+        await asyncio.sleep(self.latency.sample(record.get("latency")))
+        return ModelResponse(record["text"])
+
+
+class CircuitBreakerBackend(ModelBackend):
+    """Wraps another backend with the shared circuit breaker"""
+
+    def __init__(self, inner: ModelBackend, breaker: CircuitBreaker):
+        super().__init__(inner.model_name)
+        self.inner = inner
+        self.breaker = breaker
+        self.mode = inner.mode
+
+    def _after_error(self, error: Exception):
+        if not is_quota_error(error):
+            self.breaker.record_failure()
+
+    def generate_content(self, prompt: str):
+        admitted_state = self.breaker.acquire()
+        try:
+            response = self.inner.generate_content(prompt)
+        except Exception as e:
+            self._after_error(e)
+            raise
+        self.breaker.record_success(admitted_state)
+        return response
+
+    async def generate_content_async(self, prompt: str):
+        admitted_state = self.breaker.acquire()
+        try:
+            response = await self.inner.generate_content_async(prompt)
+        except Exception as e:
+            self._after_error(e)
+            raise
+        self.breaker.record_success(admitted_state)
+        return response
+
+
+def get_model_backend(
+    model_name: str,
+    api_key: Optional[str] = None,
+    mode: Optional[str] = None,
+    breaker: bool = True,
+) -> ModelBackend:
+    """
+    Build the configured backend for a model, behind the circuit breaker
+
+    Args:
+        model_name (str): Gemini model name, e.g. "gemini-1.5-flash"
+        api_key (str): API key for live calls (ignored by offline modes)
+        mode (str): Override for the GEMINI_BACKEND setting
+        breaker (bool): False for callers that check the breaker themselves
+    """
+    backend = _build_backend(model_name, api_key, mode)
+    if breaker and breaker_enabled():
+        return CircuitBreakerBackend(backend, gemini_breaker)
+    return backend
+
+
+def _build_backend(
+    model_name: str, api_key: Optional[str] = None, mode: Optional[str] = None
+) -> ModelBackend:
+    mode = mode or getattr(settings, "GEMINI_BACKEND", BACKEND_LIVE)
+    cassette_dir = getattr(settings, "GEMINI_CASSETTE_DIR", "gemini_cassettes")
+    latency_spec = getattr(settings, "GEMINI_FAKE_LATENCY", "")
+    seed = getattr(settings, "GEMINI_FAKE_SEED", None)
+    seed = int(seed) if seed not in (None, "") else None
+
+    if mode == BACKEND_LIVE:
+        return LiveBackend(model_name, api_key)
+    if mode == BACKEND_RECORD:
+        return RecordingBackend(
+            LiveBackend(model_name, api_key), CassetteStore(cassette_dir)
+        )
+    if mode == BACKEND_REPLAY:
+        fallback = (
+            SyntheticBackend(model_name, LatencyModel(latency_spec or "fixed:0", seed))
+            if getattr(settings, "GEMINI_REPLAY_SYNTHESIZE_MISSES", False)
+            else None
+        )
+        return ReplayBackend(
+            model_name,
+            CassetteStore(cassette_dir),
+            LatencyModel(latency_spec or "recorded", seed),
+            fallback=fallback,
+        )
+    if mode == BACKEND_SYNTHETIC:
+        return SyntheticBackend(
+            model_name, LatencyModel(latency_spec or "fixed:0", seed)
+        )
+
+    raise ValueError(f"Unknown GEMINI_BACKEND mode: {mode}")
@@ -1,24 +1,48 @@
+import re
 import uuid
 
 from django.conf import settings
 from django.db import models
 
+from .fields import CompressedTextField, CompressedTextQuerySet
+
 
 class ConversationAnalysis(models.Model):
     """Store conversation analysis results from Gemini AI"""
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    conversation_text = models.TextField()
+    # The preview is declared first so the transcript descriptor fills it in
+    conversation_preview = models.CharField(
+        max_length=200, blank=True, editable=False
+    )
+    conversation_text = CompressedTextField(preview_field="conversation_preview")
+    # Words of the transcript, searched by the admin
+    search_vector = models.TextField(blank=True, editable=False)
     extracted_data = models.JSONField(default=dict)
     analysis_timestamp = models.DateTimeField(auto_now_add=True)
 
+    objects = CompressedTextQuerySet.as_manager()
+
     class Meta:
         ordering = ["-analysis_timestamp"]
 
     def __str__(self):
         return f"Analysis for {self.user.username} at {self.analysis_timestamp}"
 
+    def save(self, *args, **kwargs):
+        # conversation_text is stored compressed, so searches run against
+        # the normalized word list kept in search_vector instead
+        if "conversation_text" in self.__dict__:
+            self.search_vector = self.build_search_vector(self.conversation_text)
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def build_search_vector(content):
+        """Lowercase, de-duplicated words of the content in first-seen order"""
+        words = re.findall(r"\w+", (content or "").lower())
+        return " ".join(dict.fromkeys(words))
+
 
 class Lead(models.Model):
     """Lead model with company info, contact details, and AI-generated fields"""
@@ -94,14 +118,21 @@ class Lead(models.Model):
     )
 
     # Conversation Context
-    conversation_history = models.TextField(
-        blank=True, help_text="Original conversation transcript"
+    conversation_preview = models.CharField(
+        max_length=200, blank=True, editable=False
+    )
+    conversation_history = CompressedTextField(
+        blank=True,
+        help_text="Original conversation transcript",
+        preview_field="conversation_preview",
     )
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CompressedTextQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -271,3 +302,24 @@ class AIInsights(models.Model):
             and self.opportunity_conversion_score >= 60
             and self.conversion_probability >= 50
         )
+
+
+class CompressionDictionary(models.Model):
+    """Trained dictionary used to compress transcript fields"""
+
+    class Codec(models.TextChoices):
+        ZLIB = "zlib", "zlib"
+        ZSTD = "zstd", "zstd"
+
+    codec = models.CharField(max_length=10, choices=Codec.choices)
+    data = models.BinaryField()
+    sample_count = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Compression dictionaries"
+
+    def __str__(self):
+        return f"{self.codec} dictionary #{self.id} ({len(self.data)} bytes)"
@@ -0,0 +1,396 @@
+"""
+Token-budgeted prompt assembly for Gemini prompts
+
+Prompt builders describe a prompt as static instruction blocks (role,
+framework, response schema) and dynamic context sections (lead data,
+conversation, meeting context). ``PromptBuilder.build()`` then:
+
+- places every static block first, normalized once and cached, so the
+  instruction prefix is byte-identical across calls and can be reused by
+  provider-side prompt caching
+- serializes context as compact JSON with null and empty fields removed
+- truncates long lists, keeping the most relevant items
+- shrinks the lowest-priority sections until the prompt fits the method's
+  token budget (AI_PROMPT_TOKEN_BUDGETS / AI_PROMPT_DEFAULT_TOKEN_BUDGET)
+
+Every build also estimates what the same content would have cost with the
+previous formatting (indented JSON, unnormalized instructions, no
+truncation) and records both in the metrics registry. That estimate is a
+reconstruction, not the old prompt text. The ``prompt_token_report`` command
+compares against ``prompt_baselines.json`` instead: the prompts the
+service sent for the same sample data before token budgets were introduced.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+from django.conf import settings
+
+from . import metrics
+
+# Same heuristic as GeminiQuotaTracker.estimate_tokens, without its minimum
+CHARS_PER_TOKEN = 3
+
+DEFAULT_TOKEN_BUDGET = 3000
+
+DEFAULT_TOKEN_BUDGETS = {
+    "extract_lead_info": 6000,
+    "generate_recommendations": 2500,
+    "calculate_lead_quality_score": 2000,
+    "generate_sales_strategy": 2500,
+    "generate_meeting_questions": 3000,
+    "generate_meeting_questions_batch": 8000,
+    "generate_dynamic_follow_up_questions": 2500,
+    "adapt_questions_based_on_conversation": 4000,
+    "track_question_effectiveness": 2000,
+    "generate_industry_insights": 2000,
+    "generate_next_steps": 2000,
+    "analyze_opportunity_conversion_potential": 2000,
+    "predict_deal_size_and_timeline": 2000,
+    "recommend_sales_stage": 2500,
+    "identify_risk_factors_and_mitigation": 2500,
+    "analyze_historical_patterns": 1800,
+    "generate_meeting_summary": 3000,
+}
+
+# Strings are never truncated below this many characters
+MIN_TEXT_CHARS = 200
+TRUNCATION_MARKER = " [...] "
+
+# Keys used to rank list items when a section has no relevance function
+RELEVANCE_KEYS = ("priority", "relevance", "confidence_score", "score", "weight")
+
+PROMPT_BASELINE_TOKENS = metrics.REGISTRY.counter(
+    "nia_ai_prompt_baseline_tokens_total",
+    "Estimated prompt tokens with a reconstruction of the previous formatting",
+    ["method"],
+)
+PROMPT_ASSEMBLED_TOKENS = metrics.REGISTRY.counter(
+    "nia_ai_prompt_assembled_tokens_total",
+    "Estimated prompt tokens after compaction and budgeting",
+    ["method"],
+)
+PROMPT_BUILDS = metrics.REGISTRY.counter(
+    "nia_ai_prompt_builds_total", "Prompts assembled", ["method"]
+)
+PROMPT_BUDGET_TRIMS = metrics.REGISTRY.counter(
+    "nia_ai_prompt_budget_trims_total",
+    "Prompts that had to be shrunk to fit their token budget",
+    ["method"],
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting"""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def get_token_budget(method: str) -> int:
+    """Token budget for a prompt-building method"""
+    overrides = getattr(settings, "AI_PROMPT_TOKEN_BUDGETS", None) or {}
+    if method in overrides:
+        return int(overrides[method])
+    if method in DEFAULT_TOKEN_BUDGETS:
+        return DEFAULT_TOKEN_BUDGETS[method]
+    return int(
+        getattr(settings, "AI_PROMPT_DEFAULT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+    )
+
+
+@lru_cache(maxsize=512)
+def static_block(text: str) -> str:
+    """
+    Normalize a static instruction block
+
+    Strips indentation (including inside embedded JSON templates, which the
+    model does not need) and collapses blank lines. Results are cached, so
+    repeated prompts reuse the same prefix string.
+    """
+    lines = [line.strip() for line in text.strip().splitlines()]
+    normalized = []
+    for line in lines:
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return "\n".join(normalized)
+
+
+def prune(value):
+    """Recursively drop None, empty strings and empty containers"""
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            item = prune(item)
+            if item is not None:
+                pruned[key] = item
+        return pruned or None
+    if isinstance(value, (list, tuple)):
+        pruned = [item for item in (prune(item) for item in value) if item is not None]
+        return pruned or None
+    if isinstance(value, str):
+        stripped = value.strip()
+        return stripped or None
+    return value
+
+
+def _default_relevance(item) -> float:
+    if isinstance(item, dict):
+        for key in RELEVANCE_KEYS:
+            if isinstance(item.get(key), (int, float)):
+                return float(item[key])
+    return 0.0
+
+
+def truncate_list(
+    items: List[Any], limit: int, relevance: Optional[Callable[[Any], float]] = None
+) -> List[Any]:
+    """
+    Keep the ``limit`` most relevant items, in their original order
+
+    Ties keep earlier items, so lists without a relevance signal are cut
+    from the end.
+    """
+    if limit is None or len(items) <= limit:
+        return list(items)
+    relevance = relevance or _default_relevance
+    ranked = sorted(range(len(items)), key=lambda i: (-relevance(items[i]), i))
+    keep = sorted(ranked[:limit])
+    return [items[i] for i in keep]
+
+
+def limit_lists(value, limit, relevance=None):
+    """Apply truncate_list to every list nested inside a value"""
+    if isinstance(value, dict):
+        return {key: limit_lists(item, limit, relevance) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [
+            limit_lists(item, limit, relevance)
+            for item in truncate_list(list(value), limit, relevance)
+        ]
+    return value
+
+
+def compact_json(value, max_items: Optional[int] = None, relevance=None) -> str:
+    """Serialize context compactly: no indentation, no null or empty fields"""
+    pruned = prune(value)
+    if max_items is not None:
+        pruned = limit_lists(pruned, max_items, relevance)
+    return json.dumps(
+        pruned if pruned is not None else {},
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Shorten text to max_chars, keeping its beginning and end"""
+    if len(text) <= max_chars:
+        return text
+    keep = max(0, max_chars - len(TRUNCATION_MARKER))
+    head = keep * 2 // 3
+    return text[:head] + TRUNCATION_MARKER + text[len(text) - (keep - head) :]
+
+
+def _longest_list(value) -> int:
+    if isinstance(value, dict):
+        return max((_longest_list(item) for item in value.values()), default=0)
+    if isinstance(value, list):
+        return max([len(value)] + [_longest_list(item) for item in value])
+    return 0
+
+
+class PromptSection:
+    """A dynamic context section of a prompt"""
+
+    def __init__(
+        self,
+        label: str,
+        value,
+        priority: int = 0,
+        max_items: Optional[int] = None,
+        relevance=None,
+        required: bool = False,
+    ):
+        self.label = label
+        self.value = value
+        self.priority = priority
+        self.max_items = max_items
+        self.relevance = relevance
+        self.required = required
+        self.max_chars = None
+        self.dropped = False
+
+    def render(self) -> str:
+        if self.dropped:
+            return ""
+        if isinstance(self.value, str):
+            body = self.value.strip()
+            if self.max_chars is not None:
+                body = truncate_text(body, self.max_chars)
+        else:
+            body = compact_json(self.value, self.max_items, self.relevance)
+            if body in ("{}", "[]"):
+                return ""
+        if not body:
+            return ""
+        return f"{self.label}:\n{body}" if self.label else body
+
+    def render_baseline(self) -> str:
+        if isinstance(self.value, str):
+            body = self.value
+        else:
+            body = json.dumps(self.value, indent=2, default=str)
+        return f"{self.label}: {body}" if self.label else body
+
+    def shrink(self) -> bool:
+        """Make the section smaller; returns False when it cannot shrink"""
+        if self.dropped:
+            return False
+        if isinstance(self.value, str):
+            current = self.max_chars or len(self.value)
+            if current > MIN_TEXT_CHARS:
+                self.max_chars = max(MIN_TEXT_CHARS, current // 2)
+                return True
+        else:
+            longest = _longest_list(limit_lists(prune(self.value), self.max_items))
+            if longest > 1:
+                self.max_items = max(1, longest // 2)
+                return True
+        if not self.required:
+            self.dropped = True
+            return True
+        return False
+
+
+class PromptBuilder:
+    """
+    Assemble a prompt from static instructions and budgeted context sections
+
+    Usage::
+
+        prompt = (
+            PromptBuilder("generate_recommendations")
+            .instructions(ROLE_AND_SCHEMA)
+            .section("Lead", lead_data, priority=2, max_items=8)
+            .section("Context", context, priority=1)
+            .build()
+        )
+
+    Static blocks always come first, in the order they were added, followed
+    by the sections and then any closing instructions. When the prompt is
+    over budget, sections are shrunk in ascending priority order: lists are
+    halved (keeping the most relevant items), then text is shortened, then
+    non-required sections are dropped.
+    """
+
+    def __init__(self, method: str, budget: Optional[int] = None):
+        self.method = method
+        self.budget = budget if budget is not None else get_token_budget(method)
+        self._static: List[str] = []
+        self._sections: List[PromptSection] = []
+        self._closing: List[str] = []
+
+    def instructions(self, text: str) -> "PromptBuilder":
+        """Add a static instruction block to the cached prefix"""
+        self._static.append(text)
+        return self
+
+    def section(self, label: str, value, **options) -> "PromptBuilder":
+        """Add a dynamic context section (see PromptSection for options)"""
+        self._sections.append(PromptSection(label, value, **options))
+        return self
+
+    def closing(self, text: str) -> "PromptBuilder":
+        """Add a short instruction placed after the context sections"""
+        self._closing.append(text)
+        return self
+
+    @property
+    def prefix(self) -> str:
+        return "\n\n".join(static_block(text) for text in self._static)
+
+    def _render(self) -> str:
+        parts = [self.prefix]
+        parts.extend(section.render() for section in self._sections)
+        parts.extend(static_block(text) for text in self._closing)
+        return "\n\n".join(part for part in parts if part)
+
+    def render_baseline(self) -> str:
+        """The same content with the previous, uncompacted formatting"""
+        parts = list(self._static)
+        parts.extend(section.render_baseline() for section in self._sections)
+        parts.extend(self._closing)
+        return "\n".join(parts)
+
+    def build(self) -> str:
+        prompt = self._render()
+        trimmed = False
+        for section in sorted(self._sections, key=lambda s: s.priority):
+            while estimate_tokens(prompt) > self.budget and section.shrink():
+                prompt = self._render()
+                trimmed = True
+
+        PROMPT_BUILDS.inc(method=self.method)
+        PROMPT_BASELINE_TOKENS.inc(
+            estimate_tokens(self.render_baseline()), method=self.method
+        )
+        PROMPT_ASSEMBLED_TOKENS.inc(estimate_tokens(prompt), method=self.method)
+        if trimmed:
+            PROMPT_BUDGET_TRIMS.inc(method=self.method)
+        return prompt
+
+
+BASELINE_PROMPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "prompt_baselines.json"
+)
+
+
+def load_baseline_tokens(path: str = BASELINE_PROMPTS_PATH) -> dict:
+    """Average tokens per method of the captured pre-budgeting prompts"""
+    with open(path, encoding="utf-8") as f:
+        prompts = json.load(f)["prompts"]
+    return {
+        method: sum(estimate_tokens(prompt) for prompt in texts) / len(texts)
+        for method, texts in prompts.items()
+        if texts
+    }
+
+
+def savings_report(baseline_tokens: Optional[dict] = None) -> List[dict]:
+    """
+    Per-method token savings recorded since the metrics were last reset
+
+    Methods found in ``baseline_tokens`` (tokens per prompt, e.g. from
+    ``load_baseline_tokens``) are compared against it (``"captured"``);
+    the others against the per-build reconstruction (``"estimated"``).
+    """
+    baseline_tokens = baseline_tokens or {}
+    rows = []
+    for key, builds in sorted(PROMPT_BUILDS._values.items()):
+        method = key[0]
+        assembled = PROMPT_ASSEMBLED_TOKENS.get(method=method)
+        if method in baseline_tokens:
+            baseline_source = "captured"
+            baseline = baseline_tokens[method] * builds
+        else:
+            baseline_source = "estimated"
+            baseline = PROMPT_BASELINE_TOKENS.get(method=method)
+        rows.append(
+            {
+                "method": method,
+                "builds": int(builds),
+                "budget": get_token_budget(method),
+                "baseline_tokens": round(baseline / builds),
+                "baseline_source": baseline_source,
+                "assembled_tokens": round(assembled / builds),
+                "saved_pct": (
+                    round(100 * (baseline - assembled) / baseline, 1)
+                    if baseline
+                    else 0.0
+                ),
+                "trimmed": int(PROMPT_BUDGET_TRIMS.get(method=method)),
+            }
+        )
+    return rows
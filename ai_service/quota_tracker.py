@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 
 from django.conf import settings
@@ -19,6 +20,7 @@ class GeminiQuotaTracker:
     """
 
     def __init__(self):
+        self._wait_stats = threading.local()
         self.cache_prefix = "gemini_quota"
         self.minute_limit = getattr(settings, "GEMINI_MINUTE_LIMIT", 15)
         self.daily_limit = getattr(settings, "GEMINI_DAILY_LIMIT", 1500)
@@ -203,6 +205,27 @@ class GeminiQuotaTracker:
         # This is a conservative estimate
         return max(100, len(text) // 3)  # Minimum 100 tokens
 
+    def record_wait(self, seconds):
+        """
+        Record time a caller spent sleeping for quota to reset
+
+        Stats are kept per thread so a caller (e.g. the load-test runner) can
+        attribute waits to the request it is executing.
+        """
+        stats = self.get_wait_stats()
+        stats["count"] += 1
+        stats["seconds"] += seconds
+
+    def get_wait_stats(self):
+        """Quota wait count and seconds recorded on the current thread"""
+        if not hasattr(self._wait_stats, "stats"):
+            self._wait_stats.stats = {"count": 0, "seconds": 0.0}
+        return self._wait_stats.stats
+
+    def reset_wait_stats(self):
+        """Clear quota wait stats for the current thread"""
+        self._wait_stats.stats = {"count": 0, "seconds": 0.0}
+
     def get_wait_time(self):
         """Get recommended wait time before next request"""
         usage = self.get_current_usage()
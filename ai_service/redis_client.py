@@ -0,0 +1,107 @@
+"""
+Shared Redis access for the AI services
+
+``get_redis`` returns the process-wide client for REDIS_URL used by the
+circuit breaker, the AI job store, metrics aggregation and the live meeting
+session store. ``LocalStore`` implements the few commands they need in
+process memory.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    redis = None
+
+_redis_client = None
+
+
+def get_redis():
+    """Shared Redis client for REDIS_URL (responses decoded to str)"""
+    global _redis_client
+    if _redis_client is None:
+        if redis is None:
+            raise RuntimeError("The redis package is not installed")
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _redis_client
+
+
+class LocalStore:
+    """
+    In-process stand-in for the handful of Redis commands used by the
+    circuit breaker, the AI job store and metrics aggregation
+
+    Used when Redis is unavailable, and in tests and single-process
+    development (GEMINI_BREAKER_STORE / AI_JOB_STORE = "local").
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key) if self._alive(key) else None
+
+    def set(self, key, value, nx=False, ex=None):
+        with self._lock:
+            if nx and self._alive(key):
+                return None
+            self._data[key] = str(value)
+            if ex:
+                self._expires[key] = time.time() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._data.get(key, 0)) + 1 if self._alive(key) else 1
+            self._data[key] = str(value)
+            return value
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if self._alive(key):
+                self._expires[key] = time.time() + seconds
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {})) if self._alive(key) else {}
+
+    def hset(self, key, mapping):
+        with self._lock:
+            current = self._data.get(key, {}) if self._alive(key) else {}
+            current.update({field: str(value) for field, value in mapping.items()})
+            self._data[key] = current
+
+    def hincrbyfloat(self, key, field, amount):
+        with self._lock:
+            current = self._data.get(key, {}) if self._alive(key) else {}
+            value = float(current.get(field, 0)) + float(amount)
+            current[field] = repr(value)
+            self._data[key] = current
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
@@ -0,0 +1,11 @@
+"""
+WebSocket routing for AI service
+"""
+
+from django.urls import re_path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r"ws/ai/jobs/(?P<job_id>\w+)/$", consumers.AIJobConsumer.as_asgi()),
+]
@@ -5,7 +5,6 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-import google.generativeai as genai
 from django.conf import settings
 
 from .ai_context_guidelines import (
@@ -16,6 +15,16 @@ from .ai_context_guidelines import (
     get_objection_handling_strategies,
     get_recommendation_guidelines,
 )
+from . import metrics
+from .circuit_breaker import (
+    CircuitOpenError,
+    breaker_enabled,
+    gemini_breaker,
+    is_quota_error,
+    protect_service,
+)
+from .model_backends import get_model_backend
+from .prompting import PromptBuilder, compact_json
 from .quota_tracker import quota_tracker
 
 logger = logging.getLogger(__name__)
@@ -140,6 +149,22 @@ class DataValidator:
         return validated_data
 
 
+# Lead analyses served from the last-known-good cache while Gemini is down;
+# other methods fall straight back to their defaults
+LAST_KNOWN_GOOD_METHODS = (
+    "calculate_lead_quality_score",
+    "generate_sales_strategy",
+    "generate_industry_insights",
+    "analyze_opportunity_conversion_potential",
+    "predict_deal_size_and_timeline",
+    "recommend_sales_stage",
+    "identify_risk_factors_and_mitigation",
+    "analyze_historical_patterns",
+)
+
+
+@metrics.instrument_service
+@protect_service(*LAST_KNOWN_GOOD_METHODS)
 class GeminiAIService:
     """Enhanced service class for interacting with Google Gemini AI"""
 
@@ -155,8 +180,10 @@ class GeminiAIService:
         """Initialize the Gemini client with the current API key"""
         try:
             current_key = self.api_keys[self.current_key_index]
-            genai.configure(api_key=current_key)
-            self.model = genai.GenerativeModel("gemini-1.5-flash")
+            # The breaker is checked once per call, in _make_api_call
+            self.model = get_model_backend(
+                "gemini-1.5-flash", api_key=current_key, breaker=False
+            )
         except Exception as e:
             logger.error(
                 f"Failed to initialize Gemini client with key index {self.current_key_index}: {e}"
@@ -169,6 +196,7 @@ class GeminiAIService:
             self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
             logger.info(f"Rotating to API key index {self.current_key_index}")
             self._initialize_client()
+            metrics.record_key_rotation()
             return True
         return False
 
@@ -178,6 +206,12 @@ class GeminiAIService:
 
         for attempt in range(max_retries + 1):
             try:
+                # Fail fast while Gemini is known to be down, before any
+                # quota waits or backoff sleeps
+                admitted_state = None
+                if breaker_enabled():
+                    admitted_state = gemini_breaker.acquire()
+
                 # Check quota before making request
                 quota_check = quota_tracker.can_make_request(estimated_tokens)
 
@@ -189,6 +223,7 @@ class GeminiAIService:
                         logger.info(
                             f"Rotated to new API key, retrying (attempt {attempt + 1})"
                         )
+                        metrics.record_retry("quota_rotation")
                         continue
                     else:
                         # No more keys to try, check if we should wait
@@ -197,6 +232,8 @@ class GeminiAIService:
                             wait_time < 300 and attempt < max_retries
                         ):  # Only wait if less than 5 minutes
                             logger.info(f"Waiting {wait_time} seconds for quota reset")
+                            quota_tracker.record_wait(wait_time)
+                            metrics.record_retry("quota_wait", wait_time)
                             time.sleep(wait_time)
                             continue
                         else:
@@ -205,7 +242,9 @@ class GeminiAIService:
                             )
 
                 # Make the API call
+                call_started = time.perf_counter()
                 response = self.model.generate_content(prompt)
+                call_seconds = time.perf_counter() - call_started
 
                 # Record successful request
                 actual_tokens = (
@@ -214,11 +253,20 @@ class GeminiAIService:
                     else estimated_tokens
                 )
                 quota_tracker.record_request(actual_tokens)
+                metrics.record_upstream_call(
+                    call_seconds, estimated_tokens, actual_tokens
+                )
+                if admitted_state is not None:
+                    gemini_breaker.record_success(admitted_state)
 
                 return response
 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 error_msg = str(e).lower()
+                if admitted_state is not None and not is_quota_error(e):
+                    gemini_breaker.record_failure()
 
                 # Check for quota-related errors
                 if (
@@ -235,6 +283,7 @@ class GeminiAIService:
                         logger.info(
                             f"Retrying with new API key (attempt {attempt + 1})"
                         )
+                        metrics.record_retry("quota_rotation")
                         continue
                     else:
                         logger.error("All API keys exhausted or max retries reached")
@@ -248,6 +297,7 @@ class GeminiAIService:
                         logger.warning(
                             f"API call failed (attempt {attempt + 1}), retrying in {wait_time} seconds: {e}"
                         )
+                        metrics.record_retry("error_backoff", wait_time)
                         time.sleep(wait_time)
                         continue
                     else:
@@ -308,7 +358,7 @@ class GeminiAIService:
         self, conversation_text: str, context: Dict[str, Any]
     ) -> str:
         """Build enhanced extraction prompt with context"""
-        base_prompt = f"""
+        instructions = """
         You are an expert sales conversation analyst. Analyze the following sales conversation and extract comprehensive lead information.
         
         IMPORTANT INSTRUCTIONS:
@@ -320,15 +370,15 @@ class GeminiAIService:
         6. Pay attention to urgency indicators and decision-making authority
         
         Return the information in this EXACT JSON structure:
-        {{
+        {
             "company_name": "extracted company name or null",
-            "contact_details": {{
+            "contact_details": {
                 "name": "contact person full name or null",
                 "email": "valid email address or null",
                 "phone": "phone number or null",
                 "title": "job title or role or null",
                 "department": "department or division or null"
-            }},
+            },
             "pain_points": ["specific business challenges or problems mentioned"],
             "requirements": ["specific needs, solutions, or features requested"],
             "budget_info": "budget range, constraints, or approval process mentioned or null",
@@ -339,15 +389,19 @@ class GeminiAIService:
             "urgency_level": "high|medium|low or null based on timeline and language used",
             "current_solution": "existing tools, vendors, or solutions mentioned or null",
             "competitors_mentioned": ["competitor names or alternative solutions discussed"]
-        }}
+        }
         """
 
-        if context:
-            base_prompt += f"\n\nAdditional Context:\n{json.dumps(context, indent=2)}\n"
-
-        base_prompt += f"\n\nConversation to analyze:\n{conversation_text}\n\nProvide the JSON response:"
-
-        return base_prompt
+        return (
+            PromptBuilder("extract_lead_info")
+            .instructions(instructions)
+            .section("Additional Context", context, priority=1, max_items=10)
+            .section(
+                "Conversation to analyze", conversation_text, priority=2, required=True
+            )
+            .closing("Provide the JSON response:")
+            .build()
+        )
 
     def _parse_ai_response(self, response_text: str) -> Dict[str, Any]:
         """Parse and clean AI response to extract JSON"""
@@ -485,33 +539,25 @@ class GeminiAIService:
         confidence_guidelines = get_confidence_guidelines()
 
         # Build context-aware prompt
-        base_prompt = build_context_prompt(
-            "lead_quality_score",
-            {
-                "industry": industry,
-                "company_size": lead_data.get("company_size", "Unknown"),
-                "typical_sales_cycle": industry_context.get(
-                    "typical_sales_cycle", "3-6 months"
-                ),
-            },
-        )
+        base_prompt = build_context_prompt("lead_quality_score")
+        prompt_context = {
+            "industry": industry,
+            "company_size": lead_data.get("company_size", "Unknown"),
+            "typical_sales_cycle": industry_context.get(
+                "typical_sales_cycle", "3-6 months"
+            ),
+        }
 
-        prompt = f"""
-        {base_prompt}
-        
-        Lead Data to Analyze: {json.dumps(lead_data, indent=2)}
-        
-        Industry Context:
-        - Common pain points: {', '.join(industry_context.get('common_pain_points', []))}
-        - Typical decision makers: {', '.join(industry_context.get('decision_makers', []))}
-        - Sales approach: {industry_context.get('sales_approach', 'Consultative')}
-        - Typical sales cycle: {industry_context.get('typical_sales_cycle', '3-6 months')}
-        
+        prompt = (
+            PromptBuilder("calculate_lead_quality_score")
+            .instructions(base_prompt)
+            .instructions(
+                f"""
         Confidence Scoring Guidelines:
         High confidence indicators: {', '.join(confidence_guidelines['high_confidence_indicators'])}
         Medium confidence indicators: {', '.join(confidence_guidelines['medium_confidence_indicators'])}
         Low confidence indicators: {', '.join(confidence_guidelines['low_confidence_indicators'])}
-        
+
         Provide analysis in this EXACT JSON format:
         {{
             "overall_score": 85,
@@ -532,9 +578,29 @@ class GeminiAIService:
             "competitive_risk": "high|medium|low",
             "next_best_action": "specific recommended next step"
         }}
-        
+
         Base your analysis on our company's strengths and the specific industry context provided.
         """
+            )
+            .section("Additional Context", prompt_context, priority=3)
+            .section("Lead Data to Analyze", lead_data, priority=2, max_items=8)
+            .section(
+                "Industry Context",
+                {
+                    "common_pain_points": industry_context.get("common_pain_points"),
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "typical_sales_cycle": industry_context.get(
+                        "typical_sales_cycle", "3-6 months"
+                    ),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .build()
+        )
 
         try:
             response = self._make_api_call(prompt)
@@ -573,27 +639,14 @@ class GeminiAIService:
         objection_strategies = get_objection_handling_strategies()
 
         # Build context-aware prompt
-        base_prompt = build_context_prompt(
-            "sales_strategy",
-            {
-                "industry": industry,
-                "quality_tier": quality_info.get("quality_tier", "medium"),
-                "company_size": lead_data.get("company_size", "Unknown"),
-            },
-        )
+        base_prompt = build_context_prompt("sales_strategy")
+        prompt_context = {
+            "industry": industry,
+            "quality_tier": quality_info.get("quality_tier", "medium"),
+            "company_size": lead_data.get("company_size", "Unknown"),
+        }
 
-        prompt = f"""
-        {base_prompt}
-        
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        Quality Assessment: {json.dumps(quality_info, indent=2)}
-        
-        Industry-Specific Context:
-        - Key messaging themes: {', '.join(industry_context.get('key_messaging', []))}
-        - Decision makers: {', '.join(industry_context.get('decision_makers', []))}
-        - Sales approach: {industry_context.get('sales_approach', 'Consultative')}
-        - Common pain points: {', '.join(industry_context.get('common_pain_points', []))}
-        
+        strategy_instructions = f"""
         Objection Handling Strategies:
         Budget concerns: {', '.join(objection_strategies['budget_concerns']['strategies'])}
         Timing concerns: {', '.join(objection_strategies['timing_concerns']['strategies'])}
@@ -633,6 +686,29 @@ class GeminiAIService:
         Align strategy with our consultative selling methodology and company strengths.
         """
 
+        prompt = (
+            PromptBuilder("generate_sales_strategy")
+            .instructions(base_prompt)
+            .instructions(strategy_instructions)
+            .section("Additional Context", prompt_context, priority=3)
+            .section("Lead Data", lead_data, priority=2, max_items=8)
+            .section("Quality Assessment", quality_info, priority=1, max_items=5)
+            .section(
+                "Industry-Specific Context",
+                {
+                    "key_messaging": industry_context.get("key_messaging"),
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "common_pain_points": industry_context.get("common_pain_points"),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -672,28 +748,129 @@ class GeminiAIService:
         industry_context = get_context_for_industry(industry)
 
         # Build context-aware prompt for question generation
-        base_prompt = build_context_prompt(
-            "meeting_questions",
-            {
-                "industry": industry,
-                "meeting_type": meeting_type,
-                "company_size": lead_data.get("company_size", "Unknown"),
-            },
+        base_prompt = build_context_prompt("meeting_questions")
+        prompt_context = {
+            "industry": industry,
+            "meeting_type": meeting_type,
+            "company_size": lead_data.get("company_size", "Unknown"),
+        }
+
+        prompt = (
+            PromptBuilder("generate_meeting_questions")
+            .instructions(base_prompt)
+            .instructions(self._meeting_questions_instructions())
+            .section("Additional Context", prompt_context, priority=3)
+            .section("Lead Information", lead_data, priority=2, max_items=8)
+            .section("Meeting Context", meeting_context, priority=2, max_items=8)
+            .section(
+                "Industry Context",
+                {
+                    "common_pain_points": industry_context.get("common_pain_points"),
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "key_messaging": industry_context.get("key_messaging"),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .build()
         )
 
-        prompt = f"""
-        {base_prompt}
-        
-        Lead Information: {json.dumps(lead_data, indent=2)}
-        Meeting Context: {json.dumps(meeting_context, indent=2)}
-        
-        Industry Context:
-        - Common pain points: {', '.join(industry_context.get('common_pain_points', []))}
-        - Typical decision makers: {', '.join(industry_context.get('decision_makers', []))}
-        - Sales approach: {industry_context.get('sales_approach', 'Consultative')}
-        - Key messaging themes: {', '.join(industry_context.get('key_messaging', []))}
-        
-        Generate targeted questions for this {meeting_type} meeting that will help:
+        try:
+            response = self._make_api_call(prompt)
+            response_text = response.text.strip()
+
+            questions_data = self._parse_ai_response(response_text)
+
+            # Enhance questions with additional metadata
+            enhanced_questions = self._enhance_meeting_questions(
+                questions_data, lead_data, meeting_context
+            )
+
+            logger.info(f"Generated meeting questions: {enhanced_questions}")
+            return enhanced_questions
+
+        except Exception as e:
+            logger.error(f"Error generating meeting questions: {e}")
+            return self._get_default_meeting_questions()
+
+    def generate_meeting_questions_batch(
+        self, industry: str, leads: dict, meetings: dict
+    ) -> dict:
+        """
+        Generate questions for several meetings of one industry in one call
+
+        Args:
+            industry (str): Industry shared by the meetings' leads
+            leads (dict): Lead data by lead key
+            meetings (dict): Meeting context by meeting key, each with the
+                key of its lead under "lead"
+
+        Returns:
+            dict: Questions by meeting key, in the format of
+            generate_meeting_questions. Meetings the response left out are
+            missing, and the result is empty if the call failed.
+        """
+        industry_context = get_context_for_industry(industry or "technology")
+
+        batch_instructions = """
+        Generate these questions for every meeting listed under Meetings, using
+        the lead it refers to under Leads. Respond with ONE JSON object mapping
+        each meeting key to its questions in the format above, e.g.
+        {"M1": {"discovery_questions": [...], ...}, "M2": {...}}
+        """
+
+        prompt = (
+            PromptBuilder("generate_meeting_questions_batch")
+            .instructions(build_context_prompt("meeting_questions"))
+            .instructions(self._meeting_questions_instructions())
+            .instructions(batch_instructions)
+            .section(
+                "Industry Context",
+                {
+                    "industry": industry,
+                    "common_pain_points": industry_context.get("common_pain_points"),
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "key_messaging": industry_context.get("key_messaging"),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .section("Leads", leads, priority=2, max_items=8, required=True)
+            .section("Meetings", meetings, priority=3, max_items=8, required=True)
+            .build()
+        )
+
+        try:
+            response = self._make_api_call(prompt)
+            batch_data = self._parse_ai_response(response.text.strip())
+        except Exception as e:
+            logger.error(f"Error generating batched meeting questions: {e}")
+            return {}
+
+        results = {}
+        for key, meeting_context in meetings.items():
+            questions_data = batch_data.get(key)
+            if not isinstance(questions_data, dict):
+                continue
+            lead_data = leads.get(meeting_context.get("lead"), {})
+            results[key] = self._enhance_meeting_questions(
+                questions_data, lead_data, meeting_context
+            )
+        logger.info(
+            f"Generated questions for {len(results)} of {len(meetings)} meetings"
+        )
+        return results
+
+    def _meeting_questions_instructions(self) -> str:
+        """Question generation instructions and response format of one meeting"""
+        return """
+        Generate targeted questions for the meeting type given in the context that will help:
         1. Qualify the lead effectively
         2. Uncover pain points and requirements
         3. Identify decision makers and budget authority
@@ -702,83 +879,83 @@ class GeminiAIService:
         6. Move the deal forward
         
         Provide questions in this EXACT JSON format:
-        {{
+        {
             "discovery_questions": [
-                {{
+                {
                     "question": "specific discovery question",
                     "priority": 8,
                     "rationale": "why this question is important",
                     "expected_insights": ["what we hope to learn"],
                     "follow_up_triggers": ["conditions that would trigger follow-ups"]
-                }}
+                }
             ],
             "budget_questions": [
-                {{
+                {
                     "question": "budget qualification question",
                     "priority": 9,
                     "rationale": "why this budget question matters",
                     "expected_insights": ["budget-related insights to uncover"],
                     "follow_up_triggers": ["budget-related follow-up conditions"]
-                }}
+                }
             ],
             "timeline_questions": [
-                {{
+                {
                     "question": "timeline and urgency question",
                     "priority": 7,
                     "rationale": "importance of timeline qualification",
                     "expected_insights": ["timeline insights to gather"],
                     "follow_up_triggers": ["timeline-based follow-ups"]
-                }}
+                }
             ],
             "decision_maker_questions": [
-                {{
+                {
                     "question": "decision maker identification question",
                     "priority": 8,
                     "rationale": "why identifying decision makers is crucial",
                     "expected_insights": ["decision-making process insights"],
                     "follow_up_triggers": ["decision maker follow-up scenarios"]
-                }}
+                }
             ],
             "pain_point_questions": [
-                {{
+                {
                     "question": "pain point discovery question",
                     "priority": 9,
                     "rationale": "how this uncovers business challenges",
                     "expected_insights": ["pain point insights to discover"],
                     "follow_up_triggers": ["pain point follow-up opportunities"]
-                }}
+                }
             ],
             "requirements_questions": [
-                {{
+                {
                     "question": "requirements qualification question",
                     "priority": 7,
                     "rationale": "importance for solution positioning",
                     "expected_insights": ["requirement insights to gather"],
                     "follow_up_triggers": ["requirement-based follow-ups"]
-                }}
+                }
             ],
             "competitive_questions": [
-                {{
+                {
                     "question": "competitive landscape question",
                     "priority": 6,
                     "rationale": "competitive positioning importance",
                     "expected_insights": ["competitive insights to uncover"],
                     "follow_up_triggers": ["competitive follow-up scenarios"]
-                }}
+                }
             ],
             "closing_questions": [
-                {{
+                {
                     "question": "closing or next steps question",
                     "priority": 8,
                     "rationale": "importance for deal progression",
                     "expected_insights": ["closing insights to gather"],
                     "follow_up_triggers": ["closing follow-up conditions"]
-                }}
+                }
             ]
-        }}
+        }
         
         Focus on:
-        - Questions that are specific to the {industry} industry
+        - Questions that are specific to the lead's industry
         - Questions that leverage our competitive advantages
         - Questions that help qualify budget, authority, need, and timeline (BANT)
         - Questions that uncover specific pain points our solution addresses
@@ -792,24 +969,6 @@ class GeminiAIService:
         - Prioritized based on conversion impact
         """
 
-        try:
-            response = self._make_api_call(prompt)
-            response_text = response.text.strip()
-
-            questions_data = self._parse_ai_response(response_text)
-
-            # Enhance questions with additional metadata
-            enhanced_questions = self._enhance_meeting_questions(
-                questions_data, lead_data, meeting_context
-            )
-
-            logger.info(f"Generated meeting questions: {enhanced_questions}")
-            return enhanced_questions
-
-        except Exception as e:
-            logger.error(f"Error generating meeting questions: {e}")
-            return self._get_default_meeting_questions()
-
     def _enhance_meeting_questions(
         self, questions_data: dict, lead_data: dict, meeting_context: dict
     ) -> dict:
@@ -922,21 +1081,10 @@ class GeminiAIService:
         response_analysis = self._analyze_question_response(response, original_question)
 
         # Build dynamic follow-up prompt
-        prompt = f"""
+        follow_up_instructions = """
         You are an expert sales conversation analyst. Based on the prospect's response to a sales question,
         generate intelligent follow-up questions that will deepen the conversation and uncover more insights.
         
-        Original Question: {original_question.get('question', '')}
-        Question Type: {original_question.get('question_type', 'discovery')}
-        Question Priority: {original_question.get('priority', 5)}
-        
-        Prospect's Response: "{response}"
-        
-        Response Analysis: {json.dumps(response_analysis, indent=2)}
-        
-        Lead Context: {json.dumps(lead_data, indent=2)}
-        Conversation Context: {json.dumps(conversation_context, indent=2)}
-        
         Generate follow-up questions that:
         1. Dig deeper into interesting points mentioned in the response
         2. Clarify any vague or incomplete information
@@ -946,44 +1094,44 @@ class GeminiAIService:
         6. Position our solution advantages
         
         Provide follow-ups in this EXACT JSON format:
-        {{
+        {
             "immediate_follow_ups": [
-                {{
+                {
                     "question": "immediate follow-up question based on response",
                     "priority": 8,
                     "rationale": "why this follow-up is important now",
                     "response_trigger": "specific part of response that triggered this",
                     "expected_outcome": "what we hope to achieve",
                     "question_type": "discovery|budget|timeline|decision_makers|pain_points|requirements|competition|closing"
-                }}
+                }
             ],
             "conditional_follow_ups": [
-                {{
+                {
                     "question": "follow-up for specific scenarios",
                     "priority": 6,
                     "condition": "when to ask this question",
                     "rationale": "strategic importance",
                     "question_type": "discovery|budget|timeline|decision_makers|pain_points|requirements|competition|closing"
-                }}
+                }
             ],
             "deep_dive_questions": [
-                {{
+                {
                     "question": "deeper exploration question",
                     "priority": 7,
                     "focus_area": "specific area to explore deeper",
                     "rationale": "why deeper exploration is valuable",
                     "question_type": "discovery|budget|timeline|decision_makers|pain_points|requirements|competition|closing"
-                }}
+                }
             ],
-            "response_insights": {{
+            "response_insights": {
                 "key_points_mentioned": ["important points from the response"],
                 "pain_points_identified": ["new pain points discovered"],
                 "buying_signals": ["positive buying indicators"],
                 "concerns_raised": ["objections or concerns mentioned"],
                 "information_gaps": ["areas needing more information"],
                 "next_best_actions": ["recommended next steps based on response"]
-            }}
-        }}
+            }
+        }
         
         Focus on questions that:
         - Build on the momentum from their response
@@ -993,6 +1141,30 @@ class GeminiAIService:
         - Create urgency around solving the problem
         """
 
+        prompt = (
+            PromptBuilder("generate_dynamic_follow_up_questions")
+            .instructions(follow_up_instructions)
+            .section(
+                "Original Question",
+                {
+                    "question": original_question.get("question", ""),
+                    "question_type": original_question.get(
+                        "question_type", "discovery"
+                    ),
+                    "priority": original_question.get("priority", 5),
+                },
+                priority=3,
+                required=True,
+            )
+            .section("Prospect's Response", response, priority=3, required=True)
+            .section("Response Analysis", response_analysis, priority=2, max_items=5)
+            .section("Lead Context", lead_data, priority=1, max_items=5)
+            .section(
+                "Conversation Context", conversation_context, priority=0, max_items=5
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -1030,18 +1202,10 @@ class GeminiAIService:
             conversation_history
         )
 
-        prompt = f"""
+        adaptation_instructions = """
         You are an expert sales conversation strategist. Based on the conversation history and responses,
         adapt the remaining questions to maximize the meeting's effectiveness.
         
-        Original Questions: {json.dumps([q for q in meeting_questions if not q.get('asked_at')], indent=2)}
-        
-        Conversation History: {json.dumps(conversation_history, indent=2)}
-        
-        Conversation Analysis: {json.dumps(conversation_analysis, indent=2)}
-        
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        
         Based on the conversation flow and responses received:
         1. Re-prioritize remaining questions based on what's been learned
         2. Suggest modifications to questions to be more targeted
@@ -1050,48 +1214,48 @@ class GeminiAIService:
         5. Suggest the optimal order for remaining questions
         
         Provide adaptation in this EXACT JSON format:
-        {{
+        {
             "adapted_questions": [
-                {{
+                {
                     "original_question_id": "question_id_if_exists",
                     "adapted_question": "modified question text",
                     "new_priority": 8,
                     "adaptation_reason": "why this question was modified",
                     "question_type": "discovery|budget|timeline|decision_makers|pain_points|requirements|competition|closing",
                     "timing_recommendation": "when to ask this question"
-                }}
+                }
             ],
             "new_questions": [
-                {{
+                {
                     "question": "new question based on conversation insights",
                     "priority": 9,
                     "rationale": "why this new question is important",
                     "question_type": "discovery|budget|timeline|decision_makers|pain_points|requirements|competition|closing",
                     "conversation_trigger": "what in the conversation triggered this question"
-                }}
+                }
             ],
             "questions_to_skip": [
-                {{
+                {
                     "question_id": "id_of_question_to_skip",
                     "skip_reason": "why this question is no longer relevant"
-                }}
+                }
             ],
             "recommended_sequence": [
-                {{
+                {
                     "question_id": "question_identifier",
                     "sequence_order": 1,
                     "timing_notes": "optimal timing for this question"
-                }}
+                }
             ],
-            "conversation_insights": {{
+            "conversation_insights": {
                 "engagement_level": "high|medium|low",
                 "buying_signals": ["positive indicators observed"],
                 "concerns_identified": ["concerns or objections raised"],
                 "information_gathered": ["key information learned"],
                 "gaps_remaining": ["information still needed"],
                 "recommended_focus": "what to focus on for remainder of meeting"
-            }}
-        }}
+            }
+        }
         
         Prioritize questions that:
         - Build on positive responses and buying signals
@@ -1101,6 +1265,27 @@ class GeminiAIService:
         - Leverage the current engagement level
         """
 
+        prompt = (
+            PromptBuilder("adapt_questions_based_on_conversation")
+            .instructions(adaptation_instructions)
+            .section(
+                "Original Questions",
+                [q for q in meeting_questions if not q.get("asked_at")],
+                priority=2,
+                max_items=15,
+            )
+            .section(
+                "Conversation History",
+                # Most recent exchanges are the most relevant
+                conversation_history[-20:],
+                priority=3,
+                required=True,
+            )
+            .section("Conversation Analysis", conversation_analysis, priority=2)
+            .section("Lead Data", lead_data, priority=1, max_items=5)
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -1135,19 +1320,10 @@ class GeminiAIService:
         Returns:
             dict: Effectiveness analysis and learning insights
         """
-        prompt = f"""
+        effectiveness_instructions = """
         You are an expert sales training analyst. Analyze the effectiveness of a sales question
         based on the response received and the outcomes achieved.
         
-        Question Asked: {question.get('question', '')}
-        Question Type: {question.get('question_type', 'discovery')}
-        Question Priority: {question.get('priority', 5)}
-        Question Rationale: {question.get('rationale', '')}
-        
-        Response Received: "{response}"
-        
-        Outcome Data: {json.dumps(outcome_data, indent=2)}
-        
         Analyze the question's effectiveness considering:
         1. Quality and depth of response received
         2. Information value and actionability
@@ -1157,48 +1333,67 @@ class GeminiAIService:
         6. Advancement of the sales process
         
         Provide analysis in this EXACT JSON format:
-        {{
+        {
             "effectiveness_score": 85,
-            "effectiveness_breakdown": {{
+            "effectiveness_breakdown": {
                 "response_quality": 90,
                 "information_value": 80,
                 "engagement_generated": 85,
                 "objective_advancement": 75,
                 "pain_point_discovery": 95,
                 "process_advancement": 70
-            }},
+            },
             "effectiveness_tier": "high|medium|low",
             "key_insights_gained": ["specific insights from the response"],
-            "response_analysis": {{
+            "response_analysis": {
                 "response_depth": "shallow|moderate|deep",
                 "emotional_indicators": ["positive|negative|neutral indicators"],
                 "buying_signals": ["signals identified in response"],
                 "concerns_raised": ["concerns or objections mentioned"],
                 "information_gaps": ["areas where more info is needed"]
-            }},
-            "question_performance": {{
+            },
+            "question_performance": {
                 "clarity": "how clear and understandable the question was",
                 "relevance": "how relevant to prospect's situation",
                 "timing": "whether timing was appropriate",
                 "follow_up_potential": "potential for generating follow-ups"
-            }},
-            "learning_insights": {{
+            },
+            "learning_insights": {
                 "what_worked_well": ["aspects that were effective"],
                 "improvement_opportunities": ["how question could be improved"],
                 "context_factors": ["situational factors that influenced effectiveness"],
                 "replication_potential": ["how to replicate success in similar situations"]
-            }},
-            "recommendations": {{
+            },
+            "recommendations": {
                 "question_modifications": ["suggested improvements to the question"],
                 "timing_adjustments": ["better timing recommendations"],
                 "context_considerations": ["when this question works best"],
                 "follow_up_suggestions": ["recommended follow-up approaches"]
-            }}
-        }}
+            }
+        }
         
         Base your analysis on sales best practices and the specific context provided.
         """
 
+        prompt = (
+            PromptBuilder("track_question_effectiveness")
+            .instructions(effectiveness_instructions)
+            .section(
+                "Question Asked",
+                {
+                    "question": question.get("question", ""),
+                    "question_type": question.get("question_type", "discovery"),
+                    "priority": question.get("priority", 5),
+                    "rationale": question.get("rationale", ""),
+                },
+                priority=3,
+                required=True,
+            )
+            .section("Response Received", response, priority=3, required=True)
+            .section("Outcome Data", outcome_data, priority=1, max_items=5)
+            .build()
+        )
+
         try:
             response_obj = self._make_api_call(prompt)
             response_text = response_obj.text.strip()
@@ -1849,58 +2044,43 @@ class GeminiAIService:
         industry_context = get_context_for_industry(industry)
 
         # Build context-aware prompt
-        base_prompt = build_context_prompt(
-            "industry_insights",
-            {
-                "industry": industry,
-                "company_size": company_size,
-                "target_market": SALES_CONTEXT["company_profile"]["target_market"],
-            },
-        )
+        base_prompt = build_context_prompt("industry_insights")
+        prompt_context = {
+            "industry": industry,
+            "company_size": company_size,
+            "target_market": SALES_CONTEXT["company_profile"]["target_market"],
+        }
 
-        prompt = f"""
-        {base_prompt}
-        
-        Industry: {industry}
-        Company Size: {company_size}
-        Lead Context: {json.dumps(lead_data, indent=2)}
-        
+        insights_instructions = f"""
         Our Company Strengths for This Industry:
         {chr(10).join(f"- {advantage}" for advantage in SALES_CONTEXT['company_profile']['competitive_advantages'])}
         
-        Industry Knowledge Base:
-        - Common pain points: {', '.join(industry_context.get('common_pain_points', []))}
-        - Typical decision makers: {', '.join(industry_context.get('decision_makers', []))}
-        - Recommended sales approach: {industry_context.get('sales_approach', 'Consultative')}
-        - Typical sales cycle: {industry_context.get('typical_sales_cycle', '3-6 months')}
-        - Key messaging themes: {', '.join(industry_context.get('key_messaging', []))}
-        
         Provide insights in this EXACT JSON format:
         {{
             "industry_trends": [
-                "current trends affecting {industry}",
+                "current trends affecting the industry",
                 "market challenges and digital transformation opportunities"
             ],
             "industry_pain_points": [
-                "common pain points specific to {industry}",
+                "common pain points specific to the industry",
                 "business challenges our solution addresses"
             ],
             "solution_fit": {{
-                "why_relevant": "why our AI-powered sales solution fits {industry}",
+                "why_relevant": "why our AI-powered sales solution fits the industry",
                 "specific_benefits": ["benefits aligned with our competitive advantages"],
                 "use_cases": ["relevant use cases showcasing our strengths"]
             }},
             "competitive_landscape": {{
-                "common_competitors": ["typical competitors in {industry} sales tech space"],
+                "common_competitors": ["typical competitors in the industry sales tech space"],
                 "differentiation_opportunities": ["how our unique advantages create competitive edge"]
             }},
             "sales_best_practices": [
-                "industry-specific sales approaches that work for {industry}",
+                "industry-specific sales approaches that work for the industry",
                 "communication preferences and decision-making patterns",
-                "proven strategies for {company_size} companies"
+                "proven strategies for companies of this size"
             ],
             "compliance_considerations": [
-                "regulatory or compliance factors relevant to {industry}",
+                "regulatory or compliance factors relevant to the industry",
                 "data privacy and security requirements"
             ],
             "success_stories": [
@@ -1909,9 +2089,34 @@ class GeminiAIService:
             ]
         }}
         
-        Focus on actionable insights that leverage our company's strengths and address specific {industry} needs.
+        Focus on actionable insights that leverage our company's strengths and address specific industry needs.
         """
 
+        prompt = (
+            PromptBuilder("generate_industry_insights")
+            .instructions(base_prompt)
+            .instructions(insights_instructions)
+            .section("Additional Context", prompt_context, priority=3)
+            .section("Lead Context", lead_data, priority=2, max_items=8)
+            .section(
+                "Industry Knowledge Base",
+                {
+                    "common_pain_points": industry_context.get("common_pain_points"),
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "typical_sales_cycle": industry_context.get(
+                        "typical_sales_cycle", "3-6 months"
+                    ),
+                    "key_messaging": industry_context.get("key_messaging"),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -1935,29 +2140,14 @@ class GeminiAIService:
         recommendation_guidelines = get_recommendation_guidelines()
 
         # Build context-aware prompt
-        base_prompt = build_context_prompt(
-            "recommendations",
-            {
-                "industry": industry,
-                "company_size": lead_data.get("company_size", "Unknown"),
-                "urgency_level": lead_data.get("urgency_level", "medium"),
-            },
-        )
+        base_prompt = build_context_prompt("recommendations")
+        prompt_context = {
+            "industry": industry,
+            "company_size": lead_data.get("company_size", "Unknown"),
+            "urgency_level": lead_data.get("urgency_level", "medium"),
+        }
 
-        return f"""
-        {base_prompt}
-        
-        Lead Information:
-        {json.dumps(lead_data, indent=2)}
-        
-        Additional Context:
-        {json.dumps(context, indent=2)}
-        
-        Industry-Specific Guidelines:
-        - Decision makers: {', '.join(industry_context.get('decision_makers', []))}
-        - Sales approach: {industry_context.get('sales_approach', 'Consultative')}
-        - Typical sales cycle: {industry_context.get('typical_sales_cycle', '3-6 months')}
-        
+        recommendation_instructions = f"""
         Recommendation Framework:
         Immediate actions: {', '.join(recommendation_guidelines['next_steps']['immediate_actions'])}
         Short-term actions: {', '.join(recommendation_guidelines['next_steps']['short_term_actions'])}
@@ -2007,6 +2197,29 @@ class GeminiAIService:
         Align all recommendations with our consultative selling approach and company strengths.
         """
 
+        return (
+            PromptBuilder("generate_recommendations")
+            .instructions(base_prompt)
+            .instructions(recommendation_instructions)
+            .section("Lead Profile", prompt_context, priority=3)
+            .section("Lead Information", lead_data, priority=2, max_items=8)
+            .section("Additional Context", context, priority=1, max_items=5)
+            .section(
+                "Industry-Specific Guidelines",
+                {
+                    "decision_makers": industry_context.get("decision_makers"),
+                    "sales_approach": industry_context.get(
+                        "sales_approach", "Consultative"
+                    ),
+                    "typical_sales_cycle": industry_context.get(
+                        "typical_sales_cycle", "3-6 months"
+                    ),
+                },
+                priority=1,
+            )
+            .build()
+        )
+
     def _enhance_recommendations(self, recommendations: dict, lead_data: dict) -> dict:
         """Enhance recommendations with confidence scoring and ranking"""
         enhanced = recommendations.copy()
@@ -2752,32 +2965,27 @@ class GeminiAIService:
         priority_focus = context.get("priority_focus", "quality")
         constraints = context.get("constraints", {})
 
-        prompt = f"""
+        next_steps_instructions = """
         Generate specific next steps for this sales lead based on the current context:
         
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        Current Stage: {current_stage}
-        Priority Focus: {priority_focus}
-        Constraints: {json.dumps(constraints, indent=2)}
-        
         Provide next steps in this EXACT JSON format:
-        {{
+        {
             "immediate_actions": [
-                {{
+                {
                     "action": "specific action to take",
                     "timeline": "when to complete this",
                     "priority": "high|medium|low",
                     "effort": "low|medium|high",
                     "expected_outcome": "what this should achieve"
-                }}
+                }
             ],
             "follow_up_sequence": [
-                {{
+                {
                     "step": 1,
                     "action": "first follow-up action",
                     "timing": "when to do this",
                     "method": "email|phone|meeting|demo"
-                }}
+                }
             ],
             "preparation_tasks": [
                 "research tasks",
@@ -2792,13 +3000,27 @@ class GeminiAIService:
                 "what to do if primary approach fails",
                 "alternative strategies"
             ]
-        }}
+        }
         
-        Tailor recommendations to the {current_stage} stage with {priority_focus} focus.
+        Tailor recommendations to the current stage and priority focus given below.
         """
 
+        prompt = (
+            PromptBuilder("generate_next_steps")
+            .instructions(next_steps_instructions)
+            .section(
+                "Current Context",
+                {"current_stage": current_stage, "priority_focus": priority_focus},
+                priority=3,
+                required=True,
+            )
+            .section("Lead Data", lead_data, priority=2, max_items=8)
+            .section("Constraints", constraints, priority=1)
+            .build()
+        )
+
         try:
-            response = self.model.generate_content(prompt)
+            response = self._make_api_call(prompt)
             response_text = response.text.strip()
 
             next_steps = self._parse_ai_response(response_text)
@@ -2896,7 +3118,7 @@ class GeminiAIService:
         historical_context = historical_data or {}
 
         # Build context-aware prompt for conversion analysis
-        prompt = f"""
+        conversion_instructions = """
         You are an expert sales conversion analyst. Analyze this lead's potential for conversion to a sales opportunity.
         
         ANALYSIS FRAMEWORK:
@@ -2905,15 +3127,8 @@ class GeminiAIService:
         3. Consider competitive landscape and urgency factors
         4. Analyze data completeness and qualification level
         
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        
-        Historical Context:
-        - Average conversion rate: {historical_context.get('avg_conversion_rate', 25)}%
-        - Typical sales cycle: {historical_context.get('avg_sales_cycle', '3-6 months')}
-        - Similar industry conversion rate: {historical_context.get('industry_conversion_rate', 30)}%
-        
         Provide analysis in this EXACT JSON format:
-        {{
+        {
             "conversion_probability": 75,
             "conversion_confidence": 85,
             "conversion_readiness_score": 80,
@@ -2947,11 +3162,33 @@ class GeminiAIService:
                 "Technical evaluation requested",
                 "Reference requests made"
             ]
-        }}
+        }
         
         Base your analysis on proven sales conversion methodologies and the specific lead characteristics provided.
         """
 
+        prompt = (
+            PromptBuilder("analyze_opportunity_conversion_potential")
+            .instructions(conversion_instructions)
+            .section("Lead Data", lead_data, priority=2, max_items=8)
+            .section(
+                "Historical Context",
+                {
+                    "avg_conversion_rate_pct": historical_context.get(
+                        "avg_conversion_rate", 25
+                    ),
+                    "avg_sales_cycle": historical_context.get(
+                        "avg_sales_cycle", "3-6 months"
+                    ),
+                    "industry_conversion_rate_pct": historical_context.get(
+                        "industry_conversion_rate", 30
+                    ),
+                },
+                priority=1,
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -2992,7 +3229,7 @@ class GeminiAIService:
         # Get industry-specific context for deal sizing
         industry_context = get_context_for_industry(industry)
 
-        prompt = f"""
+        prediction_instructions = """
         You are an expert sales forecasting analyst. Predict the deal size and sales timeline for this opportunity.
         
         PREDICTION FRAMEWORK:
@@ -3001,35 +3238,22 @@ class GeminiAIService:
         3. Factor in competitive landscape and urgency
         4. Apply industry benchmarks and historical patterns
         
-        Lead Information: {json.dumps(lead_data, indent=2)}
-        Opportunity Context: {json.dumps(opportunity_context, indent=2)}
-        
-        Industry Benchmarks:
-        - Industry: {industry}
-        - Typical deal size range: {industry_context.get('typical_deal_size', '$25K-$100K')}
-        - Average sales cycle: {industry_context.get('typical_sales_cycle', '3-6 months')}
-        - Decision complexity: {industry_context.get('decision_complexity', 'Medium')}
-        
-        Company Size Context:
-        - Size indicator: {company_size}
-        - Budget implications: Consider enterprise vs SMB budget patterns
-        
         Provide predictions in this EXACT JSON format:
-        {{
-            "deal_size_prediction": {{
+        {
+            "deal_size_prediction": {
                 "minimum_value": 25000,
                 "maximum_value": 75000,
                 "most_likely_value": 50000,
                 "confidence_level": 75,
                 "sizing_rationale": "Based on company size, pain point severity, and industry benchmarks"
-            }},
-            "timeline_prediction": {{
+            },
+            "timeline_prediction": {
                 "minimum_days": 60,
                 "maximum_days": 180,
                 "most_likely_days": 120,
                 "confidence_level": 80,
                 "timeline_rationale": "Considering decision complexity and typical industry sales cycles"
-            }},
+            },
             "deal_size_factors": [
                 "Company size indicates mid-market budget capacity",
                 "Multiple pain points suggest comprehensive solution need",
@@ -3050,16 +3274,44 @@ class GeminiAIService:
                 "Multiple stakeholder consensus required",
                 "Competitive evaluation timeline"
             ],
-            "benchmarking_data": {{
+            "benchmarking_data": {
                 "industry_average_deal_size": 45000,
                 "industry_average_sales_cycle": 105,
                 "similar_company_patterns": "Mid-market companies typically close 30% faster with clear ROI"
-            }}
-        }}
+            }
+        }
         
         Base predictions on realistic market conditions and proven sales patterns.
         """
 
+        prompt = (
+            PromptBuilder("predict_deal_size_and_timeline")
+            .instructions(prediction_instructions)
+            .instructions(
+                "Budget implications: Consider enterprise vs SMB budget patterns"
+            )
+            .section(
+                "Industry Benchmarks",
+                {
+                    "industry": industry,
+                    "typical_deal_size": industry_context.get(
+                        "typical_deal_size", "$25K-$100K"
+                    ),
+                    "typical_sales_cycle": industry_context.get(
+                        "typical_sales_cycle", "3-6 months"
+                    ),
+                    "decision_complexity": industry_context.get(
+                        "decision_complexity", "Medium"
+                    ),
+                    "company_size": company_size,
+                },
+                priority=3,
+            )
+            .section("Lead Information", lead_data, priority=2, max_items=8)
+            .section("Opportunity Context", opportunity_context, priority=1)
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -3130,7 +3382,7 @@ class GeminiAIService:
             },
         }
 
-        prompt = f"""
+        stage_instructions = """
         You are an expert sales stage analyst. Recommend the appropriate sales stage and advancement strategy.
         
         STAGE ANALYSIS FRAMEWORK:
@@ -3139,25 +3391,19 @@ class GeminiAIService:
         3. Identify gaps that need addressing
         4. Predict advancement probability and timeline
         
-        Current Stage: {current_stage}
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        Opportunity Data: {json.dumps(opportunity_data, indent=2)}
-        
-        Stage Framework: {json.dumps(stage_framework, indent=2)}
-        
         Provide recommendations in this EXACT JSON format:
-        {{
-            "current_stage_assessment": {{
+        {
+            "current_stage_assessment": {
                 "recommended_stage": "qualification",
                 "stage_confidence": 85,
                 "stage_rationale": "Lead shows clear qualification criteria but needs budget confirmation"
-            }},
-            "advancement_analysis": {{
+            },
+            "advancement_analysis": {
                 "next_stage": "proposal",
                 "advancement_probability": 70,
                 "advancement_timeline": "2-3 weeks",
                 "advancement_confidence": 75
-            }},
+            },
             "stage_requirements_met": [
                 "Initial contact established",
                 "Basic needs identified",
@@ -3188,11 +3434,21 @@ class GeminiAIService:
                 "If decision makers unavailable, work through champion",
                 "If timeline uncertain, create urgency through limited-time offers"
             ]
-        }}
+        }
         
         Base recommendations on proven sales methodology and realistic progression timelines.
         """
 
+        prompt = (
+            PromptBuilder("recommend_sales_stage")
+            .instructions(f"Stage Framework: {compact_json(stage_framework)}")
+            .instructions(stage_instructions)
+            .section("Current Stage", current_stage, priority=3, required=True)
+            .section("Lead Data", lead_data, priority=2, max_items=8)
+            .section("Opportunity Data", opportunity_data, priority=1, max_items=8)
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -3227,7 +3483,7 @@ class GeminiAIService:
         """
         historical_context = historical_data or {}
 
-        prompt = f"""
+        risk_instructions = """
         You are an expert sales risk analyst. Identify potential risks and provide mitigation strategies for this opportunity.
         
         RISK ANALYSIS FRAMEWORK:
@@ -3237,41 +3493,34 @@ class GeminiAIService:
         4. Technical and implementation risks
         5. Relationship and communication risks
         
-        Lead Data: {json.dumps(lead_data, indent=2)}
-        Opportunity Data: {json.dumps(opportunity_data, indent=2)}
-        
-        Historical Risk Patterns:
-        - Common loss reasons: {historical_context.get('common_loss_reasons', ['Price', 'Timeline', 'Features'])}
-        - Risk indicators: {historical_context.get('risk_indicators', ['Long sales cycles', 'Multiple vendors', 'Budget delays'])}
-        
         Provide analysis in this EXACT JSON format:
-        {{
-            "overall_risk_assessment": {{
+        {
+            "overall_risk_assessment": {
                 "risk_level": "medium",
                 "risk_score": 45,
                 "confidence": 80,
                 "primary_risk_category": "competitive"
-            }},
+            },
             "identified_risks": [
-                {{
+                {
                     "risk_type": "competitive",
                     "risk_description": "Multiple vendor evaluation in progress",
                     "probability": 60,
                     "impact": "high",
                     "risk_score": 75,
                     "indicators": ["Competitor mentions", "Evaluation timeline", "Feature comparisons"]
-                }},
-                {{
+                },
+                {
                     "risk_type": "budget",
                     "risk_description": "Budget approval process unclear",
                     "probability": 40,
                     "impact": "high",
                     "risk_score": 60,
                     "indicators": ["No budget range provided", "Multiple approvers mentioned"]
-                }}
+                }
             ],
             "mitigation_strategies": [
-                {{
+                {
                     "risk_type": "competitive",
                     "strategies": [
                         "Emphasize unique differentiators early in process",
@@ -3280,8 +3529,8 @@ class GeminiAIService:
                     ],
                     "timeline": "immediate",
                     "resources_required": ["Sales engineer", "Reference customers", "Executive sponsor"]
-                }},
-                {{
+                },
+                {
                     "risk_type": "budget",
                     "strategies": [
                         "Conduct thorough budget qualification",
@@ -3290,7 +3539,7 @@ class GeminiAIService:
                     ],
                     "timeline": "within 2 weeks",
                     "resources_required": ["Financial analyst", "ROI calculator", "Executive presentation"]
-                }}
+                }
             ],
             "monitoring_recommendations": [
                 "Weekly competitive intelligence updates",
@@ -3308,11 +3557,33 @@ class GeminiAIService:
                 "If budget issues arise: Explore phased implementation",
                 "If timeline delays: Maintain engagement with value-add activities"
             ]
-        }}
+        }
         
         Focus on actionable risks with specific mitigation strategies and clear monitoring criteria.
         """
 
+        prompt = (
+            PromptBuilder("identify_risk_factors_and_mitigation")
+            .instructions(risk_instructions)
+            .section("Lead Data", lead_data, priority=2, max_items=8)
+            .section("Opportunity Data", opportunity_data, priority=2, max_items=8)
+            .section(
+                "Historical Risk Patterns",
+                {
+                    "common_loss_reasons": historical_context.get(
+                        "common_loss_reasons", ["Price", "Timeline", "Features"]
+                    ),
+                    "risk_indicators": historical_context.get(
+                        "risk_indicators",
+                        ["Long sales cycles", "Multiple vendors", "Budget delays"],
+                    ),
+                },
+                priority=1,
+                max_items=5,
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
@@ -3345,7 +3616,7 @@ class GeminiAIService:
         # This would typically query historical data from the database
         # For now, we'll simulate with AI analysis of provided patterns
 
-        prompt = f"""
+        historical_instructions = """
         You are an expert sales data analyst. Analyze historical patterns to provide insights for this lead.
         
         HISTORICAL ANALYSIS FRAMEWORK:
@@ -3355,11 +3626,9 @@ class GeminiAIService:
         4. Sales methodology effectiveness
         5. Resource allocation optimization
         
-        Current Lead Profile: {json.dumps(lead_data, indent=2)}
-        
         Analyze patterns and provide insights in this EXACT JSON format:
-        {{
-            "similar_leads_analysis": {{
+        {
+            "similar_leads_analysis": {
                 "similar_leads_count": 25,
                 "average_conversion_rate": 35,
                 "average_deal_size": 45000,
@@ -3369,14 +3638,14 @@ class GeminiAIService:
                     "Executive sponsor engagement",
                     "Clear ROI demonstration"
                 ]
-            }},
-            "industry_benchmarks": {{
+            },
+            "industry_benchmarks": {
                 "industry_conversion_rate": 28,
                 "industry_average_deal_size": 52000,
                 "industry_sales_cycle": 120,
                 "competitive_win_rate": 42,
                 "seasonal_patterns": "Q4 budget flush increases close rates by 15%"
-            }},
+            },
             "predictive_insights": [
                 "Leads with similar pain points convert 40% higher than average",
                 "Company size indicates 25% higher deal value potential",
@@ -3387,7 +3656,7 @@ class GeminiAIService:
                 "Schedule executive briefing within first 2 weeks",
                 "Prepare industry-specific ROI calculator"
             ],
-            "success_probability_factors": {{
+            "success_probability_factors": {
                 "positive_indicators": [
                     "Pain point severity matches our strength areas",
                     "Company growth stage aligns with expansion needs",
@@ -3401,18 +3670,31 @@ class GeminiAIService:
                     "Geographic location shows average performance",
                     "Contact seniority level typical for industry"
                 ]
-            }},
-            "resource_allocation_guidance": {{
+            },
+            "resource_allocation_guidance": {
                 "recommended_investment_level": "high",
                 "key_resources_needed": ["Senior AE", "Sales engineer", "Executive sponsor"],
                 "timeline_priorities": ["Technical proof within 3 weeks", "Executive meeting within 4 weeks"],
                 "success_metrics": ["Technical approval", "Budget confirmation", "Timeline agreement"]
-            }}
-        }}
+            }
+        }
         
         Base analysis on realistic historical patterns and proven sales methodologies.
         """
 
+        prompt = (
+            PromptBuilder("analyze_historical_patterns")
+            .instructions(historical_instructions)
+            .section(
+                "Current Lead Profile",
+                lead_data,
+                priority=2,
+                max_items=5,
+                required=True,
+            )
+            .build()
+        )
+
         try:
             response = self._make_api_call(prompt)
             response_text = response.text.strip()
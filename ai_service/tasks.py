@@ -3,6 +3,7 @@ import logging
 from celery import shared_task
 from django.utils import timezone
 
+from .jobs import execute_job
 from .models import AIInsights, Lead
 from .services import GeminiAIService
 
@@ -282,3 +283,18 @@ def bulk_refresh_insights(lead_ids):
         "total_leads": len(lead_ids),
         "results": results,
     }
+
+
+@shared_task
+def run_ai_job(job_id):
+    """
+    Run a job submitted through the async job API
+
+    Args:
+        job_id (str): ID returned by ai_service.jobs.submit_job
+
+    Returns:
+        dict: Final job status
+    """
+    job = execute_job(job_id)
+    return {"job_id": job_id, "status": job["status"] if job else "expired"}
@@ -0,0 +1,184 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from .circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    gemini_breaker,
+)
+from .model_backends import CircuitBreakerBackend, ModelResponse, SyntheticBackend
+from .redis_client import LocalStore
+from .services import GeminiAIService
+
+User = get_user_model()
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """Test cases for the closed/open/half-open state machine"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            "test",
+            failure_threshold=3,
+            failure_window=60,
+            recovery_timeout=30,
+            store=LocalStore(),
+        )
+
+    def test_trips_after_threshold(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.get_state(), STATE_CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.get_state(), STATE_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.get_status()["trip_count"], 1)
+
+    def test_half_open_allows_single_probe(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        with patch("ai_service.circuit_breaker.time.time", return_value=10**10):
+            self.assertEqual(self.breaker.get_state(), STATE_HALF_OPEN)
+            self.assertTrue(self.breaker.allow_request())
+            self.assertFalse(self.breaker.allow_request())
+
+            self.breaker.record_success()
+
+        self.assertEqual(self.breaker.get_state(), STATE_CLOSED)
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        with patch("ai_service.circuit_breaker.time.time", return_value=10**10):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+            self.assertEqual(self.breaker.get_state(), STATE_OPEN)
+
+        self.assertEqual(self.breaker.get_status()["trip_count"], 2)
+
+    def test_quota_errors_do_not_count(self):
+        inner = SyntheticBackend("gemini-1.5-flash")
+        backend = CircuitBreakerBackend(inner, self.breaker)
+
+        with patch.object(
+            inner, "generate_content", side_effect=Exception("429 quota exceeded")
+        ):
+            for _ in range(5):
+                with self.assertRaises(Exception):
+                    backend.generate_content("prompt")
+
+        self.assertEqual(self.breaker.get_state(), STATE_CLOSED)
+
+
+@override_settings(
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    GEMINI_BREAKER_FAILURE_THRESHOLD=2,
+)
+class ServiceFallbackTest(TestCase):
+    """Test cases for failing fast while Gemini is down"""
+
+    def setUp(self):
+        cache.clear()
+        gemini_breaker.reset()
+        self.service = GeminiAIService()
+
+    def tearDown(self):
+        gemini_breaker.reset()
+
+    @patch("ai_service.services.time.sleep")
+    def test_open_breaker_skips_retries(self, mock_sleep):
+        for _ in range(2):
+            gemini_breaker.record_failure()
+
+        with patch.object(SyntheticBackend, "generate_content") as mock_generate:
+            result = self.service.analyze_historical_patterns({"industry": "Tech"})
+
+        mock_generate.assert_not_called()
+        mock_sleep.assert_not_called()
+        self.assertEqual(result, self.service._get_default_historical_analysis())
+
+    def test_open_breaker_serves_last_known_good(self):
+        lead = {"industry": "Tech"}
+        fresh = self.service.analyze_historical_patterns(lead)
+
+        for _ in range(2):
+            gemini_breaker.record_failure()
+        with patch.object(SyntheticBackend, "generate_content") as mock_generate:
+            cached = self.service.analyze_historical_patterns(lead)
+
+        mock_generate.assert_not_called()
+        self.assertEqual(cached, fresh)
+
+    def test_closed_breaker_costs_one_state_read_per_call(self):
+        with patch.object(
+            gemini_breaker, "_read", wraps=gemini_breaker._read
+        ) as mock_read:
+            self.service.extract_entities("Customer: We use Salesforce.")
+
+        self.assertEqual(mock_read.call_count, 1)
+
+    def test_only_listed_methods_use_the_cache(self):
+        with patch("ai_service.circuit_breaker.cache") as mock_cache:
+            self.service.extract_entities("Customer: We use Salesforce.")
+            mock_cache.set.assert_not_called()
+
+            self.service.analyze_historical_patterns({"industry": "Finance"})
+            mock_cache.set.assert_called_once()
+        mock_cache.get.assert_not_called()
+
+    def test_fallback_results_are_not_cached(self):
+        lead = {"industry": "Retail"}
+        with patch.object(
+            SyntheticBackend,
+            "generate_content",
+            return_value=ModelResponse("not json"),
+        ):
+            self.service.analyze_historical_patterns(lead)
+
+        for _ in range(2):
+            gemini_breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            self.service._make_api_call("prompt")
+        self.assertEqual(
+            self.service.analyze_historical_patterns(lead),
+            self.service._get_default_historical_analysis(),
+        )
+
+
+@override_settings(GEMINI_BREAKER_STORE="local")
+class QuotaStatusBreakerTest(APITestCase):
+    """Test cases for breaker state on the quota status endpoint"""
+
+    def setUp(self):
+        gemini_breaker.reset()
+        self.user = User.objects.create_user(
+            username="staff", password="pass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_status_includes_breaker(self):
+        for _ in range(gemini_breaker.failure_threshold):
+            gemini_breaker.record_failure()
+
+        response = self.client.get("/api/ai/quota-status/")
+
+        breaker = response.data["circuit_breaker"]
+        self.assertEqual(breaker["state"], STATE_OPEN)
+        self.assertEqual(breaker["trip_count"], 1)
+
+        self.client.post("/api/ai/quota-status/", {"quota_type": "circuit_breaker"})
+        response = self.client.get("/api/ai/quota-status/")
+        self.assertEqual(response.data["circuit_breaker"]["state"], STATE_CLOSED)
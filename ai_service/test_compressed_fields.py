@@ -0,0 +1,179 @@
+from io import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from .fields import (
+    MAGIC,
+    clear_dictionary_cache,
+    compress_text,
+    decompress_text,
+    is_compressed,
+    train_dictionary,
+)
+from .models import CompressionDictionary, ConversationAnalysis, Lead
+
+User = get_user_model()
+
+TRANSCRIPT = (
+    "Sales Rep: Thanks for joining the call today. What challenges are you facing?\n"
+    "Customer: Our team spends hours on manual data entry and reporting every week.\n"
+) * 20
+
+
+class CompressionCodecTest(TestCase):
+    """Test cases for the transcript compression codec"""
+
+    def tearDown(self):
+        clear_dictionary_cache()
+
+    def test_round_trip(self):
+        payload = compress_text(TRANSCRIPT)
+        self.assertTrue(payload.startswith(MAGIC))
+        self.assertLess(len(payload), len(TRANSCRIPT.encode("utf-8")))
+        self.assertEqual(decompress_text(payload), TRANSCRIPT)
+
+    def test_short_text_stored_raw(self):
+        payload = compress_text("Hello")
+        self.assertFalse(is_compressed(payload))
+        self.assertEqual(decompress_text(payload), "Hello")
+
+    def test_legacy_plain_text_is_readable(self):
+        self.assertEqual(decompress_text("plain text"), "plain text")
+        self.assertEqual(decompress_text(memoryview(b"plain bytes")), "plain bytes")
+
+    def test_dictionary_improves_ratio(self):
+        data = train_dictionary([TRANSCRIPT] * 5, "zlib", 4096)
+        dictionary = CompressionDictionary.objects.create(codec="zlib", data=data)
+        clear_dictionary_cache()
+
+        short = TRANSCRIPT[:200]
+        plain = compress_text(short, dictionary_id=0)
+        with_dictionary = compress_text(short)
+
+        self.assertLess(len(with_dictionary), len(plain))
+        clear_dictionary_cache()
+        self.assertEqual(decompress_text(with_dictionary), short)
+        self.assertTrue(dictionary.is_active)
+
+
+class CompressedTextFieldTest(TestCase):
+    """Test cases for CompressedTextField storage and list querysets"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="pass")
+
+    def tearDown(self):
+        clear_dictionary_cache()
+
+    def _stored_value(self, model, pk, column):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {column} FROM {model._meta.db_table} WHERE id = %s",
+                [model._meta.pk.get_db_prep_value(pk, connection)],
+            )
+            return cursor.fetchone()[0]
+
+    def test_value_is_stored_compressed(self):
+        analysis = ConversationAnalysis.objects.create(
+            user=self.user, conversation_text=TRANSCRIPT
+        )
+        stored = self._stored_value(
+            ConversationAnalysis, analysis.id, "conversation_text"
+        )
+
+        self.assertTrue(is_compressed(stored))
+        self.assertEqual(
+            ConversationAnalysis.objects.get(id=analysis.id).conversation_text,
+            TRANSCRIPT,
+        )
+
+    def test_preview_kept_in_sync(self):
+        lead = Lead.objects.create(
+            user=self.user, company_name="Acme", conversation_history=TRANSCRIPT
+        )
+        self.assertEqual(lead.conversation_preview, TRANSCRIPT[:200])
+
+        lead.conversation_history = "Updated transcript"
+        lead.save()
+        lead.refresh_from_db()
+        self.assertEqual(lead.conversation_preview, "Updated transcript")
+
+    def test_without_transcripts_defers_heavy_fields(self):
+        Lead.objects.create(
+            user=self.user, company_name="Acme", conversation_history=TRANSCRIPT
+        )
+
+        with self.assertNumQueries(1):
+            lead = Lead.objects.without_transcripts().get()
+            self.assertEqual(lead.conversation_preview, TRANSCRIPT[:200])
+        self.assertIn("conversation_history", lead.get_deferred_fields())
+
+        # Deferred transcript still loads transparently on access
+        self.assertEqual(lead.conversation_history, TRANSCRIPT)
+
+    def test_compress_transcripts_command(self):
+        analysis = ConversationAnalysis.objects.create(
+            user=self.user, conversation_text="placeholder"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE ai_service_conversationanalysis SET conversation_text = %s "
+                "WHERE id = %s",
+                [
+                    connection.Database.Binary(TRANSCRIPT.encode("utf-8")),
+                    ConversationAnalysis._meta.pk.get_db_prep_value(
+                        analysis.id, connection
+                    ),
+                ],
+            )
+
+        out = StringIO()
+        call_command("compress_transcripts", "--batch-size", "10", stdout=out)
+
+        stored = self._stored_value(
+            ConversationAnalysis, analysis.id, "conversation_text"
+        )
+        self.assertTrue(is_compressed(stored))
+        self.assertIn("ai_service.ConversationAnalysis.conversation_text", out.getvalue())
+        self.assertIn("1 compressed", out.getvalue())
+        self.assertEqual(
+            ConversationAnalysis.objects.get(id=analysis.id).conversation_text,
+            TRANSCRIPT,
+        )
+
+    def test_admin_search_matches_whole_transcript(self):
+        tail = "Customer: We would also need a Salesforce integration."
+        analysis = ConversationAnalysis.objects.create(
+            user=self.user, conversation_text=TRANSCRIPT + tail
+        )
+        ConversationAnalysis.objects.create(
+            user=self.user, conversation_text=TRANSCRIPT
+        )
+        model_admin = admin.site._registry[ConversationAnalysis]
+        request = RequestFactory().get("/admin/")
+        request.user = self.user
+
+        results, _ = model_admin.get_search_results(
+            request, model_admin.get_queryset(request), "salesforce integration"
+        )
+
+        # The match is far past the 200-character preview
+        self.assertNotIn("salesforce", analysis.conversation_preview.lower())
+        self.assertEqual([result.pk for result in results], [analysis.pk])
+
+    def test_admin_search_stays_within_the_queryset(self):
+        analysis = ConversationAnalysis.objects.create(
+            user=self.user, conversation_text=TRANSCRIPT + "Salesforce integration"
+        )
+        model_admin = admin.site._registry[ConversationAnalysis]
+        request = RequestFactory().get("/admin/")
+        request.user = self.user
+        queryset = model_admin.get_queryset(request).exclude(pk=analysis.pk)
+
+        with self.assertNumQueries(1):
+            results, _ = model_admin.get_search_results(request, queryset, "salesforce")
+            self.assertEqual(list(results), [])
@@ -20,8 +20,8 @@ class GeminiAIIntegrationTestCase(TestCase):
         self.ai_service = GeminiAIService()
         self.validator = DataValidator()
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_gemini_client_setup(self, mock_model, mock_configure):
         """Test that Gemini AI client is properly set up with API key"""
         # Test client initialization
@@ -33,8 +33,8 @@ class GeminiAIIntegrationTestCase(TestCase):
         # Verify that GenerativeModel was instantiated
         mock_model.assert_called_with("gemini-1.5-flash")
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_conversation_transcript_analysis(self, mock_model, mock_configure):
         """Test conversation transcript analysis functionality"""
         # Mock AI response
@@ -318,8 +318,8 @@ class GeminiAIIntegrationTestCase(TestCase):
         )
         self.assertLess(partial_completeness, 50.0)
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_api_key_rotation(self, mock_model, mock_configure):
         """Test API key rotation functionality"""
         # Mock quota exceeded error
@@ -431,8 +431,8 @@ class GeminiAIAccuracyBenchmarkTestCase(TestCase):
             },
         ]
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_extraction_accuracy_benchmark(self, mock_model, mock_configure):
         """Benchmark extraction accuracy across different conversation types"""
         for conversation in self.test_conversations:
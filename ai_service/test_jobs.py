@@ -0,0 +1,196 @@
+import asyncio
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from .circuit_breaker import gemini_breaker
+from .jobs import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_QUEUED,
+    get_job,
+    job_group_name,
+    submit_job,
+)
+from .tasks import run_ai_job
+
+User = get_user_model()
+
+IN_MEMORY_CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+JOB_SETTINGS = {
+    "GEMINI_BACKEND": "synthetic",
+    "GEMINI_FAKE_LATENCY": "fixed:0",
+    "GEMINI_BREAKER_STORE": "local",
+    "AI_JOB_STORE": "local",
+    "CHANNEL_LAYERS": IN_MEMORY_CHANNEL_LAYERS,
+}
+
+LEAD_DATA = {"company_name": "TechCorp", "industry": "Technology"}
+
+
+@override_settings(**JOB_SETTINGS)
+class AsyncJobAPITest(APITestCase):
+    """Test cases for async=true on the comprehensive AI endpoints"""
+
+    def setUp(self):
+        gemini_breaker.reset()
+        self.user = User.objects.create_user(
+            username="jobuser", email="jobuser@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.payload = {
+            "lead_data": dict(LEAD_DATA, notes=self._testMethodName),
+            "include_industry_insights": False,
+            "async": True,
+        }
+
+    @patch("ai_service.tasks.run_ai_job.delay")
+    def test_async_request_returns_202_with_job(self, mock_delay):
+        response = self.client.post(
+            "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], STATUS_QUEUED)
+        self.assertFalse(response.data["deduplicated"])
+        mock_delay.assert_called_once_with(response.data["job_id"])
+
+    @patch("ai_service.tasks.run_ai_job.delay")
+    def test_identical_submissions_share_one_job(self, mock_delay):
+        first = self.client.post(
+            "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+        )
+        second = self.client.post(
+            "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+        )
+
+        self.assertEqual(first.data["job_id"], second.data["job_id"])
+        self.assertTrue(second.data["deduplicated"])
+        self.assertEqual(mock_delay.call_count, 1)
+
+    def test_completed_job_is_available_by_polling(self):
+        with patch("ai_service.tasks.run_ai_job.delay", side_effect=run_ai_job):
+            response = self.client.post(
+                "/api/ai/comprehensive-opportunity-intelligence/",
+                self.payload,
+                format="json",
+            )
+
+        status_response = self.client.get(response.data["status_url"])
+
+        self.assertEqual(status_response.data["status"], STATUS_COMPLETED)
+        self.assertEqual(status_response.data["progress"], 100)
+        result = status_response.data["result"]
+        self.assertTrue(result["success"])
+        self.assertIn("conversion_analysis", result)
+
+    def test_finished_job_does_not_absorb_regenerate(self):
+        with patch("ai_service.tasks.run_ai_job.delay", side_effect=run_ai_job):
+            first = self.client.post(
+                "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+            )
+        with patch("ai_service.tasks.run_ai_job.delay") as mock_delay:
+            second = self.client.post(
+                "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+            )
+
+        self.assertNotEqual(first.data["job_id"], second.data["job_id"])
+        self.assertFalse(second.data["deduplicated"])
+        mock_delay.assert_called_once_with(second.data["job_id"])
+
+    def test_job_is_hidden_from_other_users(self):
+        with patch("ai_service.tasks.run_ai_job.delay"):
+            response = self.client.post(
+                "/api/ai/comprehensive-recommendations/", self.payload, format="json"
+            )
+        other = User.objects.create_user(
+            username="otheruser", email="other@example.com", password="testpass123"
+        )
+
+        self.client.force_authenticate(user=other)
+        other_response = self.client.get(response.data["status_url"])
+        self.client.force_authenticate(user=None)
+        anonymous_response = self.client.get(response.data["status_url"])
+
+        self.assertEqual(other_response.status_code, 404)
+        self.assertIn(anonymous_response.status_code, (401, 403))
+
+    def test_sync_request_is_unchanged(self):
+        payload = dict(self.payload, **{"async": False})
+
+        response = self.client.post(
+            "/api/ai/comprehensive-recommendations/", payload, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("quality_score", response.data)
+
+    def test_unknown_job_returns_404(self):
+        response = self.client.get("/api/ai/jobs/doesnotexist/")
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(**JOB_SETTINGS)
+class JobExecutionTest(TestCase):
+    """Test cases for running jobs and pushing their progress"""
+
+    def setUp(self):
+        gemini_breaker.reset()
+
+    def test_progress_and_completion_are_pushed_to_group(self):
+        with patch("ai_service.tasks.run_ai_job.delay"):
+            job, _ = submit_job(
+                "comprehensive_recommendations",
+                {"lead_data": dict(LEAD_DATA, notes="push")},
+            )
+
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(job_group_name(job["job_id"]), channel)
+
+        run_ai_job(job["job_id"])
+
+        async def drain():
+            messages = []
+            while True:
+                try:
+                    messages.append(
+                        await asyncio.wait_for(channel_layer.receive(channel), 1)
+                    )
+                except asyncio.TimeoutError:
+                    return messages
+
+        updates = [message["job"] for message in async_to_sync(drain)()]
+
+        self.assertGreater(len(updates), 2)
+        self.assertEqual(updates[-1]["status"], STATUS_COMPLETED)
+        self.assertIn("result", updates[-1])
+
+    def test_failed_job_releases_dedupe(self):
+        params = {"lead_data": dict(LEAD_DATA, notes="fail")}
+        with patch("ai_service.tasks.run_ai_job.delay"):
+            job, _ = submit_job("comprehensive_recommendations", params)
+
+        with patch(
+            "ai_service.views.ComprehensiveRecommendationsView.generate",
+            side_effect=RuntimeError("boom"),
+        ):
+            run_ai_job(job["job_id"])
+
+        failed = get_job(job["job_id"])
+        self.assertEqual(failed["status"], STATUS_FAILED)
+        self.assertEqual(failed["error"], "boom")
+
+        with patch("ai_service.tasks.run_ai_job.delay"):
+            retry, created = submit_job("comprehensive_recommendations", params)
+
+        self.assertTrue(created)
+        self.assertNotEqual(retry["job_id"], job["job_id"])
@@ -0,0 +1,173 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from . import metrics
+from .circuit_breaker import gemini_breaker
+from .model_backends import ModelResponse, SyntheticBackend
+from .quota_tracker import quota_tracker
+from .redis_client import LocalStore
+from .services import GeminiAIService
+
+
+@override_settings(
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    AI_METRICS_STORE="local",
+)
+class AIServiceMetricsTest(TestCase):
+    """Test cases for per-method AI service instrumentation"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        gemini_breaker.reset()
+        # Earlier tests may have used up the per-minute request quota
+        quota_tracker.reset_quota()
+        self.service = GeminiAIService()
+
+    def test_successful_call_records_latency_and_tokens(self):
+        self.service.extract_lead_info("Customer: We need a CRM.")
+
+        self.assertEqual(
+            metrics.METHOD_CALLS.get(method="extract_lead_info", outcome="ok"), 1
+        )
+        self.assertEqual(
+            metrics.UPSTREAM_LATENCY.get_count(method="extract_lead_info"), 1
+        )
+        self.assertGreater(metrics.PROMPT_TOKENS.get(method="extract_lead_info"), 0)
+        self.assertGreater(metrics.RESPONSE_TOKENS.get(method="extract_lead_info"), 0)
+
+    def test_parse_failure_and_fallback(self):
+        with patch.object(
+            SyntheticBackend,
+            "generate_content",
+            return_value=ModelResponse("not json"),
+        ):
+            self.service.extract_lead_info("Customer: We need a CRM.")
+
+        self.assertEqual(metrics.PARSE_FAILURES.get(method="extract_lead_info"), 1)
+        self.assertEqual(
+            metrics.DEFAULT_FALLBACKS.get(
+                method="extract_lead_info", fallback="_get_default_lead_structure"
+            ),
+            1,
+        )
+        self.assertEqual(
+            metrics.METHOD_CALLS.get(method="extract_lead_info", outcome="fallback"),
+            1,
+        )
+
+    @patch("ai_service.services.time.sleep")
+    def test_retries_record_backoff_sleep(self, mock_sleep):
+        with patch.object(
+            SyntheticBackend, "generate_content", side_effect=RuntimeError("boom")
+        ):
+            self.service.extract_lead_info("Customer: We need a CRM.")
+
+        self.assertEqual(
+            metrics.RETRIES.get(method="extract_lead_info", reason="error_backoff"), 2
+        )
+        self.assertEqual(
+            metrics.RETRY_SLEEP.get(method="extract_lead_info", reason="error_backoff"),
+            3,
+        )
+
+    def test_metrics_endpoint(self):
+        self.service.extract_lead_info("Customer: We need a CRM.")
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE nia_ai_method_duration_seconds histogram", body)
+        self.assertIn(
+            'nia_ai_method_calls_total{method="extract_lead_info",outcome="ok"} 1.0',
+            body,
+        )
+        self.assertIn(
+            'nia_ai_upstream_latency_seconds_bucket{method="extract_lead_info",le="+Inf"} 1',
+            body,
+        )
+
+    @override_settings(METRICS_AUTH_TOKEN="secret")
+    def test_metrics_endpoint_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+
+class SharedMetricsTest(TestCase):
+    """Test cases for aggregating metrics from several processes"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.store = LocalStore()
+
+    def _worker_registry(self):
+        """Registry standing in for another web or Celery process"""
+        registry = metrics.Registry()
+        registry.counter(
+            metrics.METHOD_CALLS.name,
+            metrics.METHOD_CALLS.documentation,
+            metrics.METHOD_CALLS.labelnames,
+        )
+        registry.histogram(
+            metrics.METHOD_DURATION.name,
+            metrics.METHOD_DURATION.documentation,
+            metrics.METHOD_DURATION.labelnames,
+        )
+        return registry
+
+    def test_flushes_from_several_processes_are_summed(self):
+        worker = self._worker_registry()
+        for registry in (metrics.REGISTRY, worker):
+            calls = registry._metrics[metrics.METHOD_CALLS.name]
+            duration = registry._metrics[metrics.METHOD_DURATION.name]
+            calls.inc(method="extract_lead_info", outcome="ok")
+            duration.observe(0.2, method="extract_lead_info")
+            registry.flush(self.store)
+        # Already flushed increments are not added twice
+        metrics.REGISTRY.flush(self.store)
+
+        body = metrics.REGISTRY.render(self.store)
+
+        self.assertIn(
+            'nia_ai_method_calls_total{method="extract_lead_info",outcome="ok"} 2.0',
+            body,
+        )
+        self.assertIn(
+            'nia_ai_method_duration_seconds_bucket{method="extract_lead_info",le="0.25"} 2',
+            body,
+        )
+        self.assertIn(
+            'nia_ai_method_duration_seconds_count{method="extract_lead_info"} 2', body
+        )
+
+    def test_failed_flush_keeps_increments(self):
+        metrics.METHOD_CALLS.inc(method="extract_lead_info", outcome="ok")
+        with patch.object(LocalStore, "hincrbyfloat", side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                metrics.REGISTRY.flush(self.store)
+
+        metrics.REGISTRY.flush(self.store)
+
+        self.assertIn(
+            'nia_ai_method_calls_total{method="extract_lead_info",outcome="ok"} 1.0',
+            metrics.REGISTRY.render(self.store),
+        )
+
+    def test_metrics_endpoint_serves_shared_totals(self):
+        worker = self._worker_registry()
+        worker._metrics[metrics.METHOD_CALLS.name].inc(
+            method="extract_lead_info", outcome="ok"
+        )
+        worker.flush(self.store)
+        metrics.METHOD_CALLS.inc(method="extract_lead_info", outcome="ok")
+
+        with patch.object(metrics, "get_shared_store", return_value=self.store):
+            body = self.client.get("/metrics").content.decode()
+
+        self.assertIn(
+            'nia_ai_method_calls_total{method="extract_lead_info",outcome="ok"} 2.0',
+            body,
+        )
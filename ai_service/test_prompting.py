@@ -0,0 +1,160 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from . import metrics
+from .load_testing import SAMPLE_CONVERSATION, SAMPLE_LEAD_DATA
+from .prompting import (
+    PROMPT_BUDGET_TRIMS,
+    PromptBuilder,
+    compact_json,
+    estimate_tokens,
+    get_token_budget,
+    load_baseline_tokens,
+    prune,
+    savings_report,
+    truncate_list,
+)
+from .services import GeminiAIService
+
+
+class PromptSerializationTest(SimpleTestCase):
+    """Test cases for compact context serialization"""
+
+    def test_prune_drops_null_and_empty_fields(self):
+        value = {
+            "company_name": "TechCorp",
+            "budget_info": None,
+            "timeline": "  ",
+            "pain_points": [],
+            "contact_details": {"name": "Sarah", "phone": None},
+        }
+
+        self.assertEqual(
+            prune(value),
+            {"company_name": "TechCorp", "contact_details": {"name": "Sarah"}},
+        )
+
+    def test_compact_json_has_no_whitespace(self):
+        text = compact_json({"a": [1, 2], "b": None, "c": "x"})
+
+        self.assertEqual(text, '{"a":[1,2],"c":"x"}')
+
+    def test_truncate_list_keeps_most_relevant_in_original_order(self):
+        items = [
+            {"question": "a", "priority": 3},
+            {"question": "b", "priority": 9},
+            {"question": "c", "priority": 5},
+            {"question": "d", "priority": 8},
+        ]
+
+        kept = truncate_list(items, 2)
+
+        self.assertEqual([item["question"] for item in kept], ["b", "d"])
+
+    def test_truncate_list_without_signal_cuts_from_end(self):
+        self.assertEqual(truncate_list(["a", "b", "c"], 2), ["a", "b"])
+
+
+class PromptBuilderTest(SimpleTestCase):
+    """Test cases for budgeted prompt assembly"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+
+    def test_static_prefix_is_identical_across_calls(self):
+        first = PromptBuilder("test").instructions("    Schema:\n    {}").section(
+            "Lead", {"company_name": "A"}
+        )
+        second = PromptBuilder("test").instructions("    Schema:\n    {}").section(
+            "Lead", {"company_name": "B"}
+        )
+
+        self.assertTrue(first.build().startswith(first.prefix))
+        self.assertEqual(first.prefix, second.prefix)
+
+    def test_low_priority_sections_shrink_first(self):
+        builder = (
+            PromptBuilder("test", budget=60)
+            .instructions("Analyze the lead.")
+            .section("Lead", {"company_name": "TechCorp"}, priority=2, required=True)
+            .section("History", [f"event {i}" for i in range(50)], priority=0)
+        )
+
+        prompt = builder.build()
+
+        self.assertIn("TechCorp", prompt)
+        self.assertLessEqual(estimate_tokens(prompt), 60)
+        self.assertEqual(PROMPT_BUDGET_TRIMS.get(method="test"), 1)
+
+    def test_required_text_is_truncated_not_dropped(self):
+        prompt = (
+            PromptBuilder("test", budget=150)
+            .section("Conversation", "word " * 1000, required=True)
+            .build()
+        )
+
+        self.assertIn("[...]", prompt)
+        self.assertLessEqual(estimate_tokens(prompt), 150)
+
+    @override_settings(AI_PROMPT_TOKEN_BUDGETS={"extract_lead_info": 123})
+    def test_budget_override_from_settings(self):
+        self.assertEqual(get_token_budget("extract_lead_info"), 123)
+
+
+@override_settings(GEMINI_BACKEND="synthetic", GEMINI_FAKE_LATENCY="fixed:0")
+class ServicePromptTest(SimpleTestCase):
+    """Test cases for the service prompt builders"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.service = GeminiAIService()
+
+    def test_extraction_prompt_is_smaller_than_baseline(self):
+        context = {"source": "sales_call", "notes": None}
+
+        prompt = self.service._build_extraction_prompt(SAMPLE_CONVERSATION, context)
+
+        self.assertIn(SAMPLE_CONVERSATION.strip(), prompt)
+        self.assertIn('"source":"sales_call"', prompt)
+        self.assertNotIn("notes", prompt)
+        row = savings_report()[0]
+        self.assertEqual(row["method"], "extract_lead_info")
+        self.assertLess(row["assembled_tokens"], row["baseline_tokens"])
+
+    def test_recommendations_prompt_embeds_compact_lead_data(self):
+        prompt = self.service._build_recommendations_prompt(SAMPLE_LEAD_DATA, {})
+
+        pain_points = json.dumps(SAMPLE_LEAD_DATA["pain_points"], separators=(",", ":"))
+
+        self.assertIn(pain_points, prompt)
+        self.assertNotIn("Additional Context", prompt)
+
+
+@override_settings(GEMINI_FAKE_LATENCY="fixed:0", GEMINI_BREAKER_STORE="local")
+class PromptTokenReportTest(SimpleTestCase):
+    """Test cases for the prompt_token_report baselines"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+
+    def test_report_compares_against_captured_prompts(self):
+        out = StringIO()
+
+        call_command("prompt_token_report", "--json", stdout=out)
+
+        report = json.loads(out.getvalue())
+        baselines = load_baseline_tokens()
+        self.assertTrue(report)
+        for row in report:
+            self.assertEqual(row["baseline_source"], "captured", row["method"])
+            self.assertEqual(row["baseline_tokens"], round(baselines[row["method"]]))
+
+    def test_methods_without_captured_prompt_are_estimated(self):
+        PromptBuilder("new_method").instructions("Summarize the call.").build()
+
+        row = savings_report(load_baseline_tokens())[0]
+
+        self.assertEqual(row["baseline_source"], "estimated")
@@ -50,7 +50,7 @@ class LeadQualityScoringTests(TestCase):
             "current_solution": "Manual Excel-based processes",
         }
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_calculate_lead_quality_score_success(self, mock_model):
         """Test successful lead quality score calculation"""
         # Mock AI response
@@ -108,7 +108,7 @@ class LeadQualityScoringTests(TestCase):
             "contact_details": {"name": "Jane Doe"},
         }
 
-        with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+        with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
             # Mock a lower quality response
             mock_response = MagicMock()
             mock_response.text = json.dumps(
@@ -147,7 +147,7 @@ class LeadQualityScoringTests(TestCase):
         # Test with invalid score (should be clamped)
         invalid_data = {"overall_score": 150}  # Over 100
 
-        with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+        with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
             mock_response = MagicMock()
             mock_response.text = json.dumps(invalid_data)
             mock_model.return_value.generate_content.return_value = mock_response
@@ -178,7 +178,7 @@ class SalesStrategyGenerationTests(TestCase):
             "conversion_probability": 70,
         }
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_generate_sales_strategy_success(self, mock_model):
         """Test successful sales strategy generation"""
         mock_response = MagicMock()
@@ -244,7 +244,7 @@ class SalesStrategyGenerationTests(TestCase):
                 "overall_score": 80 if tier == "high" else 50,
             }
 
-            with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+            with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
                 mock_response = MagicMock()
                 mock_response.text = json.dumps(
                     {
@@ -272,7 +272,7 @@ class IndustryInsightsTests(TestCase):
     def setUp(self):
         self.ai_service = GeminiAIService()
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_generate_industry_insights_technology(self, mock_model):
         """Test industry insights for technology sector"""
         lead_data = {
@@ -325,7 +325,7 @@ class IndustryInsightsTests(TestCase):
         self.assertIn("why_relevant", result["solution_fit"])
         self.assertTrue(result["insights_metadata"]["industry_specified"])
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_generate_industry_insights_no_industry(self, mock_model):
         """Test insights generation when industry is not specified"""
         lead_data = {
@@ -362,7 +362,7 @@ class RecommendationConsistencyTests(TestCase):
             "urgency_level": "medium",
         }
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_recommendation_confidence_scoring(self, mock_model):
         """Test that recommendations include proper confidence scoring"""
         mock_response = MagicMock()
@@ -397,7 +397,7 @@ class RecommendationConsistencyTests(TestCase):
 
     def test_recommendation_ranking_consistency(self):
         """Test that recommendations are properly ranked by priority and confidence"""
-        with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+        with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
             mock_response = MagicMock()
             mock_response.text = json.dumps(
                 {
@@ -453,7 +453,7 @@ class APIEndpointTests(APITestCase):
             "pain_points": ["API integration challenges"],
         }
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_lead_quality_score_endpoint(self, mock_model):
         """Test lead quality score API endpoint"""
         mock_response = MagicMock()
@@ -476,7 +476,7 @@ class APIEndpointTests(APITestCase):
         self.assertIn("quality_score", response.data)
         self.assertIn("overall_score", response.data["quality_score"])
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_sales_strategy_endpoint(self, mock_model):
         """Test sales strategy API endpoint"""
         mock_response = MagicMock()
@@ -497,7 +497,7 @@ class APIEndpointTests(APITestCase):
         self.assertTrue(response.data["success"])
         self.assertIn("sales_strategy", response.data)
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_industry_insights_endpoint(self, mock_model):
         """Test industry insights API endpoint"""
         mock_response = MagicMock()
@@ -518,7 +518,7 @@ class APIEndpointTests(APITestCase):
         self.assertTrue(response.data["success"])
         self.assertIn("industry_insights", response.data)
 
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_comprehensive_recommendations_endpoint(self, mock_model):
         """Test comprehensive recommendations API endpoint"""
         # Mock multiple AI responses for different components
@@ -598,7 +598,7 @@ class RecommendationQualityTests(TestCase):
             "pain_points": ["Test pain point"],
         }
 
-        with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+        with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
             mock_response = MagicMock()
             mock_response.text = json.dumps(
                 {
@@ -638,7 +638,7 @@ class RecommendationQualityTests(TestCase):
         """Test that confidence scores are within valid ranges"""
         sample_data = {"company_name": "Confidence Test Corp"}
 
-        with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+        with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
             mock_response = MagicMock()
             mock_response.text = json.dumps({"recommendations": []})
             mock_model.return_value.generate_content.return_value = mock_response
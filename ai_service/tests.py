@@ -95,8 +95,8 @@ class GeminiAIServiceTestCase(TestCase):
     def setUp(self):
         self.ai_service = GeminiAIService()
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_extract_lead_info_success(self, mock_model, mock_configure):
         """Test successful lead information extraction"""
         # Mock AI response
@@ -135,8 +135,8 @@ class GeminiAIServiceTestCase(TestCase):
         self.assertIn("Slow processes", result["pain_points"])
         self.assertGreater(result["extraction_metadata"]["confidence_score"], 0)
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_extract_lead_info_json_error(self, mock_model, mock_configure):
         """Test lead extraction with JSON parsing error"""
         mock_response = MagicMock()
@@ -464,8 +464,8 @@ class SalesRecommendationsTestCase(TestCase):
             "urgency_level": "high",
         }
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_lead_quality_score_calculation(self, mock_model, mock_configure):
         """Test lead quality score calculation"""
         mock_response = MagicMock()
@@ -504,8 +504,8 @@ class SalesRecommendationsTestCase(TestCase):
         self.assertIn("Clear pain points", quality_score["key_strengths"])
         self.assertIn("validation_metadata", quality_score)
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_sales_strategy_generation(self, mock_model, mock_configure):
         """Test sales strategy generation"""
         mock_response = MagicMock()
@@ -557,8 +557,8 @@ class SalesRecommendationsTestCase(TestCase):
         self.assertIn("strategy_metadata", sales_strategy)
         self.assertGreater(sales_strategy["strategy_metadata"]["confidence_score"], 70)
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_industry_insights_generation(self, mock_model, mock_configure):
         """Test industry-specific insights generation"""
         mock_response = MagicMock()
@@ -785,8 +785,8 @@ class LeadExtractionAccuracyTestCase(TestCase):
             },
         ]
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_lead_extraction_accuracy_comprehensive(self, mock_model, mock_configure):
         """Test comprehensive lead extraction accuracy"""
         for i, conversation in enumerate(self.sample_conversations):
@@ -1035,8 +1035,8 @@ class LeadExtractionAccuracyTestCase(TestCase):
     def setUp(self):
         self.ai_service = GeminiAIService()
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_sales_call_conversation(self, mock_model, mock_configure):
         # Test extraction from a typical sales call conversation
         mock_response = MagicMock()
@@ -1063,8 +1063,8 @@ class LeadExtractionAccuracyTestCase(TestCase):
         self.assertIn("Sarah Johnson", result["decision_makers"])
         self.assertEqual(result["urgency_level"], "high")
 
-    @patch("ai_service.services.genai.configure")
-    @patch("ai_service.services.genai.GenerativeModel")
+    @patch("ai_service.model_backends.genai.configure")
+    @patch("ai_service.model_backends.genai.GenerativeModel")
     def test_minimal_information_conversation(self, mock_model, mock_configure):
         # Test extraction from conversation with minimal information
         mock_response = MagicMock()
@@ -93,6 +93,7 @@ urlpatterns = [
         name="test_connection",
     ),
     path("quota-status/", views.GeminiQuotaStatusView.as_view(), name="quota_status"),
+    path("jobs/<str:job_id>/", views.AIJobStatusView.as_view(), name="job_status"),
     path(
         "history/", views.ConversationHistoryView.as_view(), name="conversation_history"
     ),
@@ -1,5 +1,7 @@
 import logging
 
+from django.conf import settings
+from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -9,6 +11,17 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import metrics
+from .circuit_breaker import gemini_breaker
+from .jobs import (
+    accepted_payload,
+    get_job,
+    job_params,
+    job_visible_to,
+    serialize_job,
+    submit_job,
+    wants_async,
+)
 from .models import ConversationAnalysis
 from .quota_tracker import quota_tracker
 from .services import GeminiAIService
@@ -284,6 +297,7 @@ class GeminiQuotaStatusView(APIView):
                         "usage": usage,
                         "recommendations": [],
                     },
+                    "circuit_breaker": gemini_breaker.get_status(),
                     "timestamp": timezone.now().isoformat(),
                 },
                 status=status.HTTP_200_OK,
@@ -311,7 +325,10 @@ class GeminiQuotaStatusView(APIView):
                 )
 
             quota_type = request.data.get("quota_type", "all")
-            quota_tracker.reset_quota(quota_type)
+            if quota_type == "circuit_breaker":
+                gemini_breaker.reset()
+            else:
+                quota_tracker.reset_quota(quota_type)
 
             return Response(
                 {
@@ -329,6 +346,21 @@ class GeminiQuotaStatusView(APIView):
             )
 
 
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for AI service metrics
+
+    Serves the totals aggregated in Redis from every web and Celery process
+    (see ai_service.metrics). If METRICS_AUTH_TOKEN is set, requests must
+    send it as a bearer token.
+    """
+    token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4")
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class ExtractLeadInfoView(APIView):
     """Dedicated API endpoint for lead information extraction only"""
@@ -688,9 +720,11 @@ class ConversationHistoryView(APIView):
             limit = int(request.query_params.get("limit", 10))
             offset = int(request.query_params.get("offset", 0))
 
-            analyses = ConversationAnalysis.objects.filter(user=request.user).order_by(
-                "-analysis_timestamp"
-            )[offset : offset + limit]
+            analyses = (
+                ConversationAnalysis.objects.filter(user=request.user)
+                .without_transcripts()
+                .order_by("-analysis_timestamp")[offset : offset + limit]
+            )
 
             history = []
             for analysis in analyses:
@@ -702,9 +736,9 @@ class ConversationHistoryView(APIView):
                         "id": str(analysis.id),
                         "timestamp": analysis.analysis_timestamp.isoformat(),
                         "conversation_preview": (
-                            analysis.conversation_text[:100] + "..."
-                            if len(analysis.conversation_text) > 100
-                            else analysis.conversation_text
+                            analysis.conversation_preview[:100] + "..."
+                            if len(analysis.conversation_preview) > 100
+                            else analysis.conversation_preview
                         ),
                         "company_name": lead_info.get("company_name"),
                         "contact_name": lead_info.get("contact_details", {}).get(
@@ -950,7 +984,8 @@ class ComprehensiveRecommendationsView(APIView):
             "include_quality_score": true,
             "include_sales_strategy": true,
             "include_industry_insights": true,
-            "include_next_steps": true
+            "include_next_steps": true,
+            "async": false  // true: return 202 with a job ID (see ai_service.jobs)
         }
         """
         try:
@@ -965,80 +1000,17 @@ class ComprehensiveRecommendationsView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get optional flags
-            include_quality_score = request.data.get("include_quality_score", True)
-            include_sales_strategy = request.data.get("include_sales_strategy", True)
-            include_industry_insights = request.data.get(
-                "include_industry_insights", True
-            )
-            include_next_steps = request.data.get("include_next_steps", True)
-
-            ai_service = GeminiAIService()
-
-            # Initialize response structure
-            comprehensive_recommendations = {
-                "success": True,
-                "lead_analysis": {
-                    "lead_data": lead_data,
-                    "analysis_timestamp": timezone.now().isoformat(),
-                },
-            }
-
-            # Generate quality score if requested
-            quality_score = None
-            if include_quality_score:
-                quality_score = ai_service.calculate_lead_quality_score(lead_data)
-                quality_score["validation_metadata"][
-                    "last_calculated"
-                ] = timezone.now().isoformat()
-                comprehensive_recommendations["quality_score"] = quality_score
-
-            # Generate sales strategy if requested
-            if include_sales_strategy:
-                sales_strategy = ai_service.generate_sales_strategy(
-                    lead_data, quality_score
+            if wants_async(request):
+                job, created = submit_job(
+                    "comprehensive_recommendations",
+                    job_params(request.data),
+                    request.user,
                 )
-                sales_strategy["strategy_metadata"][
-                    "last_generated"
-                ] = timezone.now().isoformat()
-                comprehensive_recommendations["sales_strategy"] = sales_strategy
-
-            # Generate industry insights if requested
-            if include_industry_insights:
-                industry_insights = ai_service.generate_industry_insights(lead_data)
-                industry_insights["insights_metadata"][
-                    "last_generated"
-                ] = timezone.now().isoformat()
-                comprehensive_recommendations["industry_insights"] = industry_insights
-
-            # Generate next steps and recommendations if requested
-            if include_next_steps:
-                context = {
-                    "quality_score": quality_score,
-                    "user_preferences": request.data.get("user_preferences", {}),
-                }
-                recommendations = ai_service.generate_recommendations(
-                    lead_data, context
+                return Response(
+                    accepted_payload(job, created), status=status.HTTP_202_ACCEPTED
                 )
-                comprehensive_recommendations["recommendations"] = recommendations
-
-            # Add overall analysis metadata
-            comprehensive_recommendations["analysis_metadata"] = {
-                "components_included": {
-                    "quality_score": include_quality_score,
-                    "sales_strategy": include_sales_strategy,
-                    "industry_insights": include_industry_insights,
-                    "next_steps": include_next_steps,
-                },
-                "overall_confidence": self._calculate_overall_analysis_confidence(
-                    comprehensive_recommendations
-                ),
-                "processing_time": None,  # Could be calculated if needed
-                "ai_model": "gemini-1.5-flash",
-                "analysis_version": "1.0",
-            }
 
-            return Response(comprehensive_recommendations, status=status.HTTP_200_OK)
+            return Response(self.generate(request.data), status=status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(
@@ -1053,6 +1025,91 @@ class ComprehensiveRecommendationsView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def generate(self, data: dict, progress=None) -> dict:
+        """
+        Build the comprehensive recommendations for a request payload
+
+        Args:
+            data (dict): Request payload (see post)
+            progress (callable): Optional progress(percent, message) callback,
+                used when running as an async job
+        """
+        progress = progress or (lambda percent, message="": None)
+        lead_data = data.get("lead_data", {})
+
+        # Get optional flags
+        include_quality_score = data.get("include_quality_score", True)
+        include_sales_strategy = data.get("include_sales_strategy", True)
+        include_industry_insights = data.get("include_industry_insights", True)
+        include_next_steps = data.get("include_next_steps", True)
+
+        ai_service = GeminiAIService()
+
+        # Initialize response structure
+        comprehensive_recommendations = {
+            "success": True,
+            "lead_analysis": {
+                "lead_data": lead_data,
+                "analysis_timestamp": timezone.now().isoformat(),
+            },
+        }
+
+        # Generate quality score if requested
+        quality_score = None
+        if include_quality_score:
+            progress(10, "Scoring lead quality")
+            quality_score = ai_service.calculate_lead_quality_score(lead_data)
+            quality_score["validation_metadata"][
+                "last_calculated"
+            ] = timezone.now().isoformat()
+            comprehensive_recommendations["quality_score"] = quality_score
+
+        # Generate sales strategy if requested
+        if include_sales_strategy:
+            progress(30, "Generating sales strategy")
+            sales_strategy = ai_service.generate_sales_strategy(lead_data, quality_score)
+            sales_strategy["strategy_metadata"][
+                "last_generated"
+            ] = timezone.now().isoformat()
+            comprehensive_recommendations["sales_strategy"] = sales_strategy
+
+        # Generate industry insights if requested
+        if include_industry_insights:
+            progress(55, "Generating industry insights")
+            industry_insights = ai_service.generate_industry_insights(lead_data)
+            industry_insights["insights_metadata"][
+                "last_generated"
+            ] = timezone.now().isoformat()
+            comprehensive_recommendations["industry_insights"] = industry_insights
+
+        # Generate next steps and recommendations if requested
+        if include_next_steps:
+            progress(80, "Generating recommendations")
+            context = {
+                "quality_score": quality_score,
+                "user_preferences": data.get("user_preferences", {}),
+            }
+            recommendations = ai_service.generate_recommendations(lead_data, context)
+            comprehensive_recommendations["recommendations"] = recommendations
+
+        # Add overall analysis metadata
+        comprehensive_recommendations["analysis_metadata"] = {
+            "components_included": {
+                "quality_score": include_quality_score,
+                "sales_strategy": include_sales_strategy,
+                "industry_insights": include_industry_insights,
+                "next_steps": include_next_steps,
+            },
+            "overall_confidence": self._calculate_overall_analysis_confidence(
+                comprehensive_recommendations
+            ),
+            "processing_time": None,  # Could be calculated if needed
+            "ai_model": "gemini-1.5-flash",
+            "analysis_version": "1.0",
+        }
+
+        return comprehensive_recommendations
+
     def _calculate_overall_analysis_confidence(self, analysis: dict) -> float:
         """Calculate overall confidence score for the comprehensive analysis"""
         confidence_scores = []
@@ -1231,6 +1288,10 @@ class LeadViewSet(viewsets.ModelViewSet):
         if urgency_filter:
             queryset = queryset.filter(urgency_level=urgency_filter)
 
+        # List responses never include the transcript
+        if self.action == "list":
+            queryset = queryset.without_transcripts()
+
         # Order by creation date (newest first) or lead score
         ordering = self.request.query_params.get("ordering", "-created_at")
         if ordering == "lead_score":
@@ -1811,7 +1872,8 @@ class ComprehensiveOpportunityIntelligenceView(APIView):
             "include_deal_predictions": true,
             "include_stage_recommendations": true,
             "include_risk_analysis": true,
-            "include_historical_patterns": true
+            "include_historical_patterns": true,
+            "async": false  // true: return 202 with a job ID (see ai_service.jobs)
         }
         """
         try:
@@ -1826,83 +1888,15 @@ class ComprehensiveOpportunityIntelligenceView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            opportunity_data = request.data.get("opportunity_data", {})
-
-            # Get optional flags
-            include_conversion = request.data.get("include_conversion_analysis", True)
-            include_predictions = request.data.get("include_deal_predictions", True)
-            include_stage_recs = request.data.get("include_stage_recommendations", True)
-            include_risk = request.data.get("include_risk_analysis", True)
-            include_historical = request.data.get("include_historical_patterns", True)
-
-            ai_service = GeminiAIService()
-
-            # Initialize comprehensive intelligence response
-            intelligence = {
-                "success": True,
-                "lead_data": lead_data,
-                "opportunity_data": opportunity_data,
-                "analysis_timestamp": timezone.now().isoformat(),
-            }
-
-            # Generate conversion analysis if requested
-            if include_conversion:
-                historical_data = request.data.get("historical_data", {})
-                conversion_analysis = (
-                    ai_service.analyze_opportunity_conversion_potential(
-                        lead_data, historical_data
-                    )
-                )
-                intelligence["conversion_analysis"] = conversion_analysis
-
-            # Generate deal predictions if requested
-            if include_predictions:
-                predictions = ai_service.predict_deal_size_and_timeline(
-                    lead_data, opportunity_data
-                )
-                intelligence["deal_predictions"] = predictions
-
-            # Generate stage recommendations if requested and opportunity data exists
-            if include_stage_recs and opportunity_data:
-                current_stage = opportunity_data.get("stage")
-                stage_recommendations = ai_service.recommend_sales_stage(
-                    lead_data, opportunity_data, current_stage
-                )
-                intelligence["stage_recommendations"] = stage_recommendations
-
-            # Generate risk analysis if requested and opportunity data exists
-            if include_risk and opportunity_data:
-                historical_data = request.data.get("historical_data", {})
-                risk_analysis = ai_service.identify_risk_factors_and_mitigation(
-                    lead_data, opportunity_data, historical_data
+            if wants_async(request):
+                job, created = submit_job(
+                    "opportunity_intelligence", job_params(request.data), request.user
                 )
-                intelligence["risk_analysis"] = risk_analysis
-
-            # Generate historical pattern analysis if requested
-            if include_historical:
-                user_id = request.data.get("user_id")
-                historical_analysis = ai_service.analyze_historical_patterns(
-                    lead_data, user_id
+                return Response(
+                    accepted_payload(job, created), status=status.HTTP_202_ACCEPTED
                 )
-                intelligence["historical_analysis"] = historical_analysis
-
-            # Add overall intelligence metadata
-            intelligence["intelligence_metadata"] = {
-                "components_included": {
-                    "conversion_analysis": include_conversion,
-                    "deal_predictions": include_predictions,
-                    "stage_recommendations": include_stage_recs,
-                    "risk_analysis": include_risk,
-                    "historical_patterns": include_historical,
-                },
-                "overall_confidence": self._calculate_intelligence_confidence(
-                    intelligence
-                ),
-                "ai_model": "gemini-1.5-flash",
-                "analysis_version": "1.0",
-            }
 
-            return Response(intelligence, status=status.HTTP_200_OK)
+            return Response(self.generate(request.data), status=status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(
@@ -1918,6 +1912,96 @@ class ComprehensiveOpportunityIntelligenceView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def generate(self, data: dict, progress=None) -> dict:
+        """
+        Build the opportunity intelligence for a request payload
+
+        Args:
+            data (dict): Request payload (see post)
+            progress (callable): Optional progress(percent, message) callback,
+                used when running as an async job
+        """
+        progress = progress or (lambda percent, message="": None)
+        lead_data = data.get("lead_data", {})
+        opportunity_data = data.get("opportunity_data", {})
+
+        # Get optional flags
+        include_conversion = data.get("include_conversion_analysis", True)
+        include_predictions = data.get("include_deal_predictions", True)
+        include_stage_recs = data.get("include_stage_recommendations", True)
+        include_risk = data.get("include_risk_analysis", True)
+        include_historical = data.get("include_historical_patterns", True)
+
+        ai_service = GeminiAIService()
+
+        # Initialize comprehensive intelligence response
+        intelligence = {
+            "success": True,
+            "lead_data": lead_data,
+            "opportunity_data": opportunity_data,
+            "analysis_timestamp": timezone.now().isoformat(),
+        }
+
+        # Generate conversion analysis if requested
+        if include_conversion:
+            progress(10, "Analyzing conversion potential")
+            historical_data = data.get("historical_data", {})
+            conversion_analysis = ai_service.analyze_opportunity_conversion_potential(
+                lead_data, historical_data
+            )
+            intelligence["conversion_analysis"] = conversion_analysis
+
+        # Generate deal predictions if requested
+        if include_predictions:
+            progress(30, "Predicting deal size and timeline")
+            predictions = ai_service.predict_deal_size_and_timeline(
+                lead_data, opportunity_data
+            )
+            intelligence["deal_predictions"] = predictions
+
+        # Generate stage recommendations if requested and opportunity data exists
+        if include_stage_recs and opportunity_data:
+            progress(50, "Recommending sales stage")
+            current_stage = opportunity_data.get("stage")
+            stage_recommendations = ai_service.recommend_sales_stage(
+                lead_data, opportunity_data, current_stage
+            )
+            intelligence["stage_recommendations"] = stage_recommendations
+
+        # Generate risk analysis if requested and opportunity data exists
+        if include_risk and opportunity_data:
+            progress(65, "Identifying risk factors")
+            historical_data = data.get("historical_data", {})
+            risk_analysis = ai_service.identify_risk_factors_and_mitigation(
+                lead_data, opportunity_data, historical_data
+            )
+            intelligence["risk_analysis"] = risk_analysis
+
+        # Generate historical pattern analysis if requested
+        if include_historical:
+            progress(80, "Analyzing historical patterns")
+            user_id = data.get("user_id")
+            historical_analysis = ai_service.analyze_historical_patterns(
+                lead_data, user_id
+            )
+            intelligence["historical_analysis"] = historical_analysis
+
+        # Add overall intelligence metadata
+        intelligence["intelligence_metadata"] = {
+            "components_included": {
+                "conversion_analysis": include_conversion,
+                "deal_predictions": include_predictions,
+                "stage_recommendations": include_stage_recs,
+                "risk_analysis": include_risk,
+                "historical_patterns": include_historical,
+            },
+            "overall_confidence": self._calculate_intelligence_confidence(intelligence),
+            "ai_model": "gemini-1.5-flash",
+            "analysis_version": "1.0",
+        }
+
+        return intelligence
+
     def _calculate_intelligence_confidence(self, intelligence: dict) -> float:
         """Calculate overall confidence score for the opportunity intelligence"""
         confidence_scores = []
@@ -1963,3 +2047,36 @@ class ComprehensiveOpportunityIntelligenceView(APIView):
             return sum(confidence_scores) / len(confidence_scores)
         else:
             return 65.0  # Default confidence for opportunity intelligence
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AIJobStatusView(APIView):
+    """Polling endpoint for async AI jobs (fallback for the WebSocket push)"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        """Return the status, progress and (once finished) result of a job"""
+        job = get_job(job_id)
+        # Other users' jobs are reported as missing rather than forbidden
+        if job is None or not job_visible_to(job, request.user):
+            return Response(
+                {
+                    "success": False,
+                    "error": "Job not found or expired",
+                    "error_code": "JOB_NOT_FOUND",
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response({"success": True, **serialize_job(job)})
+
+
+def run_comprehensive_recommendations_job(params, progress):
+    """Job handler for ComprehensiveRecommendationsView with async=true"""
+    return ComprehensiveRecommendationsView().generate(params, progress)
+
+
+def run_opportunity_intelligence_job(params, progress):
+    """Job handler for ComprehensiveOpportunityIntelligenceView with async=true"""
+    return ComprehensiveOpportunityIntelligenceView().generate(params, progress)
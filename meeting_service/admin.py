@@ -1,15 +1,21 @@
 from django.contrib import admin, messages
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 
+from .effectiveness_analytics import EffectivenessAnalytics
+from .exports import QUESTION_EXPORT_COLUMNS, StreamingExport
 from .meeting_outcome_service import MeetingOutcomeService
 from .models import (
+    AIFeatureEffectiveness,
     ConversationFlow,
     GoogleMeetCredentials,
+    LiveAnalysisTrigger,
     Meeting,
     MeetingInvitation,
     MeetingParticipant,
     MeetingQuestion,
+    MeetingReminder,
     MeetingSession,
     MeetingStatusUpdate,
     MicrosoftTeamsCredentials,
@@ -869,6 +875,47 @@ class MeetingStatusUpdateAdmin(admin.ModelAdmin):
     readonly_fields = ["timestamp"]
 
 
+@admin.register(MeetingReminder)
+class MeetingReminderAdmin(admin.ModelAdmin):
+    list_display = ["meeting", "minutes_before", "due_at", "status", "attempts"]
+    list_filter = ["status", "due_at"]
+    search_fields = ["meeting__title"]
+    readonly_fields = ["claimed_at", "sent_at", "created_at", "updated_at"]
+
+
+@admin.register(AIFeatureEffectiveness)
+class AIFeatureEffectivenessAdmin(admin.ModelAdmin):
+    list_display = [
+        "feature",
+        "meeting_type",
+        "usage_count",
+        "control_count",
+        "effectiveness",
+        "conversion_impact",
+        "computed_at",
+    ]
+    list_filter = ["feature", "meeting_type"]
+    actions = ["recompute_effectiveness"]
+
+    def recompute_effectiveness(self, request, queryset):
+        """Admin action to recompute the whole table now"""
+        try:
+            rows = EffectivenessAnalytics().recompute()
+            self.message_user(
+                request,
+                f"Recomputed AI feature effectiveness ({len(rows)} rows).",
+                level=messages.SUCCESS,
+            )
+        except Exception as e:
+            self.message_user(
+                request,
+                f"Error recomputing AI feature effectiveness: {str(e)}",
+                level=messages.ERROR,
+            )
+
+    recompute_effectiveness.short_description = "🔄 Recompute AI feature effectiveness"
+
+
 @admin.register(MeetingInvitation)
 class MeetingInvitationAdmin(admin.ModelAdmin):
     list_display = ["participant", "meeting", "status", "sent_at"]
@@ -1233,11 +1280,12 @@ class MeetingQuestionAdmin(admin.ModelAdmin):
     bulk_update_priority.short_description = "Bulk update priority"
 
     def export_question_analytics(self, request, queryset):
-        """Admin action to export question analytics"""
-        # This would generate a CSV/Excel export of question performance
-        self.message_user(
-            request,
-            f"Question analytics export functionality coming soon for {queryset.count()} question(s).",
+        """Admin action to export analytics of the selected questions as CSV"""
+        export = StreamingExport(
+            queryset.order_by("-created_at"), QUESTION_EXPORT_COLUMNS
+        )
+        return export.response(
+            "csv", f"question_analytics_{timezone.now().strftime('%Y%m%d_%H%M%S')}"
         )
 
     export_question_analytics.short_description = "Export analytics"
@@ -1332,6 +1380,9 @@ class QuestionTemplateAdmin(admin.ModelAdmin):
         "id",
         "usage_count",
         "success_rate",
+        "effectiveness_count",
+        "effectiveness_mean",
+        "effectiveness_m2",
         "created_at",
         "updated_at",
         "performance_analytics_display",
@@ -1382,6 +1433,9 @@ class QuestionTemplateAdmin(admin.ModelAdmin):
                 "fields": (
                     "usage_count",
                     "success_rate",
+                    "effectiveness_count",
+                    "effectiveness_mean",
+                    "effectiveness_m2",
                     "is_active",
                     "is_ai_generated",
                 ),
@@ -1563,6 +1617,9 @@ class QuestionTemplateAdmin(admin.ModelAdmin):
             template.name = f"{template.name} (Copy)"
             template.usage_count = 0
             template.success_rate = 0.0
+            template.effectiveness_count = 0
+            template.effectiveness_mean = 0.0
+            template.effectiveness_m2 = 0.0
             template.created_by = request.user
             template.save()
             duplicated_count += 1
@@ -1637,6 +1694,7 @@ class QuestionEffectivenessLogAdmin(admin.ModelAdmin):
         "id",
         "logged_at",
         "analyzed_at",
+        "aggregated_at",
         "response_word_count",
         "effectiveness_breakdown_display",
         "learning_insights_display",
@@ -1703,7 +1761,10 @@ class QuestionEffectivenessLogAdmin(admin.ModelAdmin):
         ),
         (
             "Timestamps",
-            {"fields": ("id", "logged_at", "analyzed_at"), "classes": ("collapse",)},
+            {
+                "fields": ("id", "logged_at", "analyzed_at", "aggregated_at"),
+                "classes": ("collapse",),
+            },
         ),
     )
 
@@ -1967,3 +2028,12 @@ class ConversationFlowAdmin(admin.ModelAdmin):
         return format_html(analysis_html)
 
     flow_analysis_display.short_description = "Flow Analysis"
+
+
+@admin.register(LiveAnalysisTrigger)
+class LiveAnalysisTriggerAdmin(admin.ModelAdmin):
+    list_display = ["name", "weight", "is_active", "meeting_types", "updated_at"]
+    list_editable = ["weight", "is_active"]
+    list_filter = ["is_active"]
+    search_fields = ["name", "terms"]
+    readonly_fields = ["created_at", "updated_at"]
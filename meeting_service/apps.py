@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MeetingServiceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "meeting_service"
+
+    def ready(self):
+        # Import signal handlers
+        import meeting_service.signals  # noqa: F401
@@ -0,0 +1,412 @@
+"""
+Free/busy engine for calendar scheduling
+
+Slot search used to ask both calendar providers for conflicts once per
+candidate slot. Instead, the events of the whole search range are fetched
+once and merged into sorted, non-overlapping busy intervals (one sort, one
+sweep). Free windows are the gaps between them, clipped to working hours,
+and candidate slots of any duration and granularity are enumerated inside
+those windows. Slots are then scored in one batch against the sorted event
+start times, so the whole search is O(n log n) in events plus slots.
+
+Searches across several attendees use ``AvailabilityGrid``: each attendee's
+busy time becomes a bitset over 5- or 15-minute slots of the search range
+(a Python int, so the bitwise operations run in C over machine words). Time
+free for everyone is the AND of the attendees' free bitsets and working
+hours, and the starts of windows of any duration come from shifted ANDs of
+that bitset, so dozens of attendees over months take a few milliseconds.
+"""
+
+import bisect
+import heapq
+import math
+from datetime import datetime, time, timedelta, tzinfo
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import CalendarEvent, MeetingSession
+
+Interval = Tuple[datetime, datetime]
+
+
+def as_aware(value: datetime) -> datetime:
+    """Naive provider times are UTC (Microsoft Graph's default)"""
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def merge_busy_intervals(
+    events: Iterable[Dict], exclude_event_ids: Iterable[str] = ()
+) -> List[Interval]:
+    """Sorted, non-overlapping busy intervals covering ``events``"""
+    excluded = set(exclude_event_ids)
+    intervals = sorted(
+        (as_aware(event["start_time"]), as_aware(event["end_time"]))
+        for event in events
+        if event["id"] not in excluded
+    )
+
+    merged: List[Interval] = []
+    for start, end in intervals:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_windows(
+    busy: Sequence[Interval], start: datetime, end: datetime
+) -> List[Interval]:
+    """Gaps between merged ``busy`` intervals within ``start``..``end``"""
+    windows = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_end <= cursor:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > cursor:
+            windows.append((cursor, busy_start))
+        cursor = busy_end
+    if cursor < end:
+        windows.append((cursor, end))
+    return windows
+
+
+def working_windows(
+    start: datetime,
+    end: datetime,
+    working_hours: Tuple[int, int] = (9, 17),
+    exclude_weekends: bool = True,
+    tz: tzinfo = None,
+) -> List[Interval]:
+    """Working hours of each day in ``start``..``end``, in ``tz``"""
+    tz = tz or timezone.get_current_timezone()
+    windows = []
+    day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+    while day <= last_day:
+        if not (exclude_weekends and day.weekday() >= 5):
+            midnight = datetime.combine(day, time.min)
+            opens = timezone.make_aware(
+                midnight + timedelta(hours=working_hours[0]), tz
+            )
+            closes = timezone.make_aware(
+                midnight + timedelta(hours=working_hours[1]), tz
+            )
+            if opens < end and closes > start:
+                windows.append((opens, closes))
+        day += timedelta(days=1)
+    return windows
+
+
+def find_free_slots(
+    busy: Sequence[Interval],
+    start: datetime,
+    end: datetime,
+    duration_minutes: int,
+    granularity_minutes: int = 60,
+    working_hours: Tuple[int, int] = (9, 17),
+    exclude_weekends: bool = True,
+    tz: tzinfo = None,
+) -> List[Interval]:
+    """
+    Free slots of ``duration_minutes`` within ``start``..``end``
+
+    Slots start on a ``granularity_minutes`` grid counted from the opening
+    of each working day and never overlap a busy interval.
+    """
+    start, end = as_aware(start), as_aware(end)
+    duration = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=granularity_minutes)
+    free = free_windows(busy, start, end)
+
+    slots = []
+    index = 0
+    for opens, closes in working_windows(
+        start, end, working_hours, exclude_weekends, tz
+    ):
+        # Both lists are sorted: skip free windows that ended before this day
+        while index < len(free) and free[index][1] <= opens:
+            index += 1
+        position = index
+        while position < len(free) and free[position][0] < closes:
+            window_start = max(free[position][0], opens, start)
+            window_end = min(free[position][1], closes)
+            steps = -((opens - window_start) // step)
+            slot_start = opens + steps * step
+            while slot_start + duration <= window_end:
+                slots.append((slot_start, slot_start + duration))
+                slot_start += step
+            position += 1
+    return slots
+
+
+def score_slots(
+    slot_starts: Sequence[datetime],
+    event_starts: Iterable[datetime],
+    tz: tzinfo = None,
+) -> List[float]:
+    """
+    Batch form of CalendarIntegrationService._calculate_slot_confidence
+
+    Events near each slot are counted by binary search over the sorted
+    event start times instead of a scan of every event per slot.
+    """
+    tz = tz or timezone.get_current_timezone()
+    starts = sorted(as_aware(event_start) for event_start in event_starts)
+    half_hour = timedelta(minutes=30)
+    hour = timedelta(minutes=60)
+
+    scores = []
+    for slot_start in slot_starts:
+        slot_start = as_aware(slot_start)
+        confidence = 100.0
+
+        # Prefer mid-morning and early afternoon slots
+        local_start = timezone.localtime(slot_start, tz)
+        slot_hour = local_start.hour
+        if 10 <= slot_hour <= 11 or 14 <= slot_hour <= 15:
+            confidence += 20
+        elif slot_hour == 9 or slot_hour == 16:
+            confidence += 10
+        elif slot_hour < 9 or slot_hour > 16:
+            confidence -= 20
+
+        # Prefer some buffer to other meetings: -30 for each starting within
+        # 30 minutes, -15 for each within an hour
+        within_half_hour = bisect.bisect_left(
+            starts, slot_start + half_hour
+        ) - bisect.bisect_right(starts, slot_start - half_hour)
+        within_hour = bisect.bisect_left(
+            starts, slot_start + hour
+        ) - bisect.bisect_right(starts, slot_start - hour)
+        confidence -= 30 * within_half_hour + 15 * (within_hour - within_half_hour)
+
+        # Prefer Tuesday-Thursday
+        weekday = local_start.weekday()
+        if 1 <= weekday <= 3:
+            confidence += 10
+        elif weekday == 0 or weekday == 4:
+            confidence -= 5
+
+        scores.append(max(0, min(100, confidence)))
+    return scores
+
+
+class AvailabilityGrid:
+    """
+    Busy and free time as bitsets over fixed-size slots of a search range
+
+    Bit ``i`` stands for the slot starting ``i * slot_minutes`` after
+    ``origin``, the first slot boundary (counted from midnight UTC) at or
+    after ``start``. Busy intervals mark every slot they overlap.
+    """
+
+    def __init__(self, start: datetime, end: datetime, slot_minutes: int = 15):
+        start, end = as_aware(start), as_aware(end)
+        self.slot = timedelta(minutes=slot_minutes)
+        self.slot_minutes = slot_minutes
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.origin = midnight + -((midnight - start) // self.slot) * self.slot
+        self.size = max(0, (end - self.origin) // self.slot)
+        self.full = (1 << self.size) - 1
+
+    def index(self, value: datetime, round_up: bool = False) -> int:
+        """Slot index of ``value``, clipped to the grid"""
+        offset = (as_aware(value) - self.origin) / self.slot
+        index = math.ceil(offset) if round_up else math.floor(offset)
+        return min(max(index, 0), self.size)
+
+    def slot_start(self, index: int) -> datetime:
+        return self.origin + index * self.slot
+
+    def _span(self, first: int, last: int) -> int:
+        """Bits ``first`` up to (not including) ``last``"""
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def busy_mask(self, intervals: Iterable[Interval]) -> int:
+        mask = 0
+        for busy_start, busy_end in intervals:
+            mask |= self._span(self.index(busy_start), self.index(busy_end, True))
+        return mask
+
+    def working_mask(
+        self,
+        working_hours: Tuple[int, int] = (9, 17),
+        exclude_weekends: bool = True,
+        tz: tzinfo = None,
+    ) -> int:
+        """Slots that lie entirely within working hours"""
+        mask = 0
+        if not self.size:
+            return mask
+        for opens, closes in working_windows(
+            self.origin, self.slot_start(self.size), working_hours, exclude_weekends, tz
+        ):
+            mask |= self._span(self.index(opens, True), self.index(closes))
+        return mask
+
+    def common_free(self, busy_masks: Iterable[int], allowed: int = None) -> int:
+        """Slots free for every attendee (and within ``allowed``)"""
+        free = self.full if allowed is None else allowed & self.full
+        for busy in busy_masks:
+            free &= ~busy
+        return free
+
+    def window_starts(
+        self, free: int, duration_minutes: int, step_minutes: int = None
+    ) -> int:
+        """
+        Slots where a window of ``duration_minutes`` fits into ``free``
+
+        Bit ``i`` survives when bits ``i`` to ``i + length - 1`` are all set;
+        runs are doubled, so this takes O(log length) shifts. With
+        ``step_minutes``, windows only start on that grid of the clock.
+        """
+        length = max(1, math.ceil(duration_minutes / self.slot_minutes))
+        starts, run = free, 1
+        while run * 2 <= length:
+            starts &= starts >> run
+            run *= 2
+        if run < length:
+            starts &= starts >> (length - run)
+        # Windows must end inside the grid
+        starts &= self.full >> (length - 1)
+
+        step = (step_minutes or self.slot_minutes) // self.slot_minutes
+        if step > 1:
+            midnight = self.origin.replace(hour=0, minute=0, second=0, microsecond=0)
+            offset = -((self.origin - midnight) // self.slot) % step
+            starts &= self._every(step, offset)
+        return starts
+
+    def _every(self, step: int, offset: int) -> int:
+        """Every ``step``-th bit from ``offset``"""
+        bits = bytearray(b"0" * self.size)
+        bits[offset::step] = b"1" * len(range(offset, self.size, step))
+        return int(bits[::-1], 2) if self.size else 0
+
+    @staticmethod
+    def indices(mask: int) -> List[int]:
+        """Set bits of ``mask``, lowest first"""
+        digits = bin(mask)[:1:-1]
+        indices = []
+        position = digits.find("1")
+        while position != -1:
+            indices.append(position)
+            position = digits.find("1", position + 1)
+        return indices
+
+
+def find_common_slots(
+    busy_by_attendee: Dict[object, Sequence[Interval]],
+    start: datetime,
+    end: datetime,
+    duration_minutes: int,
+    strategy: str = "best",
+    limit: Optional[int] = 10,
+    slot_minutes: int = 15,
+    step_minutes: int = None,
+    working_hours: Tuple[int, int] = (9, 17),
+    exclude_weekends: bool = True,
+    tz: tzinfo = None,
+) -> List[Tuple[datetime, datetime, float]]:
+    """
+    Windows of ``duration_minutes`` when every attendee is free
+
+    ``strategy`` is "earliest" (first windows in time) or "best" (highest
+    score_slots confidence over everyone's meetings, earliest on ties).
+    Returns up to ``limit`` (start, end, score) tuples; ``limit=None``
+    returns every window.
+    """
+    if strategy not in ("earliest", "best"):
+        raise ValueError(f"Unknown slot search strategy: {strategy}")
+
+    grid = AvailabilityGrid(start, end, slot_minutes)
+    free = grid.common_free(
+        (grid.busy_mask(intervals) for intervals in busy_by_attendee.values()),
+        grid.working_mask(working_hours, exclude_weekends, tz),
+    )
+    indices = grid.indices(
+        grid.window_starts(free, duration_minutes, step_minutes or slot_minutes)
+    )
+    if strategy == "earliest" and limit is not None:
+        indices = indices[:limit]
+
+    duration = timedelta(minutes=duration_minutes)
+    slot_starts = [grid.slot_start(index) for index in indices]
+    scores = score_slots(
+        slot_starts,
+        (
+            busy_start
+            for intervals in busy_by_attendee.values()
+            for busy_start, _ in intervals
+        ),
+        tz,
+    )
+    slots = [
+        (slot_start, slot_start + duration, score)
+        for slot_start, score in zip(slot_starts, scores)
+    ]
+    if strategy == "best":
+        # Stable: equal scores keep their time order
+        if limit is None:
+            slots.sort(key=lambda slot: -slot[2])
+        else:
+            slots = heapq.nsmallest(limit, slots, key=lambda slot: -slot[2])
+    return slots
+
+
+def attendee_busy_intervals(
+    user_ids: Iterable[int], start: datetime, end: datetime
+) -> Dict[int, List[Interval]]:
+    """
+    Busy time of each user within ``start``..``end``
+
+    Reads the meetings users organize or take part in and their mirrored
+    calendar events, one query each for all users.
+    """
+    user_ids = set(user_ids)
+    busy: Dict[int, set] = {user_id: set() for user_id in user_ids}
+
+    meetings = (
+        MeetingSession.objects.filter(
+            Q(organizer_id__in=user_ids) | Q(participants__user_id__in=user_ids),
+            scheduled_start_time__lt=end,
+            scheduled_end_time__gt=start,
+        )
+        .exclude(status=MeetingSession.Status.CANCELLED)
+        .values_list(
+            "organizer_id",
+            "participants__user_id",
+            "scheduled_start_time",
+            "scheduled_end_time",
+        )
+    )
+    for organizer_id, participant_id, meeting_start, meeting_end in meetings:
+        for user_id in (organizer_id, participant_id):
+            if user_id in busy:
+                busy[user_id].add((meeting_start, meeting_end))
+
+    events = (
+        CalendarEvent.objects.filter(
+            user_id__in=user_ids, start_time__lt=end, end_time__gt=start
+        )
+        .exclude(status="cancelled")
+        .values_list("user_id", "start_time", "end_time")
+    )
+    for user_id, event_start, event_end in events:
+        busy[user_id].add((event_start, event_end))
+
+    return {user_id: sorted(intervals) for user_id, intervals in busy.items()}
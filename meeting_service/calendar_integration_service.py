@@ -6,25 +6,46 @@ including automatic meeting scheduling, conflict detection, and reminder managem
 """
 
 import logging
+import math
 import uuid
 from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 
-# Microsoft Graph API imports
-import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from msal import ConfidentialClientApplication
 
 from ai_service.models import Lead
 from credentials import get_google_meet_credentials
 
+from .availability import (
+    as_aware,
+    attendee_busy_intervals,
+    find_common_slots,
+    find_free_slots,
+    merge_busy_intervals,
+    score_slots,
+)
+from .calendar_mirror import CalendarMirror
 from .models import GoogleMeetCredentials, Meeting, MicrosoftTeamsCredentials
+from .provider_clients import (
+    GRAPH_BASE_URL,
+    google_calendar_service,
+    graph_session,
+    provider_retries,
+    provider_timeout,
+    run_concurrently,
+    timed_call,
+)
+
+GRAPH_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -353,64 +374,34 @@ class CalendarIntegrationService:
     ) -> List[Dict]:
         """Get Google Calendar events for a time range"""
         try:
-            if not self.refresh_google_credentials(user):
-                return []
-
-            google_creds = GoogleMeetCredentials.objects.get(user=user)
-            credentials = Credentials(
-                token=google_creds.access_token,
-                refresh_token=google_creds.refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=self.google_client_id,
-                client_secret=self.google_client_secret,
-                scopes=self.google_scopes,
-            )
-
-            service = build("calendar", "v3", credentials=credentials)
+            service = self.get_google_calendar_service(user)
+        except Exception as e:
+            logger.error(f"Error getting Google Calendar events: {str(e)}")
+            return []
+        if service is None:
+            return []
+        return self._fetch_google_events(service, user, start_time, end_time)
 
-            events_result = (
-                service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=start_time.isoformat() + "Z",
-                    timeMax=end_time.isoformat() + "Z",
-                    singleEvents=True,
-                    orderBy="startTime",
+    def _fetch_google_events(
+        self, service, user: User, start_time: datetime, end_time: datetime
+    ) -> List[Dict]:
+        """API part of get_google_calendar_events (no database access)"""
+        try:
+            with timed_call("google"):
+                events_result = (
+                    service.events()
+                    .list(
+                        calendarId="primary",
+                        timeMin=as_aware(start_time).isoformat(),
+                        timeMax=as_aware(end_time).isoformat(),
+                        singleEvents=True,
+                        orderBy="startTime",
+                    )
+                    .execute(num_retries=provider_retries())
                 )
-                .execute()
-            )
 
             events = events_result.get("items", [])
-
-            calendar_events = []
-            for event in events:
-                start = event["start"].get("dateTime", event["start"].get("date"))
-                end = event["end"].get("dateTime", event["end"].get("date"))
-
-                # Parse datetime strings
-                if "T" in start:
-                    start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                    end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-                else:
-                    # All-day event
-                    start_dt = datetime.fromisoformat(start + "T00:00:00+00:00")
-                    end_dt = datetime.fromisoformat(end + "T23:59:59+00:00")
-
-                calendar_events.append(
-                    {
-                        "id": event["id"],
-                        "title": event.get("summary", "No Title"),
-                        "start_time": start_dt,
-                        "end_time": end_dt,
-                        "calendar_type": "google",
-                        "description": event.get("description", ""),
-                        "attendees": [
-                            att.get("email", "") for att in event.get("attendees", [])
-                        ],
-                        "location": event.get("location", ""),
-                        "status": event.get("status", "confirmed"),
-                    }
-                )
+            calendar_events = [self.parse_google_event(event) for event in events]
 
             logger.info(
                 f"Retrieved {len(calendar_events)} Google Calendar events for user {user.id}"
@@ -421,63 +412,87 @@ class CalendarIntegrationService:
             logger.error(f"Error getting Google Calendar events: {str(e)}")
             return []
 
+    def get_google_calendar_service(self, user: User):
+        """Google Calendar API client for the user, or None if not connected"""
+        if not self.refresh_google_credentials(user):
+            return None
+
+        google_creds = GoogleMeetCredentials.objects.get(user=user)
+        credentials = Credentials(
+            token=google_creds.access_token,
+            refresh_token=google_creds.refresh_token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=self.google_client_id,
+            client_secret=self.google_client_secret,
+            scopes=self.google_scopes,
+        )
+        return google_calendar_service(user.id, credentials)
+
+    def parse_google_event(self, event: Dict) -> Dict:
+        """Google Calendar API event as a calendar event dict"""
+        start = event["start"].get("dateTime", event["start"].get("date"))
+        end = event["end"].get("dateTime", event["end"].get("date"))
+
+        # Parse datetime strings
+        if "T" in start:
+            start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+            end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
+        else:
+            # All-day event
+            start_dt = datetime.fromisoformat(start + "T00:00:00+00:00")
+            end_dt = datetime.fromisoformat(end + "T23:59:59+00:00")
+
+        return {
+            "id": event["id"],
+            "title": event.get("summary", "No Title"),
+            "start_time": start_dt,
+            "end_time": end_dt,
+            "calendar_type": "google",
+            "description": event.get("description", ""),
+            "attendees": [att.get("email", "") for att in event.get("attendees", [])],
+            "location": event.get("location", ""),
+            "status": event.get("status", "confirmed"),
+        }
+
     def get_outlook_calendar_events(
         self, user: User, start_time: datetime, end_time: datetime
     ) -> List[Dict]:
         """Get Outlook Calendar events for a time range"""
         try:
-            if not self.refresh_outlook_credentials(user):
-                return []
-
-            teams_creds = MicrosoftTeamsCredentials.objects.get(user=user)
-
-            headers = {
-                "Authorization": f"Bearer {teams_creds.access_token}",
-                "Content-Type": "application/json",
-            }
+            headers = self.get_outlook_headers(user)
+        except Exception as e:
+            logger.error(f"Error getting Outlook Calendar events: {str(e)}")
+            return []
+        if headers is None:
+            return []
+        return self._fetch_outlook_events(headers, user, start_time, end_time)
 
+    def _fetch_outlook_events(
+        self, headers: Dict, user: User, start_time: datetime, end_time: datetime
+    ) -> List[Dict]:
+        """API part of get_outlook_calendar_events (no database access)"""
+        try:
             # Format times for Microsoft Graph API
-            start_str = start_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            end_str = end_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            utc = dt_timezone.utc
+            start_str = as_aware(start_time).astimezone(utc).strftime(GRAPH_TIME_FORMAT)
+            end_str = as_aware(end_time).astimezone(utc).strftime(GRAPH_TIME_FORMAT)
 
-            url = f"https://graph.microsoft.com/v1.0/me/calendar/calendarView"
+            url = f"{GRAPH_BASE_URL}/me/calendar/calendarView"
             params = {
                 "startDateTime": start_str,
                 "endDateTime": end_str,
                 "$orderby": "start/dateTime",
             }
 
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
+            with timed_call("outlook"):
+                response = graph_session().get(
+                    url, headers=headers, params=params, timeout=provider_timeout()
+                )
+                response.raise_for_status()
 
             events_data = response.json()
             events = events_data.get("value", [])
-
-            calendar_events = []
-            for event in events:
-                start_dt = datetime.fromisoformat(
-                    event["start"]["dateTime"].replace("Z", "+00:00")
-                )
-                end_dt = datetime.fromisoformat(
-                    event["end"]["dateTime"].replace("Z", "+00:00")
-                )
-
-                calendar_events.append(
-                    {
-                        "id": event["id"],
-                        "title": event.get("subject", "No Title"),
-                        "start_time": start_dt,
-                        "end_time": end_dt,
-                        "calendar_type": "outlook",
-                        "description": event.get("body", {}).get("content", ""),
-                        "attendees": [
-                            att.get("emailAddress", {}).get("address", "")
-                            for att in event.get("attendees", [])
-                        ],
-                        "location": event.get("location", {}).get("displayName", ""),
-                        "status": event.get("showAs", "busy"),
-                    }
-                )
+            calendar_events = [self.parse_outlook_event(event) for event in events]
 
             logger.info(
                 f"Retrieved {len(calendar_events)} Outlook Calendar events for user {user.id}"
@@ -488,25 +503,117 @@ class CalendarIntegrationService:
             logger.error(f"Error getting Outlook Calendar events: {str(e)}")
             return []
 
+    def get_outlook_headers(self, user: User) -> Optional[Dict]:
+        """Microsoft Graph request headers for the user, or None if not connected"""
+        if not self.refresh_outlook_credentials(user):
+            return None
+
+        teams_creds = MicrosoftTeamsCredentials.objects.get(user=user)
+        return {
+            "Authorization": f"Bearer {teams_creds.access_token}",
+            "Content-Type": "application/json",
+        }
+
+    def parse_outlook_event(self, event: Dict) -> Dict:
+        """Microsoft Graph event as a calendar event dict"""
+        start_dt = datetime.fromisoformat(
+            event["start"]["dateTime"].replace("Z", "+00:00")
+        )
+        end_dt = datetime.fromisoformat(event["end"]["dateTime"].replace("Z", "+00:00"))
+
+        return {
+            "id": event["id"],
+            "title": event.get("subject", "No Title"),
+            "start_time": start_dt,
+            "end_time": end_dt,
+            "calendar_type": "outlook",
+            "description": event.get("body", {}).get("content", ""),
+            "attendees": [
+                att.get("emailAddress", {}).get("address", "")
+                for att in event.get("attendees", [])
+            ],
+            "location": event.get("location", {}).get("displayName", ""),
+            "status": event.get("showAs", "busy"),
+        }
+
     def get_all_calendar_events(
         self, user: User, start_time: datetime, end_time: datetime
     ) -> List[Dict]:
-        """Get events from all connected calendars"""
-        all_events = []
-
-        # Get Google Calendar events
-        google_events = self.get_google_calendar_events(user, start_time, end_time)
-        all_events.extend(google_events)
+        """Get events from all connected calendars, fetched concurrently"""
+        # Credentials are refreshed here so the provider fetches, which run
+        # in parallel on worker threads, make no database queries
+        fetches = []
+        try:
+            google_service = self.get_google_calendar_service(user)
+        except Exception as e:
+            logger.error(f"Error getting Google Calendar events: {str(e)}")
+            google_service = None
+        if google_service is not None:
+            fetches.append(
+                partial(
+                    self._fetch_google_events,
+                    google_service,
+                    user,
+                    start_time,
+                    end_time,
+                )
+            )
+        try:
+            outlook_headers = self.get_outlook_headers(user)
+        except Exception as e:
+            logger.error(f"Error getting Outlook Calendar events: {str(e)}")
+            outlook_headers = None
+        if outlook_headers is not None:
+            fetches.append(
+                partial(
+                    self._fetch_outlook_events,
+                    outlook_headers,
+                    user,
+                    start_time,
+                    end_time,
+                )
+            )
 
-        # Get Outlook Calendar events
-        outlook_events = self.get_outlook_calendar_events(user, start_time, end_time)
-        all_events.extend(outlook_events)
+        all_events = []
+        for events in run_concurrently(fetches):
+            all_events.extend(events)
 
         # Sort by start time
         all_events.sort(key=lambda x: x["start_time"])
 
         return all_events
 
+    def get_scheduling_events(
+        self, user: User, start_time: datetime, end_time: datetime
+    ) -> List[Dict]:
+        """
+        Events for conflict detection and slot search, from the local mirror
+
+        Falls back to the providers (and queues a mirror sync) when the
+        mirror does not hold the range yet.
+        """
+        mirror = CalendarMirror(self)
+        if mirror.covers(user, start_time, end_time):
+            return mirror.get_events(user, start_time, end_time)
+
+        from .tasks import sync_calendar_mirror
+
+        # One queued sync per user while the mirror catches up
+        if cache.add(f"calendar_mirror_sync:{user.id}", True, timeout=60):
+            try:
+                sync_calendar_mirror.delay(user.id)
+            except Exception as e:
+                logger.warning(f"Could not queue calendar mirror sync: {str(e)}")
+        return self.get_all_calendar_events(user, start_time, end_time)
+
+    def resync_calendar_mirror(self, user: User, full: bool = False) -> Dict:
+        """Bring the user's calendar mirror up to date now"""
+        return CalendarMirror(self).sync_user(user, full=full)
+
+    def get_calendar_freshness(self, user: User) -> Dict:
+        """When each connected calendar was last mirrored"""
+        return CalendarMirror(self).freshness(user)
+
     # Conflict Detection
 
     def detect_calendar_conflicts(
@@ -526,9 +633,7 @@ class CalendarIntegrationService:
             search_start = proposed_start - buffer_time
             search_end = proposed_end + buffer_time
 
-            existing_events = self.get_all_calendar_events(
-                user, search_start, search_end
-            )
+            existing_events = self.get_scheduling_events(user, search_start, search_end)
 
             for event in existing_events:
                 # Skip excluded events
@@ -565,50 +670,63 @@ class CalendarIntegrationService:
         end_date: datetime,
         working_hours: Tuple[int, int] = (9, 17),
         exclude_weekends: bool = True,
+        granularity_minutes: int = 60,
+        attendees: Optional[List[User]] = None,
     ) -> List[Dict]:
-        """Find available time slots for scheduling meetings"""
-        try:
-            available_slots = []
-
-            # Get all existing events in the date range
-            existing_events = self.get_all_calendar_events(user, start_date, end_date)
-
-            # Generate potential time slots
-            current_date = start_date.date()
-            end_date_only = end_date.date()
-
-            while current_date <= end_date_only:
-                # Skip weekends if requested
-                if exclude_weekends and current_date.weekday() >= 5:
-                    current_date += timedelta(days=1)
-                    continue
-
-                # Check each hour within working hours
-                for hour in range(working_hours[0], working_hours[1]):
-                    slot_start = datetime.combine(
-                        current_date, datetime.min.time().replace(hour=hour)
-                    )
-                    slot_start = timezone.make_aware(slot_start)
-                    slot_end = slot_start + timedelta(minutes=duration_minutes)
-
-                    # Check if this slot conflicts with existing events
-                    conflicts = self.detect_calendar_conflicts(
-                        user, slot_start, slot_end
-                    )
+        """
+        Find available time slots for scheduling meetings
 
-                    if not conflicts:
-                        available_slots.append(
-                            {
-                                "start_time": slot_start,
-                                "end_time": slot_end,
-                                "duration_minutes": duration_minutes,
-                                "confidence_score": self._calculate_slot_confidence(
-                                    slot_start, existing_events, user
-                                ),
-                            }
-                        )
+        With ``attendees``, slots must also be free for each of them, going
+        by their meetings and mirrored calendars.
+        """
+        try:
+            # Read the whole range once
+            existing_events = self.get_scheduling_events(user, start_date, end_date)
+            busy = merge_busy_intervals(existing_events)
+
+            others = {attendee.id for attendee in attendees or ()} - {user.id}
+            if others:
+                busy_by_attendee = attendee_busy_intervals(others, start_date, end_date)
+                busy_by_attendee[user.id] = busy
+                scored_slots = find_common_slots(
+                    busy_by_attendee,
+                    start_date,
+                    end_date,
+                    duration_minutes,
+                    limit=None,
+                    slot_minutes=math.gcd(15, granularity_minutes),
+                    step_minutes=granularity_minutes,
+                    working_hours=working_hours,
+                    exclude_weekends=exclude_weekends,
+                )
+            else:
+                slots = find_free_slots(
+                    busy,
+                    start_date,
+                    end_date,
+                    duration_minutes,
+                    granularity_minutes,
+                    working_hours,
+                    exclude_weekends,
+                )
+                scores = score_slots(
+                    [slot_start for slot_start, _ in slots],
+                    [event["start_time"] for event in existing_events],
+                )
+                scored_slots = [
+                    (slot_start, slot_end, score)
+                    for (slot_start, slot_end), score in zip(slots, scores)
+                ]
 
-                current_date += timedelta(days=1)
+            available_slots = [
+                {
+                    "start_time": slot_start,
+                    "end_time": slot_end,
+                    "duration_minutes": duration_minutes,
+                    "confidence_score": score,
+                }
+                for slot_start, slot_end, score in scored_slots
+            ]
 
             # Sort by confidence score (best slots first)
             available_slots.sort(key=lambda x: x["confidence_score"], reverse=True)
@@ -626,33 +744,9 @@ class CalendarIntegrationService:
         self, slot_start: datetime, existing_events: List[Dict], user: User
     ) -> float:
         """Calculate confidence score for a time slot based on user patterns"""
-        confidence = 100.0
-
-        # Prefer mid-morning and early afternoon slots
-        hour = slot_start.hour
-        if 10 <= hour <= 11 or 14 <= hour <= 15:
-            confidence += 20
-        elif hour == 9 or hour == 16:
-            confidence += 10
-        elif hour < 9 or hour > 16:
-            confidence -= 20
-
-        # Check proximity to other meetings (prefer some buffer time)
-        for event in existing_events:
-            time_diff = abs((event["start_time"] - slot_start).total_seconds() / 60)
-            if time_diff < 30:  # Less than 30 minutes
-                confidence -= 30
-            elif time_diff < 60:  # Less than 1 hour
-                confidence -= 15
-
-        # Prefer Tuesday-Thursday
-        weekday = slot_start.weekday()
-        if 1 <= weekday <= 3:  # Tuesday to Thursday
-            confidence += 10
-        elif weekday == 0 or weekday == 4:  # Monday or Friday
-            confidence -= 5
-
-        return max(0, min(100, confidence))
+        return score_slots(
+            [slot_start], [event["start_time"] for event in existing_events]
+        )[0]
 
     # Meeting Scheduling
 
@@ -666,6 +760,9 @@ class CalendarIntegrationService:
             duration_minutes = meeting_data.get("duration_minutes", 60)
             preferred_start = meeting_data.get("preferred_start_time")
             attendee_emails = meeting_data.get("attendee_emails", [])
+            attendees = self._internal_attendees(
+                user, attendee_emails, meeting_data.get("include_manager", False)
+            )
 
             if preferred_start:
                 preferred_start = (
@@ -679,8 +776,15 @@ class CalendarIntegrationService:
                 conflicts = self.detect_calendar_conflicts(
                     user, preferred_start, preferred_end
                 )
+                attendees_busy = any(
+                    attendee_busy_intervals(
+                        [attendee.id for attendee in attendees],
+                        preferred_start,
+                        preferred_end,
+                    ).values()
+                )
 
-                if not conflicts:
+                if not conflicts and not attendees_busy:
                     # No conflicts, schedule at preferred time
                     return self._create_calendar_meeting(
                         user,
@@ -699,7 +803,11 @@ class CalendarIntegrationService:
                     )  # Search within a week
 
                     available_slots = self.find_available_time_slots(
-                        user, duration_minutes, search_start, search_end
+                        user,
+                        duration_minutes,
+                        search_start,
+                        search_end,
+                        attendees=attendees,
                     )
 
                     if available_slots:
@@ -729,7 +837,11 @@ class CalendarIntegrationService:
                 search_end = search_start + timedelta(days=14)  # Search within 2 weeks
 
                 available_slots = self.find_available_time_slots(
-                    user, duration_minutes, search_start, search_end
+                    user,
+                    duration_minutes,
+                    search_start,
+                    search_end,
+                    attendees=attendees,
                 )
 
                 if available_slots:
@@ -753,6 +865,19 @@ class CalendarIntegrationService:
             logger.error(f"Error scheduling meeting with conflict resolution: {str(e)}")
             return False, {"error": str(e)}
 
+    def _internal_attendees(
+        self, user: User, attendee_emails: List[str], include_manager: bool
+    ) -> List[User]:
+        """Attendees with an account here, whose availability is known"""
+        attendees = list(
+            User.objects.filter(email__in=attendee_emails).exclude(id=user.id)
+            if attendee_emails
+            else []
+        )
+        if include_manager and user.manager_id:
+            attendees.append(user.manager)
+        return attendees
+
     def _create_calendar_meeting(
         self,
         user: User,
@@ -782,6 +907,10 @@ class CalendarIntegrationService:
                         if google_event.get("hangoutLink"):
                             meeting_urls.append(google_event["hangoutLink"])
                         google_success = True
+                        # Later conflict checks must see it before the next sync
+                        CalendarMirror(self).record_event(
+                            user, self.parse_google_event(google_event)
+                        )
             except Exception as e:
                 logger.warning(f"Failed to create Google Calendar event: {str(e)}")
                 results["google_error"] = str(e)
@@ -800,6 +929,9 @@ class CalendarIntegrationService:
                                 outlook_event["onlineMeeting"]["joinUrl"]
                             )
                         outlook_success = True
+                        CalendarMirror(self).record_event(
+                            user, self.parse_outlook_event(outlook_event)
+                        )
             except Exception as e:
                 logger.warning(f"Failed to create Outlook Calendar event: {str(e)}")
                 results["outlook_error"] = str(e)
@@ -864,7 +996,7 @@ class CalendarIntegrationService:
                 scopes=self.google_scopes,
             )
 
-            service = build("calendar", "v3", credentials=credentials)
+            service = google_calendar_service(user.id, credentials)
 
             event = {
                 "summary": title,
@@ -894,16 +1026,18 @@ class CalendarIntegrationService:
                 },
             }
 
-            created_event = (
-                service.events()
-                .insert(
-                    calendarId="primary",
-                    body=event,
-                    conferenceDataVersion=1,
-                    sendUpdates="all",
+            # Not retried: a repeated insert would create a second event
+            with timed_call("google"):
+                created_event = (
+                    service.events()
+                    .insert(
+                        calendarId="primary",
+                        body=event,
+                        conferenceDataVersion=1,
+                        sendUpdates="all",
+                    )
+                    .execute()
                 )
-                .execute()
-            )
 
             logger.info(f"Created Google Calendar event: {created_event['id']}")
             return created_event
@@ -953,12 +1087,14 @@ class CalendarIntegrationService:
                 "reminderMinutesBeforeStart": 15,
             }
 
-            response = requests.post(
-                "https://graph.microsoft.com/v1.0/me/events",
-                headers=headers,
-                json=event_data,
-            )
-            response.raise_for_status()
+            with timed_call("outlook"):
+                response = graph_session().post(
+                    f"{GRAPH_BASE_URL}/me/events",
+                    headers=headers,
+                    json=event_data,
+                    timeout=provider_timeout(),
+                )
+                response.raise_for_status()
 
             created_event = response.json()
             logger.info(f"Created Outlook Calendar event: {created_event['id']}")
@@ -973,63 +1109,22 @@ class CalendarIntegrationService:
     def schedule_meeting_reminders(
         self, meeting: Meeting, reminder_times: List[int] = None
     ) -> bool:
-        """Schedule meeting reminders with preparation materials"""
-        try:
-            reminder_times = reminder_times or [
-                24 * 60,
-                60,
-                15,
-            ]  # 1 day, 1 hour, 15 minutes
-
-            from .pre_meeting_intelligence import PreMeetingIntelligenceService
-
-            intelligence_service = PreMeetingIntelligenceService()
-
-            # Generate preparation materials
-            preparation_materials = intelligence_service.generate_meeting_preparation(
-                meeting
-            )
-
-            # Schedule reminders (this would typically use a task queue like Celery)
-            for minutes_before in reminder_times:
-                reminder_time = meeting.scheduled_at - timedelta(minutes=minutes_before)
+        """
+        Schedule meeting reminders, ``reminder_times`` minutes before start
 
-                if reminder_time > timezone.now():
-                    # In a real implementation, this would schedule a Celery task
-                    self._schedule_reminder_task(
-                        meeting, reminder_time, preparation_materials
-                    )
+        The reminders are sent by the dispatch_meeting_reminders task when
+        due, with preparation materials generated at that time.
+        """
+        try:
+            from .reminder_dispatcher import ReminderDispatcher
 
-            logger.info(
-                f"Scheduled {len(reminder_times)} reminders for meeting {meeting.id}"
-            )
+            ReminderDispatcher().schedule(meeting, reminder_times)
             return True
 
         except Exception as e:
             logger.error(f"Error scheduling meeting reminders: {str(e)}")
             return False
 
-    def _schedule_reminder_task(
-        self, meeting: Meeting, reminder_time: datetime, preparation_materials: Dict
-    ):
-        """Schedule a reminder task (placeholder for Celery integration)"""
-        # This would typically use Celery to schedule the task
-        # For now, we'll just log the scheduled reminder
-        logger.info(f"Reminder scheduled for meeting {meeting.id} at {reminder_time}")
-
-        # Store reminder info in meeting AI insights
-        if "scheduled_reminders" not in meeting.ai_insights:
-            meeting.ai_insights["scheduled_reminders"] = []
-
-        meeting.ai_insights["scheduled_reminders"].append(
-            {
-                "reminder_time": reminder_time.isoformat(),
-                "preparation_materials": preparation_materials,
-                "status": "scheduled",
-            }
-        )
-        meeting.save()
-
     def send_meeting_reminder(self, meeting: Meeting, minutes_before: int) -> bool:
         """Send meeting reminder with preparation materials"""
         try:
@@ -1058,16 +1153,16 @@ class CalendarIntegrationService:
 
             # Render email content
             subject = f"Meeting Reminder: {meeting.title} in {minutes_before} minutes"
-            if minutes_before >= 60:
-                hours = minutes_before // 60
-                subject = f"Meeting Reminder: {meeting.title} in {hours} hour{'s' if hours > 1 else ''}"
-            elif minutes_before >= 1440:
+            if minutes_before >= 1440:
                 days = minutes_before // 1440
                 subject = (
                     f"Meeting Reminder: {meeting.title} tomorrow"
                     if days == 1
                     else f"Meeting Reminder: {meeting.title} in {days} days"
                 )
+            elif minutes_before >= 60:
+                hours = minutes_before // 60
+                subject = f"Meeting Reminder: {meeting.title} in {hours} hour{'s' if hours > 1 else ''}"
 
             # For now, we'll use a simple text email
             # In a real implementation, you'd use HTML templates
@@ -1161,6 +1256,7 @@ class CalendarIntegrationService:
             except MicrosoftTeamsCredentials.DoesNotExist:
                 status["outlook_calendar"]["error"] = "Not connected"
 
+            status["mirror"] = self.get_calendar_freshness(user)
             return status
 
         except Exception as e:
@@ -0,0 +1,316 @@
+"""
+Local mirror of users' Google and Outlook calendars
+
+Conflict detection and slot search used to list events from the providers
+on every request, so scheduling latency was the vendors' API latency. The
+mirror keeps each user's events in CalendarEvent rows instead, kept current
+by incremental sync in the periodic sync_calendar_mirrors task:
+
+- Google: events.list with the nextSyncToken of the previous sync; a 410
+  (token expired) falls back to a full sync
+- Outlook: Microsoft Graph calendarView/delta, following the deltaLink of
+  the previous sync. Graph fixes the delta window when it starts, so the
+  mirror syncs in full again once half of the window has passed.
+
+Range queries use the (user, start_time, end_time) index. CalendarSyncState
+records, per provider, the range the mirror holds and when it was last
+synced; this is reported as freshness metadata, and reads fall back to the
+providers when the mirror is stale or does not hold the range.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from googleapiclient.errors import HttpError
+
+from .availability import as_aware
+from .models import (
+    CalendarEvent,
+    CalendarSyncState,
+    GoogleMeetCredentials,
+    MicrosoftTeamsCredentials,
+)
+from .provider_clients import (
+    GRAPH_BASE_URL,
+    graph_session,
+    provider_retries,
+    provider_timeout,
+    timed_call,
+)
+
+logger = logging.getLogger(__name__)
+
+GRAPH_CALENDAR_DELTA_URL = f"{GRAPH_BASE_URL}/me/calendarView/delta"
+
+MIRRORED_FIELDS = [
+    "title",
+    "start_time",
+    "end_time",
+    "description",
+    "attendees",
+    "location",
+    "status",
+    "synced_at",
+]
+
+
+class SyncTokenExpired(Exception):
+    """The provider no longer accepts the stored sync token"""
+
+
+class CalendarMirror:
+    """Sync and query the local calendar mirror of a user"""
+
+    def __init__(self, calendar_service=None):
+        if calendar_service is None:
+            from .calendar_integration_service import CalendarIntegrationService
+
+            calendar_service = CalendarIntegrationService()
+        self.calendar_service = calendar_service
+        self.past_days = getattr(settings, "CALENDAR_MIRROR_PAST_DAYS", 7)
+        self.future_days = getattr(settings, "CALENDAR_MIRROR_FUTURE_DAYS", 120)
+        self.stale_seconds = getattr(settings, "CALENDAR_MIRROR_STALE_SECONDS", 900)
+
+    def connected_providers(self, user) -> List[str]:
+        providers = []
+        if GoogleMeetCredentials.objects.filter(user=user).exists():
+            providers.append(CalendarEvent.Provider.GOOGLE)
+        if MicrosoftTeamsCredentials.objects.filter(user=user).exists():
+            providers.append(CalendarEvent.Provider.OUTLOOK)
+        return providers
+
+    # Reads
+
+    def covers(self, user, start_time, end_time) -> bool:
+        """Every connected calendar is fresh and mirrored for the range"""
+        start_time, end_time = as_aware(start_time), as_aware(end_time)
+        freshness = self.freshness(user)
+        states = {
+            state.provider: state
+            for state in CalendarSyncState.objects.filter(user=user)
+        }
+        return all(
+            not info["stale"] and states[provider].covers(start_time, end_time)
+            for provider, info in freshness.items()
+        )
+
+    def get_events(self, user, start_time, end_time) -> List[Dict]:
+        """Mirrored events overlapping the range, by start time"""
+        events = CalendarEvent.objects.filter(
+            user=user,
+            provider__in=self.connected_providers(user),
+            start_time__lt=as_aware(end_time),
+            end_time__gt=as_aware(start_time),
+        )
+        return [event.to_event_dict() for event in events]
+
+    def freshness(self, user) -> Dict[str, Dict]:
+        """Sync metadata of each connected calendar"""
+        now = timezone.now()
+        states = {
+            state.provider: state
+            for state in CalendarSyncState.objects.filter(user=user)
+        }
+        freshness = {}
+        for provider in self.connected_providers(user):
+            state = states.get(provider)
+            synced_at = state.last_synced_at if state else None
+            age = (now - synced_at).total_seconds() if synced_at else None
+            freshness[provider] = {
+                "last_synced_at": synced_at.isoformat() if synced_at else None,
+                "age_seconds": round(age) if age is not None else None,
+                "stale": age is None or age > self.stale_seconds,
+                "window_start": (
+                    state.window_start.isoformat()
+                    if state and state.window_start
+                    else None
+                ),
+                "window_end": (
+                    state.window_end.isoformat() if state and state.window_end else None
+                ),
+                "last_error": state.last_error if state else "",
+            }
+        return freshness
+
+    # Sync
+
+    def sync_user(self, user, full: bool = False) -> Dict[str, Dict]:
+        """Sync every connected calendar of the user; errors are per provider"""
+        results = {}
+        for provider in self.connected_providers(user):
+            state, _ = CalendarSyncState.objects.get_or_create(
+                user=user, provider=provider
+            )
+            try:
+                results[provider] = self._sync(user, state, full)
+                state.last_error = ""
+            except Exception as e:
+                logger.error(
+                    f"Error syncing {provider} calendar mirror for user {user.id}: {e}"
+                )
+                state.last_error = str(e)
+                results[provider] = {"error": str(e)}
+            state.save()
+        return results
+
+    def record_event(self, user, event: Dict):
+        """Write an event created through the service into the mirror"""
+        self._apply(user, event["calendar_type"], [event], [])
+
+    def _sync(self, user, state: CalendarSyncState, full: bool) -> Dict:
+        sync = (
+            self._sync_google
+            if state.provider == CalendarEvent.Provider.GOOGLE
+            else self._sync_outlook
+        )
+        if not full and state.sync_token and not self._window_running_out(state):
+            try:
+                return sync(user, state, full=False)
+            except SyncTokenExpired:
+                logger.info(
+                    f"{state.provider} sync token expired for user {user.id}, "
+                    "syncing in full"
+                )
+        return sync(user, state, full=True)
+
+    def _window_running_out(self, state: CalendarSyncState) -> bool:
+        if state.window_end is None:
+            return False
+        remaining = state.window_end - timezone.now()
+        return remaining < timedelta(days=self.future_days / 2)
+
+    def _sync_google(self, user, state: CalendarSyncState, full: bool) -> Dict:
+        service = self.calendar_service.get_google_calendar_service(user)
+        if service is None:
+            raise ValueError("Google Calendar credentials could not be refreshed")
+
+        now = timezone.now()
+        window_start = now - timedelta(days=self.past_days)
+        params = {"calendarId": "primary", "singleEvents": True}
+        if full:
+            # Google keeps this filter for later syncs with the token
+            params["timeMin"] = window_start.isoformat()
+        else:
+            params["syncToken"] = state.sync_token
+
+        changed, removed = [], []
+        while True:
+            try:
+                with timed_call("google"):
+                    result = (
+                        service.events()
+                        .list(**params)
+                        .execute(num_retries=provider_retries())
+                    )
+            except HttpError as e:
+                if e.resp.status == 410:
+                    raise SyncTokenExpired() from e
+                raise
+            for item in result.get("items", []):
+                if item.get("status") == "cancelled":
+                    removed.append(item["id"])
+                else:
+                    changed.append(self.calendar_service.parse_google_event(item))
+            if not result.get("nextPageToken"):
+                break
+            params["pageToken"] = result["nextPageToken"]
+
+        self._apply(user, state.provider, changed, removed, replace=full)
+        state.sync_token = result.get("nextSyncToken", "")
+        if full:
+            state.window_start = window_start
+            state.window_end = None
+            state.last_full_sync_at = now
+        state.last_synced_at = now
+        return {"full": full, "updated": len(changed), "removed": len(removed)}
+
+    def _sync_outlook(self, user, state: CalendarSyncState, full: bool) -> Dict:
+        headers = self.calendar_service.get_outlook_headers(user)
+        if headers is None:
+            raise ValueError("Outlook Calendar credentials could not be refreshed")
+
+        now = timezone.now()
+        window_start = now - timedelta(days=self.past_days)
+        window_end = now + timedelta(days=self.future_days)
+        if full:
+            url = GRAPH_CALENDAR_DELTA_URL
+            params = {
+                "startDateTime": window_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "endDateTime": window_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        else:
+            url, params = state.sync_token, None
+
+        changed, removed = [], []
+        delta_link = ""
+        while url:
+            with timed_call("outlook"):
+                response = graph_session().get(
+                    url, headers=headers, params=params, timeout=provider_timeout()
+                )
+            if response.status_code == 410:
+                raise SyncTokenExpired()
+            response.raise_for_status()
+            data = response.json()
+            for item in data.get("value", []):
+                if "@removed" in item:
+                    removed.append(item["id"])
+                else:
+                    changed.append(self.calendar_service.parse_outlook_event(item))
+            # Later pages carry their own query string
+            url, params = data.get("@odata.nextLink"), None
+            delta_link = data.get("@odata.deltaLink", delta_link)
+
+        self._apply(user, state.provider, changed, removed, replace=full)
+        state.sync_token = delta_link
+        if full:
+            state.window_start = window_start
+            state.window_end = window_end
+            state.last_full_sync_at = now
+        state.last_synced_at = now
+        return {"full": full, "updated": len(changed), "removed": len(removed)}
+
+    def _apply(
+        self,
+        user,
+        provider: str,
+        changed: Iterable[Dict],
+        removed: Iterable[str],
+        replace: bool = False,
+    ):
+        """Upsert changed events and drop removed ones (all others on replace)"""
+        # Keyed by id: a later change of the same event wins
+        rows = {
+            event["id"]: CalendarEvent(
+                user=user,
+                provider=provider,
+                external_id=event["id"],
+                title=(event.get("title") or "")[:500],
+                start_time=as_aware(event["start_time"]),
+                end_time=as_aware(event["end_time"]),
+                description=event.get("description") or "",
+                attendees=event.get("attendees") or [],
+                location=(event.get("location") or "")[:500],
+                status=event.get("status") or "",
+            )
+            for event in changed
+        }
+        removed = [event_id for event_id in removed if event_id not in rows]
+
+        with transaction.atomic():
+            mirrored = CalendarEvent.objects.filter(user=user, provider=provider)
+            if replace:
+                mirrored.delete()
+            elif removed:
+                mirrored.filter(external_id__in=removed).delete()
+            CalendarEvent.objects.bulk_create(
+                rows.values(),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["user", "provider", "external_id"],
+                update_fields=MIRRORED_FIELDS,
+            )
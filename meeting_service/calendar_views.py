@@ -185,6 +185,8 @@ def detect_meeting_conflicts(request):
             )
 
         calendar_service = CalendarIntegrationService()
+        if request.data.get("resync"):
+            calendar_service.resync_calendar_mirror(request.user)
         conflicts = calendar_service.detect_calendar_conflicts(
             request.user, start_time, end_time, exclude_event_ids
         )
@@ -197,6 +199,9 @@ def detect_meeting_conflicts(request):
                     "start_time": start_time.isoformat(),
                     "end_time": end_time.isoformat(),
                 },
+                "calendar_freshness": calendar_service.get_calendar_freshness(
+                    request.user
+                ),
             }
         )
 
@@ -233,6 +238,8 @@ def find_available_time_slots(request):
             )
 
         calendar_service = CalendarIntegrationService()
+        if request.data.get("resync"):
+            calendar_service.resync_calendar_mirror(request.user)
         available_slots = calendar_service.find_available_time_slots(
             request.user,
             duration_minutes,
@@ -258,6 +265,9 @@ def find_available_time_slots(request):
                     "exclude_weekends": exclude_weekends,
                 },
                 "total_slots": len(available_slots),
+                "calendar_freshness": calendar_service.get_calendar_freshness(
+                    request.user
+                ),
             }
         )
 
@@ -374,6 +384,30 @@ def get_calendar_sync_status(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def resync_calendar_mirror(request):
+    """Sync the user's local calendar mirror now"""
+    try:
+        calendar_service = CalendarIntegrationService()
+        results = calendar_service.resync_calendar_mirror(
+            request.user, full=bool(request.data.get("full", False))
+        )
+
+        return Response(
+            {
+                "results": results,
+                "calendar_freshness": calendar_service.get_calendar_freshness(
+                    request.user
+                ),
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error resyncing calendar mirror: {str(e)}")
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def calendar_integration_dashboard(request):
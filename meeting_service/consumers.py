@@ -0,0 +1,200 @@
+"""
+WebSocket consumers for meeting service
+"""
+
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .live_meeting_support import (
+    LiveMeetingSupportService,
+    live_meeting_group_name,
+    to_jsonable,
+)
+from .models import Meeting
+
+logger = logging.getLogger(__name__)
+
+
+class LiveMeetingConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for live meeting support
+
+    Replaces polling the live meeting HTTP endpoints. Clients send turns as
+    they are spoken and receive, as they are produced:
+
+    - ``conversation_turn``: every turn added to the meeting, by any client,
+      with the local sentiment and engagement reading after it
+    - ``live_analysis``: sentiment, key moments, question suggestions,
+      meeting progress and intervention alerts from the analysis workers
+
+    Every connection for a meeting joins the same ``live_meeting_<id>``
+    group, so several observers (the presenter, a coach, other tabs) share
+    one session and one stream of analysis.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.meeting_id = None
+        self.session_id = None
+        self.group_name = None
+        self.user = None
+        self.live_service = None
+
+    async def connect(self):
+        """Handle WebSocket connection"""
+        try:
+            self.meeting_id = self.scope["url_route"]["kwargs"]["meeting_id"]
+            self.user = self.scope["user"]
+
+            if not self.user.is_authenticated:
+                await self.close(code=4001)
+                return
+
+            if not await self._can_follow_meeting():
+                await self.close(code=4004)
+                return
+
+            self.session_id = f"live_meeting_{self.meeting_id}"
+            self.group_name = live_meeting_group_name(self.meeting_id)
+            self.live_service = await sync_to_async(LiveMeetingSupportService)()
+
+            await self.channel_layer.group_add(self.group_name, self.channel_name)
+            await self.accept()
+
+            # Bring the new observer up to date without any AI calls
+            snapshot = await sync_to_async(self.live_service.get_session_snapshot)(
+                self.session_id
+            )
+            await self._send_json(
+                {
+                    "type": "connection_established",
+                    "meeting_id": self.meeting_id,
+                    "session_id": self.session_id,
+                    "session_active": snapshot is not None,
+                    "snapshot": snapshot,
+                }
+            )
+
+            logger.info(
+                f"Live meeting WebSocket connected for meeting {self.meeting_id}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error connecting live meeting WebSocket: {str(e)}")
+            await self.close(code=4000)
+
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle incoming WebSocket messages"""
+        try:
+            data = json.loads(text_data or "")
+        except json.JSONDecodeError:
+            await self._send_error("Invalid JSON format")
+            return
+
+        try:
+            message_type = data.get("type")
+
+            if message_type == "conversation_turn":
+                await self._handle_conversation_turn(data)
+            elif message_type == "get_snapshot":
+                snapshot = await sync_to_async(
+                    self.live_service.get_session_snapshot
+                )(self.session_id)
+                await self._send_json({"type": "snapshot", "snapshot": snapshot})
+            elif message_type == "ping":
+                await self._send_json({"type": "pong"})
+            else:
+                await self._send_error(f"Unknown message type: {message_type}")
+
+        except Exception as e:
+            logger.error(f"Error handling live meeting message: {str(e)}")
+            await self._send_error(str(e))
+
+    async def _handle_conversation_turn(self, data):
+        """Store a spoken turn and share it with the meeting's group"""
+        speaker = data.get("speaker")
+        content = data.get("content")
+
+        if not speaker or not content:
+            await self._send_error("speaker and content are required")
+            return
+        if speaker not in ["user", "prospect"]:
+            await self._send_error('speaker must be either "user" or "prospect"')
+            return
+
+        # Analysis is handed to the live analysis workers, so this returns
+        # as soon as the turn is stored
+        result = await sync_to_async(self.live_service.process_conversation_turn)(
+            self.session_id, speaker, content
+        )
+        if not result["success"]:
+            await self._send_error(result.get("error", "Could not process turn"))
+            return
+
+        await self.channel_layer.group_send(
+            self.group_name,
+            {
+                "type": "conversation_turn",
+                "turn": to_jsonable(result["conversation_turn"]),
+                "live_sentiment": result.get("live_sentiment"),
+                "analysis_queued": result.get("analysis_queued", False),
+            },
+        )
+
+        # Inline analysis (LIVE_ANALYSIS_ASYNC=False) is shared the same way
+        if result.get("analysis_performed"):
+            analysis = {
+                key: result[key]
+                for key in (
+                    "sentiment_analysis",
+                    "key_moments",
+                    "question_suggestions",
+                    "meeting_progress",
+                    "intervention_alerts",
+                )
+                if key in result
+            }
+            await self.channel_layer.group_send(
+                self.group_name,
+                {"type": "live_analysis", "analysis": to_jsonable(analysis)},
+            )
+
+    @database_sync_to_async
+    def _can_follow_meeting(self):
+        meetings = Meeting.objects.filter(id=self.meeting_id)
+        if not self.user.is_staff:
+            meetings = meetings.filter(lead__user=self.user)
+        return meetings.exists()
+
+    # Group message handlers
+
+    async def conversation_turn(self, event):
+        """Forward a turn added by any client of the meeting"""
+        await self._send_json(
+            {
+                "type": "conversation_turn",
+                "turn": event["turn"],
+                "live_sentiment": event.get("live_sentiment"),
+                "analysis_queued": event.get("analysis_queued", False),
+            }
+        )
+
+    async def live_analysis(self, event):
+        """Forward analysis pushed by the live analysis workers"""
+        await self._send_json({"type": "live_analysis", "analysis": event["analysis"]})
+
+    async def _send_json(self, payload):
+        await self.send(text_data=json.dumps(payload, cls=DjangoJSONEncoder))
+
+    async def _send_error(self, message):
+        await self._send_json({"type": "error", "message": message})
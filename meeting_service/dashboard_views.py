@@ -1,13 +1,27 @@
 from datetime import timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Avg
+from django.db.models import Avg, Q, Sum
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.utils import timezone
-
-from .models import Meeting, MeetingQuestion
+from django.views.decorators.http import require_POST
+
+from .effectiveness_analytics import EffectivenessAnalytics
+from .meeting_stats import (
+    STATS_FIELDS,
+    is_prepared,
+    percentage,
+    stats_sums,
+    summarize,
+)
+from .models import (
+    AIFeatureEffectiveness,
+    Meeting,
+    MeetingDailyStats,
+    MeetingQuestion,
+)
 
 
 @staff_member_required
@@ -26,85 +40,47 @@ def meeting_dashboard_view(request):
 def dashboard_metrics_api(request):
     """API endpoint for key dashboard metrics"""
     try:
-        # Calculate date ranges
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
-        sixty_days_ago = now - timedelta(days=60)
-
-        # Current period metrics
-        current_meetings = Meeting.objects.filter(created_at__gte=thirty_days_ago)
-        previous_meetings = Meeting.objects.filter(
-            created_at__gte=sixty_days_ago, created_at__lt=thirty_days_ago
-        )
-
-        # Total meetings
-        total_meetings = current_meetings.count()
-        previous_total = previous_meetings.count()
-        meetings_change = calculate_percentage_change(total_meetings, previous_total)
-
-        # Conversion rate (meetings that led to opportunities)
-        converted_meetings = current_meetings.filter(
-            lead__status__in=["qualified", "converted"]
-        ).count()
-        conversion_rate = (
-            (converted_meetings / total_meetings * 100) if total_meetings > 0 else 0
+        # The last 30 days, including today, and the 30 days before
+        today = timezone.localdate()
+        current_start = today - timedelta(days=29)
+        previous_start = current_start - timedelta(days=30)
+
+        sums = MeetingDailyStats.objects.filter(date__gte=previous_start).aggregate(
+            **stats_sums("current_", Q(date__gte=current_start)),
+            **stats_sums("previous_", Q(date__lt=current_start)),
         )
-
-        previous_converted = previous_meetings.filter(
-            lead__status__in=["qualified", "converted"]
-        ).count()
-        previous_conversion_rate = (
-            (previous_converted / previous_total * 100) if previous_total > 0 else 0
-        )
-        conversion_change = conversion_rate - previous_conversion_rate
+        current = summarize(sums, "current_")
+        previous = summarize(sums, "previous_")
 
         # Upcoming meetings
         upcoming_meetings = Meeting.objects.filter(
-            status="scheduled", scheduled_at__gt=now
+            status="scheduled", scheduled_at__gt=timezone.now()
         ).count()
 
-        # Average duration
-        avg_duration = (
-            current_meetings.filter(actual_duration_minutes__isnull=False).aggregate(
-                avg=Avg("actual_duration_minutes")
-            )["avg"]
-            or 0
-        )
-
-        previous_avg_duration = (
-            previous_meetings.filter(actual_duration_minutes__isnull=False).aggregate(
-                avg=Avg("actual_duration_minutes")
-            )["avg"]
-            or 0
-        )
-        duration_change = calculate_percentage_change(
-            avg_duration, previous_avg_duration
-        )
-
-        # AI effectiveness (based on question effectiveness scores)
-        ai_effectiveness = calculate_ai_effectiveness(current_meetings)
-        previous_ai_effectiveness = calculate_ai_effectiveness(previous_meetings)
-        ai_change = ai_effectiveness - previous_ai_effectiveness
-
-        # Preparation score (based on pre-meeting intelligence usage)
-        preparation_score = calculate_preparation_score(current_meetings)
-        previous_preparation_score = calculate_preparation_score(previous_meetings)
-        prep_change = preparation_score - previous_preparation_score
-
         return JsonResponse(
             {
-                "total_meetings": total_meetings,
-                "meetings_change": meetings_change,
-                "conversion_rate": round(conversion_rate, 1),
-                "conversion_change": round(conversion_change, 1),
+                "total_meetings": current["total_meetings"],
+                "meetings_change": calculate_percentage_change(
+                    current["total_meetings"], previous["total_meetings"]
+                ),
+                "conversion_rate": round(current["conversion_rate"], 1),
+                "conversion_change": round(
+                    current["conversion_rate"] - previous["conversion_rate"], 1
+                ),
                 "upcoming_meetings": upcoming_meetings,
                 "upcoming_change": 0,  # Would need historical tracking
-                "avg_duration": round(avg_duration, 0),
-                "duration_change": round(duration_change, 1),
-                "ai_effectiveness": round(ai_effectiveness, 1),
-                "ai_change": round(ai_change, 1),
-                "preparation_score": round(preparation_score, 1),
-                "prep_change": round(prep_change, 1),
+                "avg_duration": round(current["avg_duration"], 0),
+                "duration_change": calculate_percentage_change(
+                    current["avg_duration"], previous["avg_duration"]
+                ),
+                "ai_effectiveness": round(current["ai_effectiveness"], 1),
+                "ai_change": round(
+                    current["ai_effectiveness"] - previous["ai_effectiveness"], 1
+                ),
+                "preparation_score": round(current["preparation_score"], 1),
+                "prep_change": round(
+                    current["preparation_score"] - previous["preparation_score"], 1
+                ),
             }
         )
 
@@ -156,55 +132,19 @@ def dashboard_upcoming_meetings_api(request):
 def dashboard_performance_metrics_api(request):
     """API endpoint for meeting performance metrics"""
     try:
-        # Get performance metrics by meeting type
-        meeting_types = Meeting.MeetingType.choices
+        # Performance metrics by meeting type
         metrics_data = []
-
-        for meeting_type_code, meeting_type_name in meeting_types:
-            meetings = Meeting.objects.filter(meeting_type=meeting_type_code)
-
-            if meetings.exists():
-                total_meetings = meetings.count()
-                completed_meetings = meetings.filter(status="completed")
-
-                # Average duration
-                avg_duration = (
-                    completed_meetings.aggregate(avg=Avg("actual_duration_minutes"))[
-                        "avg"
-                    ]
-                    or 0
-                )
-
-                # Conversion rate
-                converted_count = meetings.filter(
-                    lead__status__in=["qualified", "converted"]
-                ).count()
-                conversion_rate = (
-                    (converted_count / total_meetings * 100)
-                    if total_meetings > 0
-                    else 0
-                )
-
-                # Success rate (completed vs scheduled)
-                success_rate = (
-                    (completed_meetings.count() / total_meetings * 100)
-                    if total_meetings > 0
-                    else 0
-                )
-
-                # Effectiveness (based on AI insights and outcomes)
-                effectiveness = calculate_meeting_type_effectiveness(meeting_type_code)
-
-                metrics_data.append(
-                    {
-                        "meeting_type": meeting_type_name,
-                        "total_meetings": total_meetings,
-                        "avg_duration": round(avg_duration, 0),
-                        "conversion_rate": round(conversion_rate, 1),
-                        "success_rate": round(success_rate, 1),
-                        "effectiveness": round(effectiveness, 1),
-                    }
-                )
+        for meeting_type_name, metrics in stats_by_meeting_type():
+            metrics_data.append(
+                {
+                    "meeting_type": meeting_type_name,
+                    "total_meetings": metrics["total_meetings"],
+                    "avg_duration": round(metrics["avg_duration"], 0),
+                    "conversion_rate": round(metrics["conversion_rate"], 1),
+                    "success_rate": round(metrics["success_rate"], 1),
+                    "effectiveness": round(metrics["effectiveness"], 1),
+                }
+            )
 
         # Generate chart data for performance trends
         chart_data = generate_performance_chart_data()
@@ -219,65 +159,53 @@ def dashboard_performance_metrics_api(request):
 def dashboard_ai_effectiveness_api(request):
     """API endpoint for AI recommendation effectiveness tracking"""
     try:
-        effectiveness_data = []
+        # Precomputed by the compute_ai_effectiveness task
+        overall, by_type = {}, {}
+        for row in AIFeatureEffectiveness.objects.all():
+            if row.meeting_type:
+                by_type.setdefault(row.feature, []).append(row)
+            else:
+                overall[row.feature] = row
 
-        # Pre-meeting intelligence effectiveness
-        prep_effectiveness = calculate_feature_effectiveness("preparation_materials")
-        effectiveness_data.append(
-            {
-                "feature_name": "Pre-meeting Intelligence",
-                "usage_count": prep_effectiveness["usage_count"],
-                "success_rate": prep_effectiveness["success_rate"],
-                "effectiveness": prep_effectiveness["effectiveness"],
-                "conversion_impact": prep_effectiveness["conversion_impact"],
-                "trend_direction": prep_effectiveness["trend_direction"],
-                "trend_indicator": prep_effectiveness["trend_indicator"],
-            }
-        )
+        effectiveness_data = []
+        computed_at = None
+        for feature, feature_name in AIFeatureEffectiveness.Feature.choices:
+            row = overall.get(feature)
+            if row is None:
+                continue
+            computed_at = row.computed_at
+            effectiveness_data.append(
+                {
+                    "feature_name": feature_name,
+                    **serialize_feature_effectiveness(row),
+                    "by_meeting_type": [
+                        {
+                            "meeting_type": type_row.get_meeting_type_display(),
+                            **serialize_feature_effectiveness(type_row),
+                        }
+                        for type_row in by_type.get(feature, [])
+                    ],
+                }
+            )
 
-        # Meeting questions effectiveness
-        questions_effectiveness = calculate_feature_effectiveness("meeting_questions")
-        effectiveness_data.append(
+        return JsonResponse(
             {
-                "feature_name": "AI-Generated Questions",
-                "usage_count": questions_effectiveness["usage_count"],
-                "success_rate": questions_effectiveness["success_rate"],
-                "effectiveness": questions_effectiveness["effectiveness"],
-                "conversion_impact": questions_effectiveness["conversion_impact"],
-                "trend_direction": questions_effectiveness["trend_direction"],
-                "trend_indicator": questions_effectiveness["trend_indicator"],
+                "effectiveness_data": effectiveness_data,
+                "computed_at": computed_at.isoformat() if computed_at else None,
             }
         )
 
-        # Meeting outcomes effectiveness
-        outcomes_effectiveness = calculate_feature_effectiveness("meeting_outcomes")
-        effectiveness_data.append(
-            {
-                "feature_name": "Outcome Analysis",
-                "usage_count": outcomes_effectiveness["usage_count"],
-                "success_rate": outcomes_effectiveness["success_rate"],
-                "effectiveness": outcomes_effectiveness["effectiveness"],
-                "conversion_impact": outcomes_effectiveness["conversion_impact"],
-                "trend_direction": outcomes_effectiveness["trend_direction"],
-                "trend_indicator": outcomes_effectiveness["trend_indicator"],
-            }
-        )
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
 
-        # Lead scoring updates effectiveness
-        scoring_effectiveness = calculate_feature_effectiveness("lead_scoring")
-        effectiveness_data.append(
-            {
-                "feature_name": "Lead Scoring Updates",
-                "usage_count": scoring_effectiveness["usage_count"],
-                "success_rate": scoring_effectiveness["success_rate"],
-                "effectiveness": scoring_effectiveness["effectiveness"],
-                "conversion_impact": scoring_effectiveness["conversion_impact"],
-                "trend_direction": scoring_effectiveness["trend_direction"],
-                "trend_indicator": scoring_effectiveness["trend_indicator"],
-            }
-        )
 
-        return JsonResponse({"effectiveness_data": effectiveness_data})
+@staff_member_required
+@require_POST
+def dashboard_recompute_ai_effectiveness_api(request):
+    """API endpoint to recompute AI recommendation effectiveness now"""
+    try:
+        rows = EffectivenessAnalytics().recompute()
+        return JsonResponse({"success": True, "rows": len(rows)})
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
@@ -287,72 +215,47 @@ def dashboard_ai_effectiveness_api(request):
 def dashboard_conversion_analytics_api(request):
     """API endpoint for conversion analytics"""
     try:
-        # Conversion funnel data
-        total_meetings = Meeting.objects.count()
-        scheduled_meetings = Meeting.objects.filter(status="scheduled").count()
-        completed_meetings = Meeting.objects.filter(status="completed").count()
-        qualified_leads = Meeting.objects.filter(lead__status="qualified").count()
-        converted_leads = Meeting.objects.filter(lead__status="converted").count()
-
-        funnel_data = [
-            {"stage": "Total Meetings", "count": total_meetings, "percentage": 100},
-            {
-                "stage": "Completed Meetings",
-                "count": completed_meetings,
-                "percentage": round(
-                    (
-                        (completed_meetings / total_meetings * 100)
-                        if total_meetings > 0
-                        else 0
-                    ),
-                    1,
-                ),
-            },
-            {
-                "stage": "Qualified Leads",
-                "count": qualified_leads,
-                "percentage": round(
-                    (
-                        (qualified_leads / total_meetings * 100)
-                        if total_meetings > 0
-                        else 0
-                    ),
-                    1,
-                ),
-            },
-            {
-                "stage": "Converted Leads",
-                "count": converted_leads,
-                "percentage": round(
-                    (
-                        (converted_leads / total_meetings * 100)
-                        if total_meetings > 0
-                        else 0
-                    ),
-                    1,
-                ),
-            },
-        ]
-
-        # Top converting meeting types
+        by_type = (
+            MeetingDailyStats.objects.values("meeting_type")
+            .annotate(**stats_sums())
+            .order_by()
+        )
+        funnel_sums = {field: 0 for field in STATS_FIELDS}
         meeting_types_conversion = []
-        for meeting_type_code, meeting_type_name in Meeting.MeetingType.choices:
-            meetings = Meeting.objects.filter(meeting_type=meeting_type_code)
-            if meetings.exists():
-                converted = meetings.filter(
-                    lead__status__in=["qualified", "converted"]
-                ).count()
-                conversion_rate = (
-                    (converted / meetings.count() * 100) if meetings.count() > 0 else 0
-                )
-
+        type_names = dict(Meeting.MeetingType.choices)
+        for row in by_type:
+            for field in STATS_FIELDS:
+                funnel_sums[field] += row[field]
+            if row["meeting_count"]:
                 meeting_types_conversion.append(
                     {
-                        "meeting_type": meeting_type_name,
-                        "conversion_rate": round(conversion_rate, 1),
+                        "meeting_type": type_names.get(
+                            row["meeting_type"], row["meeting_type"]
+                        ),
+                        "conversion_rate": round(summarize(row)["conversion_rate"], 1),
                     }
                 )
 
+        # Conversion funnel data
+        total_meetings = funnel_sums["meeting_count"]
+        funnel_data = [
+            {"stage": "Total Meetings", "count": total_meetings, "percentage": 100},
+        ]
+        for stage, field in (
+            ("Completed Meetings", "completed_count"),
+            ("Qualified Leads", "qualified_count"),
+            ("Converted Leads", "converted_count"),
+        ):
+            funnel_data.append(
+                {
+                    "stage": stage,
+                    "count": funnel_sums[field],
+                    "percentage": round(
+                        percentage(funnel_sums[field], total_meetings), 1
+                    ),
+                }
+            )
+
         # Sort by conversion rate
         meeting_types_conversion.sort(key=lambda x: x["conversion_rate"], reverse=True)
 
@@ -409,17 +312,10 @@ def calculate_preparation_score(meetings_queryset) -> float:
         return 0
 
     total_meetings = meetings_queryset.count()
-    prepared_meetings = 0
-
-    for meeting in meetings_queryset:
-        # Check if meeting has preparation materials
-        ai_insights = meeting.ai_insights or {}
-        if (
-            ai_insights.get("agenda")
-            or ai_insights.get("talking_points")
-            or ai_insights.get("preparation_materials")
-        ):
-            prepared_meetings += 1
+    prepared_meetings = sum(
+        is_prepared(ai_insights)
+        for ai_insights in meetings_queryset.values_list("ai_insights", flat=True)
+    )
 
     return (prepared_meetings / total_meetings * 100) if total_meetings > 0 else 0
 
@@ -458,174 +354,76 @@ def calculate_meeting_preparation_status(meeting) -> Dict[str, str]:
         }
 
 
-def calculate_meeting_type_effectiveness(meeting_type: str) -> float:
-    """Calculate effectiveness for a specific meeting type"""
-    meetings = Meeting.objects.filter(meeting_type=meeting_type, status="completed")
-
-    if not meetings.exists():
-        return 0
-
-    # Calculate based on multiple factors
-    total_score = 0
-    scored_meetings = 0
-
-    for meeting in meetings:
-        meeting_score = 0
-        factors = 0
-
-        # Factor 1: Lead conversion
-        if meeting.lead and meeting.lead.status in ["qualified", "converted"]:
-            meeting_score += 30
-        factors += 1
-
-        # Factor 2: Meeting completion vs scheduled duration
-        if meeting.actual_duration_minutes and meeting.duration_minutes:
-            duration_ratio = meeting.actual_duration_minutes / meeting.duration_minutes
-            if 0.8 <= duration_ratio <= 1.2:  # Within 20% of planned duration
-                meeting_score += 25
-        factors += 1
-
-        # Factor 3: AI insights quality
-        ai_insights = meeting.ai_insights or {}
-        if ai_insights.get("outcome") or ai_insights.get("action_items"):
-            meeting_score += 25
-        factors += 1
-
-        # Factor 4: Question effectiveness
-        questions = meeting.questions.filter(effectiveness_score__isnull=False)
-        if questions.exists():
-            avg_question_score = questions.aggregate(avg=Avg("effectiveness_score"))[
-                "avg"
-            ]
-            meeting_score += (avg_question_score / 100) * 20
-        factors += 1
-
-        if factors > 0:
-            total_score += meeting_score
-            scored_meetings += 1
-
-    return (total_score / scored_meetings) if scored_meetings > 0 else 0
-
-
-def calculate_feature_effectiveness(feature_name: str) -> Dict[str, Any]:
-    """Calculate effectiveness metrics for a specific AI feature"""
-    now = timezone.now()
-    thirty_days_ago = now - timedelta(days=30)
-
-    # Default values
-    result = {
-        "usage_count": 0,
-        "success_rate": 0,
-        "effectiveness": 0,
-        "conversion_impact": 0,
-        "trend_direction": "neutral",
-        "trend_indicator": "➡️",
+def serialize_feature_effectiveness(row: AIFeatureEffectiveness) -> Dict[str, Any]:
+    """Dashboard fields of an AI feature effectiveness row"""
+    # A trend only when the change is larger than the current uncertainty
+    trend_direction = "neutral"
+    if row.previous_effectiveness is not None:
+        change = row.effectiveness - row.previous_effectiveness
+        margin = (row.effectiveness_ci_high - row.effectiveness_ci_low) / 2
+        if change > margin:
+            trend_direction = "positive"
+        elif change < -margin:
+            trend_direction = "negative"
+
+    return {
+        "usage_count": row.usage_count,
+        "control_count": row.control_count,
+        "success_rate": round(row.success_rate, 1),
+        "effectiveness": round(row.effectiveness, 1),
+        "effectiveness_ci": [
+            round(row.effectiveness_ci_low, 1),
+            round(row.effectiveness_ci_high, 1),
+        ],
+        "control_effectiveness": round(row.control_effectiveness, 1),
+        "conversion_impact": round(row.conversion_impact, 1),
+        "conversion_impact_ci": [
+            round(row.impact_ci_low, 1),
+            round(row.impact_ci_high, 1),
+        ],
+        "trend_direction": trend_direction,
+        "trend_indicator": {"positive": "↗️", "negative": "↘️"}.get(
+            trend_direction, "➡️"
+        ),
     }
 
-    if feature_name == "preparation_materials":
-        # Count meetings with preparation materials
-        meetings_with_prep = Meeting.objects.filter(
-            created_at__gte=thirty_days_ago,
-            ai_insights__has_key="preparation_materials",
-        )
-        result["usage_count"] = meetings_with_prep.count()
-
-        if meetings_with_prep.exists():
-            # Success rate based on meeting completion
-            completed = meetings_with_prep.filter(status="completed").count()
-            result["success_rate"] = round((completed / result["usage_count"] * 100), 1)
-
-            # Effectiveness based on lead conversion
-            converted = meetings_with_prep.filter(
-                lead__status__in=["qualified", "converted"]
-            ).count()
-            result["effectiveness"] = round(
-                (converted / result["usage_count"] * 100), 1
-            )
-
-            # Conversion impact (compared to meetings without prep)
-            meetings_without_prep = Meeting.objects.filter(
-                created_at__gte=thirty_days_ago
-            ).exclude(ai_insights__has_key="preparation_materials")
-
-            if meetings_without_prep.exists():
-                without_prep_conversion = (
-                    meetings_without_prep.filter(
-                        lead__status__in=["qualified", "converted"]
-                    ).count()
-                    / meetings_without_prep.count()
-                    * 100
-                )
-
-                result["conversion_impact"] = round(
-                    result["effectiveness"] - without_prep_conversion, 1
-                )
 
-    elif feature_name == "meeting_questions":
-        # Count meetings with AI-generated questions
-        meetings_with_questions = Meeting.objects.filter(
-            created_at__gte=thirty_days_ago, questions__ai_generated=True
-        ).distinct()
-        result["usage_count"] = meetings_with_questions.count()
-
-        if meetings_with_questions.exists():
-            # Success rate based on questions asked
-            questions_asked = MeetingQuestion.objects.filter(
-                meeting__in=meetings_with_questions, asked_at__isnull=False
-            ).count()
-            total_questions = MeetingQuestion.objects.filter(
-                meeting__in=meetings_with_questions
-            ).count()
-            result["success_rate"] = round(
-                (questions_asked / total_questions * 100) if total_questions > 0 else 0,
-                1,
-            )
-
-            # Effectiveness based on average question effectiveness
-            avg_effectiveness = MeetingQuestion.objects.filter(
-                meeting__in=meetings_with_questions, effectiveness_score__isnull=False
-            ).aggregate(avg=Avg("effectiveness_score"))["avg"]
-            result["effectiveness"] = round(avg_effectiveness or 0, 1)
-
-    # Add trend calculation logic here
-    result["trend_direction"] = (
-        "positive"
-        if result["effectiveness"] > 70
-        else "negative" if result["effectiveness"] < 50 else "neutral"
-    )
-    result["trend_indicator"] = (
-        "↗️"
-        if result["trend_direction"] == "positive"
-        else "↘️" if result["trend_direction"] == "negative" else "➡️"
-    )
-
-    return result
+def stats_by_meeting_type() -> List[Tuple[str, Dict[str, float]]]:
+    """Dashboard metrics of each meeting type with meetings, in choice order"""
+    rows = {
+        row["meeting_type"]: row
+        for row in MeetingDailyStats.objects.values("meeting_type")
+        .annotate(**stats_sums())
+        .order_by()
+    }
+    return [
+        (meeting_type_name, summarize(rows[meeting_type_code]))
+        for meeting_type_code, meeting_type_name in Meeting.MeetingType.choices
+        if rows.get(meeting_type_code, {}).get("meeting_count")
+    ]
 
 
 def generate_performance_chart_data() -> Dict[str, List]:
     """Generate chart data for performance trends"""
-    # Get last 7 days of data
-    now = timezone.now()
-    dates = []
-    success_rates = []
-
-    for i in range(6, -1, -1):
-        date = now - timedelta(days=i)
-        dates.append(date.strftime("%m/%d"))
-
-        # Calculate success rate for this day
-        day_meetings = Meeting.objects.filter(
-            created_at__date=date.date(), status="completed"
+    # Last 7 days of data
+    today = timezone.localdate()
+    days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+    by_day = {
+        row["date"]: row
+        for row in MeetingDailyStats.objects.filter(date__gte=days[0])
+        .values("date")
+        .annotate(
+            completed=Sum("completed_count"),
+            converted=Sum("completed_converted_count"),
         )
+        .order_by()
+    }
 
-        if day_meetings.exists():
-            converted = day_meetings.filter(
-                lead__status__in=["qualified", "converted"]
-            ).count()
-            success_rate = converted / day_meetings.count() * 100
-        else:
-            success_rate = 0
-
+    success_rates = []
+    for day in days:
+        row = by_day.get(day, {})
+        # Converted share of the day's completed meetings
+        success_rate = percentage(row.get("converted", 0), row.get("completed", 0))
         success_rates.append(round(success_rate, 1))
 
-    return {"labels": dates, "data": success_rates}
+    return {"labels": [day.strftime("%m/%d") for day in days], "data": success_rates}
@@ -0,0 +1,301 @@
+"""
+A/B-style effectiveness analytics of the AI features
+
+dashboard_ai_effectiveness_api used to compare meetings with and without
+each AI feature, with several queries per feature, on every request. The
+compute_ai_effectiveness task now runs those comparisons every
+AI_EFFECTIVENESS_INTERVAL seconds (CELERY_BEAT_SCHEDULE) into
+AIFeatureEffectiveness rows, overall and per meeting type, and the API only
+reads them.
+
+For each feature, meetings created in the last AI_EFFECTIVENESS_WINDOW_DAYS
+days that used it are compared with those that did not:
+
+- preparation materials and AI-generated questions: all meetings
+- outcome analysis and lead scoring, which run after a meeting: completed
+  meetings
+
+Effectiveness is the conversion rate (qualified or converted lead) of the
+meetings using the feature, with a Wilson interval. For AI-generated
+questions it is their mean effectiveness score, against that of manual
+questions, with a normal interval. The conversion impact is the difference
+between the conversion rates of the two groups, with a Wald interval.
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Sum,
+)
+from django.utils import timezone
+
+from .meeting_stats import CONVERTED_LEAD_STATUSES, percentage
+from .models import AIFeatureEffectiveness, Meeting, MeetingQuestion
+
+logger = logging.getLogger(__name__)
+
+Feature = AIFeatureEffectiveness.Feature
+
+# z for 95% intervals
+Z_95 = 1.96
+
+# Meetings using each feature
+FEATURE_CONDITIONS = {
+    Feature.PREPARATION_MATERIALS: Q(ai_insights__has_key="preparation_materials"),
+    Feature.MEETING_QUESTIONS: Exists(
+        MeetingQuestion.objects.filter(meeting=OuterRef("pk"), ai_generated=True)
+    ),
+    Feature.MEETING_OUTCOMES: Q(ai_insights__has_key="meeting_summary"),
+    Feature.LEAD_SCORING: Q(ai_insights__has_key="lead_scoring_update"),
+}
+# Features compared among completed meetings only
+AFTER_MEETING_FEATURES = (Feature.MEETING_OUTCOMES, Feature.LEAD_SCORING)
+
+# (meeting type, completed, uses each feature in FEATURE_CONDITIONS order)
+MeetingGroup = Tuple[str, bool, Tuple[bool, ...]]
+
+
+def wilson_interval(successes: int, n: int) -> Tuple[float, float]:
+    """95% interval of a proportion, in percent"""
+    if not n:
+        return 0.0, 0.0
+    p = successes / n
+    denominator = 1 + Z_95**2 / n
+    centre = (p + Z_95**2 / (2 * n)) / denominator
+    margin = Z_95 * math.sqrt(p * (1 - p) / n + Z_95**2 / (4 * n**2)) / denominator
+    return max(centre - margin, 0) * 100, min(centre + margin, 1) * 100
+
+
+def difference_interval(
+    successes: int, n: int, control_successes: int, control_n: int
+) -> Tuple[float, float, float]:
+    """Difference of two proportions and its 95% interval, in points"""
+    if not n or not control_n:
+        return 0.0, 0.0, 0.0
+    p, control_p = successes / n, control_successes / control_n
+    difference = p - control_p
+    margin = Z_95 * math.sqrt(p * (1 - p) / n + control_p * (1 - control_p) / control_n)
+    return difference * 100, (difference - margin) * 100, (difference + margin) * 100
+
+
+def mean_interval(total: float, squares: float, n: int) -> Tuple[float, float, float]:
+    """Mean of n values, from their sum and sum of squares, and its 95% interval"""
+    if not n:
+        return 0.0, 0.0, 0.0
+    mean = total / n
+    if n < 2:
+        return mean, mean, mean
+    variance = max((squares - n * mean**2) / (n - 1), 0)
+    margin = Z_95 * math.sqrt(variance / n)
+    return mean, mean - margin, mean + margin
+
+
+class EffectivenessAnalytics:
+    """Compute the AI feature effectiveness table"""
+
+    def __init__(self, window_days: Optional[int] = None):
+        self.window_days = window_days or getattr(
+            settings, "AI_EFFECTIVENESS_WINDOW_DAYS", 30
+        )
+
+    def recompute(self, now: Optional[datetime] = None) -> List[AIFeatureEffectiveness]:
+        """Replace the table with the current and previous windows' comparisons"""
+        now = now or timezone.now()
+        window = timedelta(days=self.window_days)
+        current = self.compare(now - window, now)
+        previous = self.compare(now - 2 * window, now - window)
+
+        rows = []
+        for (feature, meeting_type), stats in current.items():
+            before = previous.get((feature, meeting_type))
+            rows.append(
+                AIFeatureEffectiveness(
+                    feature=feature,
+                    meeting_type=meeting_type,
+                    window_start=now - window,
+                    window_end=now,
+                    previous_effectiveness=(
+                        before["effectiveness"]
+                        if before and before["usage_count"]
+                        else None
+                    ),
+                    computed_at=now,
+                    **stats,
+                )
+            )
+        with transaction.atomic():
+            AIFeatureEffectiveness.objects.all().delete()
+            AIFeatureEffectiveness.objects.bulk_create(rows)
+
+        logger.info(f"Computed {len(rows)} AI feature effectiveness rows")
+        return rows
+
+    def compare(self, start: datetime, end: datetime) -> Dict[Tuple[str, str], Dict]:
+        """
+        Stats of each feature for meetings created from ``start`` to ``end``
+
+        Keyed by (feature, meeting type), with a blank type for all meetings.
+        Meeting types without meetings are left out.
+        """
+        groups = self._meeting_groups(start, end)
+        questions = self._question_groups(start, end)
+
+        meeting_types = sorted({meeting_type for meeting_type, _, _ in groups})
+        results = {}
+        for meeting_type in [""] + meeting_types:
+            for index, feature in enumerate(FEATURE_CONDITIONS):
+                results[(feature, meeting_type)] = self._feature_stats(
+                    feature, index, meeting_type, groups, questions
+                )
+        return results
+
+    def _meeting_groups(
+        self, start: datetime, end: datetime
+    ) -> Dict[MeetingGroup, Tuple[int, int]]:
+        """(meetings, converted meetings) by type, completion and features used"""
+        flags = {
+            f"uses_{feature.value}": ExpressionWrapper(
+                condition, output_field=BooleanField()
+            )
+            for feature, condition in FEATURE_CONDITIONS.items()
+        }
+        rows = (
+            Meeting.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(
+                is_completed=ExpressionWrapper(
+                    Q(status=Meeting.Status.COMPLETED), output_field=BooleanField()
+                ),
+                **flags,
+            )
+            .values("meeting_type", "is_completed", *flags)
+            .annotate(
+                meetings=Count("id"),
+                converted=Count(
+                    "id", filter=Q(lead__status__in=CONVERTED_LEAD_STATUSES)
+                ),
+            )
+            .order_by()
+        )
+        return {
+            (
+                row["meeting_type"],
+                bool(row["is_completed"]),
+                tuple(bool(row[flag]) for flag in flags),
+            ): (row["meetings"], row["converted"])
+            for row in rows
+        }
+
+    def _question_groups(
+        self, start: datetime, end: datetime
+    ) -> Dict[Tuple[str, bool], Dict]:
+        """Question counts and score sums by meeting type and AI generation"""
+        rows = (
+            MeetingQuestion.objects.filter(
+                meeting__created_at__gte=start, meeting__created_at__lt=end
+            )
+            .values("meeting__meeting_type", "ai_generated")
+            .annotate(
+                questions=Count("id"),
+                asked=Count("id", filter=Q(asked_at__isnull=False)),
+                scored=Count("effectiveness_score"),
+                score_total=Sum("effectiveness_score", default=0),
+                score_squares=Sum(
+                    F("effectiveness_score") * F("effectiveness_score"), default=0
+                ),
+            )
+            .order_by()
+        )
+        return {
+            (row["meeting__meeting_type"], row["ai_generated"]): row for row in rows
+        }
+
+    def _feature_stats(
+        self,
+        feature: str,
+        index: int,
+        meeting_type: str,
+        groups: Dict[MeetingGroup, Tuple[int, int]],
+        questions: Dict[Tuple[str, bool], Dict],
+    ) -> Dict:
+        # [meetings, converted, completed] using the feature, and not using it
+        used, unused = [0, 0, 0], [0, 0, 0]
+        for (group_type, completed, uses), (meetings, converted) in groups.items():
+            if meeting_type and group_type != meeting_type:
+                continue
+            if feature in AFTER_MEETING_FEATURES and not completed:
+                continue
+            totals = used if uses[index] else unused
+            totals[0] += meetings
+            totals[1] += converted
+            totals[2] += meetings if completed else 0
+
+        impact, impact_low, impact_high = difference_interval(
+            used[1], used[0], unused[1], unused[0]
+        )
+        stats = {
+            "usage_count": used[0],
+            "control_count": unused[0],
+            "conversion_impact": impact,
+            "impact_ci_low": impact_low,
+            "impact_ci_high": impact_high,
+        }
+
+        if feature == Feature.MEETING_QUESTIONS:
+            ai, manual = self._question_totals(questions, meeting_type)
+            mean, low, high = mean_interval(
+                ai["score_total"], ai["score_squares"], ai["scored"]
+            )
+            stats.update(
+                # Share of AI-generated questions that were asked
+                success_rate=percentage(ai["asked"], ai["questions"]),
+                effectiveness=mean,
+                effectiveness_ci_low=low,
+                effectiveness_ci_high=high,
+                control_effectiveness=(
+                    manual["score_total"] / manual["scored"] if manual["scored"] else 0
+                ),
+            )
+            return stats
+
+        low, high = wilson_interval(used[1], used[0])
+        stats.update(
+            # Completed share of the meetings using it; for features run after
+            # the meeting, the share of completed meetings using it
+            success_rate=(
+                percentage(used[0], used[0] + unused[0])
+                if feature in AFTER_MEETING_FEATURES
+                else percentage(used[2], used[0])
+            ),
+            effectiveness=percentage(used[1], used[0]),
+            effectiveness_ci_low=low,
+            effectiveness_ci_high=high,
+            control_effectiveness=percentage(unused[1], unused[0]),
+        )
+        return stats
+
+    def _question_totals(
+        self, questions: Dict[Tuple[str, bool], Dict], meeting_type: str
+    ) -> Tuple[Dict, Dict]:
+        """Summed question counts of AI-generated and of manual questions"""
+        fields = ("questions", "asked", "scored", "score_total", "score_squares")
+        totals = {
+            ai_generated: dict.fromkeys(fields, 0) for ai_generated in (True, False)
+        }
+        for (group_type, ai_generated), row in questions.items():
+            if meeting_type and group_type != meeting_type:
+                continue
+            for field in fields:
+                totals[ai_generated][field] += row[field]
+        return totals[True], totals[False]
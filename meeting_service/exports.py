@@ -0,0 +1,246 @@
+"""
+Streaming analytics exports
+
+An export is sent while its rows are read. The queryset is projected with
+values_list() and read with .iterator(chunk_size=...), and each chunk is
+encoded and sent before the next one is fetched, so memory use does not
+depend on the size of the table. Formats:
+
+- csv and ndjson, optionally gzip-compressed
+- parquet, one row group per chunk, when pyarrow is installed
+"""
+
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from django.http import StreamingHttpResponse
+
+from .models import MeetingQuestion
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Content type and file extension of each format
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class ExportFormatError(ValueError):
+    """The requested export format is unknown or not available"""
+
+
+@dataclass
+class ExportColumn:
+    name: str
+    # values_list() path of the value
+    path: str
+    # string, integer, float, boolean or timestamp, for parquet
+    kind: str = "string"
+    convert: Optional[Callable[[Any], Any]] = None
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """gzip-compress a stream of bytes as it is produced"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class _ParquetSink(io.RawIOBase):
+    """File object collecting what the parquet writer writes, to be sent"""
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+class StreamingExport:
+    """Stream the rows of a queryset in one of the EXPORT_FORMATS"""
+
+    def __init__(
+        self,
+        queryset,
+        columns: Sequence[ExportColumn],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.queryset = queryset
+        self.columns = list(columns)
+        self.chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[List[tuple]]:
+        """Converted rows, ``chunk_size`` at a time"""
+        rows = self.queryset.values_list(
+            *(column.path for column in self.columns)
+        ).iterator(chunk_size=self.chunk_size)
+        converters = [column.convert for column in self.columns]
+
+        chunk = []
+        for row in rows:
+            chunk.append(
+                tuple(
+                    convert(value) if convert else value
+                    for convert, value in zip(converters, row)
+                )
+            )
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def csv(self) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.name for column in self.columns])
+        for chunk in self.chunks():
+            writer.writerows(
+                ["" if value is None else value for value in row] for row in chunk
+            )
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        # The header of an empty export
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def ndjson(self) -> Iterator[bytes]:
+        names = [column.name for column in self.columns]
+        for chunk in self.chunks():
+            yield "".join(
+                json.dumps(dict(zip(names, row)), default=_json_default) + "\n"
+                for row in chunk
+            ).encode("utf-8")
+
+    def parquet(self) -> Iterator[bytes]:
+        if pyarrow is None:
+            raise ExportFormatError("Parquet exports need pyarrow")
+        types = {
+            "string": pyarrow.string(),
+            "integer": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "boolean": pyarrow.bool_(),
+            "timestamp": pyarrow.timestamp("us", tz="UTC"),
+        }
+        schema = pyarrow.schema(
+            [(column.name, types[column.kind]) for column in self.columns]
+        )
+        sink = _ParquetSink()
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+        try:
+            for chunk in self.chunks():
+                columns = list(zip(*chunk))
+                writer.write_table(
+                    pyarrow.Table.from_arrays(
+                        [
+                            pyarrow.array(values, type=field.type)
+                            for values, field in zip(columns, schema)
+                        ],
+                        schema=schema,
+                    )
+                )
+                yield sink.take()
+        finally:
+            writer.close()
+        yield sink.take()
+
+    def response(
+        self, export_format: str, filename: str, compress: bool = False
+    ) -> StreamingHttpResponse:
+        """Attachment response streaming the export"""
+        if export_format not in EXPORT_FORMATS:
+            raise ExportFormatError(f"Unknown export format: {export_format}")
+        if export_format == "parquet":
+            if pyarrow is None:
+                raise ExportFormatError("Parquet exports need pyarrow")
+            # Parquet pages are compressed already
+            compress = False
+
+        content_type, extension = EXPORT_FORMATS[export_format]
+        stream = getattr(self, export_format)()
+        filename = f"{filename}.{extension}"
+        if compress:
+            stream = gzip_stream(stream)
+            content_type = "application/gzip"
+            filename += ".gz"
+
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+# Question analytics
+
+
+def truncated(limit: int) -> Callable[[Any], str]:
+    """Converter cutting text to ``limit`` characters"""
+
+    def truncate(text):
+        if text and len(text) > limit:
+            return text[:limit] + "..."
+        return text or ""
+
+    return truncate
+
+
+QUESTION_TYPE_NAMES = dict(MeetingQuestion.QuestionType.choices)
+
+QUESTION_EXPORT_COLUMNS = [
+    ExportColumn("Question ID", "id", convert=str),
+    ExportColumn("Meeting ID", "meeting_id", convert=str),
+    ExportColumn("Meeting", "meeting__title"),
+    ExportColumn("Company", "meeting__lead__company_name"),
+    ExportColumn(
+        "Question Type",
+        "question_type",
+        convert=lambda value: QUESTION_TYPE_NAMES.get(value, value),
+    ),
+    ExportColumn("Question Text", "question_text", convert=truncated(100)),
+    ExportColumn("Priority", "priority", "integer"),
+    ExportColumn("AI Generated", "ai_generated", "boolean"),
+    ExportColumn("Confidence Score", "confidence_score", "float"),
+    ExportColumn("Asked At", "asked_at", "timestamp"),
+    ExportColumn("Response", "response", convert=truncated(50)),
+    ExportColumn("Effectiveness Score", "effectiveness_score", "float"),
+    ExportColumn("Led to Qualification", "led_to_qualification", "boolean"),
+    ExportColumn("Led to Objection", "led_to_objection", "boolean"),
+    ExportColumn("Created At", "created_at", "timestamp"),
+]
@@ -0,0 +1,237 @@
+"""
+Microsoft Graph JSON batching
+
+Graph accepts up to 20 requests in one POST to ``/$batch``. ``GraphBatch``
+sends any number of ``GraphRequest``s in as few of those as it can:
+
+- requests go out in dependency order. A dependency in the same batch is
+  passed on as ``dependsOn``, so Graph runs the two in order. One in an
+  earlier batch has already run; if it failed, its dependents fail here
+  with 424 (Failed Dependency) without being sent.
+- throttled sub-requests (429, 503, 504) are retried on their own, with
+  the dependents Graph failed because of them, after the longest
+  Retry-After they asked for
+- non-JSON bodies, such as transcript content, come back base64-encoded
+  and are decoded to text
+"""
+
+import base64
+import binascii
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from .provider_clients import (
+    GRAPH_BASE_URL,
+    graph_session,
+    provider_retries,
+    provider_timeout,
+    timed_call,
+)
+
+logger = logging.getLogger(__name__)
+
+GRAPH_BATCH_URL = f"{GRAPH_BASE_URL}/$batch"
+MAX_BATCH_SIZE = 20
+THROTTLED_STATUSES = (429, 503, 504)
+FAILED_DEPENDENCY = 424
+# Longest wait before retrying throttled sub-requests
+MAX_RETRY_AFTER_SECONDS = 10
+
+
+@dataclass
+class GraphRequest:
+    id: str
+    # Relative to the API version, e.g. "/me/joinedTeams"
+    url: str
+    method: str = "GET"
+    body: Optional[dict] = None
+    depends_on: Sequence[str] = ()
+
+    def as_batch_item(self, depends_on: Sequence[str]) -> Dict:
+        item = {"id": self.id, "method": self.method, "url": self.url}
+        if self.body is not None:
+            item["body"] = self.body
+            item["headers"] = {"Content-Type": "application/json"}
+        if depends_on:
+            item["dependsOn"] = list(depends_on)
+        return item
+
+
+@dataclass
+class GraphResponse:
+    id: str
+    status: int
+    body: object = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def value(self) -> List[dict]:
+        """Items of a successful collection response"""
+        if self.ok and isinstance(self.body, dict):
+            return self.body.get("value", [])
+        return []
+
+    def retry_after(self) -> float:
+        for name, value in self.headers.items():
+            if name.lower() == "retry-after":
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    break
+        return 1.0
+
+
+def _decode_body(body, headers: Dict[str, str]):
+    content_type = next(
+        (value for name, value in headers.items() if name.lower() == "content-type"),
+        "",
+    )
+    if not isinstance(body, str) or "json" in content_type:
+        return body
+    try:
+        return base64.b64decode(body, validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return body
+
+
+def _in_dependency_order(requests: Sequence[GraphRequest]) -> List[GraphRequest]:
+    by_id = {request.id: request for request in requests}
+    if len(by_id) != len(requests):
+        raise ValueError("Graph batch request ids must be unique")
+
+    ordered, visiting, done = [], set(), set()
+
+    def visit(request: GraphRequest):
+        if request.id in done:
+            return
+        if request.id in visiting:
+            raise ValueError(f"Graph request {request.id} depends on itself")
+        visiting.add(request.id)
+        for dependency in request.depends_on:
+            if dependency not in by_id:
+                raise ValueError(
+                    f"Graph request {request.id} depends on unknown {dependency}"
+                )
+            visit(by_id[dependency])
+        visiting.discard(request.id)
+        done.add(request.id)
+        ordered.append(request)
+
+    for request in requests:
+        visit(request)
+    return ordered
+
+
+class GraphBatch:
+    """Send Graph requests of one user through JSON batching"""
+
+    def __init__(self, access_token: str, max_retries: int = None):
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+        self.max_retries = provider_retries() if max_retries is None else max_retries
+        # $batch calls made, across retries
+        self.round_trips = 0
+
+    def execute(self, requests: Sequence[GraphRequest]) -> Dict[str, GraphResponse]:
+        """Responses by request id; requests still throttled keep their 429"""
+        responses: Dict[str, GraphResponse] = {}
+        pending = _in_dependency_order(requests)
+        for attempt in range(self.max_retries + 1):
+            pending = self._send(pending, responses)
+            if not pending or attempt == self.max_retries:
+                break
+            delay = min(
+                max(responses[request.id].retry_after() for request in pending),
+                MAX_RETRY_AFTER_SECONDS,
+            )
+            logger.info(
+                f"Retrying {len(pending)} throttled Graph requests in {delay:.1f}s"
+            )
+            time.sleep(delay)
+        return responses
+
+    def _send(
+        self, requests: List[GraphRequest], responses: Dict[str, GraphResponse]
+    ) -> List[GraphRequest]:
+        """Send ``requests`` in batches of 20; returns those to retry"""
+        retry: List[GraphRequest] = []
+        retry_ids = set()
+
+        for start in range(0, len(requests), MAX_BATCH_SIZE):
+            chunk = requests[start : start + MAX_BATCH_SIZE]
+            chunk_ids = {request.id for request in chunk}
+
+            items, sent = [], []
+            for request in chunk:
+                earlier = [dep for dep in request.depends_on if dep not in chunk_ids]
+                if any(dep in retry_ids for dep in earlier):
+                    # Waits for its throttled dependency
+                    responses[request.id] = GraphResponse(request.id, FAILED_DEPENDENCY)
+                    retry.append(request)
+                    retry_ids.add(request.id)
+                    continue
+                if any(not responses[dep].ok for dep in earlier):
+                    responses[request.id] = GraphResponse(request.id, FAILED_DEPENDENCY)
+                    continue
+                same_batch = [dep for dep in request.depends_on if dep in chunk_ids]
+                items.append(request.as_batch_item(same_batch))
+                sent.append(request)
+            if not items:
+                continue
+
+            results = {response.id: response for response in self._post(items)}
+            for request in sent:
+                response = results.get(request.id) or GraphResponse(request.id, 500)
+                responses[request.id] = response
+                status = response.status
+                throttled = status in THROTTLED_STATUSES
+                # Graph fails dependents of a throttled request with 424
+                blocked = status == FAILED_DEPENDENCY and any(
+                    dep in retry_ids for dep in request.depends_on
+                )
+                if throttled or blocked:
+                    retry.append(request)
+                    retry_ids.add(request.id)
+        return retry
+
+    def _post(self, items: List[Dict]) -> List[GraphResponse]:
+        self.round_trips += 1
+        with timed_call("graph"):
+            response = graph_session().post(
+                GRAPH_BATCH_URL,
+                headers=self.headers,
+                json={"requests": items},
+                timeout=provider_timeout(),
+            )
+
+        if response.status_code != 200:
+            # The whole batch failed; throttling is retried like a sub-request's
+            logger.error(
+                f"Graph batch request failed: {response.status_code} - {response.text}"
+            )
+            return [
+                GraphResponse(
+                    item["id"], response.status_code, None, dict(response.headers)
+                )
+                for item in items
+            ]
+
+        results = []
+        for result in response.json().get("responses", []):
+            headers = result.get("headers") or {}
+            results.append(
+                GraphResponse(
+                    id=result["id"],
+                    status=int(result.get("status", 500)),
+                    body=_decode_body(result.get("body"), headers),
+                    headers=headers,
+                )
+            )
+        return results
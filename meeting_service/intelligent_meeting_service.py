@@ -1,13 +1,20 @@
 import logging
-from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 
+from .availability import attendee_busy_intervals, find_common_slots
 from .google_meet_service import GoogleMeetService
+from .meeting_patterns import (
+    MeetingColumns,
+    cache_ttl,
+    engagement_ratio,
+    productivity_score,
+)
 from .microsoft_teams_service import MicrosoftTeamsService
 from .models import (
     GoogleMeetCredentials,
@@ -41,56 +48,27 @@ class IntelligentMeetingService:
         try:
             start_date, end_date = date_range
 
-            # Get user's meetings in the date range
-            meetings = MeetingSession.objects.filter(
-                Q(organizer=user) | Q(participants__user=user),
-                scheduled_start_time__gte=start_date,
-                scheduled_start_time__lte=end_date,
-            ).distinct()
-
-            # Analyze meeting patterns
-            daily_counts = defaultdict(int)
-            hourly_distribution = defaultdict(int)
-            duration_stats = []
-
-            for meeting in meetings:
-                # Daily meeting count
-                date_key = meeting.scheduled_start_time.date()
-                daily_counts[date_key] += 1
-
-                # Hourly distribution
-                hour_key = meeting.scheduled_start_time.hour
-                hourly_distribution[hour_key] += 1
-
-                # Duration statistics
-                if meeting.duration_minutes > 0:
-                    duration_stats.append(meeting.duration_minutes)
-
-            # Calculate statistics
-            avg_daily_meetings = sum(daily_counts.values()) / max(len(daily_counts), 1)
-            peak_hours = sorted(
-                hourly_distribution.items(), key=lambda x: x[1], reverse=True
-            )[:3]
-            avg_duration = (
-                sum(duration_stats) / max(len(duration_stats), 1)
-                if duration_stats
-                else 60
+            # Cached per user and window, to the minute
+            cache_key = (
+                f"meeting_availability:{user.id}:"
+                f"{int(start_date.timestamp()) // 60}:{int(end_date.timestamp()) // 60}"
             )
+            availability = cache.get(cache_key)
+            if availability is not None:
+                return availability
 
-            # Find available time slots
-            available_slots = self._find_available_slots(
-                user, start_date, end_date, meetings
+            meetings = MeetingColumns.load(
+                user, start_date, end_date, participants=False
             )
-
-            return {
-                "total_meetings": len(meetings),
-                "avg_daily_meetings": round(avg_daily_meetings, 2),
-                "peak_hours": [hour for hour, count in peak_hours],
-                "avg_duration_minutes": round(avg_duration, 2),
-                "daily_counts": dict(daily_counts),
-                "available_slots": available_slots,
-                "meeting_load": self._calculate_meeting_load(daily_counts),
-            }
+            availability = meetings.availability()
+            availability.update(
+                available_slots=self._find_available_slots(
+                    user, start_date, end_date, meetings.busy
+                ),
+                meeting_load=self._calculate_meeting_load(availability["daily_counts"]),
+            )
+            cache.set(cache_key, availability, timeout=cache_ttl())
+            return availability
 
         except Exception as e:
             logger.error(f"Error analyzing user availability: {str(e)}")
@@ -101,59 +79,74 @@ class IntelligentMeetingService:
         user: User,
         start_date: datetime,
         end_date: datetime,
-        existing_meetings: List[MeetingSession],
+        existing_meetings: Iterable,
     ) -> List[Dict]:
-        """Find available time slots for meetings"""
-        available_slots = []
-
-        # Create a list of busy time periods
-        busy_periods = []
-        for meeting in existing_meetings:
-            busy_periods.append(
-                {
-                    "start": meeting.scheduled_start_time,
-                    "end": meeting.scheduled_end_time,
-                }
+        """Find available time slots around meetings or (start, end) intervals"""
+        busy = [
+            (
+                (meeting.scheduled_start_time, meeting.scheduled_end_time)
+                if isinstance(meeting, MeetingSession)
+                else meeting
             )
-
-        # Sort busy periods by start time
-        busy_periods.sort(key=lambda x: x["start"])
-
-        # Find gaps between meetings
-        current_time = start_date.replace(
-            hour=self.preferred_meeting_hours[0], minute=0, second=0, microsecond=0
-        )
-        end_time = end_date.replace(
-            hour=self.preferred_meeting_hours[1], minute=0, second=0, microsecond=0
+            for meeting in existing_meetings
+        ]
+        # Default 1-hour slots on the half hour, earliest first
+        slots = find_common_slots(
+            {user.id: busy},
+            start_date,
+            end_date,
+            duration_minutes=60,
+            strategy="earliest",
+            limit=10,
+            slot_minutes=30,
+            working_hours=self.preferred_meeting_hours,
+            exclude_weekends=False,
         )
+        return [
+            {"start": slot_start, "end": slot_end, "duration_minutes": 60}
+            for slot_start, slot_end, _ in slots
+        ]
 
-        while current_time < end_time:
-            # Check if current time is during business hours
-            if (
-                self.preferred_meeting_hours[0]
-                <= current_time.hour
-                < self.preferred_meeting_hours[1]
-            ):
-                # Check if this slot conflicts with existing meetings
-                slot_end = current_time + timedelta(hours=1)  # Default 1-hour slot
-
-                is_available = True
-                for busy_period in busy_periods:
-                    if (
-                        current_time < busy_period["end"]
-                        and slot_end > busy_period["start"]
-                    ):
-                        is_available = False
-                        break
-
-                if is_available:
-                    available_slots.append(
-                        {"start": current_time, "end": slot_end, "duration_minutes": 60}
-                    )
-
-            current_time += timedelta(minutes=30)  # Check every 30 minutes
-
-        return available_slots[:10]  # Return top 10 available slots
+    def find_common_slots(
+        self,
+        users: Iterable[User],
+        start_date: datetime,
+        end_date: datetime,
+        duration_minutes: int = 60,
+        strategy: str = "best",
+        limit: int = 10,
+        slot_minutes: int = 15,
+        exclude_weekends: bool = True,
+    ) -> List[Dict]:
+        """
+        Find time slots when all ``users`` are free
+
+        Busy time comes from the users' meetings and mirrored calendars;
+        ``strategy`` is "best" or "earliest" (see availability.find_common_slots).
+        """
+        user_ids = sorted({user.id for user in users})
+        busy = attendee_busy_intervals(user_ids, start_date, end_date)
+        slots = find_common_slots(
+            busy,
+            start_date,
+            end_date,
+            duration_minutes,
+            strategy=strategy,
+            limit=limit,
+            slot_minutes=slot_minutes,
+            working_hours=self.preferred_meeting_hours,
+            exclude_weekends=exclude_weekends,
+        )
+        return [
+            {
+                "start_time": slot_start,
+                "end_time": slot_end,
+                "duration_minutes": duration_minutes,
+                "score": score,
+                "attendee_ids": user_ids,
+            }
+            for slot_start, slot_end, score in slots
+        ]
 
     def _calculate_meeting_load(self, daily_counts: Dict) -> str:
         """Calculate meeting load level"""
@@ -403,80 +396,21 @@ class IntelligentMeetingService:
     def analyze_meeting_patterns(self, user: User, days_back: int = 30) -> Dict:
         """Analyze user's meeting patterns for optimization"""
         try:
+            cache_key = f"meeting_patterns:{user.id}:{days_back}"
+            patterns = cache.get(cache_key)
+            if patterns is not None:
+                return patterns
+
             # Get meetings from the last N days
-            start_date = timezone.now() - timedelta(days=days_back)
             end_date = timezone.now()
+            start_date = end_date - timedelta(days=days_back)
+            meetings = MeetingColumns.load(user, start_date, end_date, now=end_date)
 
-            meetings = MeetingSession.objects.filter(
-                Q(organizer=user) | Q(participants__user=user),
-                scheduled_start_time__gte=start_date,
-                scheduled_start_time__lte=end_date,
-            ).distinct()
-
-            # Analyze patterns
-            patterns = {
-                "total_meetings": meetings.count(),
-                "avg_duration": 0,
-                "most_productive_hours": [],
-                "meeting_frequency_by_day": defaultdict(int),
-                "late_meetings_count": 0,
-                "cancelled_meetings_count": 0,
-                "meeting_types_distribution": defaultdict(int),
-            }
-
-            durations = []
-            hourly_productivity = defaultdict(list)
-
-            for meeting in meetings:
-                # Duration analysis
-                if meeting.duration_minutes:
-                    durations.append(meeting.duration_minutes)
-
-                # Day of week analysis
-                day_name = meeting.scheduled_start_time.strftime("%A")
-                patterns["meeting_frequency_by_day"][day_name] += 1
-
-                # Hour analysis with productivity score
-                hour = meeting.scheduled_start_time.hour
-                productivity_score = self._calculate_meeting_productivity_score(meeting)
-                hourly_productivity[hour].append(productivity_score)
-
-                # Late meetings
-                if meeting.actual_start_time and meeting.scheduled_start_time:
-                    delay_minutes = (
-                        meeting.actual_start_time - meeting.scheduled_start_time
-                    ).total_seconds() / 60
-                    if delay_minutes > self.late_meeting_threshold_minutes:
-                        patterns["late_meetings_count"] += 1
-
-                # Cancelled meetings
-                if meeting.status == MeetingSession.Status.CANCELLED:
-                    patterns["cancelled_meetings_count"] += 1
-
-                # Meeting type distribution
-                patterns["meeting_types_distribution"][meeting.meeting_type] += 1
-
-            # Calculate averages and insights
-            if durations:
-                patterns["avg_duration"] = round(sum(durations) / len(durations), 2)
-
-            # Find most productive hours
-            productive_hours = []
-            for hour, scores in hourly_productivity.items():
-                if scores:
-                    avg_score = sum(scores) / len(scores)
-                    productive_hours.append((hour, avg_score))
-
-            productive_hours.sort(key=lambda x: x[1], reverse=True)
-            patterns["most_productive_hours"] = [
-                hour for hour, score in productive_hours[:3]
-            ]
-
-            # Generate recommendations
+            patterns = meetings.patterns(self.late_meeting_threshold_minutes)
             patterns["recommendations"] = self._generate_pattern_recommendations(
                 patterns
             )
-
+            cache.set(cache_key, patterns, timeout=cache_ttl())
             return patterns
 
         except Exception as e:
@@ -485,47 +419,22 @@ class IntelligentMeetingService:
 
     def _calculate_meeting_productivity_score(self, meeting: MeetingSession) -> float:
         """Calculate a productivity score for a meeting based on various factors"""
-        score = 5.0  # Base score
-
-        # Factor in meeting duration (optimal around 30-60 minutes)
-        duration = meeting.duration_minutes or 60
-        if 30 <= duration <= 60:
-            score += 2
-        elif duration > 120:
-            score -= 1
-
-        # Factor in on-time start
+        duration = meeting.duration_minutes
+        delay = None
         if meeting.actual_start_time and meeting.scheduled_start_time:
-            delay_minutes = (
+            delay = (
                 meeting.actual_start_time - meeting.scheduled_start_time
             ).total_seconds() / 60
-            if delay_minutes <= 5:
-                score += 1
-            elif delay_minutes > 15:
-                score -= 1
-
-        # Factor in completion status
-        if meeting.status == MeetingSession.Status.ENDED:
-            score += 1
-        elif meeting.status == MeetingSession.Status.CANCELLED:
-            score -= 2
-
-        # Factor in participant engagement (based on participation duration)
-        participants = meeting.participants.all()
-        if participants:
-            engagement_scores = []
-            for participant in participants:
-                if participant.participation_duration_minutes > 0:
-                    engagement_ratio = (
-                        participant.participation_duration_minutes / duration
-                    )
-                    engagement_scores.append(min(engagement_ratio, 1.0))
 
-            if engagement_scores:
-                avg_engagement = sum(engagement_scores) / len(engagement_scores)
-                score += avg_engagement * 2
+        # Participant engagement, based on participation duration
+        ratios = [
+            engagement_ratio(participant.participation_duration_minutes, duration)
+            for participant in meeting.participants.all()
+            if participant.participation_duration_minutes > 0
+        ]
+        engagement = sum(ratios) / len(ratios) if ratios else None
 
-        return max(0, min(10, score))  # Clamp between 0 and 10
+        return productivity_score(duration, delay, meeting.status, engagement)
 
     def _generate_pattern_recommendations(self, patterns: Dict) -> List[str]:
         """Generate recommendations based on meeting patterns"""
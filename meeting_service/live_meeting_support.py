@@ -5,21 +5,70 @@ This service provides real-time conversation analysis, question suggestions,
 sentiment analysis, and key moment identification during active meetings.
 """
 
+import json
 import logging
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from django.core.cache import cache
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from ai_service.models import Lead
 from ai_service.services import GeminiAIService
 
+from .live_session_store import get_live_session_store
 from .models import Meeting
+from .sentiment_tracker import SentimentTracker
+from .trigger_engine import (
+    AnalysisDecision,
+    decide,
+    get_trigger_engine,
+    pending_flush_due,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump when the layout of the meeting context snapshot changes
+LIVE_CONTEXT_SCHEMA = 1
+
+# Lead and AI insights fields copied into the meeting context snapshot; saves
+# that touch none of them leave live snapshots valid
+LEAD_CONTEXT_FIELDS = (
+    "company_name",
+    "industry",
+    "company_size",
+    "pain_points",
+    "requirements",
+    "budget_info",
+    "timeline",
+    "decision_makers",
+    "current_solution",
+    "competitors_mentioned",
+)
+AI_INSIGHTS_CONTEXT_FIELDS = (
+    "lead_score",
+    "conversion_probability",
+    "quality_tier",
+    "key_strengths",
+    "improvement_areas",
+    "recommended_actions",
+)
+
+
+def live_meeting_group_name(meeting_id) -> str:
+    """Channels group shared by every client following a live meeting"""
+    return f"live_meeting_{meeting_id}"
+
+
+def to_jsonable(value):
+    """Convert datetimes etc. so a payload can be sent through the channel layer"""
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
 
 @dataclass
 class ConversationTurn:
@@ -31,6 +80,14 @@ class ConversationTurn:
     duration_seconds: Optional[float] = None
     confidence_score: Optional[float] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationTurn":
+        """Rebuild a turn read back from the live session store"""
+        data = dict(data)
+        if isinstance(data.get("timestamp"), str):
+            data["timestamp"] = parse_datetime(data["timestamp"])
+        return cls(**data)
+
 
 @dataclass
 class SentimentAnalysis:
@@ -162,7 +219,11 @@ class LiveMeetingSupportService:
         self.ai_service = GeminiAIService()
         self.conversation_buffer = []
         self.analysis_cache_timeout = 30  # seconds
-        self.min_analysis_interval = 10  # seconds between analyses
+        self.analysis_window_turns = 10  # turns sent to live analysis
+        self.analysis_lock_timeout = getattr(
+            settings, "LIVE_ANALYSIS_LOCK_TIMEOUT", 120
+        )  # seconds before a stuck worker's claim expires
+        self.session_store = get_live_session_store()
 
     def start_live_meeting_session(
         self, meeting_id: str, user_id: str
@@ -178,25 +239,33 @@ class LiveMeetingSupportService:
             dict: Session initialization result
         """
         try:
-            meeting = Meeting.objects.get(id=meeting_id)
+            meeting = Meeting.objects.select_related("lead", "lead__ai_insights").get(
+                id=meeting_id
+            )
 
             # Mark meeting as in progress
             meeting.mark_as_started()
 
-            # Initialize session cache
+            # Initialize session state; turns and history are appended later
             session_key = f"live_meeting_{meeting_id}"
-            session_data = {
-                "meeting_id": meeting_id,
-                "user_id": user_id,
-                "start_time": timezone.now().isoformat(),
-                "conversation_turns": [],
-                "last_analysis_time": None,
-                "key_moments": [],
-                "sentiment_history": [],
-                "question_suggestions": [],
-            }
+            self.session_store.create(
+                session_key,
+                {
+                    "meeting_id": str(meeting_id),
+                    "lead_id": str(meeting.lead_id),
+                    "user_id": user_id,
+                    "meeting_type": meeting.meeting_type,
+                    "start_time": timezone.now().isoformat(),
+                    "last_analysis_time": None,
+                },
+            )
 
-            cache.set(session_key, session_data, timeout=3600)  # 1 hour timeout
+            # Snapshot the meeting context once; live analysis reads it
+            # instead of the database
+            meeting_context = self._build_meeting_context(
+                meeting, self.session_store.context_version(meeting.lead_id)
+            )
+            self.session_store.set_context(session_key, meeting_context)
 
             # Get initial meeting context and questions
             initial_questions = self._generate_initial_questions(meeting)
@@ -210,9 +279,9 @@ class LiveMeetingSupportService:
                 "lead_company": meeting.lead.company_name,
                 "initial_questions": initial_questions,
                 "meeting_context": {
-                    "meeting_type": meeting.meeting_type,
-                    "lead_info": self._get_lead_context(meeting.lead),
-                    "ai_insights": self._get_ai_insights_context(meeting.lead),
+                    "meeting_type": meeting_context["meeting_type"],
+                    "lead_info": meeting_context["lead_info"],
+                    "ai_insights": meeting_context["ai_insights"],
                 },
             }
 
@@ -243,8 +312,8 @@ class LiveMeetingSupportService:
             dict: Real-time analysis results
         """
         try:
-            # Get session data
-            session_data = cache.get(session_id)
+            # Get session state (without the transcript)
+            session_data = self.session_store.get_state(session_id)
             if not session_data:
                 return {"success": False, "error": "Session not found or expired"}
 
@@ -257,44 +326,73 @@ class LiveMeetingSupportService:
                 confidence_score=self._calculate_transcription_confidence(content),
             )
 
-            # Add to session conversation history
-            session_data["conversation_turns"].append(asdict(conversation_turn))
+            # Append to the session transcript (atomic, constant cost)
+            session_data["turn_count"] = self.session_store.append_turn(
+                session_id, asdict(conversation_turn)
+            )
+            if not session_data["turn_count"]:
+                # The session expired since its state was read
+                return {"success": False, "error": "Session not found or expired"}
 
-            # Check if we should perform analysis
-            should_analyze = self._should_perform_analysis(session_data, content)
+            # Local sentiment and engagement, updated on every turn
+            tracker = SentimentTracker.for_session(session_data)
+            tracker.add_turn(speaker, content)
+            session_data["sentiment_tracker"] = tracker.to_state()
+            # A sharp local swing asks Gemini to recalibrate
+            session_data["sentiment_shift"] = tracker.sharp_change()
+
+            # Match the turn against the triggers and debounce
+            decision = self._plan_analysis(session_data, content)
+            run_async = getattr(settings, "LIVE_ANALYSIS_ASYNC", True)
+            schedule_flush = bool(decision.flush_in) and run_async
+            state_updates = {
+                "sentiment_tracker": session_data["sentiment_tracker"],
+                "pending_triggers": {} if decision.run_now else decision.triggers,
+            }
+            if schedule_flush:
+                state_updates["trigger_flush_scheduled"] = True
+            elif decision.run_now:
+                # This analysis takes the triggers a scheduled flush was for
+                state_updates["trigger_flush_scheduled"] = False
+            self.session_store.update_state(session_id, **state_updates)
+            if schedule_flush:
+                self._schedule_trigger_flush(session_id, decision.flush_in)
 
             analysis_result = None
-            if should_analyze:
-                # Perform real-time analysis
+            analysis_queued = False
+            analysis_trigger = decision.as_trigger() if decision.run_now else None
+            if decision.run_now and run_async:
+                # Hand off to the live analysis workers; results are pushed
+                # to the meeting's Channels group
+                self.request_live_analysis(
+                    session_id,
+                    session_data["turn_count"],
+                    turn_timestamp,
+                    trigger=analysis_trigger,
+                )
+                analysis_queued = True
+            elif decision.run_now:
+                # Perform real-time analysis inline
                 analysis_result = self._perform_live_analysis(
-                    session_data, conversation_turn
+                    session_id, session_data, conversation_turn
+                )
+                self.session_store.update_state(
+                    session_id,
+                    last_analysis_time=turn_timestamp.isoformat(),
+                    analysis_trigger=analysis_trigger,
                 )
-                session_data["last_analysis_time"] = turn_timestamp.isoformat()
-
-            # Update session cache
-            cache.set(session_id, session_data, timeout=3600)
 
             response = {
                 "success": True,
                 "conversation_turn": asdict(conversation_turn),
-                "analysis_performed": should_analyze,
+                "live_sentiment": tracker.snapshot(),
+                "analysis_performed": analysis_result is not None,
+                "analysis_queued": analysis_queued,
+                "analysis_trigger": analysis_trigger,
             }
 
             if analysis_result:
-                response.update(
-                    {
-                        "sentiment_analysis": asdict(
-                            analysis_result.sentiment_analysis
-                        ),
-                        "key_moments": [
-                            asdict(moment) for moment in analysis_result.key_moments
-                        ],
-                        "question_suggestions": [
-                            asdict(q) for q in analysis_result.question_suggestions
-                        ],
-                        "meeting_progress": analysis_result.meeting_progress,
-                    }
-                )
+                response.update(self._serialize_live_analysis(analysis_result))
 
             return response
 
@@ -313,12 +411,12 @@ class LiveMeetingSupportService:
             dict: Current suggestions and analysis
         """
         try:
-            session_data = cache.get(session_id)
+            session_data = self.session_store.get_state(session_id)
             if not session_data:
                 return {"success": False, "error": "Session not found or expired"}
 
             # Get recent conversation context
-            recent_turns = session_data["conversation_turns"][-10:]  # Last 10 turns
+            recent_turns = self.session_store.recent_turns(session_id, 10)
 
             if not recent_turns:
                 return {
@@ -333,14 +431,14 @@ class LiveMeetingSupportService:
 
             # Generate current suggestions
             suggestions = self._generate_contextual_suggestions(
-                conversation_text, session_data["meeting_id"]
+                conversation_text, self.get_meeting_context(session_id, session_data)
             )
 
-            # Get current sentiment
-            sentiment = self._analyze_current_sentiment(recent_turns)
+            # Get current sentiment (local tracker, no AI call)
+            sentiment = SentimentTracker.for_session(session_data).snapshot()
 
             # Get recent key moments
-            recent_moments = session_data.get("key_moments", [])[-5:]  # Last 5 moments
+            recent_moments = self.session_store.key_moments(session_id, 5)
 
             return {
                 "success": True,
@@ -997,7 +1095,7 @@ class LiveMeetingSupportService:
             dict: Final meeting summary and analysis
         """
         try:
-            session_data = cache.get(session_id)
+            session_data = self.session_store.get_state(session_id)
             if not session_data:
                 return {"success": False, "error": "Session not found or expired"}
 
@@ -1009,22 +1107,22 @@ class LiveMeetingSupportService:
 
             # Generate final meeting summary
             conversation_turns = [
-                ConversationTurn(**turn_data)
-                for turn_data in session_data["conversation_turns"]
+                ConversationTurn.from_dict(turn_data)
+                for turn_data in self.session_store.all_turns(session_id)
             ]
 
             final_summary = self._generate_final_meeting_summary(
                 conversation_turns,
-                session_data.get("key_moments", []),
-                session_data.get("sentiment_history", []),
+                self.session_store.key_moments(session_id),
+                self.session_store.sentiment_history(session_id),
             )
 
             # Update meeting with AI insights
             meeting.ai_insights = final_summary
             meeting.save()
 
-            # Clean up session cache
-            cache.delete(session_id)
+            # Clean up session state
+            self.session_store.delete(session_id)
 
             logger.info(f"Ended live meeting session for meeting {meeting_id}")
 
@@ -1040,8 +1138,274 @@ class LiveMeetingSupportService:
             logger.error(f"Error ending live meeting session: {e}")
             return {"success": False, "error": str(e)}
 
+    def request_live_analysis(
+        self,
+        session_id: str,
+        turn_count: int,
+        requested_at: datetime = None,
+        trigger: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Ask the live analysis workers to analyse a session up to ``turn_count``
+
+        Only one analysis runs per meeting. If a worker is already busy with
+        this session the request is just recorded, and the worker picks up
+        the newest request when it finishes, skipping any in between.
+        ``trigger`` (reasons and score) is reported with the result.
+
+        Returns:
+            bool: True if a worker task was queued
+        """
+        from .tasks import run_live_analysis
+
+        self.session_store.update_state(
+            session_id,
+            analysis_requested_turn=turn_count,
+            last_analysis_time=(requested_at or timezone.now()).isoformat(),
+            analysis_trigger=trigger,
+        )
+        if not self.session_store.claim_analysis(
+            session_id, self.analysis_lock_timeout
+        ):
+            return False
+
+        try:
+            run_live_analysis.delay(session_id)
+        except Exception:
+            self.session_store.release_analysis(session_id)
+            raise
+        return True
+
+    def flush_pending_triggers(self, session_id: str) -> bool:
+        """
+        Run the analysis for triggers coalesced during the debounce window
+
+        Scheduled by process_conversation_turn when a priority trigger fires
+        inside the window. Reschedules itself if an analysis started since.
+
+        Returns:
+            bool: True if an analysis was requested
+        """
+        session_data = self.session_store.get_state(session_id)
+        if not session_data:
+            return False
+
+        due, remaining = pending_flush_due(session_data)
+        if not due:
+            self._schedule_trigger_flush(session_id, remaining)
+            return False
+
+        pending = session_data.get("pending_triggers") or {}
+        self.session_store.update_state(
+            session_id, pending_triggers={}, trigger_flush_scheduled=False
+        )
+        if not pending:
+            # An analysis after the window already took the triggers
+            return False
+
+        self.request_live_analysis(
+            session_id,
+            session_data["turn_count"],
+            trigger=AnalysisDecision(run_now=True, triggers=pending).as_trigger(),
+        )
+        return True
+
+    def _schedule_trigger_flush(self, session_id: str, delay: float):
+        from .tasks import flush_live_analysis_triggers
+
+        try:
+            flush_live_analysis_triggers.apply_async(
+                (session_id,), countdown=max(delay, 0)
+            )
+        except Exception as e:
+            # The next turn after the window still takes the triggers, and
+            # a later priority trigger may schedule a flush again
+            logger.warning(f"Could not schedule trigger flush for {session_id}: {e}")
+            self.session_store.update_state(session_id, trigger_flush_scheduled=False)
+
+    def run_pending_analysis(self, session_id: str) -> int:
+        """
+        Worker side of request_live_analysis; the caller holds the claim
+
+        Runs analyses until the latest requested turn has been analysed,
+        pushing each result to the meeting's group, then releases the claim.
+
+        Returns:
+            int: Number of analyses run
+        """
+        runs = 0
+        while True:
+            session_data = self.session_store.get_state(session_id)
+            if self._analysis_pending(session_data):
+                self.session_store.extend_analysis(
+                    session_id, self.analysis_lock_timeout
+                )
+                self._run_live_analysis(session_id, session_data)
+                runs += 1
+                continue
+
+            self.session_store.release_analysis(session_id)
+            # A request may have arrived between the check and the release
+            session_data = self.session_store.get_state(session_id)
+            if not self._analysis_pending(session_data):
+                return runs
+            if not self.session_store.claim_analysis(
+                session_id, self.analysis_lock_timeout
+            ):
+                return runs
+
+    def _analysis_pending(self, session_data: Optional[Dict[str, Any]]) -> bool:
+        if not session_data:
+            return False
+        requested = session_data.get("analysis_requested_turn") or 0
+        return requested > (session_data.get("analysis_completed_turn") or 0)
+
+    def _run_live_analysis(self, session_id: str, session_data: Dict[str, Any]):
+        requested = session_data["analysis_requested_turn"]
+        skipped = requested - (session_data.get("analysis_completed_turn") or 0) - 1
+        if skipped > 0:
+            logger.debug(f"Live analysis for {session_id} superseded {skipped} turns")
+
+        analysis_result = self._perform_live_analysis(session_id, session_data)
+        self.session_store.update_state(session_id, analysis_completed_turn=requested)
+
+        payload = self._serialize_live_analysis(analysis_result)
+        payload.update(
+            {
+                "session_id": session_id,
+                "meeting_id": session_data["meeting_id"],
+                # Clients drop results older than the last one they applied
+                "turn_count": requested,
+                "analysis_timestamp": analysis_result.analysis_timestamp.isoformat(),
+                "trigger": session_data.get("analysis_trigger"),
+            }
+        )
+        self.publish_live_analysis(session_data["meeting_id"], payload)
+
+    def publish_live_analysis(self, meeting_id: str, payload: Dict[str, Any]):
+        """Push an analysis result to everyone following the meeting"""
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                live_meeting_group_name(meeting_id),
+                {"type": "live_analysis", "analysis": to_jsonable(payload)},
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not push live analysis for meeting {meeting_id}: {e}"
+            )
+
+    def _serialize_live_analysis(
+        self, analysis_result: LiveAnalysisResult
+    ) -> Dict[str, Any]:
+        return {
+            "sentiment_analysis": asdict(analysis_result.sentiment_analysis),
+            "key_moments": [asdict(moment) for moment in analysis_result.key_moments],
+            "question_suggestions": [
+                asdict(q) for q in analysis_result.question_suggestions
+            ],
+            "meeting_progress": analysis_result.meeting_progress,
+            "intervention_alerts": (
+                [
+                    asdict(alert)
+                    for alert in analysis_result.meeting_guidance.intervention_alerts
+                ]
+                if analysis_result.meeting_guidance
+                else []
+            ),
+        }
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Scalar state of a live session (meeting_id, turn_count, ...)"""
+        return self.session_store.get_state(session_id)
+
+    def get_session_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current session view for a newly connected client, without any AI calls
+
+        Returns:
+            dict: Turn count, recent turns, latest suggestions, recent key
+                moments and sentiment, or None if the session has expired
+        """
+        session_data = self.session_store.get_state(session_id)
+        if not session_data:
+            return None
+        return {
+            "session_id": session_id,
+            "meeting_id": session_data["meeting_id"],
+            "start_time": session_data.get("start_time"),
+            "turn_count": session_data["turn_count"],
+            "recent_turns": self.session_store.recent_turns(
+                session_id, self.analysis_window_turns
+            ),
+            "question_suggestions": self.session_store.get_suggestions(session_id),
+            "key_moments": self.session_store.key_moments(session_id, 5),
+            "sentiment": next(
+                iter(self.session_store.sentiment_history(session_id, 1)), None
+            ),
+        }
+
+    def get_recent_turns(
+        self, session_id: str, count: Optional[int] = None
+    ) -> List[ConversationTurn]:
+        """The last ``count`` turns of a live session (all if None), oldest first"""
+        if count is None:
+            turns = self.session_store.all_turns(session_id)
+        else:
+            turns = self.session_store.recent_turns(session_id, count)
+        return [ConversationTurn.from_dict(turn_data) for turn_data in turns]
+
+    def get_meeting_context(
+        self, session_id: str, session_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Meeting, lead and AI insights context for live analysis
+
+        Served from the snapshot taken at session start, so the live path
+        makes no database queries. The snapshot is rebuilt only after the
+        lead's context version has been bumped (the lead or its insights
+        changed) or the snapshot layout has changed.
+        """
+        context, version = self.session_store.get_context(
+            session_id, session_data.get("lead_id")
+        )
+        if (
+            context is not None
+            and context.get("schema") == LIVE_CONTEXT_SCHEMA
+            and context.get("version") == version
+        ):
+            return context
+
+        meeting = Meeting.objects.select_related("lead", "lead__ai_insights").get(
+            id=session_data["meeting_id"]
+        )
+        if not session_data.get("lead_id"):
+            # Sessions started before snapshots existed; record the lead so
+            # its changes reach this session from now on
+            self.session_store.update_state(session_id, lead_id=str(meeting.lead_id))
+            version = self.session_store.context_version(meeting.lead_id)
+        context = self._build_meeting_context(meeting, version)
+        self.session_store.set_context(session_id, context)
+        logger.debug(f"Rebuilt meeting context for {session_id} at version {version}")
+        return context
+
     # Private helper methods
 
+    def _build_meeting_context(self, meeting: Meeting, version: int) -> Dict[str, Any]:
+        """Compact, JSON-serializable snapshot of a meeting's context"""
+        return {
+            "schema": LIVE_CONTEXT_SCHEMA,
+            "version": version,
+            "meeting_id": str(meeting.id),
+            "meeting_type": meeting.meeting_type,
+            "company_name": meeting.lead.company_name,
+            "industry": meeting.lead.industry,
+            "lead_info": self._get_lead_context(meeting.lead),
+            "ai_insights": self._get_ai_insights_context(meeting.lead),
+        }
+
     def _generate_initial_questions(self, meeting: Meeting) -> List[Dict[str, Any]]:
         """Generate initial questions for the meeting start"""
         try:
@@ -1102,30 +1466,15 @@ class LiveMeetingSupportService:
 
     def _get_lead_context(self, lead: Lead) -> Dict[str, Any]:
         """Get lead context for meeting analysis"""
-        return {
-            "company_name": lead.company_name,
-            "industry": lead.industry,
-            "company_size": lead.company_size,
-            "pain_points": lead.pain_points,
-            "requirements": lead.requirements,
-            "budget_info": lead.budget_info,
-            "timeline": lead.timeline,
-            "decision_makers": lead.decision_makers,
-            "current_solution": lead.current_solution,
-            "competitors_mentioned": lead.competitors_mentioned,
-        }
+        return {field: getattr(lead, field) for field in LEAD_CONTEXT_FIELDS}
 
     def _get_ai_insights_context(self, lead: Lead) -> Dict[str, Any]:
         """Get AI insights context for meeting analysis"""
         try:
             ai_insights = lead.ai_insights
             return {
-                "lead_score": ai_insights.lead_score,
-                "conversion_probability": ai_insights.conversion_probability,
-                "quality_tier": ai_insights.quality_tier,
-                "key_strengths": ai_insights.key_strengths,
-                "improvement_areas": ai_insights.improvement_areas,
-                "recommended_actions": ai_insights.recommended_actions,
+                field: getattr(ai_insights, field)
+                for field in AI_INSIGHTS_CONTEXT_FIELDS
             }
         except:
             return {}
@@ -1323,79 +1672,33 @@ class LiveMeetingSupportService:
                 guidance_timestamp=timezone.now(),
             )
 
-    def _should_perform_analysis(
+    def _plan_analysis(
         self, session_data: Dict[str, Any], content: str
-    ) -> bool:
-        """Determine if we should perform real-time analysis"""
-        # Check minimum interval
-        last_analysis = session_data.get("last_analysis_time")
-        if last_analysis:
-            last_time = datetime.fromisoformat(last_analysis.replace("Z", "+00:00"))
-            if (
-                timezone.now() - last_time
-            ).total_seconds() < self.min_analysis_interval:
-                return False
-
-        # Check content significance
-        significant_keywords = [
-            "budget",
-            "cost",
-            "price",
-            "decision",
-            "approve",
-            "timeline",
-            "when",
-            "problem",
-            "challenge",
-            "issue",
-            "need",
-            "require",
-            "solution",
-            "competitor",
-            "alternative",
-            "currently",
-            "using",
-            "interested",
-            "concerned",
-            "worried",
-            "hesitant",
-            "excited",
-            "impressed",
-        ]
-
-        content_lower = content.lower()
-        has_significant_content = any(
-            keyword in content_lower for keyword in significant_keywords
-        )
-
-        # Analyze if content is significant or enough turns have passed
-        turn_count = len(session_data.get("conversation_turns", []))
-        return has_significant_content or turn_count % 5 == 0  # Every 5 turns minimum
+    ) -> AnalysisDecision:
+        """Match the turn against the configured triggers and debounce"""
+        matched = get_trigger_engine().match(content, session_data.get("meeting_type"))
+        return decide(session_data, matched)
 
     def _perform_live_analysis(
-        self, session_data: Dict[str, Any], current_turn: ConversationTurn
+        self,
+        session_id: str,
+        session_data: Dict[str, Any],
+        current_turn: Optional[ConversationTurn] = None,
     ) -> LiveAnalysisResult:
         """Perform comprehensive live analysis"""
         try:
-            # Get meeting context
-            meeting_id = session_data["meeting_id"]
-            meeting = Meeting.objects.get(id=meeting_id)
-            meeting_context = {
-                "meeting_type": meeting.meeting_type,
-                "lead_info": self._get_lead_context(meeting.lead),
-                "ai_insights": self._get_ai_insights_context(meeting.lead),
-            }
+            # Get meeting context (snapshot, no database access)
+            meeting_context = self.get_meeting_context(session_id, session_data)
 
             # Get recent conversation turns
-            conversation_turns = [
-                ConversationTurn(**turn_data)
-                for turn_data in session_data["conversation_turns"][
-                    -10:
-                ]  # Last 10 turns
-            ]
+            conversation_turns = self.get_recent_turns(
+                session_id, self.analysis_window_turns
+            )
 
             # Perform various analyses
-            sentiment_analysis = self.analyze_conversation_sentiment(conversation_turns)
+            sentiment_analysis = self._tracked_sentiment(
+                session_id, session_data, conversation_turns
+            )
             key_moments = self.identify_key_moments(conversation_turns, meeting_context)
             question_suggestions = self.generate_next_question_suggestions(
                 conversation_turns, meeting_context
@@ -1407,14 +1710,14 @@ class LiveMeetingSupportService:
                 conversation_turns, meeting_context
             )
 
-            # Update session data with new analysis
-            session_data["key_moments"].extend(
-                [asdict(moment) for moment in key_moments]
+            # Update session history with new analysis
+            self.session_store.add_key_moments(
+                session_id, [asdict(moment) for moment in key_moments]
+            )
+            self.session_store.add_sentiment(session_id, asdict(sentiment_analysis))
+            self.session_store.set_suggestions(
+                session_id, [asdict(q) for q in question_suggestions]
             )
-            session_data["sentiment_history"].append(asdict(sentiment_analysis))
-            session_data["question_suggestions"] = [
-                asdict(q) for q in question_suggestions
-            ]
 
             # Create comprehensive analysis result
             analysis_result = LiveAnalysisResult(
@@ -1463,6 +1766,30 @@ class LiveMeetingSupportService:
                 confidence_score=0.0,
             )
 
+    def _tracked_sentiment(
+        self,
+        session_id: str,
+        session_data: Dict[str, Any],
+        conversation_turns: List[ConversationTurn],
+    ) -> SentimentAnalysis:
+        """
+        Sentiment from the local tracker, calibrated with Gemini only when
+        the tracker asks for it (periodically or after a sharp swing)
+        """
+        tracker = SentimentTracker.for_session(session_data)
+        reason = tracker.calibration_reason()
+        if reason and conversation_turns:
+            reading = self.analyze_conversation_sentiment(conversation_turns)
+            # A failed call comes back as a zero-confidence neutral default
+            if reading.confidence_level > 0:
+                tracker.calibrate(
+                    reading.sentiment_score, reading.engagement_score, reason
+                )
+                self.session_store.update_state(
+                    session_id, sentiment_calibration=tracker.calibration_state()
+                )
+        return SentimentAnalysis(**tracker.snapshot())
+
     def _calculate_analysis_confidence(
         self,
         sentiment_analysis: SentimentAnalysis,
@@ -1568,24 +1895,16 @@ class LiveMeetingSupportService:
         return "\n".join([f"{turn['speaker']}: {turn['content']}" for turn in turns])
 
     def _generate_contextual_suggestions(
-        self, conversation_text: str, meeting_id: str
+        self, conversation_text: str, meeting_context: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Generate contextual suggestions based on current conversation"""
         try:
-            meeting = Meeting.objects.get(id=meeting_id)
             conversation_turns = [
                 ConversationTurn(
                     timestamp=timezone.now(), speaker="mixed", content=conversation_text
                 )
             ]
 
-            meeting_context = {
-                "meeting_type": meeting.meeting_type,
-                "company_name": meeting.lead.company_name,
-                "industry": meeting.lead.industry,
-                "lead_info": self._get_lead_context(meeting.lead),
-            }
-
             suggestions = self.generate_next_question_suggestions(
                 conversation_turns, meeting_context
             )
@@ -1600,7 +1919,7 @@ class LiveMeetingSupportService:
     ) -> Dict[str, Any]:
         """Analyze current sentiment from recent turns"""
         try:
-            turns = [ConversationTurn(**turn_data) for turn_data in recent_turns]
+            turns = [ConversationTurn.from_dict(turn_data) for turn_data in recent_turns]
             sentiment = self.analyze_conversation_sentiment(turns)
             return asdict(sentiment)
         except Exception as e:
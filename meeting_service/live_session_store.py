@@ -0,0 +1,429 @@
+"""
+Incremental storage for live meeting sessions
+
+A live session used to be one cached dict holding the whole transcript, so
+every conversation turn re-pickled everything said so far (O(n) per turn,
+O(n^2) per meeting) and two speakers posting at once could overwrite each
+other's turns. The Redis store keeps each part of a session under its own
+key instead:
+
+- ``<session_id>:state``: hash of scalar fields (meeting_id, user_id,
+  start_time, last_analysis_time, ...)
+- ``<session_id>:turns``: list of conversation turns, appended with RPUSH
+- ``<session_id>:key_moments`` and ``<session_id>:sentiment``: streams
+  capped at LIVE_SESSION_HISTORY_MAXLEN entries
+- ``<session_id>:suggestions``: the latest question suggestions
+- ``<session_id>:context``: meeting/lead/insights context snapshot taken at
+  session start, tagged with the lead's context version
+- ``<session_id>:analysis``: claim held by the worker analysing the session
+
+Appending a turn is a single Lua script (RPUSH plus TTL refreshes, only if
+the session's state still exists) whatever the length of the meeting, and
+readers fetch only the last N turns. The TTL
+(LIVE_SESSION_TTL) slides on every turn, so long meetings stay alive while
+abandoned sessions expire.
+
+``live_context_version:<lead_id>`` counts changes to a lead's context. It is
+bumped when the lead or its AI insights are saved during a live meeting;
+a snapshot tagged with an older version is rebuilt on its next use.
+
+``LocalLiveSessionStore`` implements the same interface in process memory
+for tests and single-process development (LIVE_SESSION_STORE = "local").
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ai_service.redis_client import get_redis
+
+STATE_SUFFIX = "state"
+TURNS_SUFFIX = "turns"
+KEY_MOMENTS_SUFFIX = "key_moments"
+SENTIMENT_SUFFIX = "sentiment"
+SUGGESTIONS_SUFFIX = "suggestions"
+ANALYSIS_SUFFIX = "analysis"
+CONTEXT_SUFFIX = "context"
+
+SESSION_SUFFIXES = (
+    STATE_SUFFIX,
+    TURNS_SUFFIX,
+    KEY_MOMENTS_SUFFIX,
+    SENTIMENT_SUFFIX,
+    SUGGESTIONS_SUFFIX,
+    CONTEXT_SUFFIX,
+)
+# The analysis claim has its own, shorter expiry and is not refreshed per turn
+ALL_SUFFIXES = SESSION_SUFFIXES + (ANALYSIS_SUFFIX,)
+
+
+# Appending to an expired session must not recreate its turn list on its own
+_APPEND_TURN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local count = redis.call('RPUSH', KEYS[2], ARGV[1])
+for i = 1, #KEYS do
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return count
+"""
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, cls=DjangoJSONEncoder)
+
+
+def _loads(value):
+    return json.loads(value) if value is not None else None
+
+
+def _context_version_key(lead_id) -> str:
+    return f"live_context_version:{lead_id}"
+
+
+class LiveSessionStore:
+    """Redis-backed live session store (see module docstring for the layout)"""
+
+    def __init__(self, client=None, ttl: int = None, history_maxlen: int = None):
+        self._client = client
+        self.ttl = ttl or getattr(settings, "LIVE_SESSION_TTL", 3600)
+        self.history_maxlen = history_maxlen or getattr(
+            settings, "LIVE_SESSION_HISTORY_MAXLEN", 500
+        )
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else get_redis()
+
+    def _key(self, session_id: str, suffix: str) -> str:
+        return f"{session_id}:{suffix}"
+
+    def _touch(self, pipe, session_id: str):
+        for suffix in SESSION_SUFFIXES:
+            pipe.expire(self._key(session_id, suffix), self.ttl)
+
+    # Session state
+
+    def create(self, session_id: str, state: Dict[str, Any]):
+        """Start a session, discarding anything left from a previous one"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(*(self._key(session_id, suffix) for suffix in ALL_SUFFIXES))
+        pipe.hset(
+            self._key(session_id, STATE_SUFFIX),
+            mapping={field: _dumps(value) for field, value in state.items()},
+        )
+        pipe.expire(self._key(session_id, STATE_SUFFIX), self.ttl)
+        pipe.execute()
+
+    def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Scalar session fields plus ``turn_count``, or None if expired"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self._key(session_id, STATE_SUFFIX))
+        pipe.llen(self._key(session_id, TURNS_SUFFIX))
+        raw_state, turn_count = pipe.execute()
+        if not raw_state:
+            return None
+        state = {field: _loads(value) for field, value in raw_state.items()}
+        state["turn_count"] = turn_count
+        return state
+
+    def update_state(self, session_id: str, **fields):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(
+            self._key(session_id, STATE_SUFFIX),
+            mapping={field: _dumps(value) for field, value in fields.items()},
+        )
+        self._touch(pipe, session_id)
+        pipe.execute()
+
+    def delete(self, session_id: str):
+        self.client.delete(*(self._key(session_id, suffix) for suffix in ALL_SUFFIXES))
+
+    # Conversation turns
+
+    def append_turn(self, session_id: str, turn: Dict[str, Any]) -> int:
+        """
+        Append a turn atomically; returns the new number of turns, or 0 if
+        the session has expired
+        """
+        # STATE_SUFFIX and TURNS_SUFFIX come first, as the script expects
+        keys = [self._key(session_id, suffix) for suffix in SESSION_SUFFIXES]
+        return int(
+            self.client.eval(
+                _APPEND_TURN_SCRIPT, len(keys), *keys, _dumps(turn), self.ttl
+            )
+        )
+
+    def recent_turns(self, session_id: str, count: int) -> List[Dict[str, Any]]:
+        """The last ``count`` turns, oldest first"""
+        raw = self.client.lrange(self._key(session_id, TURNS_SUFFIX), -count, -1)
+        return [_loads(item) for item in raw]
+
+    def all_turns(self, session_id: str) -> List[Dict[str, Any]]:
+        raw = self.client.lrange(self._key(session_id, TURNS_SUFFIX), 0, -1)
+        return [_loads(item) for item in raw]
+
+    # Capped history streams
+
+    def _append_history(self, session_id: str, suffix: str, entries: List[Any]):
+        if not entries:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        for entry in entries:
+            pipe.xadd(
+                self._key(session_id, suffix),
+                {"data": _dumps(entry)},
+                maxlen=self.history_maxlen,
+                approximate=True,
+            )
+        self._touch(pipe, session_id)
+        pipe.execute()
+
+    def _read_history(
+        self, session_id: str, suffix: str, count: Optional[int]
+    ) -> List[Any]:
+        key = self._key(session_id, suffix)
+        if count is None:
+            entries = self.client.xrange(key)
+        else:
+            entries = list(reversed(self.client.xrevrange(key, count=count)))
+        return [_loads(fields["data"]) for _, fields in entries]
+
+    def add_key_moments(self, session_id: str, moments: List[Dict[str, Any]]):
+        self._append_history(session_id, KEY_MOMENTS_SUFFIX, moments)
+
+    def key_moments(self, session_id: str, count: int = None) -> List[Dict[str, Any]]:
+        """Key moments, oldest first (the last ``count`` if given)"""
+        return self._read_history(session_id, KEY_MOMENTS_SUFFIX, count)
+
+    def add_sentiment(self, session_id: str, sentiment: Dict[str, Any]):
+        self._append_history(session_id, SENTIMENT_SUFFIX, [sentiment])
+
+    def sentiment_history(
+        self, session_id: str, count: int = None
+    ) -> List[Dict[str, Any]]:
+        return self._read_history(session_id, SENTIMENT_SUFFIX, count)
+
+    # Latest suggestions
+
+    def set_suggestions(self, session_id: str, suggestions: List[Dict[str, Any]]):
+        self.client.set(
+            self._key(session_id, SUGGESTIONS_SUFFIX), _dumps(suggestions), ex=self.ttl
+        )
+
+    def get_suggestions(self, session_id: str) -> List[Dict[str, Any]]:
+        return _loads(self.client.get(self._key(session_id, SUGGESTIONS_SUFFIX))) or []
+
+    # Meeting context snapshot
+
+    def set_context(self, session_id: str, context: Dict[str, Any]):
+        self.client.set(
+            self._key(session_id, CONTEXT_SUFFIX), _dumps(context), ex=self.ttl
+        )
+
+    def get_context(self, session_id: str, lead_id) -> Tuple[Optional[Dict], int]:
+        """The session's context snapshot and the lead's current context version"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self._key(session_id, CONTEXT_SUFFIX))
+        pipe.get(_context_version_key(lead_id))
+        raw_context, version = pipe.execute()
+        return _loads(raw_context), int(version or 0)
+
+    def context_version(self, lead_id) -> int:
+        return int(self.client.get(_context_version_key(lead_id)) or 0)
+
+    def bump_context_version(self, lead_id) -> int:
+        """Mark every snapshot of the lead's context as stale"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.incr(_context_version_key(lead_id))
+        pipe.expire(_context_version_key(lead_id), self.ttl)
+        return pipe.execute()[0]
+
+    # Analysis claim (one analysis in flight per session)
+
+    def claim_analysis(self, session_id: str, timeout: int) -> bool:
+        """Claim the session's analysis slot; False if a worker already holds it"""
+        return bool(
+            self.client.set(
+                self._key(session_id, ANALYSIS_SUFFIX), "1", nx=True, ex=timeout
+            )
+        )
+
+    def extend_analysis(self, session_id: str, timeout: int):
+        self.client.expire(self._key(session_id, ANALYSIS_SUFFIX), timeout)
+
+    def release_analysis(self, session_id: str):
+        self.client.delete(self._key(session_id, ANALYSIS_SUFFIX))
+
+
+class _LocalSession:
+    def __init__(self, history_maxlen: int):
+        self.state: Dict[str, Any] = {}
+        self.turns: List[Dict[str, Any]] = []
+        self.key_moments = deque(maxlen=history_maxlen)
+        self.sentiment = deque(maxlen=history_maxlen)
+        self.suggestions: List[Dict[str, Any]] = []
+        self.context: Optional[Dict[str, Any]] = None
+        self.analysis_claimed_until = 0.0
+        self.expires_at = 0.0
+
+
+class LocalLiveSessionStore:
+    """In-process live session store with the same interface and semantics"""
+
+    _sessions: Dict[str, _LocalSession] = {}
+    _context_versions: Dict[str, int] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: int = None, history_maxlen: int = None):
+        self.ttl = ttl or getattr(settings, "LIVE_SESSION_TTL", 3600)
+        self.history_maxlen = history_maxlen or getattr(
+            settings, "LIVE_SESSION_HISTORY_MAXLEN", 500
+        )
+
+    def _get(self, session_id: str, touch: bool = False) -> Optional[_LocalSession]:
+        session = self._sessions.get(session_id)
+        if session is None or session.expires_at <= time.time():
+            self._sessions.pop(session_id, None)
+            return None
+        if touch:
+            session.expires_at = time.time() + self.ttl
+        return session
+
+    # Values round-trip through JSON so both stores return the same types
+    def _copy(self, value):
+        return _loads(_dumps(value))
+
+    def create(self, session_id: str, state: Dict[str, Any]):
+        session = _LocalSession(self.history_maxlen)
+        session.state = self._copy(state)
+        session.expires_at = time.time() + self.ttl
+        with self._lock:
+            self._sessions[session_id] = session
+
+    def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            if session is None:
+                return None
+            return dict(session.state, turn_count=len(session.turns))
+
+    def update_state(self, session_id: str, **fields):
+        with self._lock:
+            session = self._get(session_id, touch=True)
+            if session is not None:
+                session.state.update(self._copy(fields))
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def append_turn(self, session_id: str, turn: Dict[str, Any]) -> int:
+        with self._lock:
+            session = self._get(session_id, touch=True)
+            if session is None:
+                return 0
+            session.turns.append(self._copy(turn))
+            return len(session.turns)
+
+    def recent_turns(self, session_id: str, count: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            return list(session.turns[-count:]) if session else []
+
+    def all_turns(self, session_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            return list(session.turns) if session else []
+
+    def add_key_moments(self, session_id: str, moments: List[Dict[str, Any]]):
+        with self._lock:
+            session = self._get(session_id, touch=True)
+            if session is not None:
+                session.key_moments.extend(self._copy(moments))
+
+    def key_moments(self, session_id: str, count: int = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            moments = list(session.key_moments) if session else []
+        return moments[-count:] if count else moments
+
+    def add_sentiment(self, session_id: str, sentiment: Dict[str, Any]):
+        with self._lock:
+            session = self._get(session_id, touch=True)
+            if session is not None:
+                session.sentiment.append(self._copy(sentiment))
+
+    def sentiment_history(
+        self, session_id: str, count: int = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            history = list(session.sentiment) if session else []
+        return history[-count:] if count else history
+
+    def set_suggestions(self, session_id: str, suggestions: List[Dict[str, Any]]):
+        with self._lock:
+            session = self._get(session_id)
+            if session is not None:
+                session.suggestions = self._copy(suggestions)
+
+    def get_suggestions(self, session_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            session = self._get(session_id)
+            return list(session.suggestions) if session else []
+
+    def set_context(self, session_id: str, context: Dict[str, Any]):
+        with self._lock:
+            session = self._get(session_id)
+            if session is not None:
+                session.context = self._copy(context)
+
+    def get_context(self, session_id: str, lead_id) -> Tuple[Optional[Dict], int]:
+        with self._lock:
+            session = self._get(session_id)
+            context = self._copy(session.context) if session else None
+            return context, self._context_versions.get(str(lead_id), 0)
+
+    def context_version(self, lead_id) -> int:
+        with self._lock:
+            return self._context_versions.get(str(lead_id), 0)
+
+    def bump_context_version(self, lead_id) -> int:
+        with self._lock:
+            version = self._context_versions.get(str(lead_id), 0) + 1
+            self._context_versions[str(lead_id)] = version
+            return version
+
+    def claim_analysis(self, session_id: str, timeout: int) -> bool:
+        with self._lock:
+            session = self._get(session_id)
+            if session is None or session.analysis_claimed_until > time.time():
+                return False
+            session.analysis_claimed_until = time.time() + timeout
+            return True
+
+    def extend_analysis(self, session_id: str, timeout: int):
+        with self._lock:
+            session = self._get(session_id)
+            if session is not None:
+                session.analysis_claimed_until = time.time() + timeout
+
+    def release_analysis(self, session_id: str):
+        with self._lock:
+            session = self._get(session_id)
+            if session is not None:
+                session.analysis_claimed_until = 0.0
+
+
+def get_live_session_store():
+    """Store selected by LIVE_SESSION_STORE ("redis" or "local")"""
+    if getattr(settings, "LIVE_SESSION_STORE", "redis") == "local":
+        return LocalLiveSessionStore()
+    return LiveSessionStore()
@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meeting_service.meeting_stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Build the daily meeting stats rollup from existing meetings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            help="First day to rebuild (YYYY-MM-DD); defaults to the first meeting",
+        )
+        parser.add_argument(
+            "--end",
+            help="Last day to rebuild (YYYY-MM-DD); defaults to the latest meeting",
+        )
+        parser.add_argument(
+            "--batch-days", type=int, default=31, help="Days rebuilt per transaction"
+        )
+
+    def handle(self, *args, **options):
+        start = self._parse_date(options["start"])
+        end = self._parse_date(options["end"])
+        if start and end and start > end:
+            raise CommandError("--start must not be after --end")
+
+        rows = rebuild_daily_stats(start, end, batch_days=options["batch_days"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} daily stats rows"))
+
+    def _parse_date(self, value):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"Invalid date: {value}")
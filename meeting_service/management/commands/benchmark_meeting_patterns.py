@@ -0,0 +1,103 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from meeting_service.meeting_patterns import MeetingColumns
+from meeting_service.models import MeetingParticipant, MeetingSession
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time meeting pattern analytics for a user with many meetings; the "
+        "generated data is rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--meetings", type=int, default=10000, help="Meetings of the user"
+        )
+        parser.add_argument(
+            "--participants", type=int, default=3, help="Participants per meeting"
+        )
+        parser.add_argument(
+            "--days", type=int, default=30, help="Days the meetings are spread over"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["meetings"] < 1 or options["days"] < 1:
+            raise CommandError("--meetings and --days must be positive")
+
+        with transaction.atomic():
+            user = self._generate(options)
+            end = timezone.now()
+            start = end - timedelta(days=options["days"])
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                meetings = MeetingColumns.load(user, start, end, now=end)
+                loaded = time.perf_counter() - started
+            self.stdout.write(
+                f"Loaded {meetings.size} meetings and "
+                f"{len(meetings.participant_meeting)} participations in "
+                f"{loaded * 1000:.1f} ms with {len(queries)} queries"
+            )
+
+            started = time.perf_counter()
+            meetings.patterns(15)
+            meetings.availability()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(f"Analysed in {elapsed * 1000:.1f} ms")
+            )
+            transaction.set_rollback(True)
+
+    def _generate(self, options):
+        rng = random.Random(options["seed"])
+        now = timezone.now()
+        user = User.objects.create_user(username=f"benchmark-{rng.random()}")
+        statuses = [choice for choice, _ in MeetingSession.Status.choices]
+        types = [choice for choice, _ in MeetingSession.MeetingType.choices]
+
+        sessions = []
+        for _ in range(options["meetings"]):
+            start = now - timedelta(minutes=rng.randrange(options["days"] * 24 * 60))
+            sessions.append(
+                MeetingSession(
+                    organizer=user,
+                    title="Benchmark meeting",
+                    meeting_type=rng.choice(types),
+                    status=rng.choice(statuses),
+                    scheduled_start_time=start,
+                    scheduled_end_time=start
+                    + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 150))),
+                    actual_start_time=start + timedelta(minutes=rng.randrange(-5, 30)),
+                )
+            )
+        MeetingSession.objects.bulk_create(sessions, batch_size=1000)
+
+        participants = []
+        for session in sessions:
+            for index in range(options["participants"]):
+                joined_at = session.actual_start_time + timedelta(
+                    minutes=rng.randrange(10)
+                )
+                participants.append(
+                    MeetingParticipant(
+                        meeting=session,
+                        email=f"participant{index}@example.com",
+                        name=f"Participant {index}",
+                        joined_at=joined_at,
+                        left_at=joined_at + timedelta(minutes=rng.randrange(5, 90)),
+                    )
+                )
+        MeetingParticipant.objects.bulk_create(participants, batch_size=1000)
+        return user
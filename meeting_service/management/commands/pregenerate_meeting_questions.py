@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from meeting_service.question_pregeneration import QuestionPregenerator
+
+
+class Command(BaseCommand):
+    help = "Generate questions for upcoming meetings that have no fresh ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Days ahead to cover; defaults to QUESTION_PREGENERATION_DAYS_AHEAD",
+        )
+        parser.add_argument(
+            "--coverage-only",
+            action="store_true",
+            help="Only report the coverage of upcoming meetings",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] < 1:
+            raise CommandError("--days must be positive")
+
+        pregenerator = QuestionPregenerator(days_ahead=options["days"])
+        if options["coverage_only"]:
+            report = pregenerator.coverage()
+        else:
+            report = pregenerator.run()
+        for key, value in report.items():
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['covered_meetings']} of {report['upcoming_meetings']} "
+                f"upcoming meetings have questions ({report['coverage']}%)"
+            )
+        )
@@ -12,9 +12,11 @@ from typing import Any, Dict, List
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from ai_service.models import AIInsights
+from ai_service.prompting import PromptBuilder
 from ai_service.services import GeminiAIService
 
 from .models import Meeting, MeetingQuestion
@@ -22,6 +24,118 @@ from .models import Meeting, MeetingQuestion
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Outcome processing steps, as conditions on a Meeting row
+OUTCOME_COMPONENTS = {
+    "summaries_generated": ~Q(outcome=""),
+    "action_items_extracted": ~Q(action_items=[]),
+    "follow_ups_scheduled": Q(ai_insights__has_key="follow_up_plan"),
+    "lead_scores_updated": Q(ai_insights__has_key="lead_scoring_update"),
+}
+
+SUMMARY_PROMPT_INSTRUCTIONS = """
+As an AI sales assistant, analyze this meeting and generate a comprehensive post-meeting summary.
+
+Please provide a structured meeting summary in JSON format with the following sections:
+{
+    "summary": "Overall meeting summary (2-3 paragraphs)",
+    "key_takeaways": ["List of 3-5 key takeaways"],
+    "discussion_highlights": ["Important discussion points"],
+    "client_feedback": "Summary of client feedback and reactions",
+    "pain_points_discussed": ["Pain points that were discussed"],
+    "requirements_clarified": ["Requirements that were clarified or identified"],
+    "decision_makers_identified": ["Decision makers mentioned or identified"],
+    "budget_timeline_info": "Any budget or timeline information discussed",
+    "competitive_mentions": ["Any competitors or alternatives mentioned"],
+    "objections_raised": ["Any objections or concerns raised"],
+    "positive_signals": ["Positive buying signals observed"],
+    "meeting_effectiveness": "Assessment of meeting effectiveness (1-10 scale with explanation)",
+    "next_meeting_recommendations": "Recommendations for next meeting type and focus"
+}
+
+Focus on extracting actionable insights that will help with lead qualification and sales progression.
+"""
+
+ACTION_ITEMS_PROMPT_INSTRUCTIONS = """
+As an AI sales assistant, analyze this meeting and extract specific action items and assignments.
+
+Please extract and structure action items in JSON format:
+{
+    "action_items": [
+        {
+            "id": "unique_id",
+            "description": "Clear description of the action",
+            "assigned_to": "Person responsible (sales rep, client, team member)",
+            "due_date": "Suggested due date (YYYY-MM-DD format)",
+            "priority": "high|medium|low",
+            "category": "follow_up|research|proposal|demo|documentation|internal",
+            "dependencies": ["List of dependencies if any"],
+            "success_criteria": "How to measure completion"
+        }
+    ],
+    "immediate_actions": ["Actions that need to be done within 24 hours"],
+    "follow_up_meetings": [
+        {
+            "type": "demo|proposal|negotiation|closing",
+            "suggested_timeframe": "within X days/weeks",
+            "purpose": "Purpose of the follow-up meeting",
+            "participants": ["Required participants"]
+        }
+    ],
+    "research_tasks": ["Information that needs to be researched"],
+    "internal_coordination": ["Internal team coordination needed"],
+    "client_deliverables": ["Items to be delivered to the client"]
+}
+
+Focus on specific, actionable items with clear ownership and deadlines.
+"""
+
+FOLLOW_UP_PROMPT_INSTRUCTIONS = """
+As an AI sales assistant, analyze this meeting outcome and recommend a comprehensive follow-up strategy.
+
+Please provide a structured follow-up plan in JSON format:
+{
+    "immediate_follow_up": {
+        "timeframe": "within X hours/days",
+        "actions": ["Specific immediate actions"],
+        "communication_method": "email|phone|meeting",
+        "key_message": "Main message to communicate"
+    },
+    "short_term_follow_up": {
+        "timeframe": "within X days/weeks",
+        "recommended_meetings": [
+            {
+                "type": "demo|proposal|technical_review|stakeholder_meeting",
+                "purpose": "Meeting purpose",
+                "duration_minutes": 60,
+                "participants": ["Required participants"],
+                "agenda_items": ["Key agenda items"]
+            }
+        ],
+        "deliverables": ["Items to prepare and deliver"]
+    },
+    "long_term_strategy": {
+        "sales_cycle_stage": "discovery|qualification|proposal|negotiation|closing",
+        "next_milestone": "Next major milestone",
+        "success_metrics": ["How to measure progress"],
+        "risk_mitigation": ["Strategies to address identified risks"]
+    },
+    "automation_triggers": [
+        {
+            "trigger": "time_based|response_based|milestone_based",
+            "condition": "Specific condition",
+            "action": "Automated action to take"
+        }
+    ],
+    "stakeholder_engagement": {
+        "decision_makers_to_engage": ["Key people to involve"],
+        "engagement_strategy": "How to engage them",
+        "messaging_approach": "Tailored messaging for each stakeholder"
+    }
+}
+
+Base recommendations on the meeting outcomes and lead progression needs.
+"""
+
 
 class MeetingOutcomeService:
     """Service for tracking and analyzing meeting outcomes"""
@@ -356,7 +470,7 @@ class MeetingOutcomeService:
             return {"success": False, "error": f"Error updating lead scoring: {str(e)}"}
 
     def process_complete_meeting_outcome(
-        self, meeting: Meeting, regenerate: bool = False
+        self, meeting: Meeting, regenerate: bool = False, progress=None
     ) -> Dict[str, Any]:
         """
         Process complete meeting outcome including all tracking components
@@ -364,6 +478,7 @@ class MeetingOutcomeService:
         Args:
             meeting: Meeting instance
             regenerate: Whether to regenerate existing data
+            progress: Optional progress(percent, message) callback
 
         Returns:
             Dict containing all outcome processing results
@@ -375,19 +490,25 @@ class MeetingOutcomeService:
                 "components": {},
             }
 
+            progress = progress or (lambda percent, message="": None)
+
             # 1. Generate meeting summary
+            progress(10, "Generating meeting summary")
             summary_result = self.generate_meeting_summary(meeting, regenerate)
             results["components"]["summary"] = summary_result
 
             # 2. Extract action items
+            progress(35, "Extracting action items")
             action_items_result = self.extract_action_items(meeting, regenerate)
             results["components"]["action_items"] = action_items_result
 
             # 3. Schedule follow-up actions
+            progress(60, "Scheduling follow-up actions")
             follow_up_result = self.schedule_follow_up_actions(meeting)
             results["components"]["follow_up"] = follow_up_result
 
             # 4. Update lead scoring
+            progress(85, "Updating lead scoring")
             scoring_result = self.update_lead_scoring(meeting)
             results["components"]["lead_scoring"] = scoring_result
 
@@ -496,170 +617,127 @@ class MeetingOutcomeService:
 
     def _build_summary_prompt(self, meeting: Meeting, context: Dict[str, Any]) -> str:
         """Build AI prompt for meeting summary generation"""
-        return f"""
-        As an AI sales assistant, analyze this meeting and generate a comprehensive post-meeting summary.
-        
-        Meeting Information:
-        - Title: {context['meeting_info']['title']}
-        - Type: {context['meeting_info']['meeting_type']}
-        - Duration: {context['meeting_info']['duration_minutes']} minutes
-        - Agenda: {context['meeting_info']['agenda']}
-        - Description: {context['meeting_info']['description']}
-        
-        Lead Context:
-        - Company: {context['lead_context'].get('company_name', 'N/A')}
-        - Industry: {context['lead_context'].get('industry', 'N/A')}
-        - Pain Points: {', '.join(context['lead_context'].get('pain_points', []))}
-        - Requirements: {', '.join(context['lead_context'].get('requirements', []))}
-        
-        Questions Asked and Responses:
-        {self._format_questions_for_prompt(context['questions_asked'])}
-        
-        Please provide a structured meeting summary in JSON format with the following sections:
-        {{
-            "summary": "Overall meeting summary (2-3 paragraphs)",
-            "key_takeaways": ["List of 3-5 key takeaways"],
-            "discussion_highlights": ["Important discussion points"],
-            "client_feedback": "Summary of client feedback and reactions",
-            "pain_points_discussed": ["Pain points that were discussed"],
-            "requirements_clarified": ["Requirements that were clarified or identified"],
-            "decision_makers_identified": ["Decision makers mentioned or identified"],
-            "budget_timeline_info": "Any budget or timeline information discussed",
-            "competitive_mentions": ["Any competitors or alternatives mentioned"],
-            "objections_raised": ["Any objections or concerns raised"],
-            "positive_signals": ["Positive buying signals observed"],
-            "meeting_effectiveness": "Assessment of meeting effectiveness (1-10 scale with explanation)",
-            "next_meeting_recommendations": "Recommendations for next meeting type and focus"
-        }}
-        
-        Focus on extracting actionable insights that will help with lead qualification and sales progression.
-        """
+        meeting_info = context["meeting_info"]
+        lead_context = context["lead_context"]
+        return (
+            PromptBuilder("generate_meeting_summary")
+            .instructions(SUMMARY_PROMPT_INSTRUCTIONS)
+            .section(
+                "Meeting Information",
+                {
+                    "title": meeting_info["title"],
+                    "type": meeting_info["meeting_type"],
+                    "duration_minutes": meeting_info["duration_minutes"],
+                    "agenda": meeting_info["agenda"],
+                    "description": meeting_info["description"],
+                },
+                priority=2,
+                required=True,
+            )
+            .section(
+                "Lead Context",
+                {
+                    "company": lead_context.get("company_name"),
+                    "industry": lead_context.get("industry"),
+                    "pain_points": lead_context.get("pain_points"),
+                    "requirements": lead_context.get("requirements"),
+                },
+                priority=1,
+                max_items=8,
+            )
+            .section(
+                "Questions Asked and Responses",
+                self._questions_for_prompt(context["questions_asked"]),
+                priority=3,
+                relevance=self._question_relevance,
+                required=True,
+            )
+            .build()
+        )
 
     def _build_action_items_prompt(
         self, meeting: Meeting, context: Dict[str, Any]
     ) -> str:
         """Build AI prompt for action items extraction"""
-        return f"""
-        As an AI sales assistant, analyze this meeting and extract specific action items and assignments.
-        
-        Meeting Context:
-        - Title: {context['meeting_info']['title']}
-        - Type: {context['meeting_info']['meeting_type']}
-        - Company: {context['lead_context'].get('company_name', 'N/A')}
-        - Participants: {', '.join(context['meeting_info'].get('participants', []))}
-        
-        Meeting Content:
-        - Agenda: {context['meeting_info']['agenda']}
-        - Description: {context['meeting_info']['description']}
-        - Questions and Responses: {self._format_questions_for_prompt(context['questions_asked'])}
-        
-        Please extract and structure action items in JSON format:
-        {{
-            "action_items": [
-                {{
-                    "id": "unique_id",
-                    "description": "Clear description of the action",
-                    "assigned_to": "Person responsible (sales rep, client, team member)",
-                    "due_date": "Suggested due date (YYYY-MM-DD format)",
-                    "priority": "high|medium|low",
-                    "category": "follow_up|research|proposal|demo|documentation|internal",
-                    "dependencies": ["List of dependencies if any"],
-                    "success_criteria": "How to measure completion"
-                }}
-            ],
-            "immediate_actions": ["Actions that need to be done within 24 hours"],
-            "follow_up_meetings": [
-                {{
-                    "type": "demo|proposal|negotiation|closing",
-                    "suggested_timeframe": "within X days/weeks",
-                    "purpose": "Purpose of the follow-up meeting",
-                    "participants": ["Required participants"]
-                }}
-            ],
-            "research_tasks": ["Information that needs to be researched"],
-            "internal_coordination": ["Internal team coordination needed"],
-            "client_deliverables": ["Items to be delivered to the client"]
-        }}
-        
-        Focus on specific, actionable items with clear ownership and deadlines.
-        """
+        meeting_info = context["meeting_info"]
+        return (
+            PromptBuilder("extract_action_items")
+            .instructions(ACTION_ITEMS_PROMPT_INSTRUCTIONS)
+            .section(
+                "Meeting Context",
+                {
+                    "title": meeting_info["title"],
+                    "type": meeting_info["meeting_type"],
+                    "company": context["lead_context"].get("company_name"),
+                    "participants": meeting_info.get("participants"),
+                    "agenda": meeting_info["agenda"],
+                    "description": meeting_info["description"],
+                },
+                priority=2,
+                max_items=10,
+                required=True,
+            )
+            .section(
+                "Questions and Responses",
+                self._questions_for_prompt(context["questions_asked"]),
+                priority=3,
+                relevance=self._question_relevance,
+                required=True,
+            )
+            .build()
+        )
 
     def _build_follow_up_prompt(self, meeting: Meeting, context: Dict[str, Any]) -> str:
         """Build AI prompt for follow-up scheduling"""
-        return f"""
-        As an AI sales assistant, analyze this meeting outcome and recommend a comprehensive follow-up strategy.
-        
-        Meeting Analysis:
-        - Type: {context['meeting_info']['meeting_type']}
-        - Company: {context['lead_context'].get('company_name', 'N/A')}
-        - Current Lead Status: {context['lead_context'].get('status', 'N/A')}
-        - Urgency Level: {context['lead_context'].get('urgency_level', 'N/A')}
-        
-        Current Lead Intelligence:
-        - Lead Score: {context['existing_insights'].get('lead_score', 'N/A')}
-        - Conversion Probability: {context['existing_insights'].get('conversion_probability', 'N/A')}%
-        - Quality Tier: {context['existing_insights'].get('quality_tier', 'N/A')}
-        
-        Meeting Outcomes:
-        - Questions Asked: {len(context['questions_asked'])} questions
-        - Key Discussion Points: {self._format_questions_for_prompt(context['questions_asked'])}
-        
-        Please provide a structured follow-up plan in JSON format:
-        {{
-            "immediate_follow_up": {{
-                "timeframe": "within X hours/days",
-                "actions": ["Specific immediate actions"],
-                "communication_method": "email|phone|meeting",
-                "key_message": "Main message to communicate"
-            }},
-            "short_term_follow_up": {{
-                "timeframe": "within X days/weeks",
-                "recommended_meetings": [
-                    {{
-                        "type": "demo|proposal|technical_review|stakeholder_meeting",
-                        "purpose": "Meeting purpose",
-                        "duration_minutes": 60,
-                        "participants": ["Required participants"],
-                        "agenda_items": ["Key agenda items"]
-                    }}
-                ],
-                "deliverables": ["Items to prepare and deliver"]
-            }},
-            "long_term_strategy": {{
-                "sales_cycle_stage": "discovery|qualification|proposal|negotiation|closing",
-                "next_milestone": "Next major milestone",
-                "success_metrics": ["How to measure progress"],
-                "risk_mitigation": ["Strategies to address identified risks"]
-            }},
-            "automation_triggers": [
-                {{
-                    "trigger": "time_based|response_based|milestone_based",
-                    "condition": "Specific condition",
-                    "action": "Automated action to take"
-                }}
-            ],
-            "stakeholder_engagement": {{
-                "decision_makers_to_engage": ["Key people to involve"],
-                "engagement_strategy": "How to engage them",
-                "messaging_approach": "Tailored messaging for each stakeholder"
-            }}
-        }}
-        
-        Base recommendations on the meeting outcomes and lead progression needs.
-        """
+        lead_context = context["lead_context"]
+        insights = context["existing_insights"]
+        return (
+            PromptBuilder("schedule_follow_up")
+            .instructions(FOLLOW_UP_PROMPT_INSTRUCTIONS)
+            .section(
+                "Meeting Analysis",
+                {
+                    "type": context["meeting_info"]["meeting_type"],
+                    "company": lead_context.get("company_name"),
+                    "lead_status": lead_context.get("status"),
+                    "urgency_level": lead_context.get("urgency_level"),
+                    "questions_asked": len(context["questions_asked"]),
+                },
+                priority=3,
+                required=True,
+            )
+            .section(
+                "Current Lead Intelligence",
+                {
+                    "lead_score": insights.get("lead_score"),
+                    "conversion_probability": insights.get("conversion_probability"),
+                    "quality_tier": insights.get("quality_tier"),
+                },
+                priority=2,
+            )
+            .section(
+                "Key Discussion Points",
+                self._questions_for_prompt(context["questions_asked"]),
+                priority=1,
+                relevance=self._question_relevance,
+            )
+            .build()
+        )
 
-    def _format_questions_for_prompt(self, questions: List[Dict]) -> str:
-        """Format questions and responses for AI prompts"""
+    def _questions_for_prompt(self, questions: List[Dict]) -> Any:
+        """Question/response pairs for AI prompts"""
         if not questions:
             return "No questions were recorded for this meeting."
 
-        formatted = []
-        for q in questions:
-            formatted.append(
-                f"Q: {q['question_text']}\nA: {q.get('response', 'No response recorded')}"
-            )
+        return [
+            {"q": q["question_text"], "a": q.get("response") or "No response recorded"}
+            for q in questions
+        ]
 
-        return "\n\n".join(formatted)
+    @staticmethod
+    def _question_relevance(item: Dict) -> float:
+        """Answered questions are kept first when the prompt is over budget"""
+        return 0.0 if item.get("a") == "No response recorded" else 1.0
 
     def _parse_summary_response(self, response: str) -> Dict[str, Any]:
         """Parse AI response for meeting summary"""
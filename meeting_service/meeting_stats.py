@@ -0,0 +1,293 @@
+"""
+Daily rollup of the meeting dashboard metrics
+
+The dashboard APIs used to count and average raw Meeting rows, per meeting
+type and per day, on every request. MeetingDailyStats holds those counts and
+sums per (date, user, meeting_type), where date is the local day the meeting
+was created, so each API reads them with one grouped query however long the
+meeting history grows.
+
+A day's stats are recomputed from its meetings, once the transaction has
+committed, whenever one of them, the effectiveness score of one of their
+questions or the status of their lead changes (signals.py). The
+backfill_meeting_stats command builds the rollup for existing meetings.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from .models import Meeting, MeetingDailyStats, MeetingQuestion
+
+logger = logging.getLogger(__name__)
+
+# Lead statuses counted as a conversion
+CONVERTED_LEAD_STATUSES = ("qualified", "converted")
+
+STATS_FIELDS = [
+    "meeting_count",
+    "scheduled_count",
+    "completed_count",
+    "cancelled_count",
+    "qualified_count",
+    "converted_count",
+    "completed_converted_count",
+    "timed_count",
+    "duration_minutes_total",
+    "prepared_count",
+    "question_score_total",
+    "question_score_count",
+    "effectiveness_total",
+]
+
+# (date, user id, meeting type)
+StatsKey = Tuple[date, int, str]
+
+
+def day_range(day: date) -> Tuple[datetime, datetime]:
+    """Start and end of a local day"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, timezone.make_aware(
+        datetime.combine(day + timedelta(days=1), time.min)
+    )
+
+
+def stats_keys(meetings) -> Set[StatsKey]:
+    """Rollup keys of a Meeting queryset"""
+    return {
+        (timezone.localdate(created_at), user_id, meeting_type)
+        for created_at, user_id, meeting_type in meetings.values_list(
+            "created_at", "lead__user_id", "meeting_type"
+        )
+    }
+
+
+def is_prepared(ai_insights: Optional[dict]) -> bool:
+    ai_insights = ai_insights or {}
+    return bool(
+        ai_insights.get("agenda")
+        or ai_insights.get("talking_points")
+        or ai_insights.get("preparation_materials")
+    )
+
+
+def meeting_effectiveness(
+    lead_converted: bool,
+    duration_minutes: Optional[int],
+    actual_duration_minutes: Optional[int],
+    ai_insights: Optional[dict],
+    question_score: Optional[float],
+) -> float:
+    """Effectiveness (0-100) of a completed meeting"""
+    score = 0.0
+    if lead_converted:
+        score += 30
+    if actual_duration_minutes and duration_minutes:
+        # Within 20% of the planned duration
+        if 0.8 <= actual_duration_minutes / duration_minutes <= 1.2:
+            score += 25
+    ai_insights = ai_insights or {}
+    if ai_insights.get("outcome") or ai_insights.get("action_items"):
+        score += 25
+    if question_score is not None:
+        score += question_score / 100 * 20
+    return score
+
+
+def stats_sums(prefix: str = "", condition: Optional[Q] = None) -> Dict[str, Sum]:
+    """Sum of every stats field, for aggregate() or annotate()"""
+    return {
+        f"{prefix}{field}": Sum(field, filter=condition, default=0)
+        for field in STATS_FIELDS
+    }
+
+
+def percentage(part: float, whole: float) -> float:
+    return part / whole * 100 if whole else 0
+
+
+def summarize(sums: Dict[str, float], prefix: str = "") -> Dict[str, float]:
+    """Dashboard metrics of summed stats"""
+    sums = {field: sums[f"{prefix}{field}"] for field in STATS_FIELDS}
+    meetings = sums["meeting_count"]
+    return {
+        "total_meetings": meetings,
+        "completed_meetings": sums["completed_count"],
+        "conversion_rate": percentage(
+            sums["qualified_count"] + sums["converted_count"], meetings
+        ),
+        "success_rate": percentage(sums["completed_count"], meetings),
+        "avg_duration": (
+            sums["duration_minutes_total"] / sums["timed_count"]
+            if sums["timed_count"]
+            else 0
+        ),
+        "ai_effectiveness": (
+            sums["question_score_total"] / sums["question_score_count"]
+            if sums["question_score_count"]
+            else 0
+        ),
+        "preparation_score": percentage(sums["prepared_count"], meetings),
+        "effectiveness": (
+            sums["effectiveness_total"] / sums["completed_count"]
+            if sums["completed_count"]
+            else 0
+        ),
+    }
+
+
+def refresh_daily_stats(keys: Iterable[StatsKey]) -> int:
+    """Recompute the stats of the given days; returns the rows written"""
+    keys = set(keys)
+    if not keys:
+        return 0
+
+    meetings = Q()
+    for day, user_id, meeting_type in keys:
+        start, end = day_range(day)
+        meetings |= Q(
+            created_at__gte=start,
+            created_at__lt=end,
+            lead__user_id=user_id,
+            meeting_type=meeting_type,
+        )
+    rows = _compute(Meeting.objects.filter(meetings))
+
+    with transaction.atomic():
+        # Days left without meetings
+        emptied = Q()
+        for day, user_id, meeting_type in keys - rows.keys():
+            emptied |= Q(date=day, user_id=user_id, meeting_type=meeting_type)
+        if emptied:
+            MeetingDailyStats.objects.filter(emptied).delete()
+        MeetingDailyStats.objects.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=["date", "user", "meeting_type"],
+            update_fields=STATS_FIELDS + ["updated_at"],
+        )
+    return len(rows)
+
+
+def refresh_daily_stats_on_commit(keys: Iterable[StatsKey] = (), meetings=None):
+    """
+    Refresh the given days, and those of a Meeting queryset, after commit
+
+    The queryset is read once the transaction has committed.
+    """
+    keys = set(keys)
+
+    def refresh():
+        refresh_daily_stats(keys | (stats_keys(meetings) if meetings else set()))
+
+    if keys or meetings is not None:
+        transaction.on_commit(refresh)
+
+
+def rebuild_daily_stats(
+    start: Optional[date] = None, end: Optional[date] = None, batch_days: int = 31
+) -> int:
+    """
+    Recompute the rollup for meetings created from ``start`` to ``end``
+
+    Defaults to the whole meeting history. Works through ``batch_days`` days
+    at a time; returns the rows written.
+    """
+    bounds = Meeting.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+    if bounds["first"] is None:
+        return 0
+    start = start or timezone.localdate(bounds["first"])
+    end = end or timezone.localdate(bounds["last"])
+
+    written = 0
+    day = start
+    while day <= end:
+        last_day = min(day + timedelta(days=batch_days - 1), end)
+        rows = _compute(
+            Meeting.objects.filter(
+                created_at__gte=day_range(day)[0],
+                created_at__lt=day_range(last_day)[1],
+            )
+        )
+        with transaction.atomic():
+            MeetingDailyStats.objects.filter(date__gte=day, date__lte=last_day).delete()
+            MeetingDailyStats.objects.bulk_create(rows.values(), batch_size=500)
+        written += len(rows)
+        logger.info(f"Rebuilt meeting stats from {day} to {last_day}: {len(rows)} rows")
+        day = last_day + timedelta(days=1)
+    return written
+
+
+def _compute(meetings) -> Dict[StatsKey, MeetingDailyStats]:
+    """Stats rows of a Meeting queryset, by key"""
+    question_scores = {
+        row["meeting_id"]: (row["total"], row["count"])
+        for row in MeetingQuestion.objects.filter(
+            meeting__in=meetings, effectiveness_score__isnull=False
+        )
+        .values("meeting_id")
+        .annotate(total=Sum("effectiveness_score"), count=Count("id"))
+    }
+
+    rows: Dict[StatsKey, MeetingDailyStats] = {}
+    now = timezone.now()
+    for meeting in meetings.values(
+        "id",
+        "created_at",
+        "lead__user_id",
+        "lead__status",
+        "meeting_type",
+        "status",
+        "duration_minutes",
+        "started_at",
+        "ended_at",
+        "ai_insights",
+    ).iterator(chunk_size=2000):
+        key = (
+            timezone.localdate(meeting["created_at"]),
+            meeting["lead__user_id"],
+            meeting["meeting_type"],
+        )
+        stats = rows.get(key)
+        if stats is None:
+            stats = rows[key] = MeetingDailyStats(
+                date=key[0], user_id=key[1], meeting_type=key[2], updated_at=now
+            )
+
+        status = meeting["status"]
+        lead_status = meeting["lead__status"]
+        lead_converted = lead_status in CONVERTED_LEAD_STATUSES
+        stats.meeting_count += 1
+        stats.scheduled_count += status == Meeting.Status.SCHEDULED
+        stats.completed_count += status == Meeting.Status.COMPLETED
+        stats.cancelled_count += status == Meeting.Status.CANCELLED
+        stats.qualified_count += lead_status == "qualified"
+        stats.converted_count += lead_status == "converted"
+        stats.completed_converted_count += (
+            status == Meeting.Status.COMPLETED and lead_converted
+        )
+
+        actual_duration = None
+        if meeting["started_at"] and meeting["ended_at"]:
+            delta = meeting["ended_at"] - meeting["started_at"]
+            actual_duration = int(delta.total_seconds() / 60)
+            stats.timed_count += 1
+            stats.duration_minutes_total += max(actual_duration, 0)
+        stats.prepared_count += is_prepared(meeting["ai_insights"])
+
+        score_total, score_count = question_scores.get(meeting["id"], (0.0, 0))
+        stats.question_score_total += score_total
+        stats.question_score_count += score_count
+        if status == Meeting.Status.COMPLETED:
+            stats.effectiveness_total += meeting_effectiveness(
+                lead_converted,
+                meeting["duration_minutes"],
+                actual_duration,
+                meeting["ai_insights"],
+                score_total / score_count if score_count else None,
+            )
+    return rows
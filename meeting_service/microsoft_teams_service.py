@@ -1,24 +1,42 @@
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
 from msal import ConfidentialClientApplication
 
+from .graph_batch import GraphBatch, GraphRequest, GraphResponse
 from .models import (
     MeetingParticipant,
     MeetingSession,
     MeetingStatusUpdate,
     MicrosoftTeamsCredentials,
 )
+from .provider_clients import (
+    GRAPH_BASE_URL,
+    graph_session,
+    provider_timeout,
+    timed_call,
+)
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Access tokens by user id, reused until shortly before they expire
+_access_tokens: Dict[int, Tuple[str, datetime]] = {}
+_access_tokens_lock = threading.Lock()
+ACCESS_TOKEN_MARGIN = timedelta(seconds=60)
+
+
+def forget_access_token(user_id: int):
+    """Drop a cached access token (it was replaced or rejected)"""
+    with _access_tokens_lock:
+        _access_tokens.pop(user_id, None)
+
 
 class MicrosoftTeamsService:
     """Service for managing Microsoft Teams integration"""
@@ -116,6 +134,7 @@ class MicrosoftTeamsService:
                 teams_creds.token_expiry = token_expiry
                 teams_creds.scope = " ".join(self.scopes)
                 teams_creds.save()
+            forget_access_token(user.id)
 
             logger.info(
                 f"Successfully stored Microsoft Teams credentials for user {user_id}"
@@ -177,37 +196,57 @@ class MicrosoftTeamsService:
             logger.error(f"Error refreshing Microsoft Teams credentials: {str(e)}")
             return False
 
+    def _get_access_token(self, user: User) -> Optional[str]:
+        """Valid access token for the user, cached in memory until expiry"""
+        with _access_tokens_lock:
+            cached = _access_tokens.get(user.id)
+        if cached and timezone.now() < cached[1] - ACCESS_TOKEN_MARGIN:
+            return cached[0]
+
+        if not self.refresh_user_credentials(user):
+            return None
+        teams_creds = MicrosoftTeamsCredentials.objects.get(user=user)
+        with _access_tokens_lock:
+            _access_tokens[user.id] = (
+                teams_creds.access_token,
+                teams_creds.token_expiry,
+            )
+        return teams_creds.access_token
+
     def _make_graph_request(
         self, user: User, method: str, endpoint: str, data: dict = None
     ) -> Optional[dict]:
         """Make authenticated request to Microsoft Graph API"""
         try:
-            if not self.refresh_user_credentials(user):
+            access_token = self._get_access_token(user)
+            if not access_token:
                 raise Exception("Invalid or missing Microsoft Teams credentials")
 
-            teams_creds = MicrosoftTeamsCredentials.objects.get(user=user)
-
             headers = {
-                "Authorization": f"Bearer {teams_creds.access_token}",
+                "Authorization": f"Bearer {access_token}",
                 "Content-Type": "application/json",
             }
 
-            url = f"https://graph.microsoft.com/v1.0{endpoint}"
+            url = f"{GRAPH_BASE_URL}{endpoint}"
 
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=headers, json=data)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=headers)
-            else:
+            method = method.upper()
+            if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
+            with timed_call("graph"):
+                response = graph_session().request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=data if method in ("POST", "PUT", "PATCH") else None,
+                    timeout=provider_timeout(),
+                )
+
             if response.status_code in [200, 201, 202, 204]:
                 return response.json() if response.content else {}
             else:
+                if response.status_code == 401:
+                    forget_access_token(user.id)
                 logger.error(
                     f"Graph API request failed: {response.status_code} - {response.text}"
                 )
@@ -217,6 +256,24 @@ class MicrosoftTeamsService:
             logger.error(f"Error making Graph API request: {str(e)}")
             return None
 
+    def _graph_batch(
+        self, user: User, requests: List[GraphRequest]
+    ) -> Optional[Dict[str, GraphResponse]]:
+        """Send Graph requests through JSON batching (see graph_batch)"""
+        try:
+            access_token = self._get_access_token(user)
+            if not access_token:
+                raise Exception("Invalid or missing Microsoft Teams credentials")
+
+            responses = GraphBatch(access_token).execute(requests)
+            if any(response.status == 401 for response in responses.values()):
+                forget_access_token(user.id)
+            return responses
+
+        except Exception as e:
+            logger.error(f"Error making Graph API batch request: {str(e)}")
+            return None
+
     def create_meeting(
         self,
         user: User,
@@ -355,6 +412,74 @@ class MicrosoftTeamsService:
             logger.error(f"Error getting team channels: {str(e)}")
             return []
 
+    def get_channels_for_teams(
+        self, user: User, team_ids: Iterable[str]
+    ) -> Dict[str, List[dict]]:
+        """Get the channels of several teams in one batched round trip"""
+        team_ids = list(dict.fromkeys(team_ids))
+        if not team_ids:
+            return {}
+        responses = self._graph_batch(
+            user,
+            [
+                GraphRequest(id=str(index), url=f"/teams/{team_id}/channels")
+                for index, team_id in enumerate(team_ids)
+            ],
+        )
+        if responses is None:
+            return {team_id: [] for team_id in team_ids}
+        return {
+            team_id: responses[str(index)].value()
+            for index, team_id in enumerate(team_ids)
+        }
+
+    def get_user_teams_with_channels(self, user: User) -> List[dict]:
+        """Get the user's teams, each with its ``channels``, in two round trips"""
+        teams = self.get_user_teams(user)
+        channels = self.get_channels_for_teams(user, [team["id"] for team in teams])
+        return [{**team, "channels": channels.get(team["id"], [])} for team in teams]
+
+    def get_dashboard_data(
+        self, user: User, meeting_ids: Iterable[str]
+    ) -> Optional[Dict[str, object]]:
+        """
+        Graph data for the Teams dashboard in two batched round trips
+
+        The first fetches the user's teams and the recordings and transcripts
+        of ``meeting_ids``; the second the channels of every team.
+        """
+        meeting_ids = list(dict.fromkeys(meeting_ids))
+        requests = [GraphRequest(id="teams", url="/me/joinedTeams")]
+        for index, meeting_id in enumerate(meeting_ids):
+            requests += [
+                GraphRequest(
+                    id=f"{index}-recordings",
+                    url=f"/me/onlineMeetings/{meeting_id}/recordings",
+                ),
+                GraphRequest(
+                    id=f"{index}-transcripts",
+                    url=f"/me/onlineMeetings/{meeting_id}/transcripts",
+                ),
+            ]
+        responses = self._graph_batch(user, requests)
+        if responses is None:
+            return None
+
+        teams = responses["teams"].value()
+        channels = self.get_channels_for_teams(user, [team["id"] for team in teams])
+        return {
+            "teams": [
+                {**team, "channels": channels.get(team["id"], [])} for team in teams
+            ],
+            "meetings": {
+                meeting_id: {
+                    "recordings": len(responses[f"{index}-recordings"].value()),
+                    "transcripts": len(responses[f"{index}-transcripts"].value()),
+                }
+                for index, meeting_id in enumerate(meeting_ids)
+            },
+        }
+
     def send_channel_message(
         self, user: User, team_id: str, channel_id: str, message: str
     ) -> bool:
@@ -377,25 +502,36 @@ class MicrosoftTeamsService:
 
     def get_meeting_recordings(self, user: User, meeting_id: str) -> List[dict]:
         """Get recordings for a specific meeting"""
-        try:
-            # Get recordings from Microsoft Graph API
-            # First try to get recordings from the online meeting
-            result = self._make_graph_request(
-                user, "GET", f"/me/onlineMeetings/{meeting_id}/recordings"
-            )
+        return self.get_recordings_for_meetings(user, [meeting_id]).get(meeting_id, [])
 
-            recordings = []
-            if result and "value" in result:
-                recordings.extend(result["value"])
-
-            # Also check for recordings in OneDrive/SharePoint
-            # Teams recordings are often stored in the organizer's OneDrive
-            drive_result = self._make_graph_request(
-                user, "GET", f"/me/drive/root/search(q='{meeting_id}')"
-            )
-
-            if drive_result and "value" in drive_result:
-                for item in drive_result["value"]:
+    def get_recordings_for_meetings(
+        self, user: User, meeting_ids: Iterable[str]
+    ) -> Dict[str, List[dict]]:
+        """Get the recordings of several meetings in batched round trips"""
+        meeting_ids = list(dict.fromkeys(meeting_ids))
+        try:
+            requests = []
+            for index, meeting_id in enumerate(meeting_ids):
+                # The online meeting's recordings, and video files in the
+                # organizer's OneDrive/SharePoint, where Teams often stores them
+                requests += [
+                    GraphRequest(
+                        id=f"{index}-meeting",
+                        url=f"/me/onlineMeetings/{meeting_id}/recordings",
+                    ),
+                    GraphRequest(
+                        id=f"{index}-drive",
+                        url=f"/me/drive/root/search(q='{meeting_id}')",
+                    ),
+                ]
+            responses = self._graph_batch(user, requests) if requests else {}
+            if responses is None:
+                return {meeting_id: [] for meeting_id in meeting_ids}
+
+            recordings_by_meeting = {}
+            for index, meeting_id in enumerate(meeting_ids):
+                recordings = list(responses[f"{index}-meeting"].value())
+                for item in responses[f"{index}-drive"].value():
                     if item.get("file", {}).get("mimeType", "").startswith("video/"):
                         recordings.append(
                             {
@@ -412,87 +548,121 @@ class MicrosoftTeamsService:
                             }
                         )
 
-            logger.info(
-                f"Found {len(recordings)} recordings for Teams meeting {meeting_id}"
-            )
-            return recordings
+                logger.info(
+                    f"Found {len(recordings)} recordings for Teams meeting {meeting_id}"
+                )
+                recordings_by_meeting[meeting_id] = recordings
+            return recordings_by_meeting
 
         except Exception as e:
             logger.error(f"Error getting Teams meeting recordings: {str(e)}")
-            return []
+            return {meeting_id: [] for meeting_id in meeting_ids}
 
     def get_meeting_transcripts(self, user: User, meeting_id: str) -> List[dict]:
         """Get transcripts for a specific meeting"""
+        return self.get_transcripts_for_meetings(user, [meeting_id]).get(meeting_id, [])
+
+    def get_transcripts_for_meetings(
+        self, user: User, meeting_ids: Iterable[str]
+    ) -> Dict[str, List[dict]]:
+        """
+        Get the transcripts of several meetings, with their content
+
+        Listings go in one batched round trip and all contents in a second,
+        instead of one request per transcript.
+        """
+        meeting_ids = list(dict.fromkeys(meeting_ids))
         try:
-            # Get transcripts from Microsoft Graph API
-            result = self._make_graph_request(
-                user, "GET", f"/me/onlineMeetings/{meeting_id}/transcripts"
-            )
-
-            transcripts = []
-            if result and "value" in result:
-                for transcript in result["value"]:
-                    # Get transcript content
-                    content_result = self._make_graph_request(
-                        user,
-                        "GET",
-                        f'/me/onlineMeetings/{meeting_id}/transcripts/{transcript["id"]}/content',
+            requests = []
+            for index, meeting_id in enumerate(meeting_ids):
+                # Transcripts of the online meeting, and transcript files in
+                # OneDrive/SharePoint
+                requests += [
+                    GraphRequest(
+                        id=f"{index}-meeting",
+                        url=f"/me/onlineMeetings/{meeting_id}/transcripts",
+                    ),
+                    GraphRequest(
+                        id=f"{index}-drive",
+                        url=f"/me/drive/root/search(q='transcript {meeting_id}')",
+                    ),
+                ]
+            listings = self._graph_batch(user, requests) if requests else {}
+            if listings is None:
+                return {meeting_id: [] for meeting_id in meeting_ids}
+
+            transcripts_by_meeting = {}
+            content_requests = []
+            for index, meeting_id in enumerate(meeting_ids):
+                transcripts = []
+                for transcript in listings[f"{index}-meeting"].value():
+                    transcripts.append(
+                        {
+                            "id": transcript["id"],
+                            "createdDateTime": transcript["createdDateTime"],
+                            "meetingId": transcript.get("meetingId", meeting_id),
+                            "content": "",
+                            "source": "teams_api",
+                        }
+                    )
+                    content_requests.append(
+                        GraphRequest(
+                            id=f"{index}-{len(transcripts) - 1}",
+                            url=f'/me/onlineMeetings/{meeting_id}/transcripts/{transcript["id"]}/content',
+                        )
                     )
 
-                    transcript_data = {
-                        "id": transcript["id"],
-                        "createdDateTime": transcript["createdDateTime"],
-                        "meetingId": transcript.get("meetingId", meeting_id),
-                        "content": content_result if content_result else "",
-                        "source": "teams_api",
-                    }
-                    transcripts.append(transcript_data)
-
-            # Also search for transcript files in OneDrive/SharePoint
-            drive_result = self._make_graph_request(
-                user, "GET", f"/me/drive/root/search(q='transcript {meeting_id}')"
-            )
-
-            if drive_result and "value" in drive_result:
-                for item in drive_result["value"]:
+                for item in listings[f"{index}-drive"].value():
+                    name = item["name"].lower()
                     if (
-                        item["name"].lower().endswith(".vtt")
-                        or item["name"].lower().endswith(".txt")
-                        or "transcript" in item["name"].lower()
+                        name.endswith(".vtt")
+                        or name.endswith(".txt")
+                        or "transcript" in name
                     ):
-
-                        # Get file content
-                        content = ""
-                        try:
-                            content_result = self._make_graph_request(
-                                user, "GET", f"/me/drive/items/{item['id']}/content"
-                            )
-                            if content_result:
-                                content = str(content_result)
-                        except Exception as e:
-                            logger.warning(
-                                f"Could not get content for transcript file {item['id']}: {str(e)}"
-                            )
-
                         transcripts.append(
                             {
                                 "id": item["id"],
                                 "name": item["name"],
                                 "webUrl": item["webUrl"],
                                 "createdDateTime": item["createdDateTime"],
-                                "content": content,
+                                "content": "",
                                 "source": "onedrive",
                             }
                         )
+                        content_requests.append(
+                            GraphRequest(
+                                id=f"{index}-{len(transcripts) - 1}",
+                                url=f"/me/drive/items/{item['id']}/content",
+                            )
+                        )
+                transcripts_by_meeting[meeting_id] = transcripts
 
-            logger.info(
-                f"Found {len(transcripts)} transcripts for Teams meeting {meeting_id}"
+            contents = (
+                self._graph_batch(user, content_requests) if content_requests else {}
             )
-            return transcripts
+            for request in content_requests:
+                response = (contents or {}).get(request.id)
+                if response is None or not response.ok:
+                    logger.warning(f"Could not get transcript content: {request.url}")
+                    continue
+                index, position = request.id.split("-")
+                transcript = transcripts_by_meeting[meeting_ids[int(index)]][
+                    int(position)
+                ]
+                body = response.body
+                transcript["content"] = (
+                    body if isinstance(body, str) else str(body) if body else ""
+                )
+
+            for meeting_id, transcripts in transcripts_by_meeting.items():
+                logger.info(
+                    f"Found {len(transcripts)} transcripts for Teams meeting {meeting_id}"
+                )
+            return transcripts_by_meeting
 
         except Exception as e:
             logger.error(f"Error getting Teams meeting transcripts: {str(e)}")
-            return []
+            return {meeting_id: [] for meeting_id in meeting_ids}
 
     def update_meeting_status(
         self, meeting_session: MeetingSession, new_status: str, user: User = None
@@ -699,33 +869,33 @@ class MicrosoftTeamsService:
             """
             )
 
-            # Send email to each recipient
-            success_count = 0
-            for email in recipient_emails:
-                try:
-                    email_data = {
+            # One sendMail per recipient, batched
+            requests = [
+                GraphRequest(
+                    id=str(index),
+                    url="/me/sendMail",
+                    method="POST",
+                    body={
                         "message": {
                             "subject": subject,
                             "body": {"contentType": "HTML", "content": body_content},
                             "toRecipients": [{"emailAddress": {"address": email}}],
                         },
                         "saveToSentItems": "true",
-                    }
-
-                    result = self._make_graph_request(
-                        user, "POST", "/me/sendMail", email_data
-                    )
-
-                    if result is not None:
-                        success_count += 1
-                        logger.info(f"Sent Teams meeting link to {email}")
-                    else:
-                        logger.error(f"Failed to send Teams meeting link to {email}")
+                    },
+                )
+                for index, email in enumerate(recipient_emails)
+            ]
+            responses = self._graph_batch(user, requests) if requests else {}
 
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send Teams meeting link to {email}: {str(e)}"
-                    )
+            success_count = 0
+            for index, email in enumerate(recipient_emails):
+                response = (responses or {}).get(str(index))
+                if response is not None and response.ok:
+                    success_count += 1
+                    logger.info(f"Sent Teams meeting link to {email}")
+                else:
+                    logger.error(f"Failed to send Teams meeting link to {email}")
 
             logger.info(
                 f"Successfully shared Teams meeting link to {success_count}/{len(recipient_emails)} recipients"
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:04
+
+from django.db import migrations, models
+
+# The keywords live analysis used to hard-code, grouped and weighted
+DEFAULT_TRIGGERS = [
+    ("budget", 3.0, ["budget", "cost", "costs", "price", "prices", "pricing"]),
+    (
+        "competitor",
+        3.0,
+        ["competitor", "competitors", "alternative", "alternatives"],
+    ),
+    ("decision", 2.0, ["decision", "decisions", "approve", "approved", "approval"]),
+    (
+        "pain_point",
+        2.0,
+        ["problem", "problems", "challenge", "challenges", "issue", "issues"],
+    ),
+    ("concern", 2.0, ["concerned", "worried", "hesitant"]),
+    ("timeline", 1.0, ["timeline", "when", "deadline"]),
+    (
+        "requirement",
+        1.0,
+        ["need", "needs", "require", "requirements", "required", "solution"],
+    ),
+    ("current_solution", 1.0, ["currently", "using"]),
+    ("interest", 1.0, ["interested", "excited", "impressed"]),
+]
+
+
+def create_default_triggers(apps, schema_editor):
+    LiveAnalysisTrigger = apps.get_model("meeting_service", "LiveAnalysisTrigger")
+    for name, weight, terms in DEFAULT_TRIGGERS:
+        LiveAnalysisTrigger.objects.get_or_create(
+            name=name, defaults={"weight": weight, "terms": "\n".join(terms)}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting_service", "0005_questiontemplate_questioneffectivenesslog_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LiveAnalysisTrigger",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Reported as the analysis reason",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "terms",
+                    models.TextField(
+                        help_text="Words or phrases, one per line (matched as whole words)"
+                    ),
+                ),
+                (
+                    "weight",
+                    models.FloatField(
+                        default=1.0,
+                        help_text="Importance of a match; triggers at or above LIVE_TRIGGER_PRIORITY_WEIGHT are analysed as soon as the meeting's analysis window allows",
+                    ),
+                ),
+                (
+                    "meeting_types",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Meeting types this trigger applies to (empty for all)",
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Live Analysis Trigger",
+                "verbose_name_plural": "Live Analysis Triggers",
+                "ordering": ["-weight", "name"],
+            },
+        ),
+        migrations.RunPython(create_default_triggers, migrations.RunPython.noop),
+    ]
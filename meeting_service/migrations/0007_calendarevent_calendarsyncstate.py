@@ -0,0 +1,117 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting_service", "0006_liveanalysistrigger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "provider",
+                    models.CharField(
+                        choices=[
+                            ("google", "Google Calendar"),
+                            ("outlook", "Outlook Calendar"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("external_id", models.CharField(max_length=512)),
+                ("title", models.CharField(blank=True, max_length=500)),
+                ("start_time", models.DateTimeField()),
+                ("end_time", models.DateTimeField()),
+                ("description", models.TextField(blank=True)),
+                ("attendees", models.JSONField(blank=True, default=list)),
+                ("location", models.CharField(blank=True, max_length=500)),
+                ("status", models.CharField(blank=True, max_length=50)),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="calendar_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["start_time"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "start_time", "end_time"],
+                        name="meeting_ser_user_id_752afd_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "end_time"],
+                        name="meeting_ser_user_id_16010f_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "provider", "external_id"),
+                        name="unique_calendar_event",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="CalendarSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "provider",
+                    models.CharField(
+                        choices=[
+                            ("google", "Google Calendar"),
+                            ("outlook", "Outlook Calendar"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("sync_token", models.TextField(blank=True)),
+                ("window_start", models.DateTimeField(blank=True, null=True)),
+                ("window_end", models.DateTimeField(blank=True, null=True)),
+                ("last_synced_at", models.DateTimeField(blank=True, null=True)),
+                ("last_full_sync_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="calendar_sync_states",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "provider")},
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting_service", "0007_calendarevent_calendarsyncstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("minutes_before", models.PositiveIntegerField()),
+                ("due_at", models.DateTimeField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reminders",
+                        to="meeting_service.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Meeting Reminder",
+                "verbose_name_plural": "Meeting Reminders",
+                "ordering": ["due_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["due_at"],
+                        name="meeting_reminder_due_idx",
+                    ),
+                    models.Index(
+                        fields=["status", "claimed_at"],
+                        name="meeting_ser_status_a454e1_idx",
+                    ),
+                ],
+                "unique_together": {("meeting", "minutes_before")},
+            },
+        ),
+    ]
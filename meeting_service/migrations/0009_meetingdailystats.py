@@ -0,0 +1,114 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_service", "0006_compressiondictionary_compressed_transcripts"),
+        ("meeting_service", "0008_meetingreminder"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "meeting_type",
+                    models.CharField(
+                        choices=[
+                            ("discovery", "Discovery Call"),
+                            ("demo", "Product Demo"),
+                            ("proposal", "Proposal Presentation"),
+                            ("negotiation", "Negotiation"),
+                            ("closing", "Closing Call"),
+                            ("follow_up", "Follow-up"),
+                            ("other", "Other"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("meeting_count", models.PositiveIntegerField(default=0)),
+                ("scheduled_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("cancelled_count", models.PositiveIntegerField(default=0)),
+                ("qualified_count", models.PositiveIntegerField(default=0)),
+                ("converted_count", models.PositiveIntegerField(default=0)),
+                (
+                    "completed_converted_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Completed meetings with a qualified or converted lead",
+                    ),
+                ),
+                (
+                    "timed_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Meetings with an actual start and end time",
+                    ),
+                ),
+                ("duration_minutes_total", models.PositiveIntegerField(default=0)),
+                (
+                    "prepared_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Meetings with preparation materials"
+                    ),
+                ),
+                ("question_score_total", models.FloatField(default=0)),
+                ("question_score_count", models.PositiveIntegerField(default=0)),
+                (
+                    "effectiveness_total",
+                    models.FloatField(
+                        default=0,
+                        help_text="Effectiveness scores of the completed meetings",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Meeting Daily Stats",
+                "verbose_name_plural": "Meeting Daily Stats",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["created_at"], name="meeting_ser_created_5f6e06_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="meetingdailystats",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="meeting_daily_stats",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meetingdailystats",
+            index=models.Index(
+                fields=["date", "meeting_type"], name="meeting_ser_date_a2a6f8_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="meetingdailystats",
+            unique_together={("date", "user", "meeting_type")},
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting_service", "0009_meetingdailystats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AIFeatureEffectiveness",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "feature",
+                    models.CharField(
+                        choices=[
+                            ("preparation_materials", "Pre-meeting Intelligence"),
+                            ("meeting_questions", "AI-Generated Questions"),
+                            ("meeting_outcomes", "Outcome Analysis"),
+                            ("lead_scoring", "Lead Scoring Updates"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "meeting_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("discovery", "Discovery Call"),
+                            ("demo", "Product Demo"),
+                            ("proposal", "Proposal Presentation"),
+                            ("negotiation", "Negotiation"),
+                            ("closing", "Closing Call"),
+                            ("follow_up", "Follow-up"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Blank for all meeting types",
+                        max_length=20,
+                    ),
+                ),
+                ("window_start", models.DateTimeField()),
+                ("window_end", models.DateTimeField()),
+                ("usage_count", models.PositiveIntegerField(default=0)),
+                ("control_count", models.PositiveIntegerField(default=0)),
+                ("success_rate", models.FloatField(default=0)),
+                ("effectiveness", models.FloatField(default=0)),
+                ("effectiveness_ci_low", models.FloatField(default=0)),
+                ("effectiveness_ci_high", models.FloatField(default=0)),
+                ("control_effectiveness", models.FloatField(default=0)),
+                (
+                    "previous_effectiveness",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Effectiveness in the window before",
+                        null=True,
+                    ),
+                ),
+                ("conversion_impact", models.FloatField(default=0)),
+                ("impact_ci_low", models.FloatField(default=0)),
+                ("impact_ci_high", models.FloatField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "AI Feature Effectiveness",
+                "verbose_name_plural": "AI Feature Effectiveness",
+                "ordering": ["feature", "meeting_type"],
+                "unique_together": {("feature", "meeting_type")},
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:43
+
+from django.db import migrations, models
+
+
+def seed_effectiveness_statistics(apps, schema_editor):
+    # success_rate was the mean of usage_count scores; the variance is unknown
+    QuestionTemplate = apps.get_model("meeting_service", "QuestionTemplate")
+    QuestionTemplate.objects.filter(usage_count__gt=0).update(
+        effectiveness_count=models.F("usage_count"),
+        effectiveness_mean=models.F("success_rate"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meeting_service", "0010_aifeatureeffectiveness"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="questioneffectivenesslog",
+            name="aggregated_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the score was folded into the question and its template",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="questiontemplate",
+            name="effectiveness_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of effectiveness scores aggregated"
+            ),
+        ),
+        migrations.AddField(
+            model_name="questiontemplate",
+            name="effectiveness_m2",
+            field=models.FloatField(
+                default=0.0,
+                help_text="Sum of squared deviations of the scores from their mean",
+            ),
+        ),
+        migrations.AddField(
+            model_name="questiontemplate",
+            name="effectiveness_mean",
+            field=models.FloatField(
+                default=0.0, help_text="Mean of the aggregated effectiveness scores"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="questioneffectivenesslog",
+            index=models.Index(
+                fields=["aggregated_at", "logged_at"],
+                name="meeting_ser_aggrega_a17d9e_idx",
+            ),
+        ),
+        migrations.RunPython(seed_effectiveness_statistics, migrations.RunPython.noop),
+    ]
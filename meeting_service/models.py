@@ -58,6 +58,91 @@ class MicrosoftTeamsCredentials(models.Model):
         return timezone.now() >= self.token_expiry
 
 
+class CalendarEvent(models.Model):
+    """Local mirror of an event in a user's connected calendar"""
+
+    class Provider(models.TextChoices):
+        GOOGLE = "google", "Google Calendar"
+        OUTLOOK = "outlook", "Outlook Calendar"
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="calendar_events"
+    )
+    provider = models.CharField(max_length=20, choices=Provider.choices)
+    external_id = models.CharField(max_length=512)
+    title = models.CharField(max_length=500, blank=True)
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    description = models.TextField(blank=True)
+    attendees = models.JSONField(default=list, blank=True)
+    location = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=50, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["start_time"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "provider", "external_id"],
+                name="unique_calendar_event",
+            )
+        ]
+        # Range queries select start_time < range end AND end_time > range start
+        indexes = [
+            models.Index(fields=["user", "start_time", "end_time"]),
+            models.Index(fields=["user", "end_time"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.provider}, {self.start_time})"
+
+    def to_event_dict(self):
+        """Same shape as the events returned by CalendarIntegrationService"""
+        return {
+            "id": self.external_id,
+            "title": self.title,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "calendar_type": self.provider,
+            "description": self.description,
+            "attendees": self.attendees,
+            "location": self.location,
+            "status": self.status,
+        }
+
+
+class CalendarSyncState(models.Model):
+    """Incremental sync position of a user's calendar mirror, per provider"""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="calendar_sync_states"
+    )
+    provider = models.CharField(max_length=20, choices=CalendarEvent.Provider.choices)
+    # Google nextSyncToken or Microsoft Graph deltaLink
+    sync_token = models.TextField(blank=True)
+    # Range the mirror holds; no end means every future event
+    window_start = models.DateTimeField(null=True, blank=True)
+    window_end = models.DateTimeField(null=True, blank=True)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ["user", "provider"]
+
+    def __str__(self):
+        return f"{self.provider} calendar sync for {self.user}"
+
+    def covers(self, start_time, end_time):
+        """The mirror has been synced and holds the whole range"""
+        return (
+            self.last_synced_at is not None
+            and self.window_start is not None
+            and self.window_start <= start_time
+            and (self.window_end is None or end_time <= self.window_end)
+        )
+
+
 class MeetingSession(models.Model):
     """Model for Google Meet sessions"""
 
@@ -385,6 +470,7 @@ class Meeting(models.Model):
             models.Index(fields=["lead", "status"]),
             models.Index(fields=["scheduled_at"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["created_at"]),
         ]
 
     def __str__(self):
@@ -599,9 +685,15 @@ class MeetingQuestion(models.Model):
         self.save(update_fields=["asked_at", "response", "updated_at"])
 
     def calculate_effectiveness(self, outcome_data: dict = None):
-        """Calculate and update effectiveness score based on outcomes"""
-        # This would be implemented with actual effectiveness calculation logic
-        # For now, we'll set a placeholder
+        """
+        Score the question from its outcomes and log the score
+
+        The score is appended to QuestionEffectivenessLog; the stored question
+        and its template are updated when the log is aggregated
+        (meeting_service/question_effectiveness.py).
+        """
+        from .question_effectiveness import record_effectiveness
+
         if outcome_data:
             # Example effectiveness calculation based on outcomes
             score = 0.0
@@ -616,12 +708,13 @@ class MeetingQuestion(models.Model):
                 score += 25
 
             self.effectiveness_score = min(score, 100.0)
-            self.save(
-                update_fields=[
-                    "effectiveness_score",
-                    "led_to_qualification",
-                    "updated_at",
-                ]
+            record_effectiveness(
+                self,
+                self.effectiveness_score,
+                led_to_qualification=bool(outcome_data.get("led_to_qualification")),
+                led_to_objection=bool(outcome_data.get("led_to_objection")),
+                generated_follow_ups=bool(outcome_data.get("generated_follow_up")),
+                moved_deal_forward=bool(outcome_data.get("moved_deal_forward")),
             )
 
 
@@ -682,6 +775,18 @@ class QuestionTemplate(models.Model):
     success_rate = models.FloatField(
         default=0.0, help_text="Success rate of questions generated from this template"
     )
+    # Running statistics of the effectiveness scores of its questions, folded
+    # in by meeting_service/question_effectiveness.py; success_rate is the mean
+    effectiveness_count = models.PositiveIntegerField(
+        default=0, help_text="Number of effectiveness scores aggregated"
+    )
+    effectiveness_mean = models.FloatField(
+        default=0.0, help_text="Mean of the aggregated effectiveness scores"
+    )
+    effectiveness_m2 = models.FloatField(
+        default=0.0,
+        help_text="Sum of squared deviations of the scores from their mean",
+    )
 
     # Template targeting
     company_size_filter = models.JSONField(
@@ -727,19 +832,31 @@ class QuestionTemplate(models.Model):
     def __str__(self):
         return f"{self.industry} - {self.get_template_type_display()} - {self.get_question_category_display()}"
 
+    @property
+    def effectiveness_variance(self):
+        """Sample variance of the aggregated effectiveness scores"""
+        if self.effectiveness_count < 2:
+            return 0.0
+        return self.effectiveness_m2 / (self.effectiveness_count - 1)
+
     def increment_usage(self):
         """Increment usage count when template is used"""
-        self.usage_count += 1
-        self.save(update_fields=["usage_count", "updated_at"])
+        # Incremented by the database, so concurrent uses are all counted
+        QuestionTemplate.objects.filter(pk=self.pk).update(
+            usage_count=models.F("usage_count") + 1, updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=["usage_count", "updated_at"])
 
     def update_success_rate(self, effectiveness_score: float):
-        """Update success rate based on question effectiveness"""
-        if self.usage_count > 0:
-            # Calculate weighted average of success rate
-            current_total = self.success_rate * (self.usage_count - 1)
-            new_total = current_total + effectiveness_score
-            self.success_rate = new_total / self.usage_count
-            self.save(update_fields=["success_rate", "updated_at"])
+        """Fold one effectiveness score into the success rate"""
+        from .question_effectiveness import TEMPLATE_STATS_FIELDS, Moments
+
+        moments = Moments()
+        moments.add(effectiveness_score)
+        QuestionTemplate.objects.filter(pk=self.pk).update(
+            updated_at=timezone.now(), **moments.fold_expressions()
+        )
+        self.refresh_from_db(fields=[*TEMPLATE_STATS_FIELDS, "updated_at"])
 
 
 class QuestionEffectivenessLog(models.Model):
@@ -856,6 +973,11 @@ class QuestionEffectivenessLog(models.Model):
     # Timestamps
     logged_at = models.DateTimeField(auto_now_add=True)
     analyzed_at = models.DateTimeField(auto_now=True)
+    aggregated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the score was folded into the question and its template",
+    )
 
     class Meta:
         ordering = ["-logged_at"]
@@ -865,6 +987,7 @@ class QuestionEffectivenessLog(models.Model):
             models.Index(fields=["question", "effectiveness_score"]),
             models.Index(fields=["meeting", "effectiveness_tier"]),
             models.Index(fields=["logged_at", "effectiveness_score"]),
+            models.Index(fields=["aggregated_at", "logged_at"]),
         ]
 
     def __str__(self):
@@ -1022,3 +1145,206 @@ class ConversationFlow(models.Model):
             )
 
         self.save()
+
+
+class LiveAnalysisTrigger(models.Model):
+    """Weighted terms that make a live meeting turn worth analysing"""
+
+    name = models.CharField(
+        max_length=100, unique=True, help_text="Reported as the analysis reason"
+    )
+    terms = models.TextField(
+        help_text="Words or phrases, one per line (matched as whole words)"
+    )
+    weight = models.FloatField(
+        default=1.0,
+        help_text=(
+            "Importance of a match; triggers at or above "
+            "LIVE_TRIGGER_PRIORITY_WEIGHT are analysed as soon as the "
+            "meeting's analysis window allows"
+        ),
+    )
+    meeting_types = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Meeting types this trigger applies to (empty for all)",
+    )
+    is_active = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-weight", "name"]
+        verbose_name = "Live Analysis Trigger"
+        verbose_name_plural = "Live Analysis Triggers"
+
+    def __str__(self):
+        return f"{self.name} ({self.weight})"
+
+    def term_list(self):
+        """Non-empty, lowercased terms"""
+        return [
+            term.strip().lower() for term in self.terms.splitlines() if term.strip()
+        ]
+
+
+class MeetingReminder(models.Model):
+    """A reminder of an upcoming meeting, sent when it falls due"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+        CANCELLED = "cancelled", "Cancelled"
+
+    meeting = models.ForeignKey(
+        Meeting, on_delete=models.CASCADE, related_name="reminders"
+    )
+    minutes_before = models.PositiveIntegerField()
+    due_at = models.DateTimeField()
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+
+    # Dispatch tracking
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["due_at"]
+        verbose_name = "Meeting Reminder"
+        verbose_name_plural = "Meeting Reminders"
+        unique_together = ["meeting", "minutes_before"]
+        indexes = [
+            # The dispatcher's scan: only pending reminders, by due time
+            models.Index(
+                fields=["due_at"],
+                name="meeting_reminder_due_idx",
+                condition=models.Q(status="pending"),
+            ),
+            models.Index(fields=["status", "claimed_at"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.meeting.title} - {self.minutes_before} min before ({self.status})"
+        )
+
+
+class MeetingDailyStats(models.Model):
+    """
+    Dashboard metrics of the meetings one user created on one day, by type
+
+    Maintained by meeting_service.meeting_stats as meetings, their questions
+    and their leads change.
+    """
+
+    date = models.DateField()
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="meeting_daily_stats"
+    )
+    meeting_type = models.CharField(max_length=20, choices=Meeting.MeetingType.choices)
+
+    # Meetings by status
+    meeting_count = models.PositiveIntegerField(default=0)
+    scheduled_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+
+    # Meetings by lead status
+    qualified_count = models.PositiveIntegerField(default=0)
+    converted_count = models.PositiveIntegerField(default=0)
+    completed_converted_count = models.PositiveIntegerField(
+        default=0, help_text="Completed meetings with a qualified or converted lead"
+    )
+
+    # Sums over meetings, divided by their counts for averages
+    timed_count = models.PositiveIntegerField(
+        default=0, help_text="Meetings with an actual start and end time"
+    )
+    duration_minutes_total = models.PositiveIntegerField(default=0)
+    prepared_count = models.PositiveIntegerField(
+        default=0, help_text="Meetings with preparation materials"
+    )
+    question_score_total = models.FloatField(default=0)
+    question_score_count = models.PositiveIntegerField(default=0)
+    effectiveness_total = models.FloatField(
+        default=0, help_text="Effectiveness scores of the completed meetings"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = "Meeting Daily Stats"
+        verbose_name_plural = "Meeting Daily Stats"
+        unique_together = ["date", "user", "meeting_type"]
+        indexes = [
+            models.Index(fields=["date", "meeting_type"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date} {self.meeting_type}"
+
+
+class AIFeatureEffectiveness(models.Model):
+    """
+    Effectiveness of an AI feature: meetings using it against those that don't
+
+    Computed periodically by meeting_service.effectiveness_analytics, overall
+    (blank meeting_type) and per meeting type. Intervals are 95%.
+    """
+
+    class Feature(models.TextChoices):
+        PREPARATION_MATERIALS = "preparation_materials", "Pre-meeting Intelligence"
+        MEETING_QUESTIONS = "meeting_questions", "AI-Generated Questions"
+        MEETING_OUTCOMES = "meeting_outcomes", "Outcome Analysis"
+        LEAD_SCORING = "lead_scoring", "Lead Scoring Updates"
+
+    feature = models.CharField(max_length=30, choices=Feature.choices)
+    meeting_type = models.CharField(
+        max_length=20,
+        choices=Meeting.MeetingType.choices,
+        blank=True,
+        help_text="Blank for all meeting types",
+    )
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+
+    # Meetings with and without the feature
+    usage_count = models.PositiveIntegerField(default=0)
+    control_count = models.PositiveIntegerField(default=0)
+    success_rate = models.FloatField(default=0)
+
+    # Conversion rate with the feature (mean score of AI questions for
+    # questions), and the same for the control group
+    effectiveness = models.FloatField(default=0)
+    effectiveness_ci_low = models.FloatField(default=0)
+    effectiveness_ci_high = models.FloatField(default=0)
+    control_effectiveness = models.FloatField(default=0)
+    previous_effectiveness = models.FloatField(
+        null=True, blank=True, help_text="Effectiveness in the window before"
+    )
+
+    # Conversion rate with the feature minus without, in points
+    conversion_impact = models.FloatField(default=0)
+    impact_ci_low = models.FloatField(default=0)
+    impact_ci_high = models.FloatField(default=0)
+
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["feature", "meeting_type"]
+        verbose_name = "AI Feature Effectiveness"
+        verbose_name_plural = "AI Feature Effectiveness"
+        unique_together = ["feature", "meeting_type"]
+
+    def __str__(self):
+        return f"{self.get_feature_display()} ({self.meeting_type or 'all types'})"
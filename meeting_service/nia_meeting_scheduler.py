@@ -118,45 +118,40 @@ class NIAMeetingScheduler:
         user: User,
         date_range: Tuple[datetime, datetime],
         meeting_type: NIAMeetingType = NIAMeetingType.GENERAL_CONSULTATION,
+        attendees: Optional[List[User]] = None,
+        include_manager: bool = False,
     ) -> List[Dict]:
-        """Get available time slots for NIA meetings"""
+        """
+        Get available time slots for NIA meetings
+
+        Slots are free for the user and every one of ``attendees`` (and the
+        user's manager with ``include_manager``), best first.
+        """
         try:
             start_date, end_date = date_range
             template = self.meeting_templates[meeting_type]
             duration = template["duration"]
 
-            # Use intelligent service to find available slots
-            availability = self.intelligent_service.analyze_user_availability(
-                user, (start_date, end_date)
-            )
-
-            # Filter slots based on NIA meeting requirements
-            available_slots = []
-            for slot in availability.get("available_slots", []):
-                # Ensure slot is long enough for the meeting type
-                slot_duration = int((slot["end"] - slot["start"]).total_seconds() / 60)
-                if slot_duration >= duration:
-                    # Adjust slot duration to match meeting type
-                    adjusted_end = slot["start"] + timedelta(minutes=duration)
-
-                    available_slots.append(
-                        {
-                            "start_time": slot["start"],
-                            "end_time": adjusted_end,
-                            "duration_minutes": duration,
-                            "meeting_type": meeting_type.value,
-                            "recommended": self._is_optimal_nia_time(slot["start"]),
-                            "preparation_time": self._calculate_preparation_time(
-                                meeting_type
-                            ),
-                        }
-                    )
+            users = [user, *(attendees or [])]
+            if include_manager and user.manager_id:
+                users.append(user.manager)
 
-            # Sort by recommendation score
-            available_slots.sort(
-                key=lambda x: (x["recommended"], x["start_time"]), reverse=True
+            slots = self.intelligent_service.find_common_slots(
+                users, start_date, end_date, duration_minutes=duration
             )
-            return available_slots[:10]  # Return top 10 slots
+
+            return [
+                {
+                    "start_time": slot["start_time"],
+                    "end_time": slot["end_time"],
+                    "duration_minutes": duration,
+                    "meeting_type": meeting_type.value,
+                    "recommended": self._is_optimal_nia_time(slot["start_time"]),
+                    "preparation_time": self._calculate_preparation_time(meeting_type),
+                    "attendee_ids": slot["attendee_ids"],
+                }
+                for slot in slots
+            ]
 
         except Exception as e:
             logger.error(f"Error getting available time slots: {str(e)}")
@@ -0,0 +1,153 @@
+"""
+Shared clients for the calendar and meeting providers
+
+- Microsoft Graph: one keep-alive ``requests.Session`` per process, with a
+  connection pool and retries (429 and 5xx, honouring Retry-After) for
+  idempotent requests
+- Google Calendar: API clients built once per user and access token, and
+  cached per thread (httplib2 connections are not thread-safe); requests
+  retry through ``execute(num_retries=...)``
+- ``run_concurrently`` runs provider fetches on a shared thread pool
+
+Timeouts and retry counts come from the PROVIDER_HTTP_* settings, and every
+provider call is timed in ``nia_calendar_provider_latency_seconds``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Sequence, Tuple, TypeVar
+
+import httplib2
+import requests
+from django.conf import settings
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ai_service import metrics
+
+T = TypeVar("T")
+
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+# Google API clients kept per thread
+GOOGLE_SERVICE_CACHE_SIZE = 64
+
+PROVIDER_LATENCY = metrics.REGISTRY.histogram(
+    "nia_calendar_provider_latency_seconds",
+    "Latency of calendar and meeting provider calls",
+    ["provider"],
+)
+PROVIDER_ERRORS = metrics.REGISTRY.counter(
+    "nia_calendar_provider_errors_total",
+    "Calendar and meeting provider calls that failed",
+    ["provider"],
+)
+
+
+def provider_timeout() -> Tuple[float, float]:
+    """(connect, read) timeout in seconds for provider requests"""
+    return (
+        getattr(settings, "PROVIDER_HTTP_CONNECT_TIMEOUT", 5),
+        getattr(settings, "PROVIDER_HTTP_READ_TIMEOUT", 30),
+    )
+
+
+def provider_retries() -> int:
+    return getattr(settings, "PROVIDER_HTTP_RETRIES", 3)
+
+
+@contextmanager
+def timed_call(provider: str):
+    """Record the latency (and failure) of one provider call"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PROVIDER_ERRORS.inc(provider=provider)
+        raise
+    finally:
+        PROVIDER_LATENCY.observe(time.perf_counter() - started, provider=provider)
+        metrics.maybe_flush()
+
+
+_graph_session = None
+_graph_session_lock = threading.Lock()
+
+
+def graph_session() -> requests.Session:
+    """Process-wide keep-alive session for Microsoft Graph"""
+    global _graph_session
+    with _graph_session_lock:
+        if _graph_session is None:
+            retry = Retry(
+                total=provider_retries(),
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=getattr(settings, "PROVIDER_HTTP_POOL_SIZE", 20),
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            _graph_session = session
+        return _graph_session
+
+
+_google_services = threading.local()
+
+
+def google_calendar_service(user_id, credentials):
+    """Google Calendar API client for the user's current access token"""
+    cache = getattr(_google_services, "cache", None)
+    if cache is None:
+        cache = _google_services.cache = OrderedDict()
+
+    key = (user_id, credentials.token)
+    service = cache.get(key)
+    if service is not None:
+        cache.move_to_end(key)
+        return service
+
+    # A refreshed token replaces the user's previous client
+    for stale_key in [k for k in cache if k[0] == user_id]:
+        del cache[stale_key]
+    http = AuthorizedHttp(
+        credentials, http=httplib2.Http(timeout=provider_timeout()[1])
+    )
+    service = build("calendar", "v3", http=http, cache_discovery=False)
+    cache[key] = service
+    if len(cache) > GOOGLE_SERVICE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return service
+
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+
+def run_concurrently(calls: Sequence[Callable[[], T]]) -> List[T]:
+    """
+    Run ``calls`` in parallel and return their results in order
+
+    The calls run on worker threads and must not use the database.
+    """
+    global _fetch_pool
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PROVIDER_FETCH_WORKERS", 8),
+                thread_name_prefix="provider-fetch",
+            )
+    futures = [_fetch_pool.submit(call) for call in calls]
+    return [future.result() for future in futures]
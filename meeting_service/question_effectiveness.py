@@ -0,0 +1,242 @@
+"""
+Question effectiveness learning
+
+Effectiveness events used to be written straight onto their question and
+template: calculate_effectiveness and track_question_effectiveness saved the
+question, and QuestionTemplate.update_success_rate recomputed the success rate
+on the Python instance before saving it, so templates scored by two meetings
+at once lost one of the scores. Events are now only appended to
+QuestionEffectivenessLog (record_effectiveness), and the
+aggregate_question_effectiveness task (CELERY_BEAT_SCHEDULE, every
+QUESTION_EFFECTIVENESS_AGGREGATION_INTERVAL seconds) folds the logs not yet
+aggregated, QUESTION_EFFECTIVENESS_AGGREGATION_BATCH_SIZE at a time:
+
+- each question gets the score of its latest log, in one UPDATE per batch
+- the scores of each template's questions (``template_id`` in their
+  generation context) are merged into the template's count, mean and sum of
+  squared deviations, with the parallel form of Welford's online algorithm.
+  The merge is written with F() expressions in one bulk_update, so the
+  database computes it from the stored values and no update is lost
+- success_rate, by which templates are ranked, is the mean. Templates scored
+  before the aggregator start from their success_rate as the mean of
+  usage_count scores (migration 0011)
+
+Logs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+aggregators fold each log once.
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, F, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+from .meeting_stats import refresh_daily_stats_on_commit
+from .models import Meeting, MeetingQuestion, QuestionEffectivenessLog, QuestionTemplate
+
+logger = logging.getLogger(__name__)
+
+# Template fields holding the running statistics
+TEMPLATE_STATS_FIELDS = (
+    "effectiveness_count",
+    "effectiveness_mean",
+    "effectiveness_m2",
+    "success_rate",
+)
+
+
+def effectiveness_tier(score: float) -> str:
+    """Tier of an effectiveness score, with the thresholds of the admin"""
+    if score >= 70:
+        return QuestionEffectivenessLog.EffectivenessTier.HIGH
+    if score >= 50:
+        return QuestionEffectivenessLog.EffectivenessTier.MEDIUM
+    return QuestionEffectivenessLog.EffectivenessTier.LOW
+
+
+def record_effectiveness(
+    question: MeetingQuestion, score: float, **fields
+) -> QuestionEffectivenessLog:
+    """
+    Append an effectiveness event for ``question``
+
+    ``fields`` are further QuestionEffectivenessLog fields. Neither the
+    question nor its template is written; the aggregator updates them.
+    """
+    tiers = QuestionEffectivenessLog.EffectivenessTier.values
+    if fields.get("effectiveness_tier") not in tiers:
+        fields["effectiveness_tier"] = effectiveness_tier(score)
+    fields.setdefault("response_text", question.response or "")
+    fields.setdefault("response_word_count", len(fields["response_text"].split()))
+    fields.setdefault("question_timing", "")
+    return QuestionEffectivenessLog.objects.create(
+        question=question,
+        meeting_id=question.meeting_id,
+        effectiveness_score=score,
+        **fields,
+    )
+
+
+@dataclass
+class Moments:
+    """Count, mean and sum of squared deviations from the mean of scores"""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, score: float):
+        """Welford's update with one more score"""
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Moments of both samples together"""
+        count = self.count + other.count
+        if not count:
+            return Moments()
+        delta = other.mean - self.mean
+        return Moments(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+        )
+
+    @property
+    def variance(self) -> float:
+        """Sample variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def fold_expressions(self) -> Dict[str, Any]:
+        """
+        QuestionTemplate field values merging these moments into its own
+
+        merge() written with F() expressions. Every F() in an UPDATE reads
+        the stored row, so the result does not depend on a copy of the
+        template held in Python.
+        """
+        count = F("effectiveness_count")
+        mean = F("effectiveness_mean")
+        total = count + Value(self.count)
+        delta = Value(self.mean) - mean
+        new_mean = mean + delta * Value(float(self.count)) / total
+        return {
+            "effectiveness_count": total,
+            "effectiveness_mean": new_mean,
+            "effectiveness_m2": F("effectiveness_m2")
+            + Value(self.m2)
+            + delta * delta * count * Value(float(self.count)) / total,
+            "success_rate": new_mean,
+        }
+
+
+class EffectivenessAggregator:
+    """Fold effectiveness logs into their questions and templates"""
+
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or getattr(
+            settings, "QUESTION_EFFECTIVENESS_AGGREGATION_BATCH_SIZE", 1000
+        )
+
+    def pending(self) -> int:
+        """Number of logs not aggregated yet"""
+        return QuestionEffectivenessLog.objects.filter(
+            aggregated_at__isnull=True
+        ).count()
+
+    def run(
+        self, now: Optional[datetime] = None, max_batches: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Aggregate the pending logs, a batch at a time"""
+        now = now or timezone.now()
+        counts = {"logs": 0, "questions": 0, "templates": 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = self.aggregate_batch(now)
+            if not batch["logs"]:
+                break
+            batches += 1
+            for key, value in batch.items():
+                counts[key] += value
+
+        if batches:
+            logger.info(f"Aggregated question effectiveness: {counts}")
+        return counts
+
+    def aggregate_batch(self, now: datetime) -> Dict[str, int]:
+        """Claim up to ``batch_size`` pending logs and fold them"""
+        with transaction.atomic():
+            ids = list(
+                QuestionEffectivenessLog.objects.select_for_update(skip_locked=True)
+                .filter(aggregated_at__isnull=True)
+                .order_by("logged_at")
+                .values_list("id", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                return {"logs": 0, "questions": 0, "templates": 0}
+
+            logs = QuestionEffectivenessLog.objects.filter(id__in=ids).values_list(
+                "question_id",
+                "meeting_id",
+                "question__generation_context__template_id",
+                "effectiveness_score",
+            )
+            question_ids, meeting_ids = set(), set()
+            moments = {}
+            for question_id, meeting_id, template_id, score in logs:
+                question_ids.add(question_id)
+                meeting_ids.add(meeting_id)
+                template_id = self._template_id(template_id)
+                if template_id is not None:
+                    moments.setdefault(template_id, Moments()).add(score)
+
+            questions = self._fold_questions(question_ids, now)
+            templates = self._fold_templates(moments, now)
+            QuestionEffectivenessLog.objects.filter(id__in=ids).update(
+                aggregated_at=now
+            )
+            refresh_daily_stats_on_commit(
+                meetings=Meeting.objects.filter(pk__in=meeting_ids)
+            )
+        return {"logs": len(ids), "questions": questions, "templates": templates}
+
+    def _fold_questions(self, question_ids, now: datetime) -> int:
+        """Give each question the score of its latest log"""
+        logs = QuestionEffectivenessLog.objects.filter(question=OuterRef("pk"))
+        return MeetingQuestion.objects.filter(pk__in=question_ids).update(
+            effectiveness_score=Subquery(
+                logs.order_by("-logged_at").values("effectiveness_score")[:1]
+            ),
+            led_to_qualification=Case(
+                When(Exists(logs.filter(led_to_qualification=True)), then=True),
+                default=F("led_to_qualification"),
+            ),
+            updated_at=now,
+        )
+
+    def _fold_templates(self, moments: Dict[uuid.UUID, Moments], now: datetime) -> int:
+        """Merge the moments of each template's new scores into its own"""
+        templates = []
+        for template_id, template_moments in moments.items():
+            template = QuestionTemplate(pk=template_id, updated_at=now)
+            for field, value in template_moments.fold_expressions().items():
+                setattr(template, field, value)
+            templates.append(template)
+        if not templates:
+            return 0
+        return QuestionTemplate.objects.bulk_update(
+            templates, [*TEMPLATE_STATS_FIELDS, "updated_at"]
+        )
+
+    def _template_id(self, value) -> Optional[uuid.UUID]:
+        try:
+            return uuid.UUID(str(value))
+        except (TypeError, ValueError):
+            return None
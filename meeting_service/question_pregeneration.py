@@ -0,0 +1,235 @@
+"""
+Nightly question generation for upcoming meetings
+
+Meeting questions used to be generated when a rep first opened a meeting,
+with a Gemini call shortly before it started. The pregenerate_meeting_questions
+task (CELERY_BEAT_SCHEDULE, every night at QUESTION_PREGENERATION_HOUR)
+generates them ahead of time for scheduled meetings in the next
+QUESTION_PREGENERATION_DAYS_AHEAD days that have no fresh AI-generated
+questions, i.e. none created in the last QUESTION_PREGENERATION_MAX_AGE_DAYS
+days.
+
+- meetings are grouped by industry, and the meetings of one lead are kept
+  together, so each prompt carries the industry context and each lead once
+- one prompt covers up to QUESTION_PREGENERATION_BATCH_SIZE meetings and
+  goes through the quota tracker like any other Gemini call. The run stops
+  when fewer than QUESTION_PREGENERATION_QUOTA_RESERVE requests are left in
+  the day, to keep them for reps
+- the questions of a batch are written with one bulk_create, replacing the
+  stale AI-generated questions that were never asked or scored
+
+Each run reports how many of the upcoming meetings have fresh questions.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ai_service.quota_tracker import quota_tracker
+
+from .models import Meeting, MeetingQuestion
+from .question_service import MeetingQuestionService
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPregenerator:
+    """Generate questions for upcoming meetings in batched prompts"""
+
+    def __init__(self, days_ahead: Optional[int] = None):
+        self.days_ahead = days_ahead or getattr(
+            settings, "QUESTION_PREGENERATION_DAYS_AHEAD", 3
+        )
+        self.batch_size = getattr(settings, "QUESTION_PREGENERATION_BATCH_SIZE", 4)
+        self.max_age = timedelta(
+            days=getattr(settings, "QUESTION_PREGENERATION_MAX_AGE_DAYS", 7)
+        )
+        self.quota_reserve = getattr(
+            settings, "QUESTION_PREGENERATION_QUOTA_RESERVE", 300
+        )
+        self._question_service = None
+
+    @property
+    def question_service(self) -> MeetingQuestionService:
+        if self._question_service is None:
+            self._question_service = MeetingQuestionService()
+        return self._question_service
+
+    def upcoming_meetings(self, now: datetime):
+        """Scheduled meetings starting in the next ``days_ahead`` days"""
+        return Meeting.objects.filter(
+            status=Meeting.Status.SCHEDULED,
+            scheduled_at__gte=now,
+            scheduled_at__lt=now + timedelta(days=self.days_ahead),
+        )
+
+    def with_fresh_questions(self, now: datetime):
+        """Condition on meetings with AI-generated questions younger than max_age"""
+        return Exists(
+            MeetingQuestion.objects.filter(
+                meeting=OuterRef("pk"),
+                ai_generated=True,
+                created_at__gte=now - self.max_age,
+            )
+        )
+
+    def due_meetings(self, now: datetime) -> List[Meeting]:
+        """Upcoming meetings without fresh questions, grouped for batching"""
+        meetings = (
+            self.upcoming_meetings(now)
+            .filter(~self.with_fresh_questions(now))
+            .select_related("lead__ai_insights")
+        )
+        return sorted(
+            meetings,
+            key=lambda meeting: (
+                self._industry(meeting),
+                str(meeting.lead_id),
+                meeting.scheduled_at,
+            ),
+        )
+
+    def coverage(self, now: Optional[datetime] = None) -> Dict:
+        """Share of the upcoming meetings that have fresh questions"""
+        now = now or timezone.now()
+        upcoming = self.upcoming_meetings(now)
+        total = upcoming.count()
+        covered = upcoming.filter(self.with_fresh_questions(now)).count()
+        return {
+            "upcoming_meetings": total,
+            "covered_meetings": covered,
+            "coverage": round(covered / total * 100, 1) if total else 100.0,
+        }
+
+    def run(self, now: Optional[datetime] = None) -> Dict:
+        """Generate questions for the due meetings and report coverage"""
+        now = now or timezone.now()
+        report = {
+            "due_meetings": 0,
+            "generated_meetings": 0,
+            "failed_meetings": 0,
+            "deferred_meetings": 0,
+            "questions_created": 0,
+            "prompts": 0,
+        }
+        meetings = self.due_meetings(now)
+        report["due_meetings"] = len(meetings)
+
+        batches = [
+            batch
+            for _, group in groupby(meetings, key=self._industry)
+            for batch in self._chunks(list(group))
+        ]
+        for index, batch in enumerate(batches):
+            if not self._quota_left():
+                report["deferred_meetings"] = sum(len(rest) for rest in batches[index:])
+                logger.warning(
+                    f"Deferred question generation for "
+                    f"{report['deferred_meetings']} meetings to keep Gemini quota"
+                )
+                break
+            report["prompts"] += 1
+            generated, questions = self.generate_batch(batch)
+            report["generated_meetings"] += generated
+            report["failed_meetings"] += len(batch) - generated
+            report["questions_created"] += questions
+
+        report.update(self.coverage(now))
+        logger.info(f"Pregenerated meeting questions: {report}")
+        return report
+
+    def generate_batch(self, meetings: List[Meeting]) -> tuple:
+        """
+        Generate and store questions for meetings of one industry
+
+        Returns:
+            tuple: Number of meetings that got questions, and of questions
+        """
+        service = self.question_service
+        # Each lead is sent once, however many of its meetings are in the batch
+        lead_keys, leads, contexts, by_key = {}, {}, {}, {}
+        for meeting in meetings:
+            if meeting.lead_id not in lead_keys:
+                lead_key = lead_keys[meeting.lead_id] = f"L{len(lead_keys) + 1}"
+                leads[lead_key] = {
+                    **service._extract_lead_data(meeting.lead),
+                    "previous_meetings": service._get_previous_meeting_context(
+                        meeting.lead
+                    ),
+                    "ai_insights": service._serialize_ai_insights(meeting.lead),
+                }
+            key = f"M{len(contexts) + 1}"
+            by_key[key] = meeting
+            contexts[key] = {
+                "lead": lead_keys[meeting.lead_id],
+                **self._meeting_context(meeting),
+            }
+
+        results = service.ai_service.generate_meeting_questions_batch(
+            self._industry(meetings[0]), leads, contexts
+        )
+
+        questions, generated = [], []
+        for key, questions_data in results.items():
+            meeting = by_key[key]
+            built = service._build_meeting_questions(meeting, questions_data)
+            if not built:
+                continue
+            service._add_question_generation_insights(meeting, questions_data, built)
+            questions.extend(built)
+            generated.append(meeting)
+
+        with transaction.atomic():
+            # ai_insights may have changed while Gemini was answering, so only
+            # the question generation entry is merged into the stored value
+            locked = Meeting.objects.select_for_update().filter(
+                pk__in=[meeting.pk for meeting in generated]
+            )
+            insights = {meeting.pk: meeting.ai_insights for meeting in generated}
+            rows = []
+            for row in locked.only("id", "ai_insights"):
+                row.ai_insights = {
+                    **(row.ai_insights or {}),
+                    "question_generation": insights[row.pk]["question_generation"],
+                }
+                row.updated_at = timezone.now()
+                rows.append(row)
+
+            # Stale AI-generated questions that were never used
+            MeetingQuestion.objects.filter(
+                meeting__in=generated,
+                ai_generated=True,
+                asked_at__isnull=True,
+                effectiveness_score__isnull=True,
+            ).delete()
+            MeetingQuestion.objects.bulk_create(questions)
+            Meeting.objects.bulk_update(rows, ["ai_insights", "updated_at"])
+        return len(generated), len(questions)
+
+    def _meeting_context(self, meeting: Meeting) -> Dict:
+        return {
+            "meeting_type": meeting.meeting_type,
+            "meeting_status": meeting.status,
+            "title": meeting.title,
+            "agenda": meeting.agenda,
+            "scheduled_at": meeting.scheduled_at.isoformat(),
+        }
+
+    def _industry(self, meeting: Meeting) -> str:
+        return (meeting.lead.industry or "").strip().lower()
+
+    def _chunks(self, meetings: List[Meeting]) -> List[List[Meeting]]:
+        return [
+            meetings[start : start + self.batch_size]
+            for start in range(0, len(meetings), self.batch_size)
+        ]
+
+    def _quota_left(self) -> bool:
+        usage = quota_tracker.get_current_usage()
+        return usage["daily_remaining"] > self.quota_reserve
@@ -11,6 +11,7 @@ from ai_service.models import Lead
 from ai_service.services import GeminiAIService
 
 from .models import Meeting, MeetingQuestion
+from .question_effectiveness import record_effectiveness
 
 logger = logging.getLogger(__name__)
 
@@ -290,7 +291,15 @@ class MeetingQuestionService:
         self, meeting: Meeting, questions_data: Dict[str, Any]
     ) -> List[MeetingQuestion]:
         """Create MeetingQuestion objects from AI-generated data"""
-        created_questions = []
+        return MeetingQuestion.objects.bulk_create(
+            self._build_meeting_questions(meeting, questions_data)
+        )
+
+    def _build_meeting_questions(
+        self, meeting: Meeting, questions_data: Dict[str, Any]
+    ) -> List[MeetingQuestion]:
+        """Unsaved MeetingQuestion objects from AI-generated data"""
+        questions = []
         sequence_counter = 1
 
         # Question type mapping
@@ -319,7 +328,7 @@ class MeetingQuestionService:
                     else:
                         priority_level = MeetingQuestion.Priority.LOW
 
-                    question = MeetingQuestion.objects.create(
+                    question = MeetingQuestion(
                         meeting=meeting,
                         question_text=question_data.get("question", ""),
                         question_type=question_type,
@@ -344,7 +353,7 @@ class MeetingQuestionService:
                         sequence_order=sequence_counter,
                     )
 
-                    created_questions.append(question)
+                    questions.append(question)
                     sequence_counter += 1
 
                 except Exception as e:
@@ -353,7 +362,7 @@ class MeetingQuestionService:
                     )
                     continue
 
-        return created_questions
+        return questions
 
     def _update_meeting_insights(
         self,
@@ -363,33 +372,44 @@ class MeetingQuestionService:
     ):
         """Update meeting AI insights with question generation data"""
         try:
-            current_insights = meeting.ai_insights or {}
-
-            current_insights.update(
-                {
-                    "question_generation": {
-                        "generated_at": timezone.now().isoformat(),
-                        "total_questions": len(created_questions),
-                        "questions_by_type": self._group_questions_by_type(
-                            created_questions
-                        ),
-                        "strategy": questions_data.get("question_strategy", {}),
-                        "high_priority_questions": len(
-                            [q for q in created_questions if q.is_high_priority]
-                        ),
-                        "conversion_focused_questions": len(
-                            [q for q in created_questions if q.is_conversion_focused]
-                        ),
-                    }
-                }
+            self._add_question_generation_insights(
+                meeting, questions_data, created_questions
             )
-
-            meeting.ai_insights = current_insights
             meeting.save(update_fields=["ai_insights", "updated_at"])
 
         except Exception as e:
             logger.error(f"Error updating meeting insights: {e}")
 
+    def _add_question_generation_insights(
+        self,
+        meeting: Meeting,
+        questions_data: Dict[str, Any],
+        created_questions: List[MeetingQuestion],
+    ):
+        """Record question generation metadata in the meeting's AI insights"""
+        current_insights = meeting.ai_insights or {}
+
+        current_insights.update(
+            {
+                "question_generation": {
+                    "generated_at": timezone.now().isoformat(),
+                    "total_questions": len(created_questions),
+                    "questions_by_type": self._group_questions_by_type(
+                        created_questions
+                    ),
+                    "strategy": questions_data.get("question_strategy", {}),
+                    "high_priority_questions": len(
+                        [q for q in created_questions if q.is_high_priority]
+                    ),
+                    "conversion_focused_questions": len(
+                        [q for q in created_questions if q.is_conversion_focused]
+                    ),
+                }
+            }
+        )
+
+        meeting.ai_insights = current_insights
+
     def _group_questions_by_type(
         self, questions: List[MeetingQuestion]
     ) -> Dict[str, int]:
@@ -603,8 +623,11 @@ class MeetingQuestionService:
                 question_data, response, outcome_data
             )
 
-            # Update question with effectiveness data
-            self._update_question_effectiveness(question, effectiveness)
+            # Log the effectiveness; the question and its template are
+            # updated when the log is aggregated
+            self._log_question_effectiveness(
+                question, response, outcome_data, effectiveness
+            )
 
             # Store learning insights for future question generation
             self._store_learning_insights(question, effectiveness)
@@ -867,29 +890,51 @@ class MeetingQuestionService:
 
         return results
 
-    def _update_question_effectiveness(
-        self, question: MeetingQuestion, effectiveness: Dict[str, Any]
+    def _log_question_effectiveness(
+        self,
+        question: MeetingQuestion,
+        response: str,
+        outcome_data: Dict[str, Any],
+        effectiveness: Dict[str, Any],
     ):
-        """Update question with effectiveness data"""
+        """Append the effectiveness analysis to QuestionEffectivenessLog"""
         try:
-            question.effectiveness_score = effectiveness.get("effectiveness_score", 0)
-
-            # Update generation context with effectiveness data
-            context = question.generation_context or {}
-            context["effectiveness_analysis"] = {
-                "analyzed_at": timezone.now().isoformat(),
-                "effectiveness_tier": effectiveness.get("effectiveness_tier", "medium"),
-                "key_insights": effectiveness.get("key_insights_gained", []),
-                "performance_breakdown": effectiveness.get(
-                    "effectiveness_breakdown", {}
+            breakdown = effectiveness.get("effectiveness_breakdown", {})
+            analysis = effectiveness.get("response_analysis", {})
+            learning = effectiveness.get("learning_insights", {})
+            recommendations = effectiveness.get("recommendations", {})
+            record_effectiveness(
+                question,
+                effectiveness.get("effectiveness_score", 0),
+                effectiveness_tier=effectiveness.get("effectiveness_tier"),
+                response_quality_score=breakdown.get("response_quality", 0),
+                information_value_score=breakdown.get("information_value", 0),
+                engagement_score=breakdown.get("engagement_generated", 0),
+                objective_advancement_score=breakdown.get("objective_advancement", 0),
+                pain_point_discovery_score=breakdown.get("pain_point_discovery", 0),
+                process_advancement_score=breakdown.get("process_advancement", 0),
+                response_text=response,
+                response_depth=analysis.get("response_depth", "moderate"),
+                buying_signals_identified=analysis.get("buying_signals", []),
+                concerns_raised=analysis.get("concerns_raised", []),
+                conversation_context=outcome_data,
+                what_worked_well=learning.get("what_worked_well", []),
+                improvement_opportunities=learning.get("improvement_opportunities", []),
+                context_factors=learning.get("context_factors", []),
+                replication_potential=learning.get("replication_potential", []),
+                question_modifications=recommendations.get(
+                    "question_modifications", []
                 ),
-                "learning_insights": effectiveness.get("learning_insights", {}),
-            }
-            question.generation_context = context
-            question.save()
+                timing_adjustments=recommendations.get("timing_adjustments", []),
+                follow_up_suggestions=recommendations.get("follow_up_suggestions", []),
+                led_to_qualification=bool(outcome_data.get("led_to_qualification")),
+                led_to_objection=bool(outcome_data.get("led_to_objection")),
+                generated_follow_ups=bool(outcome_data.get("generated_follow_up")),
+                moved_deal_forward=bool(outcome_data.get("moved_deal_forward")),
+            )
 
         except Exception as e:
-            logger.error(f"Error updating question effectiveness: {e}")
+            logger.error(f"Error logging question effectiveness: {e}")
 
     def _store_learning_insights(
         self, question: MeetingQuestion, effectiveness: Dict[str, Any]
@@ -0,0 +1,273 @@
+"""
+Due-time dispatch of meeting reminders
+
+Each reminder is a MeetingReminder row with the time it falls due. The
+dispatch_meeting_reminders task runs every REMINDER_DISPATCH_INTERVAL
+seconds (CELERY_BEAT_SCHEDULE) and claims due reminders in batches with
+``SELECT ... FOR UPDATE SKIP LOCKED``. Several dispatchers can run at once
+without sending a reminder twice, and each scan only reads pending reminders
+that are due, through a partial index on due_at. No timer is kept per
+meeting, so the number of upcoming meetings does not matter.
+
+Before a reminder is sent it is checked against its meeting. Reminders of
+cancelled, finished or past meetings are dropped, and those of meetings
+moved later are re-queued. Preparation materials are generated when a
+reminder is sent, not when it is scheduled. The meeting's later reminders
+reuse them while they are fresh (REMINDER_PREPARATION_MAX_AGE).
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Meeting, MeetingReminder
+
+logger = logging.getLogger(__name__)
+
+# 1 day, 1 hour and 15 minutes before
+DEFAULT_REMINDER_MINUTES = (24 * 60, 60, 15)
+
+
+class ReminderDispatcher:
+    """Schedule meeting reminders and send them when due"""
+
+    def __init__(self):
+        self.batch_size = getattr(settings, "REMINDER_DISPATCH_BATCH_SIZE", 200)
+        self.max_attempts = getattr(settings, "REMINDER_MAX_ATTEMPTS", 3)
+        self.claim_timeout = timedelta(
+            seconds=getattr(settings, "REMINDER_CLAIM_TIMEOUT", 600)
+        )
+        self.retry_delay = timedelta(
+            seconds=getattr(settings, "REMINDER_RETRY_DELAY", 300)
+        )
+        self.preparation_max_age = timedelta(
+            seconds=getattr(settings, "REMINDER_PREPARATION_MAX_AGE", 6 * 3600)
+        )
+        self._calendar_service = None
+        self._intelligence_service = None
+
+    @property
+    def calendar_service(self):
+        if self._calendar_service is None:
+            from .calendar_integration_service import CalendarIntegrationService
+
+            self._calendar_service = CalendarIntegrationService()
+        return self._calendar_service
+
+    @property
+    def intelligence_service(self):
+        if self._intelligence_service is None:
+            from .pre_meeting_intelligence import PreMeetingIntelligenceService
+
+            self._intelligence_service = PreMeetingIntelligenceService()
+        return self._intelligence_service
+
+    # Scheduling
+
+    def schedule(
+        self, meeting: Meeting, minutes_before: Iterable[int] = None
+    ) -> List[MeetingReminder]:
+        """
+        Set the meeting's reminders to ``minutes_before`` its start
+
+        Offsets whose time has passed are skipped, and unsent reminders at
+        other offsets are dropped. A reminder that was already sent for the
+        current meeting time is kept as it is.
+        """
+        now = timezone.now()
+        offsets = sorted(set(minutes_before or DEFAULT_REMINDER_MINUTES), reverse=True)
+        due = {
+            minutes: meeting.scheduled_at - timedelta(minutes=minutes)
+            for minutes in offsets
+        }
+        due = {minutes: due_at for minutes, due_at in due.items() if due_at > now}
+
+        with transaction.atomic():
+            existing = {
+                reminder.minutes_before: reminder
+                for reminder in MeetingReminder.objects.select_for_update().filter(
+                    meeting=meeting
+                )
+            }
+            stale = [
+                reminder.id
+                for minutes, reminder in existing.items()
+                if minutes not in due
+                and reminder.status == MeetingReminder.Status.PENDING
+            ]
+            MeetingReminder.objects.filter(id__in=stale).delete()
+
+            created, updated = [], []
+            for minutes, due_at in due.items():
+                reminder = existing.get(minutes)
+                if reminder is None:
+                    created.append(
+                        MeetingReminder(
+                            meeting=meeting, minutes_before=minutes, due_at=due_at
+                        )
+                    )
+                elif reminder.due_at != due_at or reminder.status in (
+                    MeetingReminder.Status.FAILED,
+                    MeetingReminder.Status.CANCELLED,
+                ):
+                    self._requeue(reminder, due_at, now)
+                    reminder.attempts = 0
+                    reminder.last_error = ""
+                    updated.append(reminder)
+            MeetingReminder.objects.bulk_create(created)
+            MeetingReminder.objects.bulk_update(
+                updated,
+                ["due_at", "status", "attempts", "last_error", "updated_at"],
+            )
+
+        logger.info(f"Scheduled {len(due)} reminders for meeting {meeting.id}")
+        return list(
+            MeetingReminder.objects.filter(meeting=meeting, minutes_before__in=due)
+        )
+
+    def reschedule(self, meeting: Meeting) -> int:
+        """Move or cancel pending reminders after the meeting changed"""
+        pending = MeetingReminder.objects.filter(
+            meeting=meeting, status=MeetingReminder.Status.PENDING
+        )
+        if meeting.status != Meeting.Status.SCHEDULED:
+            return pending.update(
+                status=MeetingReminder.Status.CANCELLED, updated_at=timezone.now()
+            )
+
+        now = timezone.now()
+        changed = []
+        for reminder in pending:
+            due_at = meeting.scheduled_at - timedelta(minutes=reminder.minutes_before)
+            if due_at != reminder.due_at:
+                self._requeue(reminder, due_at, now)
+                changed.append(reminder)
+        MeetingReminder.objects.bulk_update(changed, ["due_at", "updated_at"])
+        return len(changed)
+
+    # Dispatch
+
+    def dispatch_due(
+        self, now: Optional[datetime] = None, max_batches: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Send every reminder that is due, a batch at a time"""
+        now = now or timezone.now()
+        counts = {
+            "sent": 0,
+            "retrying": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rescheduled": 0,
+            "released": self.release_stale_claims(now),
+        }
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            reminders = self.claim_due(now, self.batch_size)
+            if not reminders:
+                break
+            batches += 1
+            for reminder in reminders:
+                counts[self._deliver(reminder, now)] += 1
+
+        if batches:
+            logger.info(f"Dispatched meeting reminders: {counts}")
+        return counts
+
+    def claim_due(self, now: datetime, limit: int) -> List[MeetingReminder]:
+        """
+        Mark up to ``limit`` due reminders as sending and return them
+
+        Rows locked by another dispatcher are skipped rather than waited for.
+        """
+        with transaction.atomic():
+            ids = list(
+                MeetingReminder.objects.select_for_update(skip_locked=True)
+                .filter(status=MeetingReminder.Status.PENDING, due_at__lte=now)
+                .order_by("due_at")
+                .values_list("id", flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            MeetingReminder.objects.filter(id__in=ids).update(
+                status=MeetingReminder.Status.SENDING,
+                claimed_at=now,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+        return list(
+            MeetingReminder.objects.filter(id__in=ids)
+            .select_related("meeting__lead__user")
+            .order_by("due_at")
+        )
+
+    def release_stale_claims(self, now: datetime) -> int:
+        """Reminders left sending by a dispatcher that died go back to pending"""
+        stale = MeetingReminder.objects.filter(
+            status=MeetingReminder.Status.SENDING,
+            claimed_at__lt=now - self.claim_timeout,
+        )
+        stale.filter(attempts__gte=self.max_attempts).update(
+            status=MeetingReminder.Status.FAILED,
+            last_error="Dispatch did not finish",
+            updated_at=now,
+        )
+        return stale.update(status=MeetingReminder.Status.PENDING, updated_at=now)
+
+    def _deliver(self, reminder: MeetingReminder, now: datetime) -> str:
+        meeting = reminder.meeting
+        if meeting.status != Meeting.Status.SCHEDULED or meeting.scheduled_at <= now:
+            self._finish(reminder, MeetingReminder.Status.CANCELLED)
+            return "cancelled"
+
+        due_at = meeting.scheduled_at - timedelta(minutes=reminder.minutes_before)
+        if due_at > now:
+            # The meeting was moved later
+            self._requeue(reminder, due_at, now)
+            reminder.save(update_fields=["due_at", "status", "updated_at"])
+            return "rescheduled"
+
+        self._ensure_preparation(meeting, now)
+        if self.calendar_service.send_meeting_reminder(
+            meeting, reminder.minutes_before
+        ):
+            reminder.sent_at = now
+            self._finish(reminder, MeetingReminder.Status.SENT)
+            return "sent"
+
+        reminder.last_error = "Reminder could not be sent"
+        if reminder.attempts >= self.max_attempts:
+            self._finish(reminder, MeetingReminder.Status.FAILED)
+            return "failed"
+        self._requeue(reminder, now + self.retry_delay * reminder.attempts, now)
+        reminder.save(update_fields=["due_at", "status", "last_error", "updated_at"])
+        return "retrying"
+
+    def _ensure_preparation(self, meeting: Meeting, now: datetime):
+        """Generate preparation materials unless fresh ones exist"""
+        materials = (meeting.ai_insights or {}).get("preparation_materials") or {}
+        generated_at = materials.get("generated_at")
+        if generated_at:
+            age = now - datetime.fromisoformat(generated_at.replace("Z", "+00:00"))
+            if age < self.preparation_max_age:
+                return
+        try:
+            self.intelligence_service.generate_preparation_materials(meeting)
+        except Exception as e:
+            # The reminder is still worth sending
+            logger.warning(
+                f"Could not generate preparation materials for meeting {meeting.id}: {e}"
+            )
+
+    def _requeue(self, reminder: MeetingReminder, due_at: datetime, now: datetime):
+        reminder.due_at = due_at
+        reminder.status = MeetingReminder.Status.PENDING
+        reminder.updated_at = now
+
+    def _finish(self, reminder: MeetingReminder, status: str):
+        reminder.status = status
+        reminder.save(update_fields=["status", "sent_at", "last_error", "updated_at"])
@@ -0,0 +1,14 @@
+"""
+WebSocket routing for meeting service
+"""
+
+from django.urls import re_path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(
+        r"ws/meetings/live/(?P<meeting_id>[0-9a-f-]+)/$",
+        consumers.LiveMeetingConsumer.as_asgi(),
+    ),
+]
@@ -0,0 +1,341 @@
+"""
+Streaming sentiment and engagement tracking for live meetings
+
+Asking Gemini for the sentiment of every analysis window costs an API call
+per analysis. The live UI only needs a continuous, roughly right signal, so
+each turn is scored locally with small lexicons and rules:
+
+- positive and negative terms (a negation in the three preceding words
+  flips a term, "not interested" counts as negative). Multi-word terms are
+  matched on whole words and counted once, not also as their single words
+- hedging terms ("maybe", "not sure", "we'll see") lower sentiment and
+  engagement
+- questions asked by the prospect and the prospect's share of the words
+  spoken (talk-time ratio) raise engagement
+
+Per-turn features are kept in a rolling window with running totals, so an
+update costs O(1) whatever the length of the meeting. The tracker is plain
+JSON and lives in the session state between turns: the window in
+``sentiment_tracker`` (written when a turn is added) and the calibration in
+``sentiment_calibration`` (written by the analysis worker), so the two
+writers never overwrite each other.
+
+Gemini is still used to calibrate: every LIVE_SENTIMENT_CALIBRATION_TURNS
+turns, or when the local score moves by LIVE_SENTIMENT_CALIBRATION_DELTA
+since the last calibration, the next analysis asks Gemini for the window's
+sentiment and the difference to the local score becomes an offset applied
+to later local scores.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from ai_service import metrics
+
+POSITIVE_TERMS = frozenset(
+    {
+        "great",
+        "good",
+        "excellent",
+        "perfect",
+        "love",
+        "interested",
+        "excited",
+        "impressed",
+        "helpful",
+        "valuable",
+        "useful",
+        "agree",
+        "absolutely",
+        "definitely",
+        "sounds good",
+        "makes sense",
+        "exactly",
+        "easy",
+        "fantastic",
+    }
+)
+NEGATIVE_TERMS = frozenset(
+    {
+        "bad",
+        "expensive",
+        "concerned",
+        "concern",
+        "worried",
+        "problem",
+        "difficult",
+        "frustrated",
+        "frustrating",
+        "hate",
+        "disappointed",
+        "unfortunately",
+        "risk",
+        "complicated",
+        "slow",
+        "no budget",
+        "too much",
+        "not a priority",
+    }
+)
+HEDGING_TERMS = frozenset(
+    {
+        "maybe",
+        "perhaps",
+        "possibly",
+        "probably",
+        "might",
+        "not sure",
+        "i guess",
+        "we'll see",
+        "hard to say",
+        "depends",
+        "sort of",
+        "kind of",
+        "think about it",
+    }
+)
+NEGATIONS = frozenset({"not", "no", "never", "don't", "doesn't", "isn't", "wasn't"})
+QUESTION_STARTS = frozenset(
+    {"what", "how", "why", "when", "where", "who", "which", "can", "could", "does"}
+)
+
+_WORD_RE = re.compile(r"[a-z']+")
+# Multi-word terms by their words, longest first so they win over shorter ones
+_PHRASES = sorted(
+    (
+        tuple(_WORD_RE.findall(term))
+        for term in POSITIVE_TERMS | NEGATIVE_TERMS | HEDGING_TERMS
+        if " " in term
+    ),
+    key=len,
+    reverse=True,
+)
+
+# Features per turn, in this order
+FEATURES = (
+    "prospect",
+    "words",
+    "prospect_words",
+    "positive",
+    "negative",
+    "hedges",
+    "questions",
+)
+
+LIVE_SENTIMENT_UPDATES = metrics.REGISTRY.counter(
+    "nia_live_sentiment_updates_total", "Turns scored by the local sentiment tracker"
+)
+LIVE_SENTIMENT_CALIBRATIONS = metrics.REGISTRY.counter(
+    "nia_live_sentiment_calibrations_total",
+    "Gemini sentiment calls made to calibrate the local tracker",
+    ["reason"],
+)
+
+
+def score_turn(speaker: str, content: str) -> list:
+    """Lexicon features of one turn, in FEATURES order"""
+    text = content.lower()
+    words = _WORD_RE.findall(text)
+    positive = negative = hedges = 0
+    # Words that are part of a matched phrase, which negate nothing
+    in_phrase = [False] * len(words)
+
+    index = 0
+    while index < len(words):
+        term, length = words[index], 1
+        for phrase in _PHRASES:
+            if tuple(words[index : index + len(phrase)]) == phrase:
+                term, length = " ".join(phrase), len(phrase)
+                break
+        negated = any(
+            words[before] in NEGATIONS and not in_phrase[before]
+            for before in range(max(0, index - 3), index)
+        )
+        if term in POSITIVE_TERMS:
+            if negated:
+                negative += 1
+            else:
+                positive += 1
+        elif term in NEGATIVE_TERMS:
+            if negated:
+                positive += 1
+            else:
+                negative += 1
+        elif term in HEDGING_TERMS:
+            hedges += 1
+        if length > 1:
+            in_phrase[index : index + length] = [True] * length
+        index += length
+
+    prospect = 1 if speaker == "prospect" else 0
+    question = int(
+        prospect == 1 and ("?" in text or (bool(words) and words[0] in QUESTION_STARTS))
+    )
+    return [
+        prospect,
+        len(words),
+        len(words) * prospect,
+        positive,
+        negative,
+        hedges,
+        question,
+    ]
+
+
+class SentimentTracker:
+    """Rolling-window sentiment and engagement for one live session"""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or getattr(settings, "LIVE_SENTIMENT_WINDOW_TURNS", 20)
+        self.turns = deque(maxlen=self.window)
+        self.totals = [0] * len(FEATURES)
+        self.turn_count = 0
+        self.sentiment_offset = 0.0
+        self.engagement_offset = 0.0
+        self.calibrated_turn = 0
+        self.calibrated_score: Optional[float] = None
+
+    # Persistence (JSON in the session state)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "turns": list(self.turns),
+            "totals": self.totals,
+            "turn_count": self.turn_count,
+        }
+
+    def calibration_state(self) -> Dict[str, Any]:
+        return {
+            "sentiment_offset": self.sentiment_offset,
+            "engagement_offset": self.engagement_offset,
+            "calibrated_turn": self.calibrated_turn,
+            "calibrated_score": self.calibrated_score,
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Optional[Dict[str, Any]],
+        calibration: Optional[Dict[str, Any]] = None,
+    ) -> "SentimentTracker":
+        # A session keeps the window size it started with
+        tracker = cls(window=state.get("window") if state else None)
+        if state:
+            tracker.turns.extend(state["turns"])
+            tracker.totals = list(state["totals"])
+            tracker.turn_count = state["turn_count"]
+        if calibration:
+            tracker.sentiment_offset = calibration["sentiment_offset"]
+            tracker.engagement_offset = calibration["engagement_offset"]
+            tracker.calibrated_turn = calibration["calibrated_turn"]
+            tracker.calibrated_score = calibration["calibrated_score"]
+        return tracker
+
+    @classmethod
+    def for_session(cls, session_data: Dict[str, Any]) -> "SentimentTracker":
+        return cls.from_state(
+            session_data.get("sentiment_tracker"),
+            session_data.get("sentiment_calibration"),
+        )
+
+    # Updates
+
+    def add_turn(self, speaker: str, content: str):
+        """Score a turn and slide the window (O(1) in the meeting length)"""
+        features = score_turn(speaker, content)
+        if len(self.turns) == self.window:
+            evicted = self.turns[0]
+            self.totals = [total - value for total, value in zip(self.totals, evicted)]
+        self.turns.append(features)
+        self.totals = [total + value for total, value in zip(self.totals, features)]
+        self.turn_count += 1
+        LIVE_SENTIMENT_UPDATES.inc()
+
+    def raw_scores(self):
+        """Uncalibrated (sentiment -1..1, engagement 0..100) for the window"""
+        prospect, words, prospect_words, positive, negative, hedges, questions = (
+            self.totals
+        )
+        polar = positive + negative
+        sentiment = (positive - negative) / (polar + 2)
+        sentiment -= 0.1 * min(hedges, 5) / 5
+
+        talk_ratio = prospect_words / words if words else 0.0
+        # Prospects carrying about 60% of the conversation are fully engaged
+        talk_score = min(talk_ratio / 0.6, 1.0)
+        question_rate = questions / prospect if prospect else 0.0
+        hedge_rate = hedges / prospect if prospect else 0.0
+        engagement = (
+            60 * talk_score + 30 * min(question_rate / 0.3, 1.0) + 10 * (polar > 0)
+        )
+        engagement -= 20 * min(hedge_rate, 1.0)
+        return max(-1.0, min(1.0, sentiment)), max(0.0, min(100.0, engagement))
+
+    def calibration_reason(self) -> Optional[str]:
+        """Why Gemini should recalibrate now, or None"""
+        if self.calibrated_score is None:
+            return "initial"
+        interval = getattr(settings, "LIVE_SENTIMENT_CALIBRATION_TURNS", 20)
+        if self.turn_count - self.calibrated_turn >= interval:
+            return "interval"
+        if self.sharp_change():
+            return "delta"
+        return None
+
+    def sharp_change(self) -> bool:
+        """The local score moved sharply since the last calibration"""
+        if self.calibrated_score is None:
+            return False
+        delta = getattr(settings, "LIVE_SENTIMENT_CALIBRATION_DELTA", 0.5)
+        return abs(self.raw_scores()[0] - self.calibrated_score) >= delta
+
+    def calibrate(self, sentiment_score: float, engagement_score: float, reason: str):
+        """Align the local scores with a Gemini reading of the same window"""
+        raw_sentiment, raw_engagement = self.raw_scores()
+        self.sentiment_offset = sentiment_score - raw_sentiment
+        self.engagement_offset = engagement_score - raw_engagement
+        self.calibrated_turn = self.turn_count
+        self.calibrated_score = raw_sentiment
+        LIVE_SENTIMENT_CALIBRATIONS.inc(reason=reason)
+
+    # Readings
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Calibrated reading in the shape of SentimentAnalysis"""
+        raw_sentiment, raw_engagement = self.raw_scores()
+        sentiment = max(-1.0, min(1.0, raw_sentiment + self.sentiment_offset))
+        engagement = max(0.0, min(100.0, raw_engagement + self.engagement_offset))
+
+        indicators = []
+        _, _, _, positive, negative, hedges, questions = self.totals
+        if positive:
+            indicators.append(f"{positive} positive expressions")
+        if negative:
+            indicators.append(f"{negative} concerns or negative expressions")
+        if hedges:
+            indicators.append(f"{hedges} hedging expressions")
+        if questions:
+            indicators.append(f"{questions} prospect questions")
+
+        filled = len(self.turns) / self.window
+        return {
+            "overall_sentiment": (
+                "positive"
+                if sentiment >= 0.2
+                else "negative" if sentiment <= -0.2 else "neutral"
+            ),
+            "sentiment_score": round(sentiment, 3),
+            "engagement_level": (
+                "high" if engagement >= 70 else "low" if engagement < 40 else "medium"
+            ),
+            "engagement_score": round(engagement, 1),
+            "emotional_indicators": indicators,
+            # Lower until the window fills; calibration adds confidence
+            "confidence_level": round(
+                40 * filled + (30 if self.calibrated_score is not None else 0), 1
+            ),
+        }
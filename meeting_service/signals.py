@@ -0,0 +1,213 @@
+import copy
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ai_service.models import AIInsights, Lead
+
+from .live_meeting_support import AI_INSIGHTS_CONTEXT_FIELDS, LEAD_CONTEXT_FIELDS
+from .live_session_store import get_live_session_store
+from .meeting_stats import refresh_daily_stats_on_commit
+from .models import LiveAnalysisTrigger, Meeting, MeetingQuestion
+from .reminder_dispatcher import ReminderDispatcher
+from .trigger_engine import invalidate_trigger_engine
+
+logger = logging.getLogger(__name__)
+
+# Context field values as last loaded or saved, kept on the instance
+_CONTEXT_VALUES_ATTR = "_live_context_values"
+# Meeting fields its reminders depend on
+MEETING_REMINDER_FIELDS = ("scheduled_at", "status")
+# Values behind the meeting stats rollup, kept apart from the context values
+_STATS_VALUES_ATTR = "_daily_stats_values"
+MEETING_STATS_KEY_FIELDS = ("lead_id", "meeting_type")
+LEAD_STATS_FIELDS = ("status",)
+QUESTION_STATS_FIELDS = ("effectiveness_score",)
+
+
+def _context_values(instance, context_fields) -> dict:
+    # Only loaded fields: reading a deferred one would query it
+    loaded = instance.__dict__
+    return {
+        field: copy.deepcopy(loaded[field])
+        for field in context_fields
+        if field in loaded
+    }
+
+
+def _remember_context_values(instance, context_fields, attr=_CONTEXT_VALUES_ATTR):
+    setattr(instance, attr, _context_values(instance, context_fields))
+
+
+def _context_changed(
+    instance, update_fields, context_fields, attr=_CONTEXT_VALUES_ATTR
+) -> bool:
+    """Compare the saved context fields with their last known values"""
+    fields = context_fields
+    if update_fields is not None:
+        fields = [field for field in context_fields if field in update_fields]
+    previous = getattr(instance, attr, {})
+    current = _context_values(instance, fields)
+    changed = any(
+        field not in previous or previous[field] != value
+        for field, value in current.items()
+    )
+    setattr(instance, attr, {**previous, **current})
+    return changed
+
+
+def invalidate_live_meeting_context(lead_id):
+    """Make live sessions for the lead rebuild their context snapshot"""
+    if not Meeting.objects.filter(
+        lead_id=lead_id, status=Meeting.Status.IN_PROGRESS
+    ).exists():
+        return
+
+    def bump():
+        try:
+            get_live_session_store().bump_context_version(lead_id)
+        except Exception as e:
+            logger.warning(f"Could not invalidate live context for lead {lead_id}: {e}")
+
+    # Rebuilds must see the committed change
+    transaction.on_commit(bump)
+
+
+@receiver(post_init, sender=Lead)
+def remember_lead_context(sender, instance, **kwargs):
+    _remember_context_values(instance, LEAD_CONTEXT_FIELDS)
+
+
+@receiver(post_init, sender=AIInsights)
+def remember_insights_context(sender, instance, **kwargs):
+    _remember_context_values(instance, AI_INSIGHTS_CONTEXT_FIELDS)
+
+
+@receiver(post_save, sender=Lead)
+def invalidate_live_context_on_lead_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """Lead details shown to live analysis changed"""
+    # Only a real change to a context field costs the meeting lookup
+    changed = _context_changed(instance, update_fields, LEAD_CONTEXT_FIELDS)
+    if changed and not created:
+        invalidate_live_meeting_context(instance.pk)
+
+
+@receiver(post_save, sender=AIInsights)
+def invalidate_live_context_on_insights_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """AI insights for a lead in a live meeting were created or updated"""
+    changed = _context_changed(instance, update_fields, AI_INSIGHTS_CONTEXT_FIELDS)
+    if created or changed:
+        invalidate_live_meeting_context(instance.lead_id)
+
+
+@receiver(post_delete, sender=AIInsights)
+def invalidate_live_context_on_insights_delete(sender, instance, **kwargs):
+    invalidate_live_meeting_context(instance.lead_id)
+
+
+@receiver(post_save, sender=LiveAnalysisTrigger)
+@receiver(post_delete, sender=LiveAnalysisTrigger)
+def reload_live_analysis_triggers(sender, **kwargs):
+    """Recompile this process's trigger engine after an admin edit"""
+    invalidate_trigger_engine()
+
+
+@receiver(post_init, sender=Meeting)
+def remember_meeting_schedule(sender, instance, **kwargs):
+    _remember_context_values(instance, MEETING_REMINDER_FIELDS)
+
+
+@receiver(post_save, sender=Meeting)
+def reschedule_reminders_on_meeting_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """Move or cancel pending reminders of a rescheduled or cancelled meeting"""
+    changed = _context_changed(instance, update_fields, MEETING_REMINDER_FIELDS)
+    if changed and not created:
+        ReminderDispatcher().reschedule(instance)
+
+
+@receiver(post_init, sender=Meeting)
+def remember_meeting_stats_key(sender, instance, **kwargs):
+    _remember_context_values(instance, MEETING_STATS_KEY_FIELDS, _STATS_VALUES_ATTR)
+
+
+@receiver(post_save, sender=Meeting)
+def refresh_stats_on_meeting_save(sender, instance, created, **kwargs):
+    """Recompute the meeting's day in the stats rollup"""
+    previous = getattr(instance, _STATS_VALUES_ATTR, {})
+    keys = set()
+    if not created and _context_changed(
+        instance, None, MEETING_STATS_KEY_FIELDS, _STATS_VALUES_ATTR
+    ):
+        # Moved to another lead or meeting type: its old day changes too
+        user_id = (
+            Lead.objects.filter(pk=previous.get("lead_id"))
+            .values_list("user_id", flat=True)
+            .first()
+        )
+        if user_id is not None:
+            day = timezone.localdate(instance.created_at)
+            keys.add((day, user_id, previous.get("meeting_type")))
+    refresh_daily_stats_on_commit(keys, Meeting.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Meeting)
+def refresh_stats_on_meeting_delete(sender, instance, **kwargs):
+    # Looked up now, while a lead deleted along with the meeting still exists
+    user_id = (
+        Lead.objects.filter(pk=instance.lead_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    if user_id is not None:
+        day = timezone.localdate(instance.created_at)
+        refresh_daily_stats_on_commit([(day, user_id, instance.meeting_type)])
+
+
+@receiver(post_init, sender=Lead)
+def remember_lead_stats_values(sender, instance, **kwargs):
+    _remember_context_values(instance, LEAD_STATS_FIELDS, _STATS_VALUES_ATTR)
+
+
+@receiver(post_save, sender=Lead)
+def refresh_stats_on_lead_save(sender, instance, created, update_fields=None, **kwargs):
+    """Conversions are counted by lead status"""
+    changed = _context_changed(
+        instance, update_fields, LEAD_STATS_FIELDS, _STATS_VALUES_ATTR
+    )
+    if changed and not created:
+        refresh_daily_stats_on_commit(meetings=Meeting.objects.filter(lead=instance))
+
+
+@receiver(post_init, sender=MeetingQuestion)
+def remember_question_stats_values(sender, instance, **kwargs):
+    _remember_context_values(instance, QUESTION_STATS_FIELDS, _STATS_VALUES_ATTR)
+
+
+@receiver(post_save, sender=MeetingQuestion)
+def refresh_stats_on_question_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    changed = _context_changed(
+        instance, update_fields, QUESTION_STATS_FIELDS, _STATS_VALUES_ATTR
+    )
+    if changed or (created and instance.effectiveness_score is not None):
+        refresh_daily_stats_on_commit(
+            meetings=Meeting.objects.filter(pk=instance.meeting_id)
+        )
+
+
+@receiver(post_delete, sender=MeetingQuestion)
+def refresh_stats_on_question_delete(sender, instance, **kwargs):
+    if instance.effectiveness_score is not None:
+        refresh_daily_stats_on_commit(
+            meetings=Meeting.objects.filter(pk=instance.meeting_id)
+        )
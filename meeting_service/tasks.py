@@ -0,0 +1,152 @@
+import logging
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from .calendar_mirror import CalendarMirror
+from .effectiveness_analytics import EffectivenessAnalytics
+from .live_meeting_support import LiveMeetingSupportService
+from .models import GoogleMeetCredentials, MicrosoftTeamsCredentials
+from .question_effectiveness import EffectivenessAggregator
+from .question_pregeneration import QuestionPregenerator
+from .reminder_dispatcher import ReminderDispatcher
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_live_analysis(session_id):
+    """
+    Run pending live analysis for a meeting session
+
+    Routed to the ``live_analysis`` queue (CELERY_TASK_ROUTES) so live
+    meetings are served by a dedicated worker pool. The task is only queued
+    by the caller that claimed the session's analysis slot, so at most one
+    runs per meeting.
+
+    Args:
+        session_id (str): Live meeting session ID
+
+    Returns:
+        dict: Number of analyses run
+    """
+    live_service = LiveMeetingSupportService()
+    try:
+        runs = live_service.run_pending_analysis(session_id)
+        return {"session_id": session_id, "analyses": runs}
+    except Exception as e:
+        logger.error(f"Live analysis failed for session {session_id}: {e}")
+        live_service.session_store.release_analysis(session_id)
+        raise
+
+
+@shared_task
+def flush_live_analysis_triggers(session_id):
+    """
+    Analyse the triggers a meeting coalesced during its debounce window
+
+    Scheduled with a countdown to the end of the window when a priority
+    trigger (LIVE_TRIGGER_PRIORITY_WEIGHT) fires while an analysis is too
+    recent to start another. Routed to the ``live_analysis`` queue.
+
+    Args:
+        session_id (str): Live meeting session ID
+
+    Returns:
+        dict: Whether an analysis was requested
+    """
+    live_service = LiveMeetingSupportService()
+    requested = live_service.flush_pending_triggers(session_id)
+    return {"session_id": session_id, "analysis_requested": requested}
+
+
+@shared_task
+def sync_calendar_mirror(user_id, full=False):
+    """
+    Bring one user's local calendar mirror up to date
+
+    Args:
+        user_id: ID of the user whose calendars to sync
+        full (bool): Re-list every event instead of syncing incrementally
+
+    Returns:
+        dict: Sync result per provider
+    """
+    user = User.objects.get(pk=user_id)
+    results = CalendarMirror().sync_user(user, full=full)
+    return {"user_id": user_id, "results": results}
+
+
+@shared_task
+def sync_calendar_mirrors():
+    """
+    Queue a mirror sync for every user with a connected calendar
+
+    Scheduled every CALENDAR_MIRROR_SYNC_INTERVAL seconds (CELERY_BEAT_SCHEDULE).
+
+    Returns:
+        dict: Number of users queued
+    """
+    user_ids = set(
+        GoogleMeetCredentials.objects.values_list("user_id", flat=True)
+    ) | set(MicrosoftTeamsCredentials.objects.values_list("user_id", flat=True))
+    for user_id in user_ids:
+        sync_calendar_mirror.delay(user_id)
+    return {"users": len(user_ids)}
+
+
+@shared_task
+def dispatch_meeting_reminders():
+    """
+    Send the meeting reminders that are due
+
+    Scheduled every REMINDER_DISPATCH_INTERVAL seconds (CELERY_BEAT_SCHEDULE).
+
+    Returns:
+        dict: Number of reminders sent, retrying, failed, cancelled,
+        rescheduled and released from stale claims
+    """
+    return ReminderDispatcher().dispatch_due()
+
+
+@shared_task
+def compute_ai_effectiveness():
+    """
+    Recompute the AI feature effectiveness table read by the dashboard
+
+    Scheduled every AI_EFFECTIVENESS_INTERVAL seconds (CELERY_BEAT_SCHEDULE).
+
+    Returns:
+        dict: Number of rows written
+    """
+    rows = EffectivenessAnalytics().recompute()
+    return {"rows": len(rows)}
+
+
+@shared_task
+def pregenerate_meeting_questions():
+    """
+    Generate questions for upcoming meetings that have no fresh ones
+
+    Scheduled nightly at QUESTION_PREGENERATION_HOUR (CELERY_BEAT_SCHEDULE).
+
+    Returns:
+        dict: Meetings generated, failed and deferred for quota, questions
+        created, prompts sent and the coverage of upcoming meetings
+    """
+    return QuestionPregenerator().run()
+
+
+@shared_task
+def aggregate_question_effectiveness():
+    """
+    Fold new question effectiveness logs into their questions and templates
+
+    Scheduled every QUESTION_EFFECTIVENESS_AGGREGATION_INTERVAL seconds
+    (CELERY_BEAT_SCHEDULE).
+
+    Returns:
+        dict: Number of logs aggregated, and of questions and templates updated
+    """
+    return EffectivenessAggregator().run()
@@ -1,16 +1,105 @@
-from datetime import timedelta
+import base64
+import csv
+import gzip
+import io
+import json
+import statistics
+import threading
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import MagicMock, patch
 
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
-
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ai_service.models import Lead
+from ai_service.redis_client import get_redis
+from ai_service.services import GeminiAIService
+
+from . import exports
+from .availability import (
+    AvailabilityGrid,
+    attendee_busy_intervals,
+    find_common_slots,
+    find_free_slots,
+    free_windows,
+    merge_busy_intervals,
+    score_slots,
+)
+from .calendar_integration_service import CalendarIntegrationService
+from .calendar_mirror import CalendarMirror
+from .dashboard_views import (
+    dashboard_ai_effectiveness_api,
+    dashboard_conversion_analytics_api,
+    dashboard_metrics_api,
+    dashboard_performance_metrics_api,
+    dashboard_recompute_ai_effectiveness_api,
+)
+from .effectiveness_analytics import (
+    EffectivenessAnalytics,
+    difference_interval,
+    mean_interval,
+    wilson_interval,
+)
+from .exports import QUESTION_EXPORT_COLUMNS, StreamingExport
+from .graph_batch import GraphBatch, GraphRequest
+from .live_meeting_support import (
+    LiveAnalysisResult,
+    LiveMeetingSupportService,
+    SentimentAnalysis,
+    live_meeting_group_name,
+)
+from .live_session_store import (
+    STATE_SUFFIX,
+    TURNS_SUFFIX,
+    LiveSessionStore,
+    LocalLiveSessionStore,
+)
+from .meeting_patterns import MeetingColumns
+from .meeting_stats import STATS_FIELDS, rebuild_daily_stats
+from .microsoft_teams_service import forget_access_token
 from .models import (
+    AIFeatureEffectiveness,
+    CalendarEvent,
+    CalendarSyncState,
     GoogleMeetCredentials,
+    LiveAnalysisTrigger,
+    Meeting,
+    MeetingDailyStats,
     MeetingParticipant,
+    MeetingQuestion,
+    MeetingReminder,
     MeetingSession,
     MeetingStatusUpdate,
+    QuestionEffectivenessLog,
+    QuestionTemplate,
 )
+from .provider_clients import PROVIDER_LATENCY, google_calendar_service, graph_session
+from .question_effectiveness import EffectivenessAggregator, Moments
+from .question_pregeneration import QuestionPregenerator
+from .question_service import MeetingQuestionService
+from .reminder_dispatcher import ReminderDispatcher
+from .routing import websocket_urlpatterns as meeting_websocket_urlpatterns
+from .sentiment_tracker import SentimentTracker, score_turn
+from .trigger_engine import (
+    AnalysisDecision,
+    TriggerDefinition,
+    TriggerEngine,
+    get_trigger_engine,
+    invalidate_trigger_engine,
+)
+from .views import export_question_analytics, get_meeting_outcomes_dashboard
 
 User = get_user_model()
 
@@ -323,8 +412,8 @@ class MicrosoftTeamsServiceTestCase(TestCase):
         self.assertEqual(stored_creds.tenant_id, "test-tenant-id")
         self.assertFalse(stored_creds.is_token_expired())
 
-    @patch("meeting_service.microsoft_teams_service.requests.post")
-    def test_create_teams_meeting_mock(self, mock_post):
+    @patch("meeting_service.microsoft_teams_service.graph_session")
+    def test_create_teams_meeting_mock(self, mock_session):
         """Test creating a Teams meeting with mocked API response"""
         # Mock the Graph API response
         mock_response = MagicMock()
@@ -338,7 +427,7 @@ class MicrosoftTeamsServiceTestCase(TestCase):
             },
             "organizer": {"emailAddress": {"address": "teamsservicetest@example.com"}},
         }
-        mock_post.return_value = mock_response
+        mock_session.return_value.request.return_value = mock_response
 
         # Create meeting
         start_time = timezone.now() + timedelta(hours=1)
@@ -1419,3 +1508,2632 @@ class NIAMeetingIntegrationTestCase(TestCase):
 
             nia_update = nia_updates.first()
             self.assertEqual(nia_update.metadata.get("lead_id"), "test-lead-id")
+
+
+# Live Meeting Support Tests
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+)
+class LiveSessionStoreTestCase(TestCase):
+    """Test cases for the incremental live meeting session store"""
+
+    def setUp(self):
+        self.store = LocalLiveSessionStore()
+        self.store.create("live_meeting_test", {"meeting_id": "m1", "user_id": "1"})
+
+    def tearDown(self):
+        self.store.delete("live_meeting_test")
+
+    def _turn(self, index):
+        return {
+            "timestamp": timezone.now(),
+            "speaker": "prospect" if index % 2 else "user",
+            "content": f"turn {index}",
+        }
+
+    def test_append_returns_turn_count_and_recent_turns_are_windowed(self):
+        for index in range(25):
+            count = self.store.append_turn("live_meeting_test", self._turn(index))
+
+        self.assertEqual(count, 25)
+        self.assertEqual(self.store.get_state("live_meeting_test")["turn_count"], 25)
+        recent = self.store.recent_turns("live_meeting_test", 3)
+        self.assertEqual(
+            [turn["content"] for turn in recent], ["turn 22", "turn 23", "turn 24"]
+        )
+
+    def test_history_streams_are_capped(self):
+        store = LocalLiveSessionStore(history_maxlen=3)
+        store.create("live_meeting_capped", {"meeting_id": "m2"})
+
+        store.add_key_moments(
+            "live_meeting_capped", [{"moment": index} for index in range(5)]
+        )
+
+        self.assertEqual(
+            store.key_moments("live_meeting_capped"),
+            [{"moment": 2}, {"moment": 3}, {"moment": 4}],
+        )
+        self.assertEqual(store.key_moments("live_meeting_capped", 1), [{"moment": 4}])
+        store.delete("live_meeting_capped")
+
+    def test_service_session_lifecycle(self):
+        user = User.objects.create_user(username="liveuser", password="testpass123")
+        lead = Lead.objects.create(user=user, company_name="Acme")
+        meeting = Meeting.objects.create(
+            lead=lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        service = LiveMeetingSupportService()
+
+        with patch.object(service, "_generate_initial_questions", return_value=[]):
+            session_id = service.start_live_meeting_session(
+                str(meeting.id), str(user.id)
+            )["session_id"]
+
+        with patch.object(
+            service, "_plan_analysis", return_value=AnalysisDecision(run_now=False)
+        ):
+            for content in ("Hello", "We need a CRM", "Budget is approved"):
+                result = service.process_conversation_turn(
+                    session_id, "prospect", content
+                )
+                self.assertTrue(result["success"])
+
+        turns = service.get_recent_turns(session_id, 2)
+        self.assertEqual([turn.content for turn in turns][-1], "Budget is approved")
+        self.assertIsInstance(turns[0].timestamp, datetime)
+
+        with patch.object(
+            service, "_generate_final_meeting_summary", return_value={}
+        ) as mock_summary:
+            result = service.end_live_meeting_session(session_id)
+
+        self.assertEqual(result["total_conversation_turns"], 3)
+        self.assertEqual(len(mock_summary.call_args[0][0]), 3)
+        self.assertIsNone(service.get_session(session_id))
+
+
+def _redis_available():
+    try:
+        return bool(get_redis().ping())
+    except Exception:
+        return False
+
+
+class ExpiredSessionTestsMixin:
+    """Appending to an expired session behaves the same in both stores"""
+
+    session_id = "live_meeting_expiry_test"
+
+    def _expire(self):
+        raise NotImplementedError
+
+    def _turns_exist(self) -> bool:
+        raise NotImplementedError
+
+    def tearDown(self):
+        self.store.delete(self.session_id)
+
+    def test_append_to_expired_session_is_dropped(self):
+        self.store.create(self.session_id, {"meeting_id": "m3"})
+        self.store.append_turn(self.session_id, {"content": "before expiry"})
+        self._expire()
+
+        count = self.store.append_turn(self.session_id, {"content": "late"})
+
+        self.assertEqual(count, 0)
+        self.assertIsNone(self.store.get_state(self.session_id))
+        self.assertFalse(self._turns_exist())
+
+
+class LocalExpiredSessionTestCase(ExpiredSessionTestsMixin, TestCase):
+    def setUp(self):
+        self.store = LocalLiveSessionStore()
+
+    def _expire(self):
+        self.store._sessions[self.session_id].expires_at = 0.0
+
+    def _turns_exist(self):
+        return bool(self.store.all_turns(self.session_id))
+
+
+@skipUnless(_redis_available(), "Redis is not reachable")
+class RedisExpiredSessionTestCase(ExpiredSessionTestsMixin, TestCase):
+    def setUp(self):
+        self.store = LiveSessionStore()
+
+    def _expire(self):
+        # Keys expire together; drop them the way their TTL would
+        self.store.client.delete(
+            *(self.store._key(self.session_id, s) for s in (STATE_SUFFIX, TURNS_SUFFIX))
+        )
+
+    def _turns_exist(self):
+        return bool(
+            self.store.client.exists(self.store._key(self.session_id, TURNS_SUFFIX))
+        )
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    LIVE_ANALYSIS_ASYNC=True,
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class LiveAnalysisWorkerTestCase(TestCase):
+    """Test cases for background live analysis with one worker per meeting"""
+
+    def setUp(self):
+        user = User.objects.create_user(username="workeruser", password="testpass123")
+        lead = Lead.objects.create(user=user, company_name="Acme")
+        self.meeting = Meeting.objects.create(
+            lead=lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        self.service = LiveMeetingSupportService()
+        with patch.object(self.service, "_generate_initial_questions", return_value=[]):
+            self.session_id = self.service.start_live_meeting_session(
+                str(self.meeting.id), str(user.id)
+            )["session_id"]
+
+    def tearDown(self):
+        self.service.session_store.delete(self.session_id)
+
+    def _analysis_result(self):
+        return LiveAnalysisResult(
+            conversation_turns=[],
+            sentiment_analysis=SentimentAnalysis(
+                overall_sentiment="positive",
+                sentiment_score=0.5,
+                engagement_level="high",
+                engagement_score=80.0,
+                emotional_indicators=[],
+                confidence_level=70.0,
+            ),
+            key_moments=[],
+            question_suggestions=[],
+            meeting_guidance=None,
+            meeting_progress={"progress_percentage": 50, "meeting_stage": "discovery"},
+            analysis_timestamp=timezone.now(),
+            confidence_score=70.0,
+        )
+
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_turns_return_immediately_with_one_worker_per_meeting(self, mock_delay):
+        with (
+            patch.object(
+                self.service,
+                "_plan_analysis",
+                return_value=AnalysisDecision(run_now=True),
+            ),
+            patch.object(self.service, "_perform_live_analysis") as mock_analysis,
+        ):
+            for content in ("Our budget is approved", "What does it cost?", "Great"):
+                result = self.service.process_conversation_turn(
+                    self.session_id, "prospect", content
+                )
+                self.assertTrue(result["analysis_queued"])
+                self.assertFalse(result["analysis_performed"])
+
+        mock_analysis.assert_not_called()
+        mock_delay.assert_called_once_with(self.session_id)
+        state = self.service.get_session(self.session_id)
+        self.assertEqual(state["analysis_requested_turn"], 3)
+
+    def test_worker_supersedes_stale_requests_and_pushes_results(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(
+            live_meeting_group_name(self.meeting.id), channel
+        )
+        store = self.service.session_store
+        store.update_state(self.session_id, analysis_requested_turn=3)
+        store.claim_analysis(self.session_id, 60)
+
+        def analyse(session_id, session_data, current_turn=None):
+            # Turns 4 and 5 arrive while the first analysis is running
+            if session_data["analysis_requested_turn"] == 3:
+                store.update_state(session_id, analysis_requested_turn=5)
+            return self._analysis_result()
+
+        with patch.object(
+            self.service, "_perform_live_analysis", side_effect=analyse
+        ) as mock_analysis:
+            runs = self.service.run_pending_analysis(self.session_id)
+
+        self.assertEqual(runs, 2)
+        self.assertEqual(mock_analysis.call_count, 2)
+        pushed = [
+            async_to_sync(channel_layer.receive)(channel)["analysis"]["turn_count"]
+            for _ in range(runs)
+        ]
+        self.assertEqual(pushed, [3, 5])
+        # The claim is released once the worker is idle
+        self.assertTrue(store.claim_analysis(self.session_id, 60))
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    LIVE_ANALYSIS_ASYNC=True,
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class LiveMeetingConsumerTestCase(TestCase):
+    """Test cases for the live meeting WebSocket consumer"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="socketuser", password="testpass123"
+        )
+        lead = Lead.objects.create(user=self.user, company_name="Acme")
+        self.meeting = Meeting.objects.create(
+            lead=lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        service = LiveMeetingSupportService()
+        with patch.object(service, "_generate_initial_questions", return_value=[]):
+            service.start_live_meeting_session(str(self.meeting.id), str(self.user.id))
+        self.application = URLRouter(meeting_websocket_urlpatterns)
+
+    def _communicator(self, user):
+        # channels.testing needs daphne, so drive the ASGI protocol directly
+        return ApplicationCommunicator(
+            self.application,
+            {
+                "type": "websocket",
+                "path": f"/ws/meetings/live/{self.meeting.id}/",
+                "headers": [],
+                "subprotocols": [],
+                "user": user,
+            },
+        )
+
+    async def _connect(self, communicator):
+        await communicator.send_input({"type": "websocket.connect"})
+        return await communicator.receive_output(timeout=5)
+
+    async def _receive_json(self, communicator):
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message["type"], "websocket.send")
+        return json.loads(message["text"])
+
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_turns_and_analysis_reach_every_observer(self, mock_delay):
+        async def scenario():
+            presenter = self._communicator(self.user)
+            observer = self._communicator(self.user)
+            for communicator in (presenter, observer):
+                accepted = await self._connect(communicator)
+                self.assertEqual(accepted["type"], "websocket.accept")
+                welcome = await self._receive_json(communicator)
+                self.assertTrue(welcome["session_active"])
+
+            await presenter.send_input(
+                {
+                    "type": "websocket.receive",
+                    "text": json.dumps(
+                        {
+                            "type": "conversation_turn",
+                            "speaker": "prospect",
+                            "content": "Our budget is approved for this quarter",
+                        }
+                    ),
+                }
+            )
+            for communicator in (presenter, observer):
+                message = await self._receive_json(communicator)
+                self.assertEqual(message["type"], "conversation_turn")
+                self.assertEqual(message["turn"]["speaker"], "prospect")
+
+            # Results from the analysis workers fan out to the whole group
+            await get_channel_layer().group_send(
+                live_meeting_group_name(self.meeting.id),
+                {"type": "live_analysis", "analysis": {"turn_count": 1}},
+            )
+            for communicator in (presenter, observer):
+                message = await self._receive_json(communicator)
+                self.assertEqual(message["analysis"]["turn_count"], 1)
+
+            for communicator in (presenter, observer):
+                await communicator.send_input(
+                    {"type": "websocket.disconnect", "code": 1000}
+                )
+                await communicator.wait(timeout=5)
+
+        async_to_sync(scenario)()
+
+    def test_other_users_cannot_follow_meeting(self):
+        stranger = User.objects.create_user(username="stranger", password="pass")
+
+        async def scenario():
+            closed = await self._connect(self._communicator(stranger))
+            self.assertEqual(closed["type"], "websocket.close")
+            self.assertEqual(closed["code"], 4004)
+
+        async_to_sync(scenario)()
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    LIVE_ANALYSIS_ASYNC=False,
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class LiveMeetingContextTestCase(TestCase):
+    """Test cases for the meeting context snapshot used by live analysis"""
+
+    def setUp(self):
+        user = User.objects.create_user(username="contextuser", password="testpass123")
+        self.lead = Lead.objects.create(
+            user=user, company_name="Acme", industry="Retail"
+        )
+        self.meeting = Meeting.objects.create(
+            lead=self.lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        self.service = LiveMeetingSupportService()
+        with patch.object(self.service, "_generate_initial_questions", return_value=[]):
+            self.session_id = self.service.start_live_meeting_session(
+                str(self.meeting.id), str(user.id)
+            )["session_id"]
+
+    def tearDown(self):
+        self.service.session_store.delete(self.session_id)
+
+    def _context(self):
+        session_data = self.service.get_session(self.session_id)
+        return self.service.get_meeting_context(self.session_id, session_data)
+
+    def test_live_analysis_makes_no_queries(self):
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "We need to replace our current system"
+        )
+        session_data = self.service.get_session(self.session_id)
+
+        with self.assertNumQueries(0):
+            result = self.service._perform_live_analysis(self.session_id, session_data)
+
+        self.assertEqual(len(result.conversation_turns), 1)
+        self.assertEqual(self._context()["company_name"], "Acme")
+
+    def test_context_changes_invalidate_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.industry = "Healthcare"
+            self.lead.save()
+
+        with self.assertNumQueries(1):
+            context = self._context()
+        self.assertEqual(context["industry"], "Healthcare")
+        self.assertEqual(context["version"], 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._context()["industry"], "Healthcare")
+
+    def test_unrelated_lead_updates_keep_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.status = Lead.Status.CONTACTED
+            self.lead.save(update_fields=["status"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._context()["version"], 0)
+
+    def test_saving_unchanged_lead_keeps_snapshot_without_lookup(self):
+        lead = Lead.objects.get(pk=self.lead.pk)
+        lead.status = Lead.Status.CONTACTED
+
+        # Only the UPDATE: no in-progress meeting lookup for untouched context
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                lead.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._context()["version"], 0)
+
+    def test_in_place_list_change_invalidates_snapshot(self):
+        lead = Lead.objects.get(pk=self.lead.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.pain_points.append("Slow reporting")
+            lead.save()
+
+        self.assertEqual(self._context()["version"], 1)
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    LIVE_ANALYSIS_ASYNC=False,
+    LIVE_SENTIMENT_CALIBRATION_TURNS=20,
+    LIVE_SENTIMENT_CALIBRATION_DELTA=0.5,
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+)
+class LiveSentimentTrackerTestCase(TestCase):
+    """Test cases for the local streaming sentiment tracker"""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username="sentimentuser", password="testpass123"
+        )
+        lead = Lead.objects.create(user=user, company_name="Acme")
+        meeting = Meeting.objects.create(
+            lead=lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        self.service = LiveMeetingSupportService()
+        with patch.object(self.service, "_generate_initial_questions", return_value=[]):
+            self.session_id = self.service.start_live_meeting_session(
+                str(meeting.id), str(user.id)
+            )["session_id"]
+
+    def tearDown(self):
+        self.service.session_store.delete(self.session_id)
+
+    def _gemini_reading(self, score=0.6):
+        return SentimentAnalysis(
+            overall_sentiment="positive",
+            sentiment_score=score,
+            engagement_level="high",
+            engagement_score=80.0,
+            emotional_indicators=[],
+            confidence_level=90.0,
+        )
+
+    def test_negation_flips_terms(self):
+        features = score_turn("prospect", "We are not interested. Maybe later?")
+
+        positive, negative, hedges, questions = features[3:]
+        self.assertEqual((positive, negative, hedges, questions), (0, 1, 1, 1))
+
+    def test_phrases_are_counted_once(self):
+        self.assertEqual(score_turn("prospect", "That sounds good")[3:6], [1, 0, 0])
+        self.assertEqual(
+            score_turn("prospect", "There is no budget, not sure")[3:6], [0, 1, 1]
+        )
+
+    def test_negation_flips_phrases(self):
+        self.assertEqual(
+            score_turn("prospect", "That does not sound good, not sounds good")[3:5],
+            [0, 2],
+        )
+        # The "no" of "no budget" does not negate the words after it
+        self.assertEqual(score_turn("prospect", "No budget, great")[3:5], [1, 1])
+
+    def test_phrases_match_whole_words(self):
+        self.assertEqual(
+            score_turn("prospect", "It makes sensed goodness")[3:6], [0, 0, 0]
+        )
+
+    def test_window_totals_match_recomputed_features(self):
+        tracker = SentimentTracker(window=3)
+        contents = [
+            "Great, exactly what we need",
+            "I am worried it is too expensive",
+            "Not sure, we'll see",
+            "How does onboarding work?",
+        ]
+        for content in contents:
+            tracker.add_turn("prospect", content)
+
+        expected = [
+            sum(values)
+            for values in zip(*(score_turn("prospect", c) for c in contents[-3:]))
+        ]
+        self.assertEqual(tracker.totals, expected)
+        restored = SentimentTracker.from_state(tracker.to_state())
+        self.assertEqual(restored.snapshot(), tracker.snapshot())
+
+    def test_turns_report_live_sentiment_without_gemini(self):
+        with patch.object(
+            self.service, "analyze_conversation_sentiment"
+        ) as mock_gemini, patch.object(
+            self.service,
+            "_plan_analysis",
+            return_value=AnalysisDecision(run_now=False),
+        ):
+            self.service.process_conversation_turn(
+                self.session_id, "user", "How is the rollout going?"
+            )
+            result = self.service.process_conversation_turn(
+                self.session_id, "prospect", "Great, this is exactly what we need"
+            )
+
+        mock_gemini.assert_not_called()
+        self.assertEqual(result["live_sentiment"]["overall_sentiment"], "positive")
+        self.assertGreater(result["live_sentiment"]["engagement_score"], 0)
+
+    def test_gemini_only_calibrates_periodically(self):
+        with patch.object(
+            self.service,
+            "_plan_analysis",
+            return_value=AnalysisDecision(run_now=False),
+        ):
+            self.service.process_conversation_turn(
+                self.session_id, "prospect", "We need a better CRM"
+            )
+
+        with patch.object(
+            self.service,
+            "analyze_conversation_sentiment",
+            return_value=self._gemini_reading(),
+        ) as mock_gemini, patch.object(
+            self.service, "generate_next_question_suggestions", return_value=[]
+        ), patch.object(
+            self.service, "generate_meeting_guidance", return_value=None
+        ):
+            for _ in range(3):
+                session_data = self.service.get_session(self.session_id)
+                analysis = self.service._perform_live_analysis(
+                    self.session_id, session_data
+                )
+
+        self.assertEqual(mock_gemini.call_count, 1)
+        # The calibration offset carries Gemini's reading forward
+        self.assertAlmostEqual(analysis.sentiment_analysis.sentiment_score, 0.6)
+
+    def test_sharp_swing_triggers_recalibration(self):
+        with patch.object(
+            self.service,
+            "_plan_analysis",
+            return_value=AnalysisDecision(run_now=False),
+        ):
+            self.service.process_conversation_turn(
+                self.session_id, "prospect", "Great, exactly what we need"
+            )
+        with patch.object(
+            self.service,
+            "analyze_conversation_sentiment",
+            return_value=self._gemini_reading(),
+        ):
+            self.service._perform_live_analysis(
+                self.session_id, self.service.get_session(self.session_id)
+            )
+
+        with patch.object(
+            self.service,
+            "analyze_conversation_sentiment",
+            return_value=self._gemini_reading(-0.7),
+        ) as mock_gemini:
+            result = self.service.process_conversation_turn(
+                self.session_id,
+                "prospect",
+                "Unfortunately it is too expensive and complicated",
+            )
+
+        self.assertTrue(result["analysis_performed"])
+        mock_gemini.assert_called_once()
+        self.assertEqual(result["sentiment_analysis"]["overall_sentiment"], "negative")
+
+
+@override_settings(
+    LIVE_SESSION_STORE="local",
+    LIVE_ANALYSIS_ASYNC=True,
+    LIVE_ANALYSIS_WINDOW_SECONDS=10,
+    LIVE_ANALYSIS_EVERY_TURNS=5,
+    LIVE_TRIGGER_PRIORITY_WEIGHT=3.0,
+    GEMINI_BACKEND="synthetic",
+    GEMINI_FAKE_LATENCY="fixed:0",
+    GEMINI_BREAKER_STORE="local",
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class LiveAnalysisTriggerTestCase(TestCase):
+    """Test cases for the live analysis trigger engine and debounce scheduler"""
+
+    def setUp(self):
+        invalidate_trigger_engine()
+        user = User.objects.create_user(username="triggeruser", password="testpass123")
+        lead = Lead.objects.create(user=user, company_name="Acme")
+        meeting = Meeting.objects.create(
+            lead=lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        self.service = LiveMeetingSupportService()
+        with patch.object(self.service, "_generate_initial_questions", return_value=[]):
+            self.session_id = self.service.start_live_meeting_session(
+                str(meeting.id), str(user.id)
+            )["session_id"]
+
+    def tearDown(self):
+        self.service.session_store.delete(self.session_id)
+        invalidate_trigger_engine()
+
+    def _end_window(self):
+        """Move the last analysis out of the debounce window"""
+        self.service.session_store.update_state(
+            self.session_id,
+            last_analysis_time=(timezone.now() - timedelta(seconds=11)).isoformat(),
+        )
+
+    def test_engine_matches_whole_words_and_phrases(self):
+        engine = TriggerEngine(
+            [
+                TriggerDefinition("budget", ["budget", "price"], 3.0),
+                TriggerDefinition("pilot", ["pilot program"], 2.0),
+                TriggerDefinition("demo", ["demo"], 1.0, meeting_types=["demo"]),
+            ]
+        )
+
+        self.assertEqual(
+            engine.match("The price of the Pilot Program?"),
+            {"budget": 3.0, "pilot": 2.0},
+        )
+        self.assertEqual(engine.match("Budgeting happens later"), {})
+        self.assertEqual(engine.match("Show me a demo", "discovery"), {})
+        self.assertEqual(engine.match("Show me a demo", "demo"), {"demo": 1.0})
+
+    def test_default_triggers_are_seeded(self):
+        matched = get_trigger_engine().match("Which competitor fits our budget?")
+
+        self.assertEqual(matched, {"budget": 3.0, "competitor": 3.0})
+
+    def test_saving_a_trigger_reloads_the_engine(self):
+        self.assertEqual(get_trigger_engine().match("Can we run a pilot?"), {})
+
+        LiveAnalysisTrigger.objects.create(name="pilot", terms="pilot\ntrial")
+
+        self.assertEqual(
+            get_trigger_engine().match("Can we run a pilot?"), {"pilot": 1.0}
+        )
+
+    @patch("meeting_service.tasks.flush_live_analysis_triggers.apply_async")
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_triggers_inside_window_are_coalesced(self, mock_delay, mock_flush):
+        first = self.service.process_conversation_turn(
+            self.session_id, "prospect", "We are worried about the timeline"
+        )
+        second = self.service.process_conversation_turn(
+            self.session_id, "prospect", "Is a deadline realistic when we need it?"
+        )
+
+        self.assertTrue(first["analysis_queued"])
+        self.assertEqual(first["analysis_trigger"]["reasons"], ["concern", "timeline"])
+        self.assertFalse(second["analysis_queued"])
+        self.assertIsNone(second["analysis_trigger"])
+        mock_flush.assert_not_called()
+        state = self.service.get_session(self.session_id)
+        self.assertEqual(
+            state["pending_triggers"], {"timeline": 1.0, "requirement": 1.0}
+        )
+
+        self._end_window()
+        self.service.session_store.release_analysis(self.session_id)
+        third = self.service.process_conversation_turn(
+            self.session_id, "prospect", "Okay"
+        )
+
+        self.assertTrue(third["analysis_queued"])
+        self.assertEqual(
+            third["analysis_trigger"],
+            {"reasons": ["requirement", "timeline"], "score": 2.0},
+        )
+        self.assertEqual(
+            self.service.get_session(self.session_id)["pending_triggers"], {}
+        )
+
+    @patch("meeting_service.tasks.flush_live_analysis_triggers.apply_async")
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_priority_trigger_flushes_at_end_of_window(self, mock_delay, mock_flush):
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "What does it cost?"
+        )
+        for _ in range(2):
+            result = self.service.process_conversation_turn(
+                self.session_id, "prospect", "We also looked at a competitor"
+            )
+            self.assertFalse(result["analysis_queued"])
+
+        # One flush per window, however many priority triggers fire
+        mock_flush.assert_called_once()
+        self.assertEqual(mock_flush.call_args.args[0], (self.session_id,))
+        self.assertGreater(mock_flush.call_args.kwargs["countdown"], 0)
+        self.assertLessEqual(mock_flush.call_args.kwargs["countdown"], 10)
+
+        self.service.session_store.release_analysis(self.session_id)
+        self._end_window()
+        self.assertTrue(self.service.flush_pending_triggers(self.session_id))
+
+        state = self.service.get_session(self.session_id)
+        self.assertEqual(state["analysis_requested_turn"], 3)
+        self.assertEqual(
+            state["analysis_trigger"], {"reasons": ["competitor"], "score": 3.0}
+        )
+        self.assertEqual(state["pending_triggers"], {})
+        self.assertFalse(state["trigger_flush_scheduled"])
+        self.assertEqual(mock_delay.call_count, 2)
+
+    @patch("meeting_service.tasks.flush_live_analysis_triggers.apply_async")
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_early_flush_reschedules(self, mock_delay, mock_flush):
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "What does it cost?"
+        )
+
+        self.assertFalse(self.service.flush_pending_triggers(self.session_id))
+        mock_flush.assert_called_once()
+        mock_delay.assert_called_once()
+
+    @patch(
+        "meeting_service.tasks.flush_live_analysis_triggers.apply_async",
+        side_effect=ConnectionError("broker down"),
+    )
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_failed_flush_schedule_is_retried(self, mock_delay, mock_flush):
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "What does it cost?"
+        )
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "We also looked at a competitor"
+        )
+
+        self.assertFalse(
+            self.service.get_session(self.session_id)["trigger_flush_scheduled"]
+        )
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "Which competitor is cheaper?"
+        )
+        self.assertEqual(mock_flush.call_count, 2)
+
+    @patch("meeting_service.tasks.flush_live_analysis_triggers.apply_async")
+    @patch("meeting_service.tasks.run_live_analysis.delay")
+    def test_analysis_clears_the_scheduled_flush(self, mock_delay, mock_flush):
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "What does it cost?"
+        )
+        self.service.process_conversation_turn(
+            self.session_id, "prospect", "We also looked at a competitor"
+        )
+        self.assertTrue(
+            self.service.get_session(self.session_id)["trigger_flush_scheduled"]
+        )
+
+        self._end_window()
+        self.service.session_store.release_analysis(self.session_id)
+        result = self.service.process_conversation_turn(
+            self.session_id, "prospect", "Okay"
+        )
+
+        self.assertTrue(result["analysis_queued"])
+        state = self.service.get_session(self.session_id)
+        self.assertEqual(state["pending_triggers"], {})
+        self.assertFalse(state["trigger_flush_scheduled"])
+
+    def test_worker_reports_the_trigger(self):
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        group = live_meeting_group_name(
+            self.service.get_session(self.session_id)["meeting_id"]
+        )
+        async_to_sync(channel_layer.group_add)(group, channel_name)
+        self.service.session_store.update_state(
+            self.session_id,
+            analysis_requested_turn=1,
+            analysis_trigger={"reasons": ["budget"], "score": 3.0},
+        )
+
+        with patch.object(
+            self.service,
+            "analyze_conversation_sentiment",
+            return_value=SentimentAnalysis(
+                overall_sentiment="neutral",
+                sentiment_score=0.0,
+                engagement_level="medium",
+                engagement_score=50.0,
+                emotional_indicators=[],
+                confidence_level=80.0,
+            ),
+        ), patch.object(
+            self.service, "generate_next_question_suggestions", return_value=[]
+        ), patch.object(
+            self.service, "generate_meeting_guidance", return_value=None
+        ):
+            self.service.run_pending_analysis(self.session_id)
+
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(
+            message["analysis"]["trigger"], {"reasons": ["budget"], "score": 3.0}
+        )
+
+
+class CalendarAvailabilityTestCase(TestCase):
+    """Test cases for the free/busy engine behind slot search"""
+
+    def setUp(self):
+        # Tuesday 2 January 2024, UTC
+        self.day = timezone.make_aware(datetime(2024, 1, 2))
+
+    def _at(self, hours, days=0):
+        return self.day + timedelta(days=days, hours=hours)
+
+    def _event(self, event_id, start_hours, end_hours, days=0):
+        return {
+            "id": event_id,
+            "title": event_id,
+            "start_time": self._at(start_hours, days),
+            "end_time": self._at(end_hours, days),
+            "calendar_type": "google",
+        }
+
+    def test_busy_intervals_are_merged(self):
+        events = [
+            self._event("c", 13, 14),
+            self._event("a", 9, 10.5),
+            self._event("b", 10, 11),
+            self._event("d", 11, 12),
+            self._event("x", 15, 16),
+        ]
+
+        busy = merge_busy_intervals(events, exclude_event_ids=["x"])
+
+        self.assertEqual(
+            busy, [(self._at(9), self._at(12)), (self._at(13), self._at(14))]
+        )
+        self.assertEqual(
+            free_windows(busy, self._at(8), self._at(18)),
+            [
+                (self._at(8), self._at(9)),
+                (self._at(12), self._at(13)),
+                (self._at(14), self._at(18)),
+            ],
+        )
+
+    def test_slots_avoid_busy_time_weekends_and_range_edges(self):
+        busy = merge_busy_intervals(
+            [self._event("a", 9.5, 11), self._event("b", 13, 14)]
+        )
+
+        # Tuesday 10:15 to Saturday
+        slots = find_free_slots(busy, self._at(10.25), self._at(0, days=4), 45, 30)
+        tuesday = [start for start, _ in slots if start < self._at(0, days=1)]
+
+        self.assertEqual(
+            tuesday,
+            [self._at(h) for h in (11, 11.5, 12, 14, 14.5, 15, 15.5, 16)],
+        )
+        self.assertTrue(
+            all(end - start == timedelta(minutes=45) for start, end in slots)
+        )
+        # Wednesday to Friday are free, Saturday is a weekend
+        self.assertEqual(len(slots), len(tuesday) + 3 * 15)
+
+    def test_batch_scores_match_per_slot_scan(self):
+        event_starts = [self._at(h) for h in (9, 9.75, 11.5, 14.25, 16)]
+        slot_starts = [self._at(h, days) for h in range(8, 18) for days in (0, 3)]
+
+        expected = []
+        for slot_start in slot_starts:
+            confidence = 100.0
+            hour = slot_start.hour
+            if 10 <= hour <= 11 or 14 <= hour <= 15:
+                confidence += 20
+            elif hour in (9, 16):
+                confidence += 10
+            elif hour < 9 or hour > 16:
+                confidence -= 20
+            for event_start in event_starts:
+                minutes = abs((event_start - slot_start).total_seconds() / 60)
+                if minutes < 30:
+                    confidence -= 30
+                elif minutes < 60:
+                    confidence -= 15
+            confidence += 10 if 1 <= slot_start.weekday() <= 3 else -5
+            expected.append(max(0, min(100, confidence)))
+
+        self.assertEqual(score_slots(slot_starts, event_starts), expected)
+
+    @patch(
+        "meeting_service.calendar_integration_service.get_google_meet_credentials",
+        return_value={"client_id": "id", "client_secret": "secret"},
+    )
+    def test_calendars_are_fetched_once_per_search(self, mock_credentials):
+        user = User.objects.create_user(username="calendaruser", password="pw123456")
+        service = CalendarIntegrationService()
+
+        with (
+            patch.object(
+                service,
+                "get_scheduling_events",
+                return_value=[self._event("a", 9, 12, days=1)],
+            ) as mock_events,
+            patch.object(service, "detect_calendar_conflicts") as mock_conflicts,
+        ):
+            slots = service.find_available_time_slots(
+                user, 60, self._at(0), self._at(0, days=14)
+            )
+
+        mock_events.assert_called_once_with(user, self._at(0), self._at(0, days=14))
+        mock_conflicts.assert_not_called()
+        self.assertEqual(len(slots), 20)
+        self.assertFalse(
+            any(
+                slot["start_time"] < self._at(12, days=1)
+                and slot["end_time"] > self._at(9, days=1)
+                for slot in slots
+            )
+        )
+        scores = [slot["confidence_score"] for slot in slots]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+@patch(
+    "meeting_service.calendar_integration_service.get_google_meet_credentials",
+    return_value={"client_id": "id", "client_secret": "secret"},
+)
+class CalendarMirrorTestCase(TestCase):
+    """Test cases for the local calendar mirror and its incremental sync"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="mirroruser", password="pw123456")
+        GoogleMeetCredentials.objects.create(
+            user=self.user,
+            access_token="token",
+            refresh_token="refresh",
+            token_expiry=timezone.now() + timedelta(hours=1),
+            scope="calendar",
+        )
+        self.start = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    def _google_event(self, event_id, hours, status="confirmed"):
+        start = self.start + timedelta(hours=hours)
+        return {
+            "id": event_id,
+            "status": status,
+            "summary": event_id,
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + timedelta(hours=1)).isoformat()},
+        }
+
+    def _google_service(self, pages):
+        """Fake Google client answering events().list with ``pages(params)``"""
+        service = MagicMock()
+        self.list_calls = []
+
+        def list_events(**params):
+            self.list_calls.append(params)
+            request = MagicMock()
+            request.execute.side_effect = lambda **kwargs: pages(params)
+            return request
+
+        service.events.return_value.list.side_effect = list_events
+        return service
+
+    def _service(self, google_service):
+        service = CalendarIntegrationService()
+        service.get_google_calendar_service = MagicMock(return_value=google_service)
+        return service
+
+    def test_incremental_google_sync(self, mock_credentials):
+        def pages(params):
+            if "syncToken" not in params:
+                if "pageToken" not in params:
+                    return {
+                        "items": [self._google_event("a", 1)],
+                        "nextPageToken": "p2",
+                    }
+                return {"items": [self._google_event("b", 3)], "nextSyncToken": "t1"}
+            self.assertEqual(params["syncToken"], "t1")
+            return {
+                "items": [
+                    self._google_event("a", 0, status="cancelled"),
+                    self._google_event("c", 5),
+                ],
+                "nextSyncToken": "t2",
+            }
+
+        mirror = CalendarMirror(self._service(self._google_service(pages)))
+
+        first = mirror.sync_user(self.user)
+        second = mirror.sync_user(self.user)
+
+        self.assertTrue(first["google"]["full"])
+        self.assertEqual(second["google"], {"full": False, "updated": 1, "removed": 1})
+        self.assertEqual(
+            list(CalendarEvent.objects.values_list("external_id", flat=True)),
+            ["b", "c"],
+        )
+        state = CalendarSyncState.objects.get(user=self.user, provider="google")
+        self.assertEqual(state.sync_token, "t2")
+
+    def test_expired_sync_token_falls_back_to_full_sync(self, mock_credentials):
+        CalendarSyncState.objects.create(
+            user=self.user,
+            provider="google",
+            sync_token="expired",
+            window_start=self.start - timedelta(days=7),
+            last_synced_at=self.start,
+        )
+        CalendarEvent.objects.create(
+            user=self.user,
+            provider="google",
+            external_id="gone",
+            start_time=self.start,
+            end_time=self.start + timedelta(hours=1),
+        )
+
+        def pages(params):
+            if "syncToken" in params:
+                raise HttpError(MagicMock(status=410), b"Sync token expired")
+            return {"items": [self._google_event("a", 1)], "nextSyncToken": "t1"}
+
+        result = CalendarMirror(self._service(self._google_service(pages))).sync_user(
+            self.user
+        )
+
+        self.assertTrue(result["google"]["full"])
+        self.assertEqual(
+            list(CalendarEvent.objects.values_list("external_id", flat=True)), ["a"]
+        )
+
+    def test_outlook_delta_sync_follows_links(self, mock_credentials):
+        GoogleMeetCredentials.objects.filter(user=self.user).delete()
+        MicrosoftTeamsCredentials.objects.create(
+            user=self.user,
+            access_token="token",
+            refresh_token="refresh",
+            token_expiry=timezone.now() + timedelta(hours=1),
+            scope="calendar",
+        )
+        service = CalendarIntegrationService()
+        service.get_outlook_headers = MagicMock(return_value={})
+
+        def outlook_event(event_id, hours):
+            start = (self.start + timedelta(hours=hours)).replace(tzinfo=None)
+            return {
+                "id": event_id,
+                "subject": event_id,
+                "start": {"dateTime": start.isoformat(), "timeZone": "UTC"},
+                "end": {
+                    "dateTime": (start + timedelta(hours=1)).isoformat(),
+                    "timeZone": "UTC",
+                },
+            }
+
+        responses = {
+            "delta": {
+                "value": [outlook_event("a", 1)],
+                "@odata.nextLink": "page-2",
+            },
+            "page-2": {
+                "value": [outlook_event("b", 2)],
+                "@odata.deltaLink": "delta-1",
+            },
+            "delta-1": {
+                "value": [{"id": "a", "@removed": {"reason": "deleted"}}],
+                "@odata.deltaLink": "delta-2",
+            },
+        }
+
+        def get(url, **kwargs):
+            key = "delta" if url.endswith("calendarView/delta") else url
+            return MagicMock(
+                status_code=200, json=MagicMock(return_value=responses[key])
+            )
+
+        with patch("meeting_service.calendar_mirror.graph_session") as mock_session:
+            mock_session.return_value.get.side_effect = get
+            mirror = CalendarMirror(service)
+            mirror.sync_user(self.user)
+            self.assertEqual(CalendarEvent.objects.count(), 2)
+            mirror.sync_user(self.user)
+
+        self.assertEqual(
+            list(CalendarEvent.objects.values_list("external_id", flat=True)), ["b"]
+        )
+        state = CalendarSyncState.objects.get(user=self.user, provider="outlook")
+        self.assertEqual(state.sync_token, "delta-2")
+        self.assertIsNotNone(state.window_end)
+
+    def test_conflicts_read_the_mirror_when_fresh(self, mock_credentials):
+        def pages(params):
+            return {"items": [self._google_event("a", 1)], "nextSyncToken": "t1"}
+
+        service = self._service(self._google_service(pages))
+        service.resync_calendar_mirror(self.user)
+
+        with patch.object(service, "get_all_calendar_events") as mock_live:
+            conflicts = service.detect_calendar_conflicts(
+                self.user,
+                self.start + timedelta(hours=1, minutes=30),
+                self.start + timedelta(hours=2, minutes=30),
+            )
+
+        mock_live.assert_not_called()
+        self.assertEqual([conflict.event_id for conflict in conflicts], ["a"])
+        freshness = service.get_calendar_freshness(self.user)["google"]
+        self.assertFalse(freshness["stale"])
+        self.assertEqual(freshness["last_error"], "")
+
+    @patch("meeting_service.tasks.sync_calendar_mirror.delay")
+    def test_stale_mirror_falls_back_to_providers(self, mock_sync, mock_credentials):
+        CalendarSyncState.objects.create(
+            user=self.user,
+            provider="google",
+            sync_token="t1",
+            window_start=self.start - timedelta(days=7),
+            last_synced_at=timezone.now() - timedelta(hours=1),
+        )
+        service = CalendarIntegrationService()
+
+        with patch.object(
+            service, "get_all_calendar_events", return_value=[]
+        ) as mock_live:
+            service.get_scheduling_events(
+                self.user, self.start, self.start + timedelta(days=1)
+            )
+
+        mock_live.assert_called_once()
+        mock_sync.assert_called_once_with(self.user.id)
+        self.assertTrue(service.get_calendar_freshness(self.user)["google"]["stale"])
+
+
+@patch(
+    "meeting_service.calendar_integration_service.get_google_meet_credentials",
+    return_value={"client_id": "id", "client_secret": "secret"},
+)
+class ProviderClientsTestCase(TestCase):
+    """Test cases for the pooled, concurrent calendar provider clients"""
+
+    def test_providers_are_fetched_concurrently(self, mock_credentials):
+        user = User.objects.create_user(username="fetchuser", password="pw123456")
+        service = CalendarIntegrationService()
+        start = timezone.now()
+        # Both fetches must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(calendar_type):
+            def run(client, fetch_user, start_time, end_time):
+                barrier.wait()
+                return [
+                    {
+                        "id": calendar_type,
+                        "start_time": start_time,
+                        "calendar_type": calendar_type,
+                    }
+                ]
+
+            return run
+
+        with (
+            patch.object(service, "get_google_calendar_service", return_value=object()),
+            patch.object(service, "get_outlook_headers", return_value={}),
+            patch.object(service, "_fetch_google_events", side_effect=fetch("google")),
+            patch.object(
+                service, "_fetch_outlook_events", side_effect=fetch("outlook")
+            ),
+        ):
+            events = service.get_all_calendar_events(
+                user, start, start + timedelta(days=1)
+            )
+
+        self.assertEqual(
+            sorted(event["calendar_type"] for event in events), ["google", "outlook"]
+        )
+
+    def test_google_latency_is_recorded(self, mock_credentials):
+        user = User.objects.create_user(username="latencyuser", password="pw123456")
+        client = MagicMock()
+        client.events.return_value.list.return_value.execute.return_value = {
+            "items": []
+        }
+        before = PROVIDER_LATENCY.get_count(provider="google")
+
+        events = CalendarIntegrationService()._fetch_google_events(
+            client, user, timezone.now(), timezone.now() + timedelta(hours=1)
+        )
+
+        self.assertEqual(events, [])
+        self.assertEqual(PROVIDER_LATENCY.get_count(provider="google"), before + 1)
+        client.events.return_value.list.return_value.execute.assert_called_once_with(
+            num_retries=3
+        )
+
+    def test_google_clients_are_reused_until_the_token_changes(self, mock_credentials):
+        first = google_calendar_service(1, Credentials(token="token-a"))
+
+        self.assertIs(google_calendar_service(1, Credentials(token="token-a")), first)
+        self.assertIsNot(
+            google_calendar_service(1, Credentials(token="token-b")), first
+        )
+
+    def test_graph_session_is_shared_with_retries(self, mock_credentials):
+        session = graph_session()
+
+        self.assertIs(graph_session(), session)
+        adapter = session.get_adapter("https://graph.microsoft.com/v1.0/me")
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+
+
+class AttendeeAvailabilityTestCase(TestCase):
+    """Test cases for the bitset availability engine across attendees"""
+
+    def setUp(self):
+        # Tuesday 2 January 2024, UTC
+        self.day = timezone.make_aware(datetime(2024, 1, 2))
+
+    def _at(self, hours, days=0):
+        return self.day + timedelta(days=days, hours=hours)
+
+    def test_window_starts_match_a_scan_of_the_free_bits(self):
+        grid = AvailabilityGrid(self._at(0), self._at(0, days=1), slot_minutes=5)
+        free = grid.common_free(
+            [
+                grid.busy_mask(
+                    [(self._at(9.5), self._at(10)), (self._at(13), self._at(15))]
+                )
+            ],
+            grid.working_mask(),
+        )
+        free_bits = set(grid.indices(free))
+
+        for duration in (5, 25, 45, 60, 95, 240):
+            length = duration // 5
+            expected = [
+                index
+                for index in range(grid.size)
+                if all(index + offset in free_bits for offset in range(length))
+            ]
+            self.assertEqual(
+                grid.indices(grid.window_starts(free, duration)), expected, duration
+            )
+
+    def test_common_slots_are_free_for_every_attendee(self):
+        busy = {
+            "rep": [(self._at(9), self._at(10.25))],
+            "manager": [(self._at(11), self._at(12)), (self._at(13.5), self._at(17))],
+            "participant": [(self._at(12.5), self._at(13))],
+        }
+
+        slots = find_common_slots(
+            busy,
+            self._at(0),
+            self._at(0, days=1),
+            30,
+            strategy="earliest",
+            limit=None,
+            step_minutes=30,
+        )
+
+        self.assertEqual(
+            [start for start, _, _ in slots],
+            [self._at(h) for h in (10.5, 12, 13)],
+        )
+        self.assertEqual(slots[0][1], self._at(11))
+
+    def test_best_slots_are_the_top_scored(self):
+        busy = {"rep": [(self._at(9), self._at(9.5))], "manager": []}
+
+        best = find_common_slots(busy, self._at(0), self._at(0, days=5), 60, limit=3)
+        every = find_common_slots(
+            busy, self._at(0), self._at(0, days=5), 60, limit=None
+        )
+
+        self.assertEqual(len(best), 3)
+        self.assertEqual(
+            [slot[2] for slot in best],
+            sorted((slot[2] for slot in every), reverse=True)[:3],
+        )
+        # Equal scores keep their time order
+        self.assertEqual(best, sorted(best, key=lambda slot: (-slot[2], slot[0])))
+        with self.assertRaises(ValueError):
+            find_common_slots(busy, self._at(0), self._at(0, days=1), 60, "latest")
+
+    def test_busy_intervals_come_from_meetings_and_mirrored_events(self):
+        rep = User.objects.create_user(username="rep", password="pw123456")
+        manager = User.objects.create_user(username="manager", password="pw123456")
+        meeting = MeetingSession.objects.create(
+            organizer=rep,
+            title="Demo",
+            scheduled_start_time=self._at(10),
+            scheduled_end_time=self._at(11),
+        )
+        MeetingParticipant.objects.create(
+            meeting=meeting, user=manager, email="manager@example.com", name="Manager"
+        )
+        MeetingSession.objects.create(
+            organizer=manager,
+            title="Cancelled",
+            scheduled_start_time=self._at(14),
+            scheduled_end_time=self._at(15),
+            status=MeetingSession.Status.CANCELLED,
+        )
+        CalendarEvent.objects.create(
+            user=manager,
+            provider=CalendarEvent.Provider.GOOGLE,
+            external_id="standup",
+            title="Standup",
+            start_time=self._at(9),
+            end_time=self._at(9.25),
+        )
+
+        busy = attendee_busy_intervals(
+            [rep.id, manager.id], self._at(0), self._at(0, days=1)
+        )
+
+        self.assertEqual(busy[rep.id], [(self._at(10), self._at(11))])
+        self.assertEqual(
+            busy[manager.id],
+            [(self._at(9), self._at(9.25)), (self._at(10), self._at(11))],
+        )
+
+
+def graph_batch_reply(statuses, bodies=None, headers=None):
+    """Fake $batch endpoint: answers each sub-request with statuses[id]"""
+
+    def post(url, headers=None, json=None, timeout=None):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {
+            "responses": [
+                {
+                    "id": item["id"],
+                    "status": statuses(item["id"]),
+                    "headers": (reply_headers or {}).get(item["id"], {}),
+                    "body": (bodies or {}).get(item["id"], {"value": []}),
+                }
+                for item in json["requests"]
+            ]
+        }
+        return response
+
+    reply_headers = headers
+    return post
+
+
+class GraphBatchTestCase(TestCase):
+    """Test cases for Microsoft Graph JSON batching"""
+
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_requests_are_sent_twenty_at_a_time_in_dependency_order(self, mock_session):
+        post = mock_session.return_value.post
+        post.side_effect = graph_batch_reply(lambda request_id: 200)
+        requests = [GraphRequest(id=f"r{i}", url=f"/items/{i}") for i in range(25)]
+        # r22 needs r21 (same batch), r21 needs r0 (first batch)
+        requests[21].depends_on = ["r0"]
+        requests[22].depends_on = ["r21"]
+
+        batch = GraphBatch("token", max_retries=0)
+        responses = batch.execute(requests)
+
+        self.assertEqual(batch.round_trips, 2)
+        self.assertTrue(all(response.ok for response in responses.values()))
+        first, second = [
+            call.kwargs["json"]["requests"] for call in post.call_args_list
+        ]
+        self.assertEqual(len(first), 20)
+        self.assertEqual(len(second), 5)
+        items = {item["id"]: item for item in first + second}
+        self.assertNotIn("dependsOn", items["r21"])
+        self.assertEqual(items["r22"]["dependsOn"], ["r21"])
+        self.assertEqual(
+            post.call_args.kwargs["headers"]["Authorization"], "Bearer token"
+        )
+
+    @patch("meeting_service.graph_batch.time.sleep")
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_throttled_requests_are_retried_with_their_dependents(
+        self, mock_session, mock_sleep
+    ):
+        post = mock_session.return_value.post
+        attempts = []
+
+        def status(request_id):
+            attempts.append(request_id)
+            if attempts.count("a") == 1:
+                return {"a": 429, "b": 424}.get(request_id, 200)
+            return 200
+
+        post.side_effect = graph_batch_reply(
+            status, headers={"a": {"Retry-After": "2"}}
+        )
+
+        responses = GraphBatch("token").execute(
+            [
+                GraphRequest(id="a", url="/a"),
+                GraphRequest(id="b", url="/b", depends_on=["a"]),
+                GraphRequest(id="c", url="/c"),
+            ]
+        )
+
+        self.assertEqual(post.call_count, 2)
+        retried = post.call_args.kwargs["json"]["requests"]
+        self.assertEqual([item["id"] for item in retried], ["a", "b"])
+        self.assertEqual(retried[1]["dependsOn"], ["a"])
+        mock_sleep.assert_called_once_with(2.0)
+        self.assertTrue(all(response.ok for response in responses.values()))
+
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_failed_dependencies_in_earlier_batches_fail_dependents(self, mock_session):
+        post = mock_session.return_value.post
+        post.side_effect = graph_batch_reply(
+            lambda request_id: 404 if request_id == "r0" else 200
+        )
+        requests = [GraphRequest(id=f"r{i}", url=f"/items/{i}") for i in range(21)]
+        requests[20].depends_on = ["r0"]
+
+        responses = GraphBatch("token", max_retries=0).execute(requests)
+
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(responses["r0"].status, 404)
+        self.assertEqual(responses["r20"].status, 424)
+
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_text_bodies_are_decoded(self, mock_session):
+        mock_session.return_value.post.side_effect = graph_batch_reply(
+            lambda request_id: 200,
+            bodies={"vtt": base64.b64encode(b"WEBVTT\n\nHello").decode()},
+            headers={"vtt": {"Content-Type": "text/vtt"}},
+        )
+
+        responses = GraphBatch("token").execute([GraphRequest(id="vtt", url="/vtt")])
+
+        self.assertEqual(responses["vtt"].body, "WEBVTT\n\nHello")
+
+
+@patch("meeting_service.microsoft_teams_service.ConfidentialClientApplication")
+class TeamsGraphBatchingTestCase(TestCase):
+    """Test cases for Teams data fetched through Graph batching"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="graphuser", password="pw123456")
+        MicrosoftTeamsCredentials.objects.create(
+            user=self.user,
+            access_token="graph-token",
+            refresh_token="refresh",
+            token_expiry=timezone.now() + timedelta(hours=1),
+            scope="scope",
+        )
+        forget_access_token(self.user.id)
+
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_transcripts_take_two_round_trips(self, mock_session, mock_msal):
+        bodies = {
+            "0-meeting": {
+                "value": [
+                    {"id": "t1", "createdDateTime": "2024-01-02T10:00:00Z"},
+                    {"id": "t2", "createdDateTime": "2024-01-02T11:00:00Z"},
+                ]
+            },
+            "0-0": base64.b64encode(b"first").decode(),
+            "0-1": base64.b64encode(b"second").decode(),
+        }
+        headers = {
+            "0-0": {"Content-Type": "text/vtt"},
+            "0-1": {"Content-Type": "text/vtt"},
+        }
+        post = mock_session.return_value.post
+        post.side_effect = graph_batch_reply(lambda request_id: 200, bodies, headers)
+        service = MicrosoftTeamsService()
+
+        with patch.object(
+            service, "refresh_user_credentials", return_value=True
+        ) as mock_refresh:
+            transcripts = service.get_meeting_transcripts(self.user, "meeting-1")
+            service.get_meeting_recordings(self.user, "meeting-1")
+
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(
+            [transcript["content"] for transcript in transcripts], ["first", "second"]
+        )
+        # The access token is cached after the first call
+        mock_refresh.assert_called_once_with(self.user)
+
+    @patch("meeting_service.graph_batch.graph_session")
+    def test_dashboard_data_takes_two_round_trips(self, mock_session, mock_msal):
+        bodies = {
+            "teams": {"value": [{"id": "team-1"}, {"id": "team-2"}]},
+            "0-recordings": {"value": [{"id": "rec"}]},
+            "0": {"value": [{"id": "general"}]},
+            "1": {"value": [{"id": "sales"}, {"id": "support"}]},
+        }
+        post = mock_session.return_value.post
+        post.side_effect = graph_batch_reply(lambda request_id: 200, bodies)
+
+        data = MicrosoftTeamsService().get_dashboard_data(
+            self.user, ["meeting-1", "meeting-2"]
+        )
+
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual([len(team["channels"]) for team in data["teams"]], [1, 2])
+        self.assertEqual(
+            data["meetings"]["meeting-1"], {"recordings": 1, "transcripts": 0}
+        )
+
+
+class MeetingReminderTestCase(TestCase):
+    """Test cases for due-time dispatch of meeting reminders"""
+
+    def setUp(self):
+        user = User.objects.create_user(username="reminderuser", password="testpass123")
+        lead = Lead.objects.create(user=user, company_name="Acme")
+        self.meeting = Meeting.objects.create(
+            lead=lead,
+            title="Discovery",
+            scheduled_at=timezone.now() + timedelta(hours=3),
+        )
+        self.dispatcher = ReminderDispatcher()
+        self.calendar_service = MagicMock()
+        self.calendar_service.send_meeting_reminder.return_value = True
+        self.dispatcher._calendar_service = self.calendar_service
+        self.intelligence_service = MagicMock()
+        self.dispatcher._intelligence_service = self.intelligence_service
+
+    def _minutes(self):
+        return sorted(self.meeting.reminders.values_list("minutes_before", flat=True))
+
+    def test_schedule_skips_passed_offsets_and_is_idempotent(self):
+        self.dispatcher.schedule(self.meeting, [24 * 60, 60, 15])
+        self.dispatcher.schedule(self.meeting, [24 * 60, 60, 15])
+
+        self.assertEqual(self._minutes(), [15, 60])
+        reminder = self.meeting.reminders.get(minutes_before=60)
+        self.assertEqual(
+            reminder.due_at, self.meeting.scheduled_at - timedelta(minutes=60)
+        )
+
+        self.dispatcher.schedule(self.meeting, [30])
+        self.assertEqual(self._minutes(), [30])
+
+    def test_calendar_service_schedules_reminders(self):
+        with patch(
+            "meeting_service.calendar_integration_service.get_google_meet_credentials"
+        ):
+            service = CalendarIntegrationService()
+        self.assertTrue(service.schedule_meeting_reminders(self.meeting, [60, 15]))
+        self.assertEqual(self._minutes(), [15, 60])
+
+    def test_dispatch_sends_due_reminders_once(self):
+        self.dispatcher.schedule(self.meeting, [60, 15])
+        now = self.meeting.scheduled_at - timedelta(minutes=30)
+
+        counts = self.dispatcher.dispatch_due(now)
+        again = self.dispatcher.dispatch_due(now)
+
+        self.assertEqual(counts["sent"], 1)
+        self.assertEqual(again["sent"], 0)
+        self.calendar_service.send_meeting_reminder.assert_called_once_with(
+            self.meeting, 60
+        )
+        self.intelligence_service.generate_preparation_materials.assert_called_once()
+        sent = self.meeting.reminders.get(minutes_before=60)
+        self.assertEqual(sent.status, MeetingReminder.Status.SENT)
+        self.assertEqual(
+            self.meeting.reminders.get(minutes_before=15).status,
+            MeetingReminder.Status.PENDING,
+        )
+
+    def test_fresh_preparation_materials_are_reused(self):
+        self.meeting.ai_insights = {
+            "preparation_materials": {"generated_at": timezone.now().isoformat()}
+        }
+        self.meeting.save()
+        self.dispatcher.schedule(self.meeting, [60])
+
+        self.dispatcher.dispatch_due(self.meeting.scheduled_at - timedelta(minutes=30))
+
+        self.intelligence_service.generate_preparation_materials.assert_not_called()
+        self.calendar_service.send_meeting_reminder.assert_called_once()
+
+    def test_cancelling_meeting_cancels_reminders(self):
+        self.dispatcher.schedule(self.meeting, [60, 15])
+
+        self.meeting.status = Meeting.Status.CANCELLED
+        self.meeting.save()
+
+        self.assertFalse(
+            self.meeting.reminders.filter(
+                status=MeetingReminder.Status.PENDING
+            ).exists()
+        )
+        counts = self.dispatcher.dispatch_due(self.meeting.scheduled_at)
+        self.assertEqual(counts["sent"], 0)
+        self.calendar_service.send_meeting_reminder.assert_not_called()
+
+    def test_moving_meeting_moves_reminders(self):
+        self.dispatcher.schedule(self.meeting, [60])
+        moved_to = self.meeting.scheduled_at + timedelta(days=1)
+
+        Meeting.objects.filter(pk=self.meeting.pk).update(scheduled_at=moved_to)
+        counts = self.dispatcher.dispatch_due(moved_to - timedelta(days=1, minutes=30))
+        self.assertEqual(counts["rescheduled"], 1)
+        self.calendar_service.send_meeting_reminder.assert_not_called()
+
+        meeting = Meeting.objects.get(pk=self.meeting.pk)
+        meeting.scheduled_at = moved_to + timedelta(hours=1)
+        meeting.save()
+        self.assertEqual(
+            meeting.reminders.get().due_at,
+            meeting.scheduled_at - timedelta(minutes=60),
+        )
+
+    @override_settings(REMINDER_MAX_ATTEMPTS=2, REMINDER_RETRY_DELAY=60)
+    def test_failed_sends_are_retried_then_failed(self):
+        dispatcher = ReminderDispatcher()
+        dispatcher._calendar_service = self.calendar_service
+        dispatcher._intelligence_service = self.intelligence_service
+        self.calendar_service.send_meeting_reminder.return_value = False
+        dispatcher.schedule(self.meeting, [60])
+        now = self.meeting.scheduled_at - timedelta(minutes=50)
+
+        self.assertEqual(dispatcher.dispatch_due(now)["retrying"], 1)
+        self.assertEqual(dispatcher.dispatch_due(now)["sent"], 0)
+        self.assertEqual(
+            dispatcher.dispatch_due(now + timedelta(minutes=1))["failed"], 1
+        )
+        reminder = self.meeting.reminders.get()
+        self.assertEqual(reminder.status, MeetingReminder.Status.FAILED)
+        self.assertEqual(reminder.attempts, 2)
+
+    def test_stale_claims_are_released(self):
+        self.dispatcher.schedule(self.meeting, [60])
+        now = self.meeting.scheduled_at - timedelta(minutes=30)
+        self.assertEqual(len(self.dispatcher.claim_due(now, 10)), 1)
+
+        later = now + self.dispatcher.claim_timeout + timedelta(seconds=1)
+        counts = self.dispatcher.dispatch_due(later)
+
+        self.assertEqual(counts["released"], 1)
+        self.assertEqual(counts["sent"], 1)
+
+
+class MeetingDailyStatsTestCase(TestCase):
+    """Test cases for the daily rollup behind the meeting dashboard"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="statsuser", password="testpass123", is_staff=True
+        )
+        self.lead = Lead.objects.create(user=self.user, company_name="Acme")
+        self.other_lead = Lead.objects.create(
+            user=self.user, company_name="Globex", status="converted"
+        )
+
+    def _meeting(self, lead=None, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Meeting.objects.create(
+                lead=lead or self.lead,
+                title="Meeting",
+                scheduled_at=timezone.now(),
+                **fields,
+            )
+
+    def _rollup(self):
+        return {
+            (stats.date, stats.user_id, stats.meeting_type): {
+                field: getattr(stats, field) for field in STATS_FIELDS
+            }
+            for stats in MeetingDailyStats.objects.all()
+        }
+
+    def _create_history(self):
+        started = timezone.now() - timedelta(hours=2)
+        self._meeting(meeting_type="demo")
+        completed = self._meeting(
+            lead=self.other_lead,
+            meeting_type="demo",
+            started_at=started,
+            ended_at=started + timedelta(minutes=55),
+            ai_insights={"agenda": ["Intro"], "outcome": "Positive"},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            completed.status = Meeting.Status.COMPLETED
+            completed.save()
+            MeetingQuestion.objects.create(
+                meeting=completed, question_text="Budget?", effectiveness_score=80
+            )
+        self._meeting(meeting_type="discovery", status="cancelled")
+        return completed
+
+    def _assert_matches_rebuild(self):
+        incremental = self._rollup()
+        rebuild_daily_stats()
+        self.assertEqual(incremental, self._rollup())
+
+    def test_rollup_follows_meeting_question_and_lead_changes(self):
+        completed = self._create_history()
+
+        demo = MeetingDailyStats.objects.get(meeting_type="demo")
+        self.assertEqual(demo.meeting_count, 2)
+        self.assertEqual(demo.completed_count, 1)
+        self.assertEqual(demo.converted_count, 1)
+        self.assertEqual(demo.completed_converted_count, 1)
+        self.assertEqual((demo.timed_count, demo.duration_minutes_total), (1, 55))
+        self.assertEqual(demo.question_score_total, 80)
+        self.assertEqual(demo.prepared_count, 1)
+        # Conversion 30, duration 25, outcome 25 and questions 80% of 20
+        self.assertAlmostEqual(demo.effectiveness_total, 96)
+        self._assert_matches_rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.status = "qualified"
+            self.lead.save()
+        self.assertEqual(
+            MeetingDailyStats.objects.get(meeting_type="demo").qualified_count, 1
+        )
+        self._assert_matches_rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question = completed.questions.get()
+            question.effectiveness_score = 40
+            question.save()
+            completed.meeting_type = "closing"
+            completed.save()
+        self.assertEqual(
+            MeetingDailyStats.objects.get(meeting_type="demo").meeting_count, 1
+        )
+        closing = MeetingDailyStats.objects.get(meeting_type="closing")
+        self.assertEqual(closing.question_score_total, 40)
+        self._assert_matches_rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            completed.delete()
+        self.assertFalse(MeetingDailyStats.objects.filter(meeting_type="closing"))
+        self._assert_matches_rebuild()
+
+    def test_backfill_command_builds_the_rollup(self):
+        self._create_history()
+        expected = self._rollup()
+        MeetingDailyStats.objects.all().delete()
+
+        call_command("backfill_meeting_stats", stdout=StringIO())
+
+        self.assertEqual(self._rollup(), expected)
+
+    def _get(self, view):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return json.loads(view(request).content)
+
+    def test_dashboard_apis_read_the_rollup(self):
+        self._create_history()
+
+        with self.assertNumQueries(2):
+            metrics = self._get(dashboard_metrics_api)
+        self.assertEqual(metrics["total_meetings"], 3)
+        self.assertEqual(metrics["conversion_rate"], 33.3)
+        self.assertEqual(metrics["avg_duration"], 55)
+        self.assertEqual(metrics["ai_effectiveness"], 80)
+
+        with self.assertNumQueries(2):
+            performance = self._get(dashboard_performance_metrics_api)
+        self.assertEqual(
+            [row["meeting_type"] for row in performance["metrics"]],
+            ["Discovery Call", "Product Demo"],
+        )
+        demo = performance["metrics"][1]
+        self.assertEqual((demo["total_meetings"], demo["success_rate"]), (2, 50))
+        self.assertEqual(demo["effectiveness"], 96)
+        self.assertEqual(performance["chart_data"]["data"][-1], 100)
+
+        with self.assertNumQueries(1):
+            conversion = self._get(dashboard_conversion_analytics_api)
+        funnel = {
+            row["stage"]: row["count"]
+            for row in conversion["conversion_data"]["funnel"]
+        }
+        self.assertEqual(funnel["Total Meetings"], 3)
+        self.assertEqual(funnel["Completed Meetings"], 1)
+        self.assertEqual(funnel["Converted Leads"], 1)
+
+
+class AIFeatureEffectivenessTestCase(TestCase):
+    """Test cases for the precomputed AI feature effectiveness analytics"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="effectivenessuser", password="testpass123", is_staff=True
+        )
+        self.converted = Lead.objects.create(
+            user=self.user, company_name="Acme", status="converted"
+        )
+        self.new = Lead.objects.create(user=self.user, company_name="Globex")
+
+    def _meeting(self, lead, meeting_type="discovery", **fields):
+        return Meeting.objects.create(
+            lead=lead,
+            title="Meeting",
+            meeting_type=meeting_type,
+            scheduled_at=timezone.now(),
+            **fields,
+        )
+
+    def _create_history(self):
+        prepared = {"preparation_materials": {"agenda": []}}
+        # With preparation: 3 of 4 converted; without: 1 of 4
+        for lead in (self.converted, self.converted, self.converted, self.new):
+            self._meeting(lead, ai_insights=prepared)
+        for lead in (self.converted, self.new, self.new, self.new):
+            self._meeting(lead, meeting_type="demo")
+
+        # Outcome analysis runs on completed meetings only
+        self._meeting(
+            self.converted, status="completed", ai_insights={"meeting_summary": {}}
+        )
+        self._meeting(self.new, status="completed")
+
+        meeting = self._meeting(self.new, meeting_type="demo")
+        for score, ai_generated in ((80, True), (60, True), (40, False)):
+            MeetingQuestion.objects.create(
+                meeting=meeting,
+                question_text="Budget?",
+                ai_generated=ai_generated,
+                effectiveness_score=score,
+                asked_at=timezone.now() if score > 50 else None,
+            )
+
+    def _row(self, feature, meeting_type=""):
+        return AIFeatureEffectiveness.objects.get(
+            feature=feature, meeting_type=meeting_type
+        )
+
+    def test_intervals(self):
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(low, 23.7, places=1)
+        self.assertAlmostEqual(high, 76.3, places=1)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 0.0))
+
+        difference, low, high = difference_interval(3, 4, 1, 4)
+        self.assertAlmostEqual(difference, 50)
+        self.assertLess(low, 0)
+        self.assertAlmostEqual(high - difference, difference - low)
+
+        mean, low, high = mean_interval(80 + 60, 80**2 + 60**2, 2)
+        self.assertEqual(mean, 70)
+        self.assertAlmostEqual(high - mean, 1.96 * 10, places=5)
+
+    def test_recompute_compares_meetings_with_and_without_each_feature(self):
+        self._create_history()
+
+        EffectivenessAnalytics().recompute()
+
+        preparation = self._row(AIFeatureEffectiveness.Feature.PREPARATION_MATERIALS)
+        self.assertEqual((preparation.usage_count, preparation.control_count), (4, 7))
+        self.assertEqual(preparation.effectiveness, 75)
+        self.assertAlmostEqual(preparation.control_effectiveness, 200 / 7)
+        self.assertAlmostEqual(preparation.conversion_impact, 75 - 200 / 7)
+        self.assertLess(preparation.effectiveness_ci_low, 75)
+        self.assertGreater(preparation.effectiveness_ci_high, 75)
+        self.assertIsNone(preparation.previous_effectiveness)
+
+        outcomes = self._row(AIFeatureEffectiveness.Feature.MEETING_OUTCOMES)
+        self.assertEqual((outcomes.usage_count, outcomes.control_count), (1, 1))
+        self.assertEqual(outcomes.success_rate, 50)
+
+        questions = self._row(AIFeatureEffectiveness.Feature.MEETING_QUESTIONS)
+        self.assertEqual(questions.usage_count, 1)
+        self.assertEqual(questions.effectiveness, 70)
+        self.assertEqual(questions.control_effectiveness, 40)
+        self.assertEqual(questions.success_rate, 100)
+
+        # Per meeting type
+        demo = self._row(AIFeatureEffectiveness.Feature.PREPARATION_MATERIALS, "demo")
+        self.assertEqual((demo.usage_count, demo.control_count), (0, 5))
+        self.assertFalse(
+            AIFeatureEffectiveness.objects.filter(meeting_type="closing").exists()
+        )
+
+    def _request(self, method="get"):
+        request = getattr(RequestFactory(), method)("/")
+        request.user = self.user
+        return request
+
+    def test_api_serves_the_precomputed_table(self):
+        self._create_history()
+        response = dashboard_recompute_ai_effectiveness_api(self._request("post"))
+        self.assertEqual(json.loads(response.content)["rows"], 12)
+
+        with self.assertNumQueries(1):
+            data = json.loads(dashboard_ai_effectiveness_api(self._request()).content)
+
+        features = data["effectiveness_data"]
+        self.assertEqual(
+            [feature["feature_name"] for feature in features],
+            [name for _, name in AIFeatureEffectiveness.Feature.choices],
+        )
+        self.assertEqual(features[0]["effectiveness"], 75)
+        self.assertEqual(len(features[0]["by_meeting_type"]), 2)
+        self.assertIsNotNone(data["computed_at"])
+
+    def test_trend_needs_a_change_beyond_the_interval(self):
+        self._create_history()
+        EffectivenessAnalytics().recompute()
+        row = self._row(AIFeatureEffectiveness.Feature.PREPARATION_MATERIALS)
+        row.previous_effectiveness = 70
+        row.save()
+
+        data = json.loads(dashboard_ai_effectiveness_api(self._request()).content)
+        self.assertEqual(data["effectiveness_data"][0]["trend_direction"], "neutral")
+
+        row.previous_effectiveness = 0
+        row.save()
+        data = json.loads(dashboard_ai_effectiveness_api(self._request()).content)
+        self.assertEqual(data["effectiveness_data"][0]["trend_direction"], "positive")
+
+
+class MeetingOutcomesDashboardTestCase(TestCase):
+    """Test cases for the meeting outcomes dashboard"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="outcomesuser", password="testpass123"
+        )
+        self.lead = Lead.objects.create(user=self.user, company_name="Acme")
+        ended_at = timezone.now()
+        processed = {"follow_up_plan": {}, "lead_scoring_update": {}}
+        # 25 completed meetings: 5 fully processed, 10 with a summary only
+        for index in range(25):
+            Meeting.objects.create(
+                lead=self.lead,
+                title=f"Meeting {index}",
+                scheduled_at=ended_at,
+                ended_at=ended_at - timedelta(hours=index),
+                status=Meeting.Status.COMPLETED,
+                outcome="Went well" if index < 15 else "",
+                action_items=["Send proposal"] if index < 5 else [],
+                ai_insights=processed if index < 5 else {},
+            )
+        Meeting.objects.create(
+            lead=self.lead, title="Upcoming", scheduled_at=ended_at, outcome="Notes"
+        )
+
+    def _get(self):
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+        return get_meeting_outcomes_dashboard(request).data
+
+    def test_totals_cover_every_completed_meeting(self):
+        data = self._get()
+
+        self.assertEqual(data["total_completed_meetings"], 25)
+        self.assertEqual(data["outcomes_processed"], 5)
+        self.assertEqual(data["pending_processing"], 20)
+        self.assertEqual(
+            data["processing_stats"],
+            {
+                "summaries_generated": 15,
+                "action_items_extracted": 5,
+                "follow_ups_scheduled": 5,
+                "lead_scores_updated": 5,
+            },
+        )
+
+        recent = data["recent_meetings"]
+        self.assertEqual(len(recent), 20)
+        self.assertEqual(recent[0]["title"], "Meeting 0")
+        self.assertEqual(recent[0]["company_name"], "Acme")
+        self.assertTrue(recent[0]["processing_status"]["fully_processed"])
+        self.assertEqual(recent[10]["processing_status"]["processed_components"], 1)
+
+    def test_query_count_does_not_grow_with_meetings(self):
+        with self.assertNumQueries(2):
+            self._get()
+
+
+class QuestionAnalyticsExportTestCase(TestCase):
+    """Test cases for streaming question analytics exports"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="exportuser", password="testpass123", is_staff=True
+        )
+        lead = Lead.objects.create(user=self.user, company_name="Acme")
+        self.meetings = [
+            Meeting.objects.create(
+                lead=lead, title=f"Meeting {index}", scheduled_at=timezone.now()
+            )
+            for index in range(2)
+        ]
+        for index in range(5):
+            MeetingQuestion.objects.create(
+                meeting=self.meetings[index % 2],
+                question_text="What is your budget? " * (index + 1),
+                ai_generated=index % 2 == 0,
+                effectiveness_score=index * 10,
+            )
+
+    def _export(self, **params):
+        request = RequestFactory().get("/", params)
+        request.user = self.user
+        return export_question_analytics(request)
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def _csv_rows(self, content):
+        return list(csv.reader(io.StringIO(content.decode("utf-8"))))
+
+    def test_csv_is_streamed_in_chunks(self):
+        export = StreamingExport(
+            MeetingQuestion.objects.order_by("created_at"),
+            QUESTION_EXPORT_COLUMNS,
+            chunk_size=2,
+        )
+        chunks = list(export.csv())
+
+        self.assertEqual(len(chunks), 3)
+        rows = self._csv_rows(b"".join(chunks))
+        self.assertEqual(rows[0][0], "Question ID")
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(rows[5][5].endswith("..."))
+        self.assertEqual(len(self._csv_rows(chunks[0])), 3)
+
+    def test_view_streams_filtered_csv(self):
+        response = self._export(meeting=str(self.meetings[0].id))
+
+        self.assertTrue(response.streaming)
+        self.assertIn(".csv", response["Content-Disposition"])
+        rows = self._csv_rows(self._body(response))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row[2] for row in rows[1:]}, {"Meeting 0"})
+
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        rows = self._csv_rows(self._body(self._export(date_from=tomorrow)))
+        self.assertEqual(len(rows), 1)
+
+    def test_ndjson_and_gzip(self):
+        response = self._export(format="ndjson", gzip="1")
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".ndjson.gz", response["Content-Disposition"])
+        lines = gzip.decompress(self._body(response)).decode("utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(
+            sorted(record["Effectiveness Score"] for record in records),
+            [0, 10, 20, 30, 40],
+        )
+        self.assertIn("AI Generated", records[0])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self._export(format="xlsx").status_code, 400)
+        self.assertEqual(self._export(date_to="yesterday").status_code, 400)
+
+    @skipUnless(exports.pyarrow, "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        response = self._export(format="parquet")
+
+        table = pyarrow.parquet.read_table(io.BytesIO(self._body(response)))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.column_names[0], "Question ID")
+
+
+class MeetingPatternsTestCase(TestCase):
+    """Test cases for columnar meeting pattern analytics"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username="patternuser")
+        other = User.objects.create_user(username="patternother")
+        self.now = timezone.now().replace(microsecond=0)
+        day = self.now - timedelta(days=2)
+
+        def session(organizer, hour, minutes, **fields):
+            start = day.replace(hour=hour, minute=0, second=0)
+            return MeetingSession.objects.create(
+                organizer=organizer,
+                title=f"Meeting at {hour}",
+                scheduled_start_time=start,
+                scheduled_end_time=start + timedelta(minutes=minutes),
+                **fields,
+            )
+
+        start = day.replace(hour=10, minute=0, second=0)
+        self.meetings = [
+            session(
+                self.user,
+                10,
+                60,
+                status=MeetingSession.Status.ENDED,
+                actual_start_time=start + timedelta(minutes=2),
+            ),
+            session(
+                self.user,
+                14,
+                150,
+                status=MeetingSession.Status.ENDED,
+                actual_start_time=day.replace(hour=14, minute=20, second=0),
+            ),
+            session(self.user, 14, 30, status=MeetingSession.Status.CANCELLED),
+            # Organized by someone else, with the user taking part
+            session(
+                other,
+                9,
+                45,
+                meeting_type=MeetingSession.MeetingType.MICROSOFT_TEAMS,
+            ),
+        ]
+        for index, minutes in enumerate((30, 90)):
+            MeetingParticipant.objects.create(
+                meeting=self.meetings[0],
+                email=f"p{index}@example.com",
+                name=f"P{index}",
+                joined_at=start,
+                left_at=start + timedelta(minutes=minutes),
+            )
+        MeetingParticipant.objects.create(
+            meeting=self.meetings[3],
+            user=self.user,
+            email="patternuser@example.com",
+            name="Pattern User",
+        )
+        # Outside the window
+        MeetingSession.objects.create(
+            organizer=self.user,
+            title="Old Meeting",
+            scheduled_start_time=self.now - timedelta(days=60),
+            scheduled_end_time=self.now - timedelta(days=60, hours=-1),
+        )
+
+    def _service(self):
+        with patch(
+            "meeting_service.intelligent_meeting_service.GoogleMeetService"
+        ), patch("meeting_service.intelligent_meeting_service.MicrosoftTeamsService"):
+            return IntelligentMeetingService()
+
+    def _columns(self):
+        return MeetingColumns.load(
+            self.user, self.now - timedelta(days=30), self.now, now=self.now
+        )
+
+    def test_loads_meetings_in_two_queries(self):
+        with self.assertNumQueries(2):
+            columns = self._columns()
+
+        self.assertEqual(columns.size, 4)
+        self.assertEqual(sorted(columns.participant_minutes), [30, 90])
+
+    def test_scores_match_per_meeting_score(self):
+        columns = self._columns()
+        service = self._service()
+        expected = {
+            (meeting.scheduled_start_time, meeting.scheduled_end_time): (
+                service._calculate_meeting_productivity_score(meeting)
+            )
+            for meeting in self.meetings
+        }
+
+        for interval, score in zip(columns.busy, list(columns.scores())):
+            self.assertAlmostEqual(score, expected[interval])
+        # 60 minutes, on time, ended, engagement (0.5 + 1) / 2
+        self.assertAlmostEqual(
+            service._calculate_meeting_productivity_score(self.meetings[0]), 10.0
+        )
+
+    def test_analyze_meeting_patterns(self):
+        service = self._service()
+
+        patterns = service.analyze_meeting_patterns(self.user, days_back=30)
+
+        self.assertEqual(patterns["total_meetings"], 4)
+        self.assertEqual(patterns["avg_duration"], 71.25)
+        self.assertEqual(patterns["late_meetings_count"], 1)
+        self.assertEqual(patterns["cancelled_meetings_count"], 1)
+        self.assertEqual(patterns["most_productive_hours"][0], 10)
+        day_name = self.meetings[0].scheduled_start_time.strftime("%A")
+        self.assertEqual(patterns["meeting_frequency_by_day"], {day_name: 4})
+        self.assertEqual(
+            patterns["meeting_types_distribution"],
+            {
+                MeetingSession.MeetingType.GOOGLE_MEET: 3,
+                MeetingSession.MeetingType.MICROSOFT_TEAMS: 1,
+            },
+        )
+
+        # Cached per user and window
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                service.analyze_meeting_patterns(self.user, days_back=30), patterns
+            )
+
+    def test_analyze_user_availability(self):
+        service = self._service()
+        window = (self.now - timedelta(days=7), self.now)
+
+        availability = service.analyze_user_availability(self.user, window)
+
+        self.assertEqual(availability["total_meetings"], 4)
+        self.assertEqual(
+            availability["daily_counts"],
+            {self.meetings[0].scheduled_start_time.date(): 4},
+        )
+        self.assertEqual(availability["peak_hours"], [14, 9, 10])
+        self.assertEqual(availability["meeting_load"], "heavy")
+        for slot in availability["available_slots"]:
+            for meeting in self.meetings:
+                self.assertFalse(
+                    slot["start"] < meeting.scheduled_end_time
+                    and meeting.scheduled_start_time < slot["end"]
+                )
+
+        with self.assertNumQueries(0):
+            service.analyze_user_availability(self.user, window)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_meeting_patterns", meetings=50, participants=2, stdout=out
+        )
+
+        self.assertIn("Loaded 50 meetings and 100 participations", out.getvalue())
+        self.assertIn("with 2 queries", out.getvalue())
+        self.assertFalse(
+            MeetingSession.objects.filter(title="Benchmark meeting").exists()
+        )
+
+
+def batch_questions(count=1):
+    return {
+        "discovery_questions": [
+            {"question": f"Discovery question {index}", "priority": 8}
+            for index in range(count)
+        ],
+        "budget_questions": [{"question": "What is the budget?", "priority": 6}],
+    }
+
+
+@override_settings(GEMINI_BACKEND="synthetic", GEMINI_FAKE_LATENCY="fixed:0")
+class QuestionPregenerationTestCase(TestCase):
+    """Test cases for nightly batched question generation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="pregenuser")
+        self.now = timezone.now()
+        saas = [
+            Lead.objects.create(user=self.user, company_name=name, industry="SaaS")
+            for name in ("Acme", "Globex")
+        ]
+        clinic = Lead.objects.create(
+            user=self.user, company_name="Clinic", industry="Healthcare"
+        )
+
+        def meeting(lead, hours, **fields):
+            return Meeting.objects.create(
+                lead=lead,
+                title=f"{lead.company_name} in {hours}h",
+                scheduled_at=self.now + timedelta(hours=hours),
+                **fields,
+            )
+
+        self.due = [
+            meeting(saas[0], 5),
+            meeting(saas[1], 10),
+            meeting(saas[0], 30),
+            meeting(clinic, 20),
+        ]
+        self.fresh = meeting(clinic, 40)
+        MeetingQuestion.objects.create(
+            meeting=self.fresh, question_text="Fresh?", ai_generated=True
+        )
+        # Stale: one unused AI question is replaced, the asked one is kept
+        stale = [
+            MeetingQuestion.objects.create(
+                meeting=self.due[1], question_text=text, ai_generated=True
+            )
+            for text in ("Old unused?", "Old asked?")
+        ]
+        MeetingQuestion.objects.filter(pk__in=[q.pk for q in stale]).update(
+            created_at=self.now - timedelta(days=10)
+        )
+        MeetingQuestion.objects.filter(pk=stale[1].pk).update(asked_at=self.now)
+        meeting(saas[1], 24 * 5)
+        meeting(saas[1], 15, status=Meeting.Status.CANCELLED)
+
+        self.pregenerator = QuestionPregenerator(days_ahead=3)
+        self.pregenerator._question_service = MeetingQuestionService()
+        self.calls = []
+
+    def _generate(self, industry, leads, meetings):
+        self.calls.append((industry, leads, meetings))
+        return {key: batch_questions() for key in meetings}
+
+    def _run(self, generate=None):
+        with patch.object(
+            self.pregenerator.question_service.ai_service,
+            "generate_meeting_questions_batch",
+            side_effect=generate or self._generate,
+        ):
+            return self.pregenerator.run(self.now)
+
+    def test_due_meetings(self):
+        due = self.pregenerator.due_meetings(self.now)
+
+        self.assertEqual({m.pk for m in due}, {m.pk for m in self.due})
+        # Grouped by industry, with the meetings of a lead together
+        self.assertEqual(due[0].lead.industry, "Healthcare")
+        acme, globex = self.due[0].lead_id, self.due[1].lead_id
+        self.assertIn(
+            [m.lead_id for m in due[1:]], ([acme, acme, globex], [globex, acme, acme])
+        )
+
+    def test_run_generates_batches_per_industry(self):
+        report = self._run()
+
+        self.assertEqual(report["prompts"], 2)
+        self.assertEqual(report["generated_meetings"], 4)
+        self.assertEqual(report["questions_created"], 8)
+        self.assertEqual(report["coverage"], 100.0)
+        self.assertEqual(report["upcoming_meetings"], 5)
+        industries = {
+            industry: (leads, meetings) for industry, leads, meetings in self.calls
+        }
+        leads, meetings = industries["saas"]
+        # Each lead is sent once
+        self.assertEqual(len(leads), 2)
+        self.assertEqual(len(meetings), 3)
+        self.assertEqual({m["lead"] for m in meetings.values()}, set(leads))
+
+        stale_meeting = self.due[1]
+        self.assertEqual(
+            sorted(stale_meeting.questions.values_list("question_text", flat=True)),
+            ["Discovery question 0", "Old asked?", "What is the budget?"],
+        )
+        stale_meeting.refresh_from_db()
+        self.assertEqual(
+            stale_meeting.ai_insights["question_generation"]["total_questions"], 2
+        )
+
+        # Nothing is due on the next run
+        self.assertEqual(self._run()["prompts"], 0)
+
+    def test_insights_written_during_generation_are_kept(self):
+        meeting = self.due[0]
+        Meeting.objects.filter(pk=meeting.pk).update(
+            ai_insights={"question_generation": {"total_questions": 9}}
+        )
+
+        def generate(industry, leads, meetings):
+            # Written elsewhere while the prompt was being answered
+            Meeting.objects.filter(pk=meeting.pk).update(
+                ai_insights={
+                    "question_generation": {"total_questions": 9},
+                    "preparation_materials": {"summary": "Prepared"},
+                }
+            )
+            return self._generate(industry, leads, meetings)
+
+        self._run(generate)
+
+        meeting.refresh_from_db()
+        self.assertEqual(
+            meeting.ai_insights["preparation_materials"], {"summary": "Prepared"}
+        )
+        self.assertEqual(
+            meeting.ai_insights["question_generation"]["total_questions"], 2
+        )
+
+    def test_meetings_left_out_of_the_response_fail(self):
+        def generate(industry, leads, meetings):
+            return {key: batch_questions() for key in list(meetings)[:1]}
+
+        report = self._run(generate)
+
+        self.assertEqual(report["generated_meetings"], 2)
+        self.assertEqual(report["failed_meetings"], 2)
+        self.assertEqual(report["coverage"], 60.0)
+
+    @override_settings(QUESTION_PREGENERATION_QUOTA_RESERVE=100)
+    def test_stops_before_the_quota_reserve(self):
+        self.pregenerator = QuestionPregenerator(days_ahead=3)
+        self.pregenerator._question_service = MeetingQuestionService()
+        with patch(
+            "meeting_service.question_pregeneration.quota_tracker.get_current_usage",
+            side_effect=[{"daily_remaining": 500}, {"daily_remaining": 100}],
+        ):
+            report = self._run()
+
+        self.assertEqual(report["prompts"], 1)
+        self.assertEqual(report["deferred_meetings"], 3)
+        self.assertEqual(report["covered_meetings"], 2)
+
+
+@override_settings(GEMINI_BACKEND="synthetic", GEMINI_FAKE_LATENCY="fixed:0")
+class BatchedMeetingQuestionsTestCase(TestCase):
+    """Test cases for GeminiAIService.generate_meeting_questions_batch"""
+
+    def test_questions_by_meeting_key(self):
+        service = GeminiAIService()
+        response = MagicMock(text=json.dumps({"M1": batch_questions(2)}))
+        leads = {"L1": {"company_name": "Acme", "industry": "SaaS"}}
+        meetings = {
+            "M1": {"lead": "L1", "meeting_type": "discovery"},
+            "M2": {"lead": "L1", "meeting_type": "demo"},
+        }
+
+        with patch.object(service, "_make_api_call", return_value=response) as call:
+            results = service.generate_meeting_questions_batch("saas", leads, meetings)
+
+        prompt = call.call_args[0][0]
+        self.assertEqual(prompt.count('"company_name":"Acme"'), 1)
+        self.assertIn('"M2":{"lead":"L1","meeting_type":"demo"}', prompt)
+        self.assertEqual(list(results), ["M1"])
+        self.assertEqual(len(results["M1"]["discovery_questions"]), 2)
+        self.assertIn("question_strategy", results["M1"])
+
+    def test_failed_call_returns_nothing(self):
+        service = GeminiAIService()
+
+        with patch.object(service, "_make_api_call", side_effect=Exception("down")):
+            self.assertEqual(
+                service.generate_meeting_questions_batch("saas", {}, {"M1": {}}), {}
+            )
+
+
+class QuestionEffectivenessAggregationTestCase(TestCase):
+    """Test cases for logging and aggregating question effectiveness"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="effectivenessuser")
+        self.lead = Lead.objects.create(
+            user=self.user, company_name="Acme", industry="SaaS"
+        )
+        self.meeting = Meeting.objects.create(
+            lead=self.lead, title="Discovery", scheduled_at=timezone.now()
+        )
+        self.template = QuestionTemplate.objects.create(
+            name="Pain points",
+            industry="SaaS",
+            template_type=QuestionTemplate.TemplateType.DISCOVERY,
+            question_category=QuestionTemplate.QuestionCategory.PAIN_POINTS,
+            question_template="What slows {company_name} down?",
+            rationale="Finds pain points",
+        )
+
+    def question(self, template=None):
+        return MeetingQuestion.objects.create(
+            meeting=self.meeting,
+            question_text="What slows you down?",
+            generation_context=(
+                {"template_id": str(template.id)} if template else {"rationale": ""}
+            ),
+        )
+
+    def assert_moments(self, template, scores):
+        template.refresh_from_db()
+        self.assertEqual(template.effectiveness_count, len(scores))
+        self.assertAlmostEqual(template.effectiveness_mean, statistics.mean(scores))
+        self.assertAlmostEqual(template.success_rate, statistics.mean(scores))
+        self.assertAlmostEqual(
+            template.effectiveness_variance, statistics.variance(scores)
+        )
+
+    def test_merged_moments_match_the_whole_sample(self):
+        first, second = [70, 85, 40], [100, 55]
+        moments, other = Moments(), Moments()
+        for score in first:
+            moments.add(score)
+        for score in second:
+            other.add(score)
+
+        merged = moments.merge(other)
+        self.assertEqual(merged.count, 5)
+        self.assertAlmostEqual(merged.mean, statistics.mean(first + second))
+        self.assertAlmostEqual(merged.variance, statistics.variance(first + second))
+        self.assertEqual(Moments().merge(Moments()), Moments())
+
+    def test_calculate_effectiveness_only_appends_a_log(self):
+        question = self.question(self.template)
+
+        with self.assertNumQueries(1):
+            question.calculate_effectiveness(
+                {"led_to_qualification": True, "positive_response": True}
+            )
+
+        self.assertEqual(question.effectiveness_score, 55)
+        log = QuestionEffectivenessLog.objects.get(question=question)
+        self.assertEqual(
+            (log.effectiveness_score, log.effectiveness_tier, log.aggregated_at),
+            (55, QuestionEffectivenessLog.EffectivenessTier.MEDIUM, None),
+        )
+        self.assertTrue(log.led_to_qualification)
+        question.refresh_from_db()
+        self.assertIsNone(question.effectiveness_score)
+        self.assertFalse(question.led_to_qualification)
+
+    def test_aggregation_updates_questions_and_templates(self):
+        other_template = QuestionTemplate.objects.create(
+            name="Budget",
+            industry="SaaS",
+            template_type=QuestionTemplate.TemplateType.DISCOVERY,
+            question_category=QuestionTemplate.QuestionCategory.BUDGET,
+            question_template="What is the budget?",
+            rationale="Qualifies the lead",
+        )
+        first, second = self.question(self.template), self.question(self.template)
+        budget, untemplated = self.question(other_template), self.question()
+        first.calculate_effectiveness({"led_to_qualification": True})
+        first.calculate_effectiveness({"positive_response": True})
+        second.calculate_effectiveness({"moved_deal_forward": True})
+        budget.calculate_effectiveness({"generated_follow_up": True})
+        untemplated.calculate_effectiveness({"positive_response": True})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = EffectivenessAggregator().run()
+
+        self.assertEqual(counts, {"logs": 5, "questions": 4, "templates": 2})
+        first.refresh_from_db()
+        # Latest score, and qualification from any of its logs
+        self.assertEqual(first.effectiveness_score, 25)
+        self.assertTrue(first.led_to_qualification)
+        untemplated.refresh_from_db()
+        self.assertEqual(untemplated.effectiveness_score, 25)
+        self.assert_moments(self.template, [30, 25, 25])
+        other_template.refresh_from_db()
+        self.assertEqual(
+            (other_template.effectiveness_count, other_template.success_rate), (1, 20)
+        )
+        self.assertEqual(other_template.effectiveness_variance, 0)
+        self.assertFalse(
+            QuestionEffectivenessLog.objects.filter(aggregated_at__isnull=True).exists()
+        )
+        self.assertEqual(EffectivenessAggregator().run()["logs"], 0)
+
+    def test_batches_merge_into_the_stored_statistics(self):
+        question = self.question(self.template)
+        outcomes = [
+            {"led_to_qualification": True, "moved_deal_forward": True},
+            {"positive_response": True},
+            {"generated_follow_up": True, "positive_response": True},
+            {},
+            {"led_to_qualification": True},
+        ]
+        for outcome in outcomes[:3]:
+            question.calculate_effectiveness(outcome)
+        EffectivenessAggregator().run()
+        self.template.update_success_rate(90)
+        for outcome in outcomes[3:]:
+            question.calculate_effectiveness(outcome or {"none": True})
+
+        counts = EffectivenessAggregator(batch_size=1).run()
+
+        self.assertEqual(counts["logs"], 2)
+        self.assert_moments(self.template, [55, 25, 45, 90, 0, 30])
+
+    def test_concurrent_template_updates_are_not_lost(self):
+        first = QuestionTemplate.objects.get(pk=self.template.pk)
+        second = QuestionTemplate.objects.get(pk=self.template.pk)
+
+        first.increment_usage()
+        second.increment_usage()
+        first.update_success_rate(80)
+        second.update_success_rate(40)
+
+        self.assertEqual(second.usage_count, 2)
+        self.assert_moments(second, [80, 40])
+
+    @override_settings(GEMINI_BACKEND="synthetic", GEMINI_FAKE_LATENCY="fixed:0")
+    def test_tracked_effectiveness_is_logged(self):
+        question = self.question(self.template)
+        service = MeetingQuestionService()
+        effectiveness = {
+            "effectiveness_score": 85,
+            "effectiveness_breakdown": {"response_quality": 90},
+            "effectiveness_tier": "high",
+            "response_analysis": {"buying_signals": ["Asked about pricing"]},
+            "learning_insights": {"what_worked_well": ["Specific"]},
+        }
+
+        with patch.object(
+            service.ai_service,
+            "track_question_effectiveness",
+            return_value=effectiveness,
+        ):
+            result = service.track_question_effectiveness(
+                question, "We lose two days a month", {"moved_deal_forward": True}
+            )
+
+        self.assertEqual(result["effectiveness_score"], 85)
+        log = QuestionEffectivenessLog.objects.get(question=question)
+        self.assertEqual(log.response_quality_score, 90)
+        self.assertEqual(log.response_word_count, 6)
+        self.assertEqual(log.buying_signals_identified, ["Asked about pricing"])
+        self.assertTrue(log.moved_deal_forward)
+        question.refresh_from_db()
+        self.assertIsNone(question.effectiveness_score)
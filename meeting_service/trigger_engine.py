@@ -0,0 +1,211 @@
+"""
+Trigger engine and debounce scheduling for live meeting analysis
+
+Which turns are worth a (Gemini-backed) live analysis is configured in the
+admin as ``LiveAnalysisTrigger`` rows: weighted lists of words and phrases,
+optionally limited to some meeting types. The active triggers are compiled
+into one regular expression (longest terms first, whole words only), so a
+turn is matched against every term in a single pass. The compiled engine is
+cached per process and reloaded every LIVE_TRIGGER_RELOAD_SECONDS, or at
+once in the process that saved a trigger.
+
+Matches feed a per-meeting debounce scheduler:
+
+- at most one analysis starts per LIVE_ANALYSIS_WINDOW_SECONDS window
+- triggers that fire inside the window are coalesced into the session's
+  pending triggers instead of being dropped
+- pending triggers with a weight of at least LIVE_TRIGGER_PRIORITY_WEIGHT
+  (budget and competitor mentions by default) schedule a flush for the end
+  of the window; lower-weight ones wait for the next turn after it
+- every LIVE_ANALYSIS_EVERY_TURNS turns and sharp sentiment swings count as
+  built-in triggers
+
+Each analysis reports the triggers that caused it, highest weight first.
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import LiveAnalysisTrigger
+
+logger = logging.getLogger(__name__)
+
+# Built-in triggers that are not configured as terms
+TURN_INTERVAL_TRIGGER = "turn_interval"
+SENTIMENT_SHIFT_TRIGGER = "sentiment_shift"
+
+
+@dataclass
+class TriggerDefinition:
+    name: str
+    terms: Sequence[str]
+    weight: float
+    meeting_types: Sequence[str] = ()
+
+
+@dataclass
+class AnalysisDecision:
+    """What the scheduler decided for one turn"""
+
+    run_now: bool
+    # Trigger name -> weight, highest weight first when reported
+    triggers: Dict[str, float] = field(default_factory=dict)
+    # Seconds until a flush of the pending triggers should run (0 = none)
+    flush_in: float = 0.0
+
+    @property
+    def reasons(self) -> List[str]:
+        return sorted(self.triggers, key=lambda name: (-self.triggers[name], name))
+
+    def as_trigger(self) -> Dict[str, object]:
+        """Trigger reason stored with, and reported by, the analysis"""
+        return {
+            "reasons": self.reasons,
+            "score": round(sum(self.triggers.values()), 2),
+        }
+
+
+class TriggerEngine:
+    """Weighted multi-pattern matcher compiled from trigger definitions"""
+
+    def __init__(self, definitions: Iterable[TriggerDefinition]):
+        self.definitions = list(definitions)
+        self._term_triggers: Dict[str, List[TriggerDefinition]] = {}
+        for definition in self.definitions:
+            for term in definition.terms:
+                self._term_triggers.setdefault(term.lower(), []).append(definition)
+
+        terms = sorted(self._term_triggers, key=len, reverse=True)
+        self._pattern = (
+            re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+            if terms
+            else None
+        )
+
+    def match(
+        self, content: str, meeting_type: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Triggers (name -> weight) whose terms occur in ``content``"""
+        if self._pattern is None:
+            return {}
+        matched = {}
+        for term in set(self._pattern.findall(content.lower())):
+            for definition in self._term_triggers[term]:
+                if (
+                    meeting_type
+                    and definition.meeting_types
+                    and meeting_type not in definition.meeting_types
+                ):
+                    continue
+                matched[definition.name] = definition.weight
+        return matched
+
+
+_engine: Optional[TriggerEngine] = None
+_engine_loaded_at = 0.0
+_engine_lock = threading.Lock()
+
+
+def _load_definitions() -> List[TriggerDefinition]:
+    return [
+        TriggerDefinition(
+            name=trigger.name,
+            terms=trigger.term_list(),
+            weight=trigger.weight,
+            meeting_types=trigger.meeting_types or (),
+        )
+        for trigger in LiveAnalysisTrigger.objects.filter(is_active=True)
+    ]
+
+
+def get_trigger_engine() -> TriggerEngine:
+    """The compiled engine for the active triggers (cached per process)"""
+    global _engine, _engine_loaded_at
+    reload_after = getattr(settings, "LIVE_TRIGGER_RELOAD_SECONDS", 60)
+    with _engine_lock:
+        if _engine is None or time.monotonic() - _engine_loaded_at >= reload_after:
+            try:
+                _engine = TriggerEngine(_load_definitions())
+            except Exception as e:
+                logger.error(f"Could not load live analysis triggers: {e}")
+                if _engine is None:
+                    _engine = TriggerEngine([])
+            _engine_loaded_at = time.monotonic()
+        return _engine
+
+
+def invalidate_trigger_engine():
+    """Recompile on next use (called when a trigger is saved or deleted)"""
+    global _engine
+    with _engine_lock:
+        _engine = None
+
+
+def _seconds_since(value: Optional[str], now: datetime) -> Optional[float]:
+    if not value:
+        return None
+    last_time = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return (now - last_time).total_seconds()
+
+
+def decide(
+    session_data: Dict[str, object],
+    matched: Dict[str, float],
+    now: Optional[datetime] = None,
+) -> AnalysisDecision:
+    """
+    Debounce and coalesce triggers for one turn
+
+    ``session_data`` supplies ``last_analysis_time``, ``pending_triggers``,
+    ``trigger_flush_scheduled``, ``turn_count`` and ``sentiment_shift``.
+    """
+    now = now or timezone.now()
+    triggers = dict(session_data.get("pending_triggers") or {})
+    for name, weight in matched.items():
+        triggers[name] = max(weight, triggers.get(name, 0.0))
+
+    every_turns = getattr(settings, "LIVE_ANALYSIS_EVERY_TURNS", 5)
+    turn_count = session_data.get("turn_count") or 0
+    if every_turns and turn_count and turn_count % every_turns == 0:
+        triggers.setdefault(TURN_INTERVAL_TRIGGER, 0.5)
+    if session_data.get("sentiment_shift"):
+        triggers[SENTIMENT_SHIFT_TRIGGER] = getattr(
+            settings, "LIVE_TRIGGER_PRIORITY_WEIGHT", 3.0
+        )
+
+    if not triggers:
+        return AnalysisDecision(run_now=False)
+
+    window = getattr(settings, "LIVE_ANALYSIS_WINDOW_SECONDS", 10)
+    elapsed = _seconds_since(session_data.get("last_analysis_time"), now)
+    if elapsed is None or elapsed >= window:
+        return AnalysisDecision(run_now=True, triggers=triggers)
+
+    flush_in = 0.0
+    priority = getattr(settings, "LIVE_TRIGGER_PRIORITY_WEIGHT", 3.0)
+    if max(triggers.values()) >= priority and not session_data.get(
+        "trigger_flush_scheduled"
+    ):
+        flush_in = window - elapsed
+    return AnalysisDecision(run_now=False, triggers=triggers, flush_in=flush_in)
+
+
+def pending_flush_due(
+    session_data: Dict[str, object], now: Optional[datetime] = None
+) -> Tuple[bool, float]:
+    """Whether a scheduled flush may run now, else the seconds left"""
+    window = getattr(settings, "LIVE_ANALYSIS_WINDOW_SECONDS", 10)
+    elapsed = _seconds_since(
+        session_data.get("last_analysis_time"), now or timezone.now()
+    )
+    if elapsed is None or elapsed >= window:
+        return True, 0.0
+    return False, window - elapsed
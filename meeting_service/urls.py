@@ -448,6 +448,11 @@ urlpatterns = [
         dashboard_views.dashboard_ai_effectiveness_api,
         name="dashboard_ai_effectiveness_api",
     ),
+    path(
+        "admin/dashboard/ai-effectiveness/recompute/",
+        dashboard_views.dashboard_recompute_ai_effectiveness_api,
+        name="dashboard_recompute_ai_effectiveness_api",
+    ),
     path(
         "admin/dashboard/conversion/",
         dashboard_views.dashboard_conversion_analytics_api,
@@ -499,6 +504,11 @@ urlpatterns = [
         calendar_views.get_calendar_sync_status,
         name="get_calendar_sync_status",
     ),
+    path(
+        "api/calendar/resync/",
+        calendar_views.resync_calendar_mirror,
+        name="resync_calendar_mirror",
+    ),
     path(
         "api/calendar/dashboard/",
         calendar_views.calendar_integration_dashboard,
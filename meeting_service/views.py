@@ -1,8 +1,9 @@
 import json
 from dataclasses import asdict
-from datetime import timedelta
+from datetime import date, timedelta
 
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import get_user_model
 from django.db import models
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
@@ -14,7 +15,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .meeting_outcome_service import MeetingOutcomeService
+from ai_service.jobs import accepted_payload, submit_job, wants_async
+
+from .exports import QUESTION_EXPORT_COLUMNS, ExportFormatError, StreamingExport
+from .meeting_outcome_service import OUTCOME_COMPONENTS, MeetingOutcomeService
 from .microsoft_teams_service import MicrosoftTeamsService
 from .models import (
     Meeting,
@@ -619,15 +623,24 @@ def teams_meeting_dashboard(request):
         ]
         active_meetings = [m for m in all_meetings if m.is_active()]
 
+        # Teams, channels and recent meetings' media in two Graph round trips
+        recent_meetings = all_meetings[:5]
+        graph_data = teams_service.get_dashboard_data(
+            request.user,
+            [m.teams_meeting_id for m in recent_meetings if m.teams_meeting_id],
+        )
+
         return Response(
             {
                 "today_meetings": len(today_meetings),
                 "upcoming_meetings": len(upcoming_meetings),
                 "active_meetings": len(active_meetings),
                 "recent_meetings": MeetingSessionSerializer(
-                    all_meetings[:5], many=True
+                    recent_meetings, many=True
                 ).data,
-                "teams_auth_status": True,  # If we reach here, user has valid credentials
+                "teams": graph_data["teams"] if graph_data else [],
+                "recent_meeting_media": graph_data["meetings"] if graph_data else {},
+                "teams_auth_status": graph_data is not None,
             }
         )
     except Exception as e:
@@ -1129,27 +1142,16 @@ def get_meeting_guidance(request):
 
         if result["success"]:
             # Extract meeting guidance from the session
-            from django.core.cache import cache
-
-            session_data = cache.get(session_id)
+            session_data = live_service.get_session(session_id)
 
             if session_data:
                 # Get recent conversation turns for guidance generation
-                recent_turns = [
-                    live_service.ConversationTurn(**turn_data)
-                    for turn_data in session_data["conversation_turns"][-10:]
-                ]
+                recent_turns = live_service.get_recent_turns(session_id, 10)
 
                 if recent_turns:
-                    meeting_id = session_data["meeting_id"]
-                    meeting = Meeting.objects.get(id=meeting_id)
-                    meeting_context = {
-                        "meeting_type": meeting.meeting_type,
-                        "lead_info": live_service._get_lead_context(meeting.lead),
-                        "ai_insights": live_service._get_ai_insights_context(
-                            meeting.lead
-                        ),
-                    }
+                    meeting_context = live_service.get_meeting_context(
+                        session_id, session_data
+                    )
 
                     # Generate meeting guidance
                     guidance = live_service.generate_meeting_guidance(
@@ -1219,16 +1221,11 @@ def handle_objection(request):
         # Get meeting context if session_id provided
         meeting_context = {"meeting_type": "discovery"}
         if session_id:
-            from django.core.cache import cache
-
-            session_data = cache.get(session_id)
+            session_data = live_service.get_session(session_id)
             if session_data:
-                meeting_id = session_data["meeting_id"]
-                meeting = Meeting.objects.get(id=meeting_id)
-                meeting_context = {
-                    "meeting_type": meeting.meeting_type,
-                    "lead_info": live_service._get_lead_context(meeting.lead),
-                }
+                meeting_context = live_service.get_meeting_context(
+                    session_id, session_data
+                )
 
         # Generate objection handling advice
         guidance = live_service.generate_meeting_guidance(
@@ -1270,9 +1267,7 @@ def identify_closing_opportunity(request):
             )
 
         live_service = LiveMeetingSupportService()
-        from django.core.cache import cache
-
-        session_data = cache.get(session_id)
+        session_data = live_service.get_session(session_id)
 
         if not session_data:
             return Response(
@@ -1281,10 +1276,7 @@ def identify_closing_opportunity(request):
             )
 
         # Get recent conversation turns
-        recent_turns = [
-            live_service.ConversationTurn(**turn_data)
-            for turn_data in session_data["conversation_turns"][-5:]  # Last 5 turns
-        ]
+        recent_turns = live_service.get_recent_turns(session_id, 5)
 
         if conversation_context:
             # Add the current context as a turn
@@ -1296,12 +1288,7 @@ def identify_closing_opportunity(request):
             recent_turns.append(context_turn)
 
         # Get meeting context
-        meeting_id = session_data["meeting_id"]
-        meeting = Meeting.objects.get(id=meeting_id)
-        meeting_context = {
-            "meeting_type": meeting.meeting_type,
-            "lead_info": live_service._get_lead_context(meeting.lead),
-        }
+        meeting_context = live_service.get_meeting_context(session_id, session_data)
 
         # Generate meeting guidance focused on closing
         guidance = live_service.generate_meeting_guidance(recent_turns, meeting_context)
@@ -1345,9 +1332,7 @@ def get_follow_up_recommendations(request):
             )
 
         live_service = LiveMeetingSupportService()
-        from django.core.cache import cache
-
-        session_data = cache.get(session_id)
+        session_data = live_service.get_session(session_id)
 
         if not session_data:
             return Response(
@@ -1356,19 +1341,13 @@ def get_follow_up_recommendations(request):
             )
 
         # Get all conversation turns
-        conversation_turns = [
-            live_service.ConversationTurn(**turn_data)
-            for turn_data in session_data["conversation_turns"]
-        ]
+        conversation_turns = live_service.get_recent_turns(session_id)
 
         # Get meeting context
-        meeting_id = session_data["meeting_id"]
-        meeting = Meeting.objects.get(id=meeting_id)
-        meeting_context = {
-            "meeting_type": meeting.meeting_type,
-            "lead_info": live_service._get_lead_context(meeting.lead),
-            "meeting_outcome": meeting_outcome,
-        }
+        meeting_context = dict(
+            live_service.get_meeting_context(session_id, session_data),
+            meeting_outcome=meeting_outcome,
+        )
 
         # Generate meeting guidance focused on follow-up
         guidance = live_service.generate_meeting_guidance(
@@ -1411,9 +1390,7 @@ def check_intervention_alerts(request):
             )
 
         live_service = LiveMeetingSupportService()
-        from django.core.cache import cache
-
-        session_data = cache.get(session_id)
+        session_data = live_service.get_session(session_id)
 
         if not session_data:
             return Response(
@@ -1422,10 +1399,7 @@ def check_intervention_alerts(request):
             )
 
         # Get recent conversation turns
-        recent_turns = [
-            live_service.ConversationTurn(**turn_data)
-            for turn_data in session_data["conversation_turns"][-8:]  # Last 8 turns
-        ]
+        recent_turns = live_service.get_recent_turns(session_id, 8)
 
         if not recent_turns:
             return Response(
@@ -1437,12 +1411,7 @@ def check_intervention_alerts(request):
             )
 
         # Get meeting context
-        meeting_id = session_data["meeting_id"]
-        meeting = Meeting.objects.get(id=meeting_id)
-        meeting_context = {
-            "meeting_type": meeting.meeting_type,
-            "lead_info": live_service._get_lead_context(meeting.lead),
-        }
+        meeting_context = live_service.get_meeting_context(session_id, session_data)
 
         # Generate meeting guidance focused on intervention alerts
         guidance = live_service.generate_meeting_guidance(recent_turns, meeting_context)
@@ -1702,18 +1671,17 @@ def end_live_meeting_session(request):
 def get_live_meeting_status(request):
     """Get status of all active live meeting sessions for the user"""
     try:
-        from django.core.cache import cache
-
-        # Get all cache keys for live meetings (this is a simplified approach)
+        # Look up sessions for the user's in-progress meetings
         # In production, you might want to maintain a separate index of active sessions
         user_meetings = Meeting.objects.filter(
             lead__user=request.user, status=Meeting.Status.IN_PROGRESS
-        )
+        ).select_related("lead")
 
+        live_service = LiveMeetingSupportService()
         active_sessions = []
         for meeting in user_meetings:
             session_key = f"live_meeting_{meeting.id}"
-            session_data = cache.get(session_key)
+            session_data = live_service.get_session(session_key)
 
             if session_data:
                 active_sessions.append(
@@ -1723,9 +1691,7 @@ def get_live_meeting_status(request):
                         "meeting_title": meeting.title,
                         "company_name": meeting.lead.company_name,
                         "start_time": session_data.get("start_time"),
-                        "conversation_turns": len(
-                            session_data.get("conversation_turns", [])
-                        ),
+                        "conversation_turns": session_data["turn_count"],
                         "last_activity": session_data.get("last_analysis_time"),
                     }
                 )
@@ -1770,9 +1736,25 @@ def get_nia_available_slots(request):
         except ValueError:
             meeting_type = NIAMeetingType.GENERAL_CONSULTATION
 
+        # Other users who must be free too, as comma-separated ids
+        attendee_ids = [
+            attendee_id.strip()
+            for attendee_id in request.GET.get("attendee_ids", "").split(",")
+            if attendee_id.strip().isdigit()
+        ]
+        attendees = list(get_user_model().objects.filter(id__in=attendee_ids))
+        include_manager = request.GET.get("include_manager", "").lower() in (
+            "1",
+            "true",
+        )
+
         nia_scheduler = NIAMeetingScheduler()
         available_slots = nia_scheduler.get_available_time_slots(
-            request.user, (start_date, end_date), meeting_type
+            request.user,
+            (start_date, end_date),
+            meeting_type,
+            attendees=attendees,
+            include_manager=include_manager,
         )
 
         return Response(
@@ -2021,73 +2003,43 @@ def bulk_update_question_priority(request):
 
 @staff_member_required
 def export_question_analytics(request):
-    """Admin view to export question analytics"""
-    try:
-        import csv
-        from datetime import datetime
-
-        from django.http import HttpResponse
-
-        # Create CSV response
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = (
-            f'attachment; filename="question_analytics_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        )
-
-        writer = csv.writer(response)
-
-        # Write header
-        writer.writerow(
-            [
-                "Question ID",
-                "Meeting Title",
-                "Company",
-                "Question Type",
-                "Question Text",
-                "Priority",
-                "AI Generated",
-                "Asked At",
-                "Response Length",
-                "Effectiveness Score",
-                "Led to Qualification",
-                "Led to Objection",
-                "Confidence Score",
-            ]
-        )
+    """
+    Admin view to export question analytics
 
-        # Write data
-        questions = MeetingQuestion.objects.select_related(
-            "meeting", "meeting__lead"
-        ).all()
+    Streams every question, or those selected (question_ids), of some meetings
+    (meeting) or created from date_from to date_to, as csv, ndjson or parquet
+    (format). gzip=1 compresses csv and ndjson.
+    """
+    try:
+        params = request.POST if request.method == "POST" else request.GET
+        questions = MeetingQuestion.objects.order_by("-created_at")
 
-        for question in questions:
-            writer.writerow(
-                [
-                    str(question.id),
-                    question.meeting.title,
-                    question.meeting.lead.company_name if question.meeting.lead else "",
-                    question.get_question_type_display(),
-                    (
-                        question.question_text[:100] + "..."
-                        if len(question.question_text) > 100
-                        else question.question_text
-                    ),
-                    question.priority,
-                    "Yes" if question.ai_generated else "No",
-                    (
-                        question.asked_at.strftime("%Y-%m-%d %H:%M:%S")
-                        if question.asked_at
-                        else ""
-                    ),
-                    len(question.response.split()) if question.response else 0,
-                    question.effectiveness_score or 0,
-                    "Yes" if question.led_to_qualification else "No",
-                    "Yes" if question.led_to_objection else "No",
-                    question.confidence_score,
-                ]
+        if params.getlist("question_ids"):
+            questions = questions.filter(id__in=params.getlist("question_ids"))
+        if params.getlist("meeting"):
+            questions = questions.filter(meeting_id__in=params.getlist("meeting"))
+        try:
+            if params.get("date_from"):
+                questions = questions.filter(
+                    created_at__date__gte=date.fromisoformat(params["date_from"])
+                )
+            if params.get("date_to"):
+                questions = questions.filter(
+                    created_at__date__lte=date.fromisoformat(params["date_to"])
+                )
+        except ValueError:
+            return JsonResponse(
+                {"success": False, "error": "Dates must be YYYY-MM-DD"}, status=400
             )
 
-        return response
+        export = StreamingExport(questions, QUESTION_EXPORT_COLUMNS)
+        return export.response(
+            params.get("format", "csv"),
+            f"question_analytics_{timezone.now().strftime('%Y%m%d_%H%M%S')}",
+            compress=params.get("gzip") in ("1", "true"),
+        )
+    except ExportFormatError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
@@ -2151,6 +2103,9 @@ def duplicate_question_template(request, template_id):
         template.name = f"{template.name} (Copy)"
         template.usage_count = 0
         template.success_rate = 0.0
+        template.effectiveness_count = 0
+        template.effectiveness_mean = 0.0
+        template.effectiveness_m2 = 0.0
         template.created_by = request.user
         template.save()
 
@@ -3121,6 +3076,9 @@ def duplicate_question_template(request, template_id):
         template.name = f"{template.name} (Copy)"
         template.usage_count = 0
         template.success_rate = 0.0
+        template.effectiveness_count = 0
+        template.effectiveness_mean = 0.0
+        template.effectiveness_m2 = 0.0
         template.created_by = request.user
         template.save()
 
@@ -3227,82 +3185,41 @@ def bulk_update_question_priority(request):
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
 
-@staff_member_required
-def export_question_analytics(request):
-    """Admin view to export question analytics"""
-    try:
-        import csv
-
-        from django.http import HttpResponse
-
-        # Create CSV response
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = (
-            'attachment; filename="question_analytics.csv"'
-        )
-
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "Question ID",
-                "Meeting",
-                "Company",
-                "Question Type",
-                "Question Text",
-                "Priority",
-                "Confidence Score",
-                "Asked At",
-                "Response",
-                "Effectiveness Score",
-                "Led to Qualification",
-                "AI Generated",
-                "Created At",
-            ]
-        )
+# Pre-Meeting Intelligence Generation Views
 
-        # Get all questions with related data
-        questions = MeetingQuestion.objects.select_related(
-            "meeting", "meeting__lead"
-        ).order_by("-created_at")
+MEETING_INTELLIGENCE_MESSAGES = {
+    "preparation_materials": (
+        "Comprehensive preparation materials generated successfully"
+    ),
+    "agenda": "Meeting agenda generated successfully",
+    "talking_points": "Talking points generated successfully",
+    "competitive_analysis": "Competitive analysis generated successfully",
+}
 
-        for question in questions:
-            writer.writerow(
-                [
-                    str(question.id),
-                    question.meeting.title,
-                    question.meeting.lead.company_name,
-                    question.get_question_type_display(),
-                    (
-                        question.question_text[:100] + "..."
-                        if len(question.question_text) > 100
-                        else question.question_text
-                    ),
-                    question.priority,
-                    question.confidence_score,
-                    (
-                        question.asked_at.strftime("%Y-%m-%d %H:%M:%S")
-                        if question.asked_at
-                        else ""
-                    ),
-                    (
-                        question.response[:50] + "..."
-                        if question.response and len(question.response) > 50
-                        else question.response or ""
-                    ),
-                    question.effectiveness_score or "",
-                    "Yes" if question.led_to_qualification else "No",
-                    "Yes" if question.ai_generated else "No",
-                    question.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                ]
-            )
 
-        return response
+def _generate_meeting_intelligence(meeting, intelligence_type):
+    """Generate one type of pre-meeting intelligence for a meeting"""
+    intelligence_service = PreMeetingIntelligenceService()
 
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)}, status=500)
+    if intelligence_type == "preparation_materials":
+        return intelligence_service.generate_preparation_materials(
+            meeting, regenerate=True
+        )
+    if intelligence_type == "agenda":
+        return intelligence_service.generate_meeting_agenda(meeting, regenerate=True)
+    if intelligence_type == "talking_points":
+        return intelligence_service.generate_talking_points(meeting)
+    return intelligence_service.generate_competitive_analysis(meeting)
 
 
-# Pre-Meeting Intelligence Generation Views
+def run_meeting_intelligence_job(params, progress):
+    """Job handler for generate_meeting_intelligence with async=true"""
+    meeting = Meeting.objects.get(id=params["meeting_id"])
+    progress(10, f"Generating {params['type'].replace('_', ' ')}")
+    result = _generate_meeting_intelligence(meeting, params["type"])
+    if result.get("success"):
+        result.setdefault("message", MEETING_INTELLIGENCE_MESSAGES[params["type"]])
+    return result
 
 
 @staff_member_required
@@ -3323,27 +3240,7 @@ def generate_meeting_intelligence(request, meeting_id):
                 {"success": False, "error": "Meeting not found"}, status=404
             )
 
-        # Initialize intelligence service
-        intelligence_service = PreMeetingIntelligenceService()
-
-        # Generate the requested intelligence type
-        if intelligence_type == "preparation_materials":
-            result = intelligence_service.generate_preparation_materials(
-                meeting, regenerate=True
-            )
-            message = "Comprehensive preparation materials generated successfully"
-        elif intelligence_type == "agenda":
-            result = intelligence_service.generate_meeting_agenda(
-                meeting, regenerate=True
-            )
-            message = "Meeting agenda generated successfully"
-        elif intelligence_type == "talking_points":
-            result = intelligence_service.generate_talking_points(meeting)
-            message = "Talking points generated successfully"
-        elif intelligence_type == "competitive_analysis":
-            result = intelligence_service.generate_competitive_analysis(meeting)
-            message = "Competitive analysis generated successfully"
-        else:
+        if intelligence_type not in MEETING_INTELLIGENCE_MESSAGES:
             return JsonResponse(
                 {
                     "success": False,
@@ -3352,6 +3249,17 @@ def generate_meeting_intelligence(request, meeting_id):
                 status=400,
             )
 
+        if wants_async(request):
+            job, created = submit_job(
+                "meeting_intelligence",
+                {"meeting_id": str(meeting.id), "type": intelligence_type},
+                request.user,
+            )
+            return JsonResponse(accepted_payload(job, created), status=202)
+
+        result = _generate_meeting_intelligence(meeting, intelligence_type)
+        message = MEETING_INTELLIGENCE_MESSAGES[intelligence_type]
+
         if result.get("success"):
             return JsonResponse(
                 {
@@ -3595,25 +3503,46 @@ def process_complete_meeting_outcome(request, meeting_id):
 
         regenerate = request.data.get("regenerate", False)
 
+        if wants_async(request):
+            job, created = submit_job(
+                "meeting_outcome",
+                {"meeting_id": str(meeting.id), "regenerate": bool(regenerate)},
+                request.user,
+            )
+            return Response(
+                accepted_payload(job, created), status=status.HTTP_202_ACCEPTED
+            )
+
         outcome_service = MeetingOutcomeService()
         result = outcome_service.process_complete_meeting_outcome(meeting, regenerate)
 
-        return Response(
-            {
-                "success": result.get("overall_success", False),
-                "components": result.get("components", {}),
-                "message": result.get("message", ""),
-                "processing_time": {
-                    "started_at": result.get("processing_started_at"),
-                    "completed_at": result.get("processing_completed_at"),
-                },
-            }
-        )
+        return Response(_meeting_outcome_response(result))
 
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _meeting_outcome_response(result):
+    return {
+        "success": result.get("overall_success", False),
+        "components": result.get("components", {}),
+        "message": result.get("message", ""),
+        "processing_time": {
+            "started_at": result.get("processing_started_at"),
+            "completed_at": result.get("processing_completed_at"),
+        },
+    }
+
+
+def run_meeting_outcome_job(params, progress):
+    """Job handler for process_complete_meeting_outcome with async=true"""
+    meeting = Meeting.objects.get(id=params["meeting_id"])
+    result = MeetingOutcomeService().process_complete_meeting_outcome(
+        meeting, params.get("regenerate", False), progress=progress
+    )
+    return _meeting_outcome_response(result)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_meeting_outcome_status(request, meeting_id):
@@ -3685,49 +3614,47 @@ def get_meeting_outcomes_dashboard(request):
         # Get user's completed meetings
         completed_meetings = Meeting.objects.filter(
             lead__user=request.user, status=Meeting.Status.COMPLETED
-        ).order_by("-ended_at")[:20]
+        )
+        fully_processed = models.Q()
+        for condition in OUTCOME_COMPONENTS.values():
+            fully_processed &= condition
+
+        # Totals over all of them in one query
+        totals = completed_meetings.aggregate(
+            total=models.Count("id"),
+            processed=models.Count("id", filter=fully_processed),
+            **{
+                name: models.Count("id", filter=condition)
+                for name, condition in OUTCOME_COMPONENTS.items()
+            },
+        )
 
         dashboard_data = {
-            "total_completed_meetings": completed_meetings.count(),
-            "outcomes_processed": 0,
-            "pending_processing": 0,
+            "total_completed_meetings": totals["total"],
+            "outcomes_processed": totals["processed"],
+            "pending_processing": totals["total"] - totals["processed"],
             "recent_meetings": [],
-            "processing_stats": {
-                "summaries_generated": 0,
-                "action_items_extracted": 0,
-                "follow_ups_scheduled": 0,
-                "lead_scores_updated": 0,
-            },
+            "processing_stats": {name: totals[name] for name in OUTCOME_COMPONENTS},
         }
 
-        for meeting in completed_meetings:
-            # Check processing status
-            has_summary = bool(meeting.outcome)
-            has_action_items = bool(meeting.action_items)
-            has_follow_up = "follow_up_plan" in meeting.ai_insights
-            has_scoring_update = "lead_scoring_update" in meeting.ai_insights
-
+        recent_meetings = (
+            completed_meetings.select_related("lead")
+            .only("id", "title", "ended_at", "lead__company_name")
+            .annotate(
+                **{
+                    name: models.ExpressionWrapper(
+                        condition, output_field=models.BooleanField()
+                    )
+                    for name, condition in OUTCOME_COMPONENTS.items()
+                }
+            )
+            .order_by("-ended_at")[:20]
+        )
+        total_components = len(OUTCOME_COMPONENTS)
+        for meeting in recent_meetings:
             processed_components = sum(
-                [has_summary, has_action_items, has_follow_up, has_scoring_update]
+                bool(getattr(meeting, name)) for name in OUTCOME_COMPONENTS
             )
-            is_fully_processed = processed_components == 4
-
-            if is_fully_processed:
-                dashboard_data["outcomes_processed"] += 1
-            else:
-                dashboard_data["pending_processing"] += 1
-
-            # Update processing stats
-            if has_summary:
-                dashboard_data["processing_stats"]["summaries_generated"] += 1
-            if has_action_items:
-                dashboard_data["processing_stats"]["action_items_extracted"] += 1
-            if has_follow_up:
-                dashboard_data["processing_stats"]["follow_ups_scheduled"] += 1
-            if has_scoring_update:
-                dashboard_data["processing_stats"]["lead_scores_updated"] += 1
-
-            # Add to recent meetings
             dashboard_data["recent_meetings"].append(
                 {
                     "id": str(meeting.id),
@@ -3739,10 +3666,13 @@ def get_meeting_outcomes_dashboard(request):
                         meeting.ended_at.isoformat() if meeting.ended_at else None
                     ),
                     "processing_status": {
-                        "fully_processed": is_fully_processed,
+                        "fully_processed": processed_components == total_components,
                         "processed_components": processed_components,
-                        "total_components": 4,
-                        "completion_percentage": (processed_components / 4) * 100,
+                        "total_components": total_components,
+                        "completion_percentage": (
+                            processed_components / total_components
+                        )
+                        * 100,
                     },
                 }
             )
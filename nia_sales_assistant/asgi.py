@@ -20,8 +20,16 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nia_sales_assistant.settings")
 # is populated before importing code that may import ORM models.
 django_asgi_app = get_asgi_application()
 
+from ai_service.routing import websocket_urlpatterns as ai_websocket_urlpatterns
+from meeting_service.routing import (
+    websocket_urlpatterns as meeting_websocket_urlpatterns,
+)
 from voice_service.routing import websocket_urlpatterns
 
+websocket_urlpatterns = (
+    websocket_urlpatterns + ai_websocket_urlpatterns + meeting_websocket_urlpatterns
+)
+
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 """
 
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -222,13 +223,67 @@ GEMINI_MINUTE_LIMIT = config("GEMINI_MINUTE_LIMIT", default=15, cast=int)
 GEMINI_DAILY_LIMIT = config("GEMINI_DAILY_LIMIT", default=1500, cast=int)
 GEMINI_TOKEN_MINUTE_LIMIT = config("GEMINI_TOKEN_MINUTE_LIMIT", default=1000000, cast=int)
 
+# Model backend: live, record, replay or synthetic (see ai_service/model_backends.py).
+# record/replay store responses as JSON files in GEMINI_CASSETTE_DIR.
+GEMINI_BACKEND = config("GEMINI_BACKEND", default="live")
+GEMINI_CASSETTE_DIR = config(
+    "GEMINI_CASSETTE_DIR", default=str(BASE_DIR / "gemini_cassettes")
+)
+# Simulated latency for offline backends, e.g. "fixed:0.5" or "lognormal:0.8:0.4"
+GEMINI_FAKE_LATENCY = config("GEMINI_FAKE_LATENCY", default="")
+GEMINI_FAKE_SEED = config("GEMINI_FAKE_SEED", default=None)
+GEMINI_REPLAY_SYNTHESIZE_MISSES = config(
+    "GEMINI_REPLAY_SYNTHESIZE_MISSES", default=False, cast=bool
+)
+
+# Circuit breaker around the Gemini backend (state shared through Redis).
+# GEMINI_BREAKER_STORE="local" keeps the state per process instead.
+GEMINI_BREAKER_ENABLED = config("GEMINI_BREAKER_ENABLED", default=True, cast=bool)
+GEMINI_BREAKER_STORE = config("GEMINI_BREAKER_STORE", default="redis")
+GEMINI_BREAKER_FAILURE_THRESHOLD = config(
+    "GEMINI_BREAKER_FAILURE_THRESHOLD", default=5, cast=int
+)
+GEMINI_BREAKER_FAILURE_WINDOW = config(
+    "GEMINI_BREAKER_FAILURE_WINDOW", default=60, cast=int
+)
+GEMINI_BREAKER_RECOVERY_TIMEOUT = config(
+    "GEMINI_BREAKER_RECOVERY_TIMEOUT", default=30, cast=int
+)
+# Seconds a successful result is kept to answer calls while the breaker is open
+GEMINI_LAST_KNOWN_GOOD_TTL = config("GEMINI_LAST_KNOWN_GOOD_TTL", default=86400, cast=int)
+
+# Optional bearer token required to scrape /metrics (empty = open)
+METRICS_AUTH_TOKEN = config("METRICS_AUTH_TOKEN", default="")
+# AI metrics are aggregated across web and Celery processes in Redis;
+# "local" makes /metrics report only the process that serves it
+AI_METRICS_STORE = config("AI_METRICS_STORE", default="redis")
+# Seconds between a process's flushes of its metric deltas to Redis
+AI_METRICS_FLUSH_INTERVAL = config("AI_METRICS_FLUSH_INTERVAL", default=10, cast=int)
+
+# Prompt token budgets (see ai_service/prompting.py). Per-method overrides,
+# e.g. {"extract_lead_info": 8000}; methods without a budget use the default.
+AI_PROMPT_DEFAULT_TOKEN_BUDGET = config(
+    "AI_PROMPT_DEFAULT_TOKEN_BUDGET", default=3000, cast=int
+)
+AI_PROMPT_TOKEN_BUDGETS = {}
+
+# Transcript compression (CompressedTextField). "zstd" requires the optional
+# zstandard package and falls back to zlib when it is not installed.
+TRANSCRIPT_COMPRESSION_CODEC = config("TRANSCRIPT_COMPRESSION_CODEC", default="zlib")
+TRANSCRIPT_COMPRESSION_LEVEL = config("TRANSCRIPT_COMPRESSION_LEVEL", default=6, cast=int)
+TRANSCRIPT_COMPRESSION_USE_DICTIONARY = config(
+    "TRANSCRIPT_COMPRESSION_USE_DICTIONARY", default=True, cast=bool
+)
+
 # ==============================================================================
 # CELERY CONFIGURATION (Background Tasks)
 # ==============================================================================
 
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+
 # Redis broker configuration for Celery
-CELERY_BROKER_URL = config("REDIS_URL", default="redis://localhost:6379/0")
-CELERY_RESULT_BACKEND = config("REDIS_URL", default="redis://localhost:6379/0")
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 
 # Celery serialization settings
 CELERY_ACCEPT_CONTENT = ["json"]
@@ -236,6 +291,19 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
+# Live meeting analysis runs on its own worker pool:
+#   celery worker -Q live_analysis
+CELERY_TASK_ROUTES = {
+    "meeting_service.tasks.run_live_analysis": {"queue": "live_analysis"},
+    "meeting_service.tasks.flush_live_analysis_triggers": {"queue": "live_analysis"},
+}
+
+# Async AI jobs (ai_service.jobs): "redis" shares job state between web and
+# Celery processes; "local" keeps it in-process (tests, single-process dev)
+AI_JOB_STORE = config("AI_JOB_STORE", default="redis")
+# Seconds job status and results are kept after the last update
+AI_JOB_TTL = config("AI_JOB_TTL", default=3600, cast=int)
+
 # ==============================================================================
 # GOOGLE CLOUD INTEGRATION
 # ==============================================================================
@@ -273,6 +341,134 @@ MICROSOFT_REDIRECT_URI = config(
     default="http://localhost:8000/meeting/oauth/outlook/callback/",
 )
 
+# ==============================================================================
+# CALENDAR MIRROR (meeting_service/calendar_mirror.py)
+# ==============================================================================
+
+# Conflict detection and slot search read a local copy of users' calendars,
+# kept current by incremental sync (Google sync tokens, Graph delta queries)
+CALENDAR_MIRROR_PAST_DAYS = config("CALENDAR_MIRROR_PAST_DAYS", default=7, cast=int)
+CALENDAR_MIRROR_FUTURE_DAYS = config(
+    "CALENDAR_MIRROR_FUTURE_DAYS", default=120, cast=int
+)
+# Seconds between periodic syncs, and age after which reads go to the providers
+CALENDAR_MIRROR_SYNC_INTERVAL = config(
+    "CALENDAR_MIRROR_SYNC_INTERVAL", default=300, cast=int
+)
+CALENDAR_MIRROR_STALE_SECONDS = config(
+    "CALENDAR_MIRROR_STALE_SECONDS", default=900, cast=int
+)
+
+# ==============================================================================
+# MEETING REMINDERS (meeting_service/reminder_dispatcher.py)
+# ==============================================================================
+
+# Seconds between scans for due reminders, and reminders claimed per batch
+REMINDER_DISPATCH_INTERVAL = config("REMINDER_DISPATCH_INTERVAL", default=60, cast=int)
+REMINDER_DISPATCH_BATCH_SIZE = config(
+    "REMINDER_DISPATCH_BATCH_SIZE", default=200, cast=int
+)
+# Sends tried before a reminder fails, and the delay between them (seconds)
+REMINDER_MAX_ATTEMPTS = config("REMINDER_MAX_ATTEMPTS", default=3, cast=int)
+REMINDER_RETRY_DELAY = config("REMINDER_RETRY_DELAY", default=300, cast=int)
+# Seconds after which a claimed, unfinished reminder is claimed again
+REMINDER_CLAIM_TIMEOUT = config("REMINDER_CLAIM_TIMEOUT", default=600, cast=int)
+# Preparation materials younger than this (seconds) are reused by reminders
+REMINDER_PREPARATION_MAX_AGE = config(
+    "REMINDER_PREPARATION_MAX_AGE", default=6 * 3600, cast=int
+)
+
+# ==============================================================================
+# QUESTION PREGENERATION (meeting_service/question_pregeneration.py)
+# ==============================================================================
+
+# Hour (UTC) of the nightly run, and days ahead of it whose meetings get questions
+QUESTION_PREGENERATION_HOUR = config("QUESTION_PREGENERATION_HOUR", default=2, cast=int)
+QUESTION_PREGENERATION_DAYS_AHEAD = config(
+    "QUESTION_PREGENERATION_DAYS_AHEAD", default=3, cast=int
+)
+# Meetings per Gemini prompt
+QUESTION_PREGENERATION_BATCH_SIZE = config(
+    "QUESTION_PREGENERATION_BATCH_SIZE", default=4, cast=int
+)
+# AI-generated questions older than this (days) are generated again
+QUESTION_PREGENERATION_MAX_AGE_DAYS = config(
+    "QUESTION_PREGENERATION_MAX_AGE_DAYS", default=7, cast=int
+)
+# Daily Gemini requests the run leaves for interactive use
+QUESTION_PREGENERATION_QUOTA_RESERVE = config(
+    "QUESTION_PREGENERATION_QUOTA_RESERVE", default=300, cast=int
+)
+
+# ==============================================================================
+# QUESTION EFFECTIVENESS AGGREGATION (meeting_service/question_effectiveness.py)
+# ==============================================================================
+
+# Seconds between folds of the effectiveness logs into questions and templates
+QUESTION_EFFECTIVENESS_AGGREGATION_INTERVAL = config(
+    "QUESTION_EFFECTIVENESS_AGGREGATION_INTERVAL", default=300, cast=int
+)
+# Logs folded per transaction
+QUESTION_EFFECTIVENESS_AGGREGATION_BATCH_SIZE = config(
+    "QUESTION_EFFECTIVENESS_AGGREGATION_BATCH_SIZE", default=1000, cast=int
+)
+
+# ==============================================================================
+# AI FEATURE EFFECTIVENESS (meeting_service/effectiveness_analytics.py)
+# ==============================================================================
+
+# Seconds between recomputes, and days of meetings compared in each
+AI_EFFECTIVENESS_INTERVAL = config("AI_EFFECTIVENESS_INTERVAL", default=3600, cast=int)
+AI_EFFECTIVENESS_WINDOW_DAYS = config(
+    "AI_EFFECTIVENESS_WINDOW_DAYS", default=30, cast=int
+)
+
+# Periodic tasks (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    "sync-calendar-mirrors": {
+        "task": "meeting_service.tasks.sync_calendar_mirrors",
+        "schedule": CALENDAR_MIRROR_SYNC_INTERVAL,
+    },
+    "dispatch-meeting-reminders": {
+        "task": "meeting_service.tasks.dispatch_meeting_reminders",
+        "schedule": REMINDER_DISPATCH_INTERVAL,
+    },
+    "compute-ai-effectiveness": {
+        "task": "meeting_service.tasks.compute_ai_effectiveness",
+        "schedule": AI_EFFECTIVENESS_INTERVAL,
+    },
+    "pregenerate-meeting-questions": {
+        "task": "meeting_service.tasks.pregenerate_meeting_questions",
+        "schedule": crontab(hour=QUESTION_PREGENERATION_HOUR, minute=0),
+    },
+    "aggregate-question-effectiveness": {
+        "task": "meeting_service.tasks.aggregate_question_effectiveness",
+        "schedule": QUESTION_EFFECTIVENESS_AGGREGATION_INTERVAL,
+    },
+}
+
+# ==============================================================================
+# PROVIDER HTTP CLIENTS (meeting_service/provider_clients.py)
+# ==============================================================================
+
+# Timeouts (seconds) and retries for Google Calendar and Microsoft Graph calls
+PROVIDER_HTTP_CONNECT_TIMEOUT = config(
+    "PROVIDER_HTTP_CONNECT_TIMEOUT", default=5, cast=float
+)
+PROVIDER_HTTP_READ_TIMEOUT = config("PROVIDER_HTTP_READ_TIMEOUT", default=30, cast=float)
+PROVIDER_HTTP_RETRIES = config("PROVIDER_HTTP_RETRIES", default=3, cast=int)
+# Keep-alive connections to Microsoft Graph per process
+PROVIDER_HTTP_POOL_SIZE = config("PROVIDER_HTTP_POOL_SIZE", default=20, cast=int)
+# Threads fetching calendars from several providers at once
+PROVIDER_FETCH_WORKERS = config("PROVIDER_FETCH_WORKERS", default=8, cast=int)
+
+# ==============================================================================
+# MEETING PATTERN ANALYTICS (meeting_service/meeting_patterns.py)
+# ==============================================================================
+
+# Seconds meeting pattern and availability analyses are cached per user and window
+MEETING_PATTERNS_CACHE_TTL = config("MEETING_PATTERNS_CACHE_TTL", default=300, cast=int)
+
 # ==============================================================================
 # DJANGO CHANNELS CONFIGURATION (WebSocket Support)
 # ==============================================================================
@@ -285,7 +481,50 @@ CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
-            "hosts": [config("REDIS_URL", default="redis://localhost:6379/0")],
+            "hosts": [REDIS_URL],
         },
     },
 }
+
+# ==============================================================================
+# LIVE MEETING SUPPORT
+# ==============================================================================
+
+# Live session storage (meeting_service.live_session_store): "redis" shares
+# sessions between workers; "local" keeps them in-process (tests, single-process dev)
+LIVE_SESSION_STORE = config("LIVE_SESSION_STORE", default="redis")
+# Seconds a live session survives without a new conversation turn
+LIVE_SESSION_TTL = config("LIVE_SESSION_TTL", default=3600, cast=int)
+# Entries kept in the key moment and sentiment history streams
+LIVE_SESSION_HISTORY_MAXLEN = config(
+    "LIVE_SESSION_HISTORY_MAXLEN", default=500, cast=int
+)
+# Analyse turns on the live analysis workers and push results over Channels
+# (False runs the analysis inside the conversation turn request)
+LIVE_ANALYSIS_ASYNC = config("LIVE_ANALYSIS_ASYNC", default=True, cast=bool)
+# Seconds before a stuck live analysis worker's claim on a meeting expires
+LIVE_ANALYSIS_LOCK_TIMEOUT = config("LIVE_ANALYSIS_LOCK_TIMEOUT", default=120, cast=int)
+# Live analysis triggers (meeting_service/trigger_engine.py, edited in the admin):
+# at most one analysis per window, triggers inside it are coalesced and those
+# weighing at least the priority weight flush at the end of the window
+LIVE_ANALYSIS_WINDOW_SECONDS = config(
+    "LIVE_ANALYSIS_WINDOW_SECONDS", default=10, cast=float
+)
+# Built-in trigger every N turns (0 disables it)
+LIVE_ANALYSIS_EVERY_TURNS = config("LIVE_ANALYSIS_EVERY_TURNS", default=5, cast=int)
+LIVE_TRIGGER_PRIORITY_WEIGHT = config(
+    "LIVE_TRIGGER_PRIORITY_WEIGHT", default=3.0, cast=float
+)
+# Seconds a process keeps its compiled triggers before reloading them
+LIVE_TRIGGER_RELOAD_SECONDS = config(
+    "LIVE_TRIGGER_RELOAD_SECONDS", default=60, cast=int
+)
+# Local sentiment tracker (meeting_service/sentiment_tracker.py): turns in its
+# rolling window, and when live analysis asks Gemini to recalibrate it
+LIVE_SENTIMENT_WINDOW_TURNS = config("LIVE_SENTIMENT_WINDOW_TURNS", default=20, cast=int)
+LIVE_SENTIMENT_CALIBRATION_TURNS = config(
+    "LIVE_SENTIMENT_CALIBRATION_TURNS", default=20, cast=int
+)
+LIVE_SENTIMENT_CALIBRATION_DELTA = config(
+    "LIVE_SENTIMENT_CALIBRATION_DELTA", default=0.5, cast=float
+)
@@ -21,6 +21,8 @@ from django.contrib import admin
 from django.shortcuts import redirect
 from django.urls import include, path
 
+from ai_service.views import metrics_view
+
 
 def redirect_to_admin(request):
     """Redirect root URL to admin panel"""
@@ -33,6 +35,7 @@ urlpatterns = [
     path("api/voice/", include("voice_service.urls")),
     path("meeting/", include("meeting_service.urls")),
     path("admin-config/", include("admin_config.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("", redirect_to_admin, name="home"),
 ]
 
@@ -46,7 +46,7 @@ def test_lead_quality_scoring():
     }
 
     # Mock the AI response
-    with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+    with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
         mock_response = MagicMock()
         mock_response.text = json.dumps(
             {
@@ -100,7 +100,7 @@ def test_sales_strategy_generation():
     quality_score = {"overall_score": 80, "quality_tier": "high"}
 
     # Mock the AI response
-    with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+    with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
         mock_response = MagicMock()
         mock_response.text = json.dumps(
             {
@@ -146,7 +146,7 @@ def test_industry_insights():
     }
 
     # Mock the AI response
-    with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+    with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
         mock_response = MagicMock()
         mock_response.text = json.dumps(
             {
@@ -198,7 +198,7 @@ def test_comprehensive_recommendations():
     }
 
     # Mock the AI response
-    with patch("ai_service.services.genai.GenerativeModel") as mock_model:
+    with patch("ai_service.model_backends.genai.GenerativeModel") as mock_model:
         mock_response = MagicMock()
         mock_response.text = json.dumps(
             {
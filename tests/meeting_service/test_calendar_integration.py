@@ -223,9 +223,9 @@ def test_calendar_integration():
                 print(f"   📅 Meeting: {recent_meeting.title}")
                 print(f"   ⏰ Reminder times: 60 minutes, 15 minutes before")
 
-                # Check if reminders were stored in AI insights
-                reminders = recent_meeting.ai_insights.get("scheduled_reminders", [])
-                print(f"   📝 Stored reminders: {len(reminders)}")
+                # Check if reminders were stored
+                reminders = recent_meeting.reminders.count()
+                print(f"   📝 Stored reminders: {reminders}")
             else:
                 print(f"   ⚠️  Meeting reminders scheduling had issues")
         else:
@@ -26,10 +26,10 @@ from django.contrib.auth import get_user_model
 from ai_service.models import AIInsights, Lead
 from meeting_service.dashboard_views import (
     calculate_ai_effectiveness,
-    calculate_feature_effectiveness,
     calculate_meeting_preparation_status,
     calculate_preparation_score,
 )
+from meeting_service.effectiveness_analytics import EffectivenessAnalytics
 from meeting_service.models import Meeting, MeetingQuestion
 
 User = get_user_model()
@@ -208,16 +208,11 @@ def test_dashboard_functions():
         )
 
     # Test feature effectiveness
-    features = [
-        "preparation_materials",
-        "meeting_questions",
-        "meeting_outcomes",
-        "lead_scoring",
-    ]
-    for feature in features:
-        effectiveness = calculate_feature_effectiveness(feature)
+    for effectiveness in EffectivenessAnalytics().recompute():
+        if effectiveness.meeting_type:
+            continue
         print(
-            f"{feature} effectiveness: {effectiveness['effectiveness']:.1f}% (usage: {effectiveness['usage_count']})"
+            f"{effectiveness.feature} effectiveness: {effectiveness.effectiveness:.1f}% (usage: {effectiveness.usage_count})"
         )
 
 
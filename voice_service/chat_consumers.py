@@ -778,10 +778,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """Search chat history"""
         from .chat_models import ChatSearchHistory
 
-        # Simple search implementation
+        # Match every query word against the search vector; the full content
+        # is stored compressed and is not loaded for search results
         search_results = ChatSearchHistory.objects.filter(
-            user=self.user, searchable_content__icontains=query
-        )[:10]
+            user=self.user
+        ).without_transcripts()
+        for word in ChatSearchHistory.build_search_vector(query).split():
+            search_results = search_results.filter(search_vector__icontains=word)
+        search_results = search_results.select_related("session")[:10]
 
         return [
             {
@@ -2,11 +2,14 @@
 Chat models for smart chat interface with voice fallback
 """
 
+import re
 import uuid
 
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from ai_service.fields import CompressedTextField, CompressedTextQuerySet
+
 from .models import CallSession
 
 User = get_user_model()
@@ -279,7 +282,7 @@ class ChatSearchHistory(models.Model):
     )
 
     # Search content
-    searchable_content = models.TextField()  # Concatenated message content
+    searchable_content = CompressedTextField()  # Concatenated message content
     conversation_summary = models.TextField(blank=True)
 
     # Search metadata
@@ -294,6 +297,8 @@ class ChatSearchHistory(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CompressedTextQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -303,3 +308,16 @@ class ChatSearchHistory(models.Model):
 
     def __str__(self):
         return f"Search History for Session {self.session.session_id}"
+
+    def save(self, *args, **kwargs):
+        # searchable_content is stored compressed, so searches run against
+        # the normalized word list kept in search_vector instead
+        if "searchable_content" in self.__dict__:
+            self.search_vector = self.build_search_vector(self.searchable_content)
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def build_search_vector(content):
+        """Lowercase, de-duplicated words of the content in first-seen order"""
+        words = re.findall(r"\w+", (content or "").lower())
+        return " ".join(dict.fromkeys(words))
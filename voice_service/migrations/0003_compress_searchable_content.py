@@ -0,0 +1,41 @@
+import re
+
+from django.db import migrations
+
+import ai_service.fields
+
+
+def build_search_vectors(apps, schema_editor):
+    """Fill search_vector for rows saved before chat search switched to it"""
+    ChatSearchHistory = apps.get_model("voice_service", "ChatSearchHistory")
+    batch = []
+    for history in ChatSearchHistory.objects.only(
+        "id", "searchable_content", "search_vector"
+    ).iterator(chunk_size=500):
+        # Same normalization as ChatSearchHistory.build_search_vector
+        words = re.findall(r"\w+", (history.searchable_content or "").lower())
+        history.search_vector = " ".join(dict.fromkeys(words))
+        batch.append(history)
+        if len(batch) >= 500:
+            ChatSearchHistory.objects.bulk_update(batch, ["search_vector"])
+            batch = []
+    if batch:
+        ChatSearchHistory.objects.bulk_update(batch, ["search_vector"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_service", "0006_compressiondictionary_compressed_transcripts"),
+        ("voice_service", "0002_chatbotcommand_chatsession_chatsearchhistory_and_more"),
+    ]
+
+    operations = [
+        ai_service.fields.convert_to_compressed(
+            "voice_service",
+            "chatsearchhistory",
+            "searchable_content",
+            ai_service.fields.CompressedTextField(),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
@@ -43,7 +43,9 @@ class ConversationSummaryService:
     def model(self):
         """Lazy-load Gemini model"""
         if self._model is None and self.genai:
-            self._model = self.genai.GenerativeModel("gemini-pro")
+            from ai_service.model_backends import get_model_backend
+
+            self._model = get_model_backend("gemini-pro")
         return self._model
 
     async def generate_conversation_summary(self, session_id: str) -> Dict: